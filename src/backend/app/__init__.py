@@ -21,6 +21,8 @@ jwt = JWTManager()
 
 # Import db at module level to make it available for mvp_routes
 from models import db
+from app.services.config_loader import get_resource_loading_settings
+from app.services.lazy_resources import format_startup_report, measure_import
 
 def create_app(config_name='development'):
     """Application factory pattern"""
@@ -64,15 +66,16 @@ def create_app(config_name='development'):
 
     # Register blueprints - Refactored routes structure (Dec 2025)
     # All routes are now organized into domain-specific blueprints
-    from app.routes.auth import auth_bp
-    from app.routes.organization import org_bp
-    from app.routes.phase1_maturity import phase1_maturity_bp
-    from app.routes.phase1_roles import phase1_roles_bp
-    from app.routes.phase1_strategies import phase1_strategies_bp
-    from app.routes.phase2_assessment import phase2_assessment_bp
-    from app.routes.phase2_learning import phase2_learning_bp
-    from app.routes.main import main_bp
-    from app.competency_service import competency_service_bp
+    with measure_import('routes'):
+        from app.routes.auth import auth_bp
+        from app.routes.organization import org_bp
+        from app.routes.phase1_maturity import phase1_maturity_bp
+        from app.routes.phase1_roles import phase1_roles_bp
+        from app.routes.phase1_strategies import phase1_strategies_bp
+        from app.routes.phase2_assessment import phase2_assessment_bp
+        from app.routes.phase2_learning import phase2_learning_bp
+        from app.routes.main import main_bp
+        from app.competency_service import competency_service_bp
 
     # Register all blueprints under /api prefix
     app.register_blueprint(auth_bp, url_prefix='/api')
@@ -96,8 +99,10 @@ def create_app(config_name='development'):
           "\n  - main_bp: /api/ (misc routes)")
 
     # Import Derik's routes - Enable competency assessor integration
+    # (the RAG-LLM pipeline itself is loaded lazily, see app/services/lazy_resources.py)
     try:
-        from app.derik_integration import derik_bp
+        with measure_import('derik_integration'):
+            from app.derik_integration import derik_bp
         app.register_blueprint(derik_bp, url_prefix='/api/derik')
         print("Derik's competency assessor integration enabled (bridge routes only)")
     except Exception as e:
@@ -138,4 +143,7 @@ def create_app(config_name='development'):
             }
         }
 
+    if get_resource_loading_settings().get('startup_report', True):
+        print(format_startup_report())
+
     return app
\ No newline at end of file
@@ -11,22 +11,24 @@ import sys
 import json
 import traceback
 
-# Import LLM pipeline from local services
-try:
-    from app.services.llm_pipeline import llm_process_identification_pipeline
-    create_pipeline = llm_process_identification_pipeline.create_pipeline
+# LLM pipeline from local services. Only its availability is checked here;
+# LangChain, tiktoken and the vector index are loaded by the first request
+# (or preloaded in the gunicorn master, see app/services/lazy_resources.py)
+from app.services.lazy_resources import startup_report
+from app.services.llm_pipeline.resources import pipeline_available, pipeline_module
+from app.services.llm_pipeline.retrieval import get_retrieval_cache
+
+DERIK_AVAILABLE, _unavailable_reason = pipeline_available()
+if DERIK_AVAILABLE:
+    print("[SUCCESS] Derik's competency assessor integration enabled (RAG-LLM pipeline loads on first use)")
+else:
+    print(f"[WARNING] Derik's components not available: {_unavailable_reason}")
+
+
+def create_pipeline():
+    """Warm process identification pipeline (loads the pipeline resources on first call)"""
+    return pipeline_module.get().create_pipeline()
 
-    # from app.services.llm_pipeline.rank_competency_indicators_llm import RankCompetencyIndicators
-    # from app.services.llm_pipeline.most_similar_role import FindMostSimilarRole
-    DERIK_AVAILABLE = True
-    print("[SUCCESS] Derik's competency assessor integration enabled (RAG-LLM pipeline loaded)")
-except ImportError as e:
-    # Use print instead of current_app.logger since we're at module level
-    print(f"[WARNING] Derik's components not available: {e}")
-    import traceback
-    print(f"   Traceback: {traceback.format_exc()}")
-    DERIK_AVAILABLE = False
-    create_pipeline = None
 
 from models import db
 from models import User, SECompetency, SERole
@@ -43,7 +45,9 @@ def get_derik_status():
             'competency_ranking': DERIK_AVAILABLE,
             'role_similarity': DERIK_AVAILABLE
         },
-        'message': 'Derik\'s competency assessor is ready' if DERIK_AVAILABLE else 'Components not found'
+        'message': 'Derik\'s competency assessor is ready' if DERIK_AVAILABLE else 'Components not found',
+        'resources': startup_report()['resources'],
+        'retrieval_cache': get_retrieval_cache().stats()
     }
 
 @derik_bp.route('/public/identify-processes', methods=['POST'])
@@ -4,8 +4,11 @@ from pydantic import BaseModel, Field
 from langchain.prompts import ChatPromptTemplate
 from langchain_openai import ChatOpenAI
 import os
+import threading
 from dotenv import load_dotenv
 
+from app.services.llm_executor import get_rate_limiter
+
 # Load environment variables from .env
 load_dotenv()
 
@@ -72,11 +75,25 @@ def create_feedback_chain(llm):
     structured_llm = llm.with_structured_output(CompetencyAreaFeedback)
     return prompt | structured_llm
 
+# --- Shared Chain ---
+
+_feedback_chain = None
+_feedback_chain_lock = threading.Lock()
+
+
+def get_feedback_chain():
+    """Process-wide feedback chain (one ChatOpenAI client, safe to invoke from several threads)"""
+    global _feedback_chain
+    if _feedback_chain is None:
+        with _feedback_chain_lock:
+            if _feedback_chain is None:
+                _feedback_chain = create_feedback_chain(init_llm())
+    return _feedback_chain
+
 # --- Feedback Generation Function ---
 
 def generate_feedback_with_llm(competency_area, competencies):
-    llm = init_llm()
-    feedback_chain = create_feedback_chain(llm)
+    feedback_chain = get_feedback_chain()
 
     # Prepare competency details for LLM input
     competency_details = ""
@@ -93,5 +110,7 @@ def generate_feedback_with_llm(competency_area, competencies):
         "competency_area": competency_area,
         "competency_details": competency_details
     }
+    # Share the request-rate limit with the other LLM callers
+    get_rate_limiter().acquire()
     structured_feedback = feedback_chain.invoke(inputs)
     return structured_feedback.to_json()
@@ -18,7 +18,6 @@ from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime
 import json
-import os
 import traceback
 from sqlalchemy import text, func
 from sqlalchemy.exc import SQLAlchemyError
@@ -29,11 +28,8 @@ from models import (
     db,
     User,
     Organization,
-    RoleCluster,
     OrganizationRoles,
     OrganizationRoleMapping,
-    IsoProcesses,
-    Competency,
     RoleProcessMatrix,
     ProcessCompetencyMatrix,
     RoleCompetencyMatrix,
@@ -45,9 +41,16 @@ from models import (
 # Import AI services
 from app.services.role_cluster_mapping_service import RoleClusterMappingService
 from app.services.custom_role_matrix_generator import CustomRoleMatrixGenerator
+from app.services.input_revision import bump_input_revision
+from app.services.role_process_matrix_init import initialize_role_matrices
+from app.services import document_ingestion
+from app.services.reference_data import get_reference_data
+from app.services.competency_matrix_recompute import (
+    recompute_role_competencies, update_process_competency_column, upsert_role_process_values
+)
 
 # Import helper functions
-from app.most_similar_role import find_most_similar_role_cluster
+from app.most_similar_role import find_most_similar_role_cluster, find_most_similar_role_clusters
 
 # Create blueprint
 phase1_roles_bp = Blueprint('phase1_roles', __name__)
@@ -352,6 +355,9 @@ def save_roles():
         })
         db.session.add(role_data)
 
+        # Invalidate learning objectives cache (removed roles cascade to user role assignments)
+        bump_input_revision(org_id, 'roles_save')
+
         db.session.commit()
 
         # Build response message
@@ -408,6 +414,7 @@ def initialize_role_process_matrix():
     This endpoint should be called after roles are saved to organization_roles.
 
     Refactored: 2025-10-30 - Now uses ORM instead of raw SQL
+    Refactored: 2026-10-18 - Bulk writes, see services/role_process_matrix_init.py
     """
     try:
         data = request.get_json()
@@ -423,187 +430,31 @@ def initialize_role_process_matrix():
 
         # Smart merge: Only delete matrix for removed roles (already done by CASCADE)
         # Full reset: Delete all matrix entries
-        if not smart_merge:
-            # Full reset - delete existing matrix entries for this organization using ORM
-            RoleProcessMatrix.query.filter_by(organization_id=org_id).delete()
-            current_app.logger.info(f"[MATRIX INIT] Full reset - deleted existing matrix for org {org_id}")
-        else:
-            current_app.logger.info(f"[MATRIX INIT] Smart merge - preserving matrix for unchanged roles")
-
-        # Get all process IDs using ORM
-        all_processes = IsoProcesses.query.order_by(IsoProcesses.id).all()
-        all_process_ids = [p.id for p in all_processes]
-
-        if len(all_process_ids) != 30:
-            current_app.logger.warning(f"[MATRIX INIT] Expected 30 processes, found {len(all_process_ids)}")
-
-        entries_created = 0
-        roles_skipped = 0
-
-        for role in roles:
-            role_id = role.get('id')
-            role_name = role.get('orgRoleName')
-            standard_cluster_id = role.get('standardRoleId')
-            identification_method = role.get('identificationMethod', 'STANDARD')
-
-            if not role_id:
-                current_app.logger.warning(f"[MATRIX INIT] Skipping role without ID: {role_name}")
-                continue
-
-            # SMART MERGE: Skip roles that already have matrix data (unchanged roles)
-            if smart_merge:
-                existing_matrix_count = RoleProcessMatrix.query.filter_by(
-                    organization_id=org_id,
-                    role_cluster_id=role_id
-                ).count()
-
-                if existing_matrix_count > 0:
-                    roles_skipped += 1
-                    current_app.logger.info(
-                        f"[MATRIX INIT] Skipping role '{role_name}' (ID: {role_id}) - "
-                        f"matrix already exists ({existing_matrix_count} entries)"
-                    )
-                    continue
-
-            if identification_method == 'STANDARD' and standard_cluster_id:
-                # Find reference role in organization 1 (template org) with same cluster ID
-                # NOTE: Org 1 is the template organization with all 14 standard roles and baseline matrix
-                reference_role = OrganizationRoles.query.filter_by(
-                    organization_id=1,
-                    standard_role_cluster_id=standard_cluster_id
-                ).first()
-
-                if reference_role:
-                    # Get reference matrix entries using ORM
-                    reference_entries = RoleProcessMatrix.query.filter_by(
-                        organization_id=1,
-                        role_cluster_id=reference_role.id
-                    ).all()
-
-                    reference_values = {entry.iso_process_id: entry.role_process_value for entry in reference_entries}
-                else:
-                    current_app.logger.warning(
-                        f"[MATRIX INIT] No reference role found for cluster {standard_cluster_id}, using zeros"
-                    )
-                    reference_values = {pid: 0 for pid in all_process_ids}
-
-                # Insert matrix entries for this role using ORM
-                for process_id in all_process_ids:
-                    value = reference_values.get(process_id, 0)
-                    new_entry = RoleProcessMatrix(
-                        organization_id=org_id,
-                        role_cluster_id=role_id,
-                        iso_process_id=process_id,
-                        role_process_value=value
-                    )
-                    db.session.add(new_entry)
-                    entries_created += 1
-
-                current_app.logger.info(
-                    f"[MATRIX INIT] Copied {len(reference_values)} values for STANDARD role "
-                    f"'{role_name}' (cluster {standard_cluster_id})"
-                )
-
-            elif identification_method == 'CUSTOM':
-                # Use AI to generate intelligent matrix values for custom roles
-                current_app.logger.info(f"[MATRIX INIT] Generating AI-powered matrix for CUSTOM role '{role_name}'")
-
-                try:
-                    # Prepare process list for AI
-                    processes_for_ai = [{'id': p.id, 'name': p.name, 'description': p.description or ''} for p in all_processes]
-
-                    # Get role description from the role object
-                    role_description = role.get('standard_role_description', '') or role.get('description', '')
-
-                    # Get existing matrix context (to make AI-generation context-aware)
-                    existing_matrix_entries = RoleProcessMatrix.query.filter_by(organization_id=org_id).all()
-                    existing_matrix = {}
-                    for entry in existing_matrix_entries:
-                        if entry.iso_process_id not in existing_matrix:
-                            existing_matrix[entry.iso_process_id] = {}
-                        existing_matrix[entry.iso_process_id][entry.role_cluster_id] = entry.role_process_value
-
-                    # Get existing roles for context
-                    existing_roles_objs = OrganizationRoles.query.filter_by(organization_id=org_id).all()
-                    existing_roles = []
-                    for r in existing_roles_objs:
-                        existing_roles.append({
-                            'id': r.id,
-                            'orgRoleName': r.role_name,
-                            'standardRoleName': r.standard_cluster.role_cluster_name if r.standard_cluster else None
-                        })
-
-                    # Call AI to generate matrix
-                    ai_result = custom_role_matrix_generator.generate_matrix_for_custom_role(
-                        role_name=role_name,
-                        role_description=role_description,
-                        processes=processes_for_ai,
-                        existing_matrix=existing_matrix if existing_matrix else None,
-                        existing_roles=existing_roles if existing_roles else None
-                    )
-
-                    if ai_result['success']:
-                        ai_matrix = ai_result['matrix']
-                        current_app.logger.info(f"[MATRIX INIT] AI generated matrix for '{role_name}': {ai_result.get('reasoning', '')}")
-
-                        # Insert AI-generated values
-                        for process_id in all_process_ids:
-                            value = ai_matrix.get(process_id, 0)
-                            new_entry = RoleProcessMatrix(
-                                organization_id=org_id,
-                                role_cluster_id=role_id,
-                                iso_process_id=process_id,
-                                role_process_value=value
-                            )
-                            db.session.add(new_entry)
-                            entries_created += 1
-
-                        current_app.logger.info(f"[MATRIX INIT] AI-generated {len(all_process_ids)} values for CUSTOM role '{role_name}'")
-                    else:
-                        # Fallback to zeros if AI fails
-                        current_app.logger.warning(f"[MATRIX INIT] AI generation failed for '{role_name}', using zeros: {ai_result.get('error', 'Unknown error')}")
-                        for process_id in all_process_ids:
-                            new_entry = RoleProcessMatrix(
-                                organization_id=org_id,
-                                role_cluster_id=role_id,
-                                iso_process_id=process_id,
-                                role_process_value=0
-                            )
-                            db.session.add(new_entry)
-                            entries_created += 1
-
-                except Exception as ai_error:
-                    # Fallback to zeros if AI generation fails
-                    current_app.logger.error(f"[MATRIX INIT] AI generation error for '{role_name}': {str(ai_error)}")
-                    current_app.logger.error(traceback.format_exc())
-                    current_app.logger.info(f"[MATRIX INIT] Falling back to zeros for CUSTOM role '{role_name}'")
-
-                    for process_id in all_process_ids:
-                        new_entry = RoleProcessMatrix(
-                            organization_id=org_id,
-                            role_cluster_id=role_id,
-                            iso_process_id=process_id,
-                            role_process_value=0
-                        )
-                        db.session.add(new_entry)
-                        entries_created += 1
-            else:
-                current_app.logger.warning(
-                    f"[MATRIX INIT] Unknown identification method '{identification_method}' for role '{role_name}'"
-                )
+        result = initialize_role_matrices(org_id, roles, smart_merge, custom_role_matrix_generator)
+        entries_created = result['entries_created']
+        roles_skipped = result['roles_skipped']
+        initialized_role_ids = result['initialized_role_ids']
 
         db.session.commit()
 
         # CRITICAL: Calculate role-competency matrix from role-process × process-competency
         # This is required for Phase 2 competency assessment to work!
+        # Smart merge only recomputes the newly initialized roles; a full reset
+        # recomputes the whole organization. Unchanged rows are not rewritten.
+        rows_touched = 0
         try:
-            db.session.execute(
-                text('CALL update_role_competency_matrix(:org_id);'),
-                {'org_id': org_id}
+            rows_touched = recompute_role_competencies(
+                org_id, role_ids=initialized_role_ids if smart_merge else None
             )
+            if rows_touched:
+                bump_input_revision(org_id, 'role_process_matrix')
             db.session.commit()
-            current_app.logger.info(f"[MATRIX INIT] Calculated role-competency matrix for org {org_id}")
+            current_app.logger.info(
+                f"[MATRIX INIT] Calculated role-competency matrix for org {org_id} "
+                f"({rows_touched} rows touched)"
+            )
         except Exception as calc_error:
+            db.session.rollback()
             current_app.logger.error(f"[MATRIX INIT] Failed to calculate role-competency matrix: {calc_error}")
             # Don't fail the whole operation, but log the error
             current_app.logger.error(traceback.format_exc())
@@ -621,7 +472,8 @@ def initialize_role_process_matrix():
             'roles_processed': len(roles),
             'roles_skipped': roles_skipped,
             'smart_merge': smart_merge,
-            'processes_per_role': len(all_process_ids)
+            'processes_per_role': result['processes_per_role'],
+            'role_competency_rows_touched': rows_touched
         }), 201
 
     except Exception as e:
@@ -668,10 +520,11 @@ def find_processes():
         # Try to use LLM pipeline if available
         llm_success = False
         try:
-            from app.services.llm_pipeline import llm_process_identification_pipeline
-            pipeline = llm_process_identification_pipeline.create_pipeline()
+            from app.services.llm_pipeline.resources import pipeline_module
+            pipeline = pipeline_module.get().create_pipeline()
 
-            result = pipeline(tasks_responsibilities)
+            # Role selection runs in the background while the processes are stored
+            result = pipeline(tasks_responsibilities, defer_role_selection=True)
 
             print(f"[findProcesses] DEBUG: Pipeline returned result: {result}")
             print(f"[findProcesses] DEBUG: Result type: {type(result)}")
@@ -681,7 +534,8 @@ def find_processes():
             if result.get("status") == "invalid_tasks":
                 return jsonify({
                     "status": "invalid_tasks",
-                    "message": result.get("message", "Tasks are invalid or empty")
+                    "message": result.get("message", "Tasks are invalid or empty"),
+                    "metadata": result.get("metadata")
                 }), 400
 
             # Handle success case
@@ -703,15 +557,12 @@ def find_processes():
                 print(f"[findProcesses] Formatted {len(processes)} processes for response")
                 llm_success = True
 
-                # Extract LLM role suggestion if available
-                llm_role_suggestion = result.get("llm_role_suggestion", None)
-
                 # DERIK'S APPROACH: Store in UnknownRoleProcessMatrix for competency calculation
                 try:
                     print(f"[findProcesses] Starting DB storage for username: {username}, org: {organization_id}")
 
-                    # Fetch ALL ISO Processes from database
-                    iso_processes = IsoProcesses.query.with_entities(IsoProcesses.id, IsoProcesses.name).all()
+                    # Fetch ALL ISO Processes (reference data cache)
+                    iso_processes = get_reference_data().iso_processes()
                     print(f"[findProcesses] Fetched {len(iso_processes)} ISO processes from DB")
                     iso_process_map = {
                         process.name.strip().lower(): process.id for process in iso_processes
@@ -792,9 +643,20 @@ def find_processes():
                     db.session.rollback()
                     # Continue anyway - return processes to frontend
 
+                # Collect the LLM role suggestion (ran concurrently with the DB storage)
+                llm_role_suggestion = None
+                role_future = result.get("llm_role_suggestion_future")
+                if role_future is not None:
+                    try:
+                        llm_role_suggestion, role_selection_seconds = role_future.result()
+                        result["metadata"]["stage_timings"]["role_selection"] = role_selection_seconds
+                    except Exception as role_error:
+                        print(f"[findProcesses] ERROR in LLM role selection: {str(role_error)}")
+
                 response_data = {
                     "status": "success",
-                    "processes": processes
+                    "processes": processes,
+                    "metadata": result.get("metadata")
                 }
 
                 # Add LLM role suggestion if available
@@ -878,8 +740,8 @@ def find_processes():
             try:
                 print(f"[findProcesses] [FALLBACK] Starting DB storage for username: {username}, org: {organization_id}")
 
-                # Fetch ALL ISO Processes from database
-                iso_processes = IsoProcesses.query.with_entities(IsoProcesses.id, IsoProcesses.name).all()
+                # Fetch ALL ISO Processes (reference data cache)
+                iso_processes = get_reference_data().iso_processes()
                 print(f"[findProcesses] [FALLBACK] Fetched {len(iso_processes)} ISO processes from DB")
                 iso_process_map = {
                     process.name.strip().lower(): process.id for process in iso_processes
@@ -964,6 +826,44 @@ def find_processes():
         return jsonify({"error": str(e)}), 500
 
 
+def _role_suggestion_confidence(result):
+    """
+    Confidence of a find_most_similar_role_cluster() result, based on metric
+    agreement and the separation of the best from the second best role.
+
+    Returns:
+        (confidence, [(role_id, euclidean_distance), ...] sorted by distance)
+    """
+    metric_agreement = result.get('metric_agreement', 0)
+
+    # Get all distances sorted
+    sorted_distances = sorted(result['distances']['euclidean'].items(), key=lambda x: x[1])
+
+    if len(sorted_distances) >= 2:
+        best_distance = sorted_distances[0][1]
+        second_best_distance = sorted_distances[1][1]
+
+        # Calculate separation (how much better is #1 vs #2)
+        if second_best_distance > 0:
+            separation = (second_best_distance - best_distance) / second_best_distance
+        else:
+            separation = 1.0
+
+        # Confidence based on:
+        # 1. All 3 distance metrics agree (metric_agreement = 3): +0.15
+        # 2. Good separation from second best: up to +0.30
+        base_confidence = 0.55
+        agreement_bonus = 0.15 if metric_agreement == 3 else (0.10 if metric_agreement == 2 else 0.05)
+        separation_bonus = separation * 0.30
+
+        confidence = min(base_confidence + agreement_bonus + separation_bonus, 0.95)
+    else:
+        # Only one role found
+        confidence = 0.80 if metric_agreement == 3 else 0.70
+
+    return confidence, sorted_distances
+
+
 @phase1_roles_bp.route('/phase1/roles/suggest-from-processes', methods=['POST'])
 def suggest_role_from_processes():
     """
@@ -1030,31 +930,7 @@ def suggest_role_from_processes():
         best_role_id = result['role_ids'][0]
         distances = result['distances']['euclidean']
         metric_agreement = result.get('metric_agreement', 0)
-
-        # Get all distances sorted
-        sorted_distances = sorted(distances.items(), key=lambda x: x[1])
-
-        if len(sorted_distances) >= 2:
-            best_distance = sorted_distances[0][1]
-            second_best_distance = sorted_distances[1][1]
-
-            # Calculate separation (how much better is #1 vs #2)
-            if second_best_distance > 0:
-                separation = (second_best_distance - best_distance) / second_best_distance
-            else:
-                separation = 1.0
-
-            # Confidence based on:
-            # 1. All 3 distance metrics agree (metric_agreement = 3): +0.15
-            # 2. Good separation from second best: up to +0.30
-            base_confidence = 0.55
-            agreement_bonus = 0.15 if metric_agreement == 3 else (0.10 if metric_agreement == 2 else 0.05)
-            separation_bonus = separation * 0.30
-
-            confidence = min(base_confidence + agreement_bonus + separation_bonus, 0.95)
-        else:
-            # Only one role found
-            confidence = 0.80 if metric_agreement == 3 else 0.70
+        confidence, sorted_distances = _role_suggestion_confidence(result)
 
         print(f"[suggest-role-simple] Best role ID: {best_role_id}")
         print(f"[suggest-role-simple] Euclidean distance: {distances[best_role_id]:.4f}")
@@ -1064,7 +940,8 @@ def suggest_role_from_processes():
         # ====================
         # STEP 4: Build response
         # ====================
-        best_role = RoleCluster.query.get(best_role_id)
+        reference = get_reference_data()
+        best_role = reference.role_cluster(best_role_id)
 
         if not best_role:
             return jsonify({'error': 'Role not found in database'}), 500
@@ -1072,7 +949,7 @@ def suggest_role_from_processes():
         # Get alternative roles (next 2 best matches)
         alternative_roles = []
         for role_id, distance in sorted_distances[1:3]:
-            role = RoleCluster.query.get(role_id)
+            role = reference.role_cluster(role_id)
             if role:
                 alt_confidence = confidence * 0.75  # Lower confidence for alternatives
                 alt_role_dict = role.to_dict()
@@ -1089,9 +966,9 @@ def suggest_role_from_processes():
                 'euclidean_distance': round(distances[best_role_id], 4),
                 'metric_agreement': f"{metric_agreement}/3",
                 'all_distances': {
-                    RoleCluster.query.get(rid).role_cluster_name: round(dist, 4)
+                    reference.role_cluster(rid).role_cluster_name: round(dist, 4)
                     for rid, dist in sorted_distances[:5]
-                    if RoleCluster.query.get(rid)
+                    if reference.role_cluster(rid)
                 }
             }
         }
@@ -1108,6 +985,61 @@ def suggest_role_from_processes():
         }), 500
 
 
+@phase1_roles_bp.route('/phase1/roles/suggest-from-processes/all', methods=['POST'])
+def suggest_roles_for_all_users():
+    """
+    Suggest a role for every task-based user of an organization at once.
+    All users are ranked against the organization's role matrix in one
+    matrix operation (same distance matching as suggest-from-processes).
+    """
+    try:
+        data = request.get_json() or {}
+        organization_id = data.get('organizationId')
+        if not organization_id:
+            return jsonify({'error': 'organizationId required'}), 400
+
+        # One query for all task-based users' competency requirements
+        rows = UnknownRoleCompetencyMatrix.query.filter_by(
+            organization_id=organization_id
+        ).order_by(UnknownRoleCompetencyMatrix.user_name).all()
+
+        user_scores = {}
+        for row in rows:
+            user_scores.setdefault(row.user_name, []).append(
+                {'competency_id': row.competency_id, 'score': row.role_competency_value}
+            )
+
+        usernames = list(user_scores)
+        results = find_most_similar_role_clusters(organization_id, [user_scores[u] for u in usernames])
+
+        reference = get_reference_data()
+        suggestions = []
+        for username, result in zip(usernames, results):
+            role = reference.role_cluster(result['role_ids'][0]) if result['role_ids'] else None
+            if not role:
+                suggestions.append({'username': username, 'suggestedRole': None, 'confidence': 0})
+                continue
+            confidence, _ = _role_suggestion_confidence(result)
+            suggestions.append({
+                'username': username,
+                'suggestedRole': role.to_dict(),
+                'confidence': round(confidence, 2),
+                'euclidean_distance': round(result['min_distance'], 4),
+                'metric_agreement': f"{result['metric_agreement']}/3"
+            })
+
+        print(f"[suggest-role-all] Org {organization_id}: suggested roles for {len(suggestions)} users")
+        return jsonify({'organizationId': organization_id, 'suggestions': suggestions}), 200
+
+    except Exception as e:
+        print(f"[suggest-role-all] ERROR: {str(e)}")
+        traceback.print_exc()
+        return jsonify({
+            'error': 'Internal server error',
+            'details': str(e)
+        }), 500
+
+
 # =============================================================================
 # AI ROLE MAPPING (DOCUMENT EXTRACTION AND CLUSTER MAPPING)
 # =============================================================================
@@ -1147,109 +1079,27 @@ def extract_roles_from_document():
         if not organization_id:
             return jsonify({'success': False, 'error': 'organization_id is required'}), 400
 
-        # Get file extension
-        filename = file.filename.lower()
-
-        # Extract text based on file type
-        extracted_text = None
-
-        if filename.endswith('.txt'):
-            extracted_text = file.read().decode('utf-8', errors='ignore')
-
-        elif filename.endswith('.pdf'):
-            try:
-                import PyPDF2
-                pdf_reader = PyPDF2.PdfReader(file)
-                text_parts = []
-                for page in pdf_reader.pages:
-                    text_parts.append(page.extract_text())
-                extracted_text = '\n'.join(text_parts)
-            except Exception as e:
-                current_app.logger.error(f"[ERROR] PDF extraction failed: {str(e)}")
-                return jsonify({'success': False, 'error': f'Failed to extract text from PDF: {str(e)}'}), 500
-
-        elif filename.endswith('.docx'):
-            try:
-                import docx
-                doc = docx.Document(file)
-                text_parts = [para.text for para in doc.paragraphs]
-                extracted_text = '\n'.join(text_parts)
-            except Exception as e:
-                current_app.logger.error(f"[ERROR] DOCX extraction failed: {str(e)}")
-                return jsonify({'success': False, 'error': f'Failed to extract text from DOCX: {str(e)}'}), 500
-
-        else:
-            return jsonify({'success': False, 'error': 'Unsupported file format. Please upload PDF, DOCX, or TXT files.'}), 400
-
-        if not extracted_text or len(extracted_text.strip()) < 50:
-            return jsonify({'success': False, 'error': 'Document appears to be empty or too short'}), 400
-
-        # Use OpenAI to extract role information
-        from openai import OpenAI
-        client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
-
-        prompt = f"""You are an expert in analyzing organizational role descriptions.
-Extract all roles mentioned in the following document and structure them as a JSON array.
-
-For each role, extract:
-- title: The job title or role name
-- description: A brief description of the role
-- responsibilities: An array of key responsibilities (at least 2-3 if mentioned)
-- skills: An array of required skills/technologies (if mentioned)
-
-If a role doesn't have explicit responsibilities or skills listed, infer them from the description.
-
-Document text:
-{extracted_text[:8000]}
-
-Return ONLY a valid JSON array of roles, nothing else. Example format:
-[
-  {{
-    "title": "Software Engineer",
-    "description": "Develops and maintains software applications",
-    "responsibilities": ["Write code", "Debug issues", "Review code"],
-    "skills": ["Python", "JavaScript", "Git"]
-  }}
-]
-"""
-
         try:
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant that extracts structured role information from documents. Always respond with valid JSON only."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3
-            )
-
-            ai_response = response.choices[0].message.content.strip()
-
-            # Remove markdown code blocks if present
-            if ai_response.startswith('```'):
-                ai_response = ai_response.split('```')[1]
-                if ai_response.startswith('json'):
-                    ai_response = ai_response[4:]
-                ai_response = ai_response.strip()
-
-            # Parse JSON response
-            roles = json.loads(ai_response)
-
-            if not isinstance(roles, list):
-                raise ValueError("Expected an array of roles")
+            extraction = document_ingestion.extract_roles_from_document(file.read(), file.filename)
+        except document_ingestion.DocumentIngestionError as e:
+            current_app.logger.error(f"[ERROR] Role extraction failed: {str(e)}")
+            return jsonify({'success': False, 'error': str(e)}), e.status_code
 
-            current_app.logger.info(f"[OK] Extracted {len(roles)} roles from document")
+        # Persists the fragment cache entry of a fresh extraction
+        db.session.commit()
 
-            return jsonify({
-                'success': True,
-                'roles': roles,
-                'total': len(roles)
-            })
+        roles = extraction['result']
+        current_app.logger.info(
+            f"[OK] Extracted {len(roles)} roles from document "
+            f"({extraction['chunks']} chunks, cached: {extraction['cached']})"
+        )
 
-        except json.JSONDecodeError as e:
-            current_app.logger.error(f"[ERROR] Failed to parse AI response: {str(e)}")
-            current_app.logger.error(f"[ERROR] AI response was: {ai_response}")
-            return jsonify({'success': False, 'error': 'Failed to parse role information from document'}), 500
+        return jsonify({
+            'success': True,
+            'roles': roles,
+            'total': len(roles),
+            'ingestion': {k: extraction[k] for k in ('sha256', 'chunks', 'failed_chunks', 'truncated', 'cached')}
+        })
 
     except Exception as e:
         current_app.logger.error(f"[ERROR] Document extraction failed: {str(e)}")
@@ -1546,8 +1396,9 @@ def get_organization_roles(org_id):
 def get_roles_and_processes():
     """Get all roles and processes for admin matrix editing"""
     try:
-        roles = RoleCluster.query.all()
-        processes = IsoProcesses.query.all()
+        reference = get_reference_data()
+        roles = reference.role_clusters()
+        processes = reference.iso_processes()
 
         return jsonify({
             'roles': [r.to_dict() for r in roles],
@@ -1590,45 +1441,26 @@ def bulk_update_role_process_matrix():
         if not all([organization_id, role_cluster_id, matrix]):
             return jsonify({'error': 'Missing required fields'}), 400
 
-        # Update or create matrix entries
-        for process_id, value in matrix.items():
-            process_id = int(process_id)
-
-            # Find existing entry or create new one
-            entry = RoleProcessMatrix.query.filter_by(
-                organization_id=organization_id,
-                role_cluster_id=role_cluster_id,
-                iso_process_id=process_id
-            ).first()
-
-            if entry:
-                entry.role_process_value = value
-            else:
-                entry = RoleProcessMatrix(
-                    organization_id=organization_id,
-                    role_cluster_id=role_cluster_id,
-                    iso_process_id=process_id,
-                    role_process_value=value
-                )
-                db.session.add(entry)
-
-        db.session.commit()
-
-        # Recalculate role-competency matrix for this organization
+        # Write the changed cells in one statement, then recompute only the
+        # (role, competency) rows reachable from them
         # As per MATRIX_CALCULATION_PATTERN.md
-        print(f"[ROLE-PROCESS MATRIX] Calling stored procedure to recalculate role-competency matrix for org {organization_id}")
-        current_app.logger.info(f"[ROLE-PROCESS MATRIX] Calling stored procedure to recalculate role-competency matrix for org {organization_id}")
-        db.session.execute(
-            text('CALL update_role_competency_matrix(:org_id);'),
-            {'org_id': organization_id}
+        changed_process_ids = upsert_role_process_values(organization_id, role_cluster_id, matrix)
+        rows_touched = recompute_role_competencies(
+            organization_id, role_ids=[role_cluster_id], process_ids=changed_process_ids
         )
+        if rows_touched:
+            bump_input_revision(organization_id, 'role_process_matrix')
         db.session.commit()
-        print(f"[ROLE-PROCESS MATRIX] Successfully recalculated role-competency matrix for org {organization_id}")
-        current_app.logger.info(f"[ROLE-PROCESS MATRIX] Successfully recalculated role-competency matrix for org {organization_id}")
+        current_app.logger.info(
+            f"[ROLE-PROCESS MATRIX] org {organization_id}, role {role_cluster_id}: "
+            f"{len(changed_process_ids)} cells changed, {rows_touched} role-competency rows touched"
+        )
 
         return jsonify({
             'message': 'Role-process matrix updated successfully',
-            'recalculated': True
+            'recalculated': True,
+            'cells_changed': len(changed_process_ids),
+            'role_competency_rows_touched': rows_touched
         }), 200
 
     except Exception as e:
@@ -1642,7 +1474,7 @@ def bulk_update_role_process_matrix():
 def get_competencies_for_matrix():
     """Get all competencies for admin matrix editing"""
     try:
-        competencies = Competency.query.all()
+        competencies = get_reference_data().competencies()
 
         return jsonify([c.to_dict() for c in competencies]), 200
 
@@ -1656,7 +1488,7 @@ def get_process_competency_matrix(competency_id):
     """Get process-competency matrix values for a specific competency"""
     try:
         # Get all processes
-        processes = IsoProcesses.query.all()
+        processes = get_reference_data().iso_processes()
 
         # Get matrix entries for this competency
         matrix_entries = ProcessCompetencyMatrix.query.filter_by(
@@ -1676,7 +1508,8 @@ def get_process_competency_matrix(competency_id):
 @phase1_roles_bp.route('/process-competency-matrix/bulk', methods=['PUT'])
 def bulk_update_process_competency_matrix():
     """
-    Bulk update process-competency matrix and recalculate for ALL organizations
+    Bulk update one competency column of the process-competency matrix and
+    recalculate that competency for ALL organizations
     Based on Derik's implementation (routes.py:322-328)
     """
     try:
@@ -1687,41 +1520,16 @@ def bulk_update_process_competency_matrix():
         if not all([competency_id, matrix]):
             return jsonify({'error': 'Missing required fields'}), 400
 
-        # Update or create matrix entries
-        for process_id, value in matrix.items():
-            process_id = int(process_id)
-
-            # Find existing entry or create new one
-            entry = ProcessCompetencyMatrix.query.filter_by(
-                iso_process_id=process_id,
-                competency_id=competency_id
-            ).first()
-
-            if entry:
-                entry.process_competency_value = value
-            else:
-                entry = ProcessCompetencyMatrix(
-                    iso_process_id=process_id,
-                    competency_id=competency_id,
-                    process_competency_value=value
-                )
-                db.session.add(entry)
-
-        db.session.commit()
-
-        # Recalculate role-competency matrix for ALL organizations
-        # As per MATRIX_CALCULATION_PATTERN.md
-        organizations = Organization.query.all()
-        for org in organizations:
-            db.session.execute(
-                text('CALL update_role_competency_matrix(:org_id);'),
-                {'org_id': org.id}
-            )
+        # Upsert the column in one statement and recompute only this
+        # competency for all organizations and task-based users
+        counts = update_process_competency_column(int(competency_id), matrix)
         db.session.commit()
 
         return jsonify({
             'message': 'Process-competency matrix updated successfully',
-            'recalculated_for_orgs': len(organizations)
+            'recalculated_for_orgs': counts['organizations'],
+            'role_competency_rows': counts['role_competency_rows'],
+            'unknown_role_competency_rows': counts['unknown_role_competency_rows']
         }), 200
 
     except Exception as e:
@@ -20,6 +20,7 @@ from sqlalchemy import text
 
 from models import db, User, Organization, LearningStrategy, PhaseQuestionnaireResponse
 from app.strategy_selection_engine import StrategySelectionEngine, SE_TRAINING_STRATEGIES
+from app.services.input_revision import bump_input_revision
 
 # Create blueprint
 phase1_strategies_bp = Blueprint('phase1_strategies', __name__)
@@ -302,6 +303,9 @@ def save_strategies():
                 )
                 db.session.add(new_strategy)
 
+        # Invalidate learning objectives cache
+        bump_input_revision(org_id, 'strategies_save')
+
         db.session.commit()
 
         current_app.logger.info(f"[OK] Saved {len(strategies)} strategies for org {org_id} to both tables")
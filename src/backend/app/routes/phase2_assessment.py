@@ -19,14 +19,21 @@ from models import (
     RoleCompetencyMatrix,
     UnknownRoleCompetencyMatrix,
     UserCompetencySurveyResults,
-    UserRoleCluster,
     UserCompetencySurveyFeedback,
     UserAssessment,
     OrganizationRoles
 )
 
-# Import LLM feedback generation
-from app.generate_survey_feedback import generate_feedback_with_llm
+# LLM feedback generation (background after submit, stored per assessment)
+from app.services.assessment_feedback import (
+    get_feedback_status, load_required_scores, schedule_feedback_generation
+)
+from app.services.assessment_submission import (
+    apply_submissions, build_submission_results, collect_answers,
+    upsert_role_assignments, write_survey_results
+)
+from app.services.input_revision import bump_input_revision
+from app.services.latest_scores import refresh_latest_scores
 
 # Create blueprint
 phase2_assessment_bp = Blueprint('phase2_assessment', __name__)
@@ -606,148 +613,26 @@ def submit_phase2_assessment():
         if not assessment:
             return jsonify({"success": False, "error": "Assessment not found"}), 404
 
-        print(f"[submit_phase2_assessment] Submitting {len(answers)} answers for assessment {assessment_id}")
-
-        # Delete existing survey results for this assessment
-        UserCompetencySurveyResults.query.filter_by(
-            user_id=assessment.user_id,
-            assessment_id=assessment_id
-        ).delete()
-
-        # Insert new survey results
-        for answer in answers:
-            competency_id = answer.get('competency_id')
-            current_level = answer.get('current_level', 0)
-
-            if competency_id is None:
-                continue
-
-            survey_result = UserCompetencySurveyResults(
-                user_id=assessment.user_id,
-                organization_id=assessment.organization_id,
-                competency_id=competency_id,
-                score=current_level,
-                assessment_id=assessment_id
-            )
-            db.session.add(survey_result)
-            print(f"[submit_phase2_assessment] Added result: competency {competency_id}, score {current_level}")
-
-        # Mark assessment as completed
-        assessment.completed_at = datetime.utcnow()
-
-        # Populate user_role_cluster table for role-based pathway
-        # This is required for learning objectives to detect high-maturity organizations
-        if assessment.survey_type == 'known_roles' and assessment.selected_roles:
-            # Delete existing role assignments for this assessment
-            UserRoleCluster.query.filter_by(assessment_id=assessment_id).delete()
-
-            # Insert new role assignments
-            for role_id in assessment.selected_roles:
-                role_entry = UserRoleCluster(
-                    user_id=assessment.user_id,
-                    role_cluster_id=role_id,
-                    assessment_id=assessment_id
-                )
-                db.session.add(role_entry)
-                print(f"[submit_phase2_assessment] Added role {role_id} to user_role_cluster for user {assessment.user_id}")
-
+        # Survey results, role assignments and latest scores in bulk (one transaction)
+        scores = collect_answers(answers)
+        counts = apply_submissions([(assessment, scores)])
         db.session.commit()
 
-        print(f"[submit_phase2_assessment] Assessment {assessment_id} completed successfully")
+        print(f"[submit_phase2_assessment] Assessment {assessment_id} completed successfully "
+              f"({counts['survey_results']} results, {counts['role_assignments']} roles)")
 
-        # After saving, fetch results with gap analysis using existing get_assessment_results logic
-        # This provides immediate feedback to the user and enables caching for future visits
+        # Generate LLM feedback now so the results page can serve it from the database
         try:
-            # Fetch user competencies
-            print(f"[submit_phase2_assessment] Fetching competencies for assessment_id={assessment_id}")
-            user_competencies = UserCompetencySurveyResults.query.filter_by(
-                assessment_id=assessment_id
-            ).order_by(UserCompetencySurveyResults.competency_id).all()
-
-            print(f"[submit_phase2_assessment] Found {len(user_competencies)} user competencies")
-
-            competencies = Competency.query.filter(
-                Competency.id.in_([u.competency_id for u in user_competencies])
-            ).order_by(Competency.id).all()
-
-            competency_info_map = {comp.id: {'name': comp.competency_name, 'area': comp.competency_area} for comp in competencies}
-
-            user_scores = [
-                {
-                    'competency_id': u.competency_id,
-                    'score': u.score,
-                    'competency_name': competency_info_map[u.competency_id]['name'],
-                    'competency_area': competency_info_map[u.competency_id]['area']
-                }
-                for u in user_competencies
-            ]
-
-            # Fetch required scores based on survey type
-            if assessment.survey_type == 'known_roles':
-                # Use selected_roles from assessment (not UserRoleCluster)
-                role_cluster_ids = assessment.selected_roles or []
-
-                if not role_cluster_ids:
-                    print(f"[submit_phase2_assessment] WARNING: No role IDs found in assessment.selected_roles")
-                    max_scores = []
-                else:
-                    print(f"[submit_phase2_assessment] Role-based pathway: role_ids={role_cluster_ids}, org_id={assessment.organization_id}")
-                    max_scores = db.session.query(
-                        RoleCompetencyMatrix.competency_id,
-                        db.func.max(RoleCompetencyMatrix.role_competency_value).label('max_score')
-                    ).filter(
-                        RoleCompetencyMatrix.organization_id == assessment.organization_id,
-                        RoleCompetencyMatrix.role_cluster_id.in_(role_cluster_ids)
-                    ).group_by(RoleCompetencyMatrix.competency_id).having(
-                        db.func.max(RoleCompetencyMatrix.role_competency_value) > 0
-                    ).order_by(RoleCompetencyMatrix.competency_id).all()
-                    print(f"[submit_phase2_assessment] Found {len(max_scores)} required competencies from role_competency_matrix")
-
-            elif assessment.survey_type == 'unknown_roles':
-                # For task-based pathway - get username from tasks_responsibilities JSON
-                task_based_username = assessment.tasks_responsibilities.get('username') if assessment.tasks_responsibilities else None
-
-                if not task_based_username:
-                    print(f"[submit_phase2_assessment] ERROR: No task-based username found in assessment {assessment_id}")
-                    raise Exception("Task-based username not found in assessment")
-
-                print(f"[submit_phase2_assessment] Task-based pathway: task_username={task_based_username}, org_id={assessment.organization_id}")
-                max_scores = db.session.query(
-                    UnknownRoleCompetencyMatrix.competency_id,
-                    UnknownRoleCompetencyMatrix.role_competency_value.label('max_score')
-                ).filter(
-                    UnknownRoleCompetencyMatrix.organization_id == assessment.organization_id,
-                    UnknownRoleCompetencyMatrix.user_name == task_based_username,
-                    UnknownRoleCompetencyMatrix.role_competency_value > 0
-                ).all()
-                print(f"[submit_phase2_assessment] Found {len(max_scores)} required competencies from unknown_role_competency_matrix")
-            else:
-                max_scores = []
-
-            max_scores_dict = [{'competency_id': m.competency_id, 'max_score': float(m.max_score)} for m in max_scores]
-
-            # Filter user_scores to only include competencies with required level > 0
-            required_competency_ids = {m['competency_id'] for m in max_scores_dict}
-            print(f"[submit_phase2_assessment] Required competency IDs: {required_competency_ids}")
-            user_scores = [score for score in user_scores if score['competency_id'] in required_competency_ids]
-            print(f"[submit_phase2_assessment] Filtered user_scores to {len(user_scores)} competencies")
-
-            # Calculate summary statistics
-            total_competencies = len(user_scores)
-            proficient = 0
-            needs_improvement = 0
-
-            for score in user_scores:
-                comp_id = score['competency_id']
-                current_level = score['score']
-                required_level = next((m['max_score'] for m in max_scores_dict if m['competency_id'] == comp_id), 0)
+            schedule_feedback_generation(assessment_id)
+        except Exception as e:
+            print(f"[submit_phase2_assessment] Could not schedule feedback generation: {str(e)}")
 
-                if current_level >= required_level:
-                    proficient += 1
-                else:
-                    needs_improvement += 1
+        # Gap summary from the submitted answers - provides immediate feedback to the user
+        try:
+            user_scores, max_scores, summary = build_submission_results(assessment, scores)
 
-            print(f"[submit_phase2_assessment] Gap analysis: {proficient}/{total_competencies} proficient, {needs_improvement} need improvement")
+            print(f"[submit_phase2_assessment] Gap analysis: {summary['proficient']}/{summary['total']} proficient, "
+                  f"{summary['needs_improvement']} need improvement")
 
             return jsonify({
                 "success": True,
@@ -757,14 +642,10 @@ def submit_phase2_assessment():
                     "assessment_id": assessment_id,  # Add for CompetencyResults compatibility
                     "assessment": assessment.to_dict(),
                     "user_scores": user_scores,
-                    "max_scores": max_scores_dict,
-                    "feedback_list": []  # Will be generated on first results page visit
+                    "max_scores": max_scores,
+                    "feedback_list": []  # Generating in the background (served by the results endpoint)
                 },
-                "summary": {
-                    "total": total_competencies,
-                    "proficient": proficient,
-                    "needs_improvement": needs_improvement
-                }
+                "summary": summary
             }), 200
 
         except Exception as results_error:
@@ -784,6 +665,68 @@ def submit_phase2_assessment():
         return jsonify({"success": False, "error": "An error occurred", "details": str(e)}), 500
 
 
+@phase2_assessment_bp.route('/phase2/submit-assessments', methods=['POST'])
+def submit_phase2_assessments_batch():
+    """
+    Submit many Phase 2 assessments in one transaction (proctored / offline imports)
+
+    Expected payload:
+    - assessments: Array of {assessment_id, answers}
+
+    Returns:
+    - Submitted assessment IDs and written row counts; nothing is stored
+      if any assessment is missing or listed twice
+    """
+    data = request.get_json() or {}
+    try:
+        entries = data.get('assessments') or []
+        if not entries:
+            return jsonify({"success": False, "error": "assessments is required"}), 400
+
+        assessment_ids = [entry.get('assessment_id') for entry in entries]
+        if any(aid is None for aid in assessment_ids):
+            return jsonify({"success": False, "error": "assessment_id is required for every assessment"}), 400
+        if len(set(assessment_ids)) != len(assessment_ids):
+            return jsonify({"success": False, "error": "Duplicate assessment_id in batch"}), 400
+
+        assessments = {
+            a.id: a for a in UserAssessment.query.filter(UserAssessment.id.in_(assessment_ids)).all()
+        }
+        missing = [aid for aid in assessment_ids if aid not in assessments]
+        if missing:
+            return jsonify({"success": False, "error": "Assessment not found", "missing_assessment_ids": missing}), 404
+
+        submissions = [
+            (assessments[entry['assessment_id']], collect_answers(entry.get('answers', [])))
+            for entry in entries
+        ]
+        counts = apply_submissions(submissions)
+        db.session.commit()
+
+        print(f"[submit_phase2_assessments_batch] {len(submissions)} assessments completed "
+              f"({counts['survey_results']} results, {counts['role_assignments']} roles)")
+
+        for assessment_id in assessment_ids:
+            try:
+                schedule_feedback_generation(assessment_id)
+            except Exception as e:
+                print(f"[submit_phase2_assessments_batch] Could not schedule feedback generation for {assessment_id}: {str(e)}")
+
+        return jsonify({
+            "success": True,
+            "message": f"{len(submissions)} assessments submitted successfully",
+            "assessment_ids": assessment_ids,
+            "survey_results": counts['survey_results'],
+            "role_assignments": counts['role_assignments']
+        }), 200
+
+    except Exception as e:
+        print(f"[submit_phase2_assessments_batch] Error: {str(e)}")
+        traceback.print_exc()
+        db.session.rollback()
+        return jsonify({"success": False, "error": "An error occurred", "details": str(e)}), 500
+
+
 @phase2_assessment_bp.route('/phase2/role-based-pathway/<int:organization_id>', methods=['GET'])
 def get_role_based_pathway_analysis(organization_id):
     """
@@ -854,60 +797,59 @@ def submit_assessment(assessment_id):
         assessment.tasks_responsibilities = tasks_responsibilities
         assessment.completed_at = datetime.utcnow()
 
-        # Delete existing roles for this assessment if any
-        UserRoleCluster.query.filter_by(assessment_id=assessment_id).delete()
-
-        # Insert new roles with assessment_id
-        # After migration 003: role_cluster_id now references organization_roles.id directly
-        # Supports both standard-derived AND custom roles
-        for role in selected_roles:
-            org_role_id = role.get('role_id') or role.get('id')
-
-            role_entry = UserRoleCluster(
-                user_id=assessment.user_id,
-                role_cluster_id=org_role_id,  # Now directly uses organization_roles.id
-                assessment_id=assessment_id
-            )
-            db.session.add(role_entry)
-            print(f"[submit_assessment] Added role {org_role_id} for assessment {assessment_id}")
-
-        # Delete existing survey results for this assessment
-        UserCompetencySurveyResults.query.filter_by(
-            user_id=assessment.user_id,
-            assessment_id=assessment_id
-        ).delete()
-
         # Define valid competency scores (aligned with learning objectives templates)
         VALID_SCORES = [0, 1, 2, 4, 6]
 
-        # Insert survey results with assessment_id
+        # Validate all scores before writing anything
+        scores = {}
         for competency in competency_scores:
             # Extract score with proper fallback to 0 for None values
             score = competency.get('user_score') if competency.get('user_score') is not None else competency.get('score')
             if score is None:
                 score = 0  # Default to 0 if no score provided
 
+            competency_id = competency.get('competency_id') or competency.get('competencyId')
+
             # Validate score is one of the allowed values
             if score not in VALID_SCORES:
+                db.session.rollback()
                 return jsonify({
                     "error": f"Invalid competency score: {score}. Valid scores are {VALID_SCORES}.",
-                    "competency_id": competency.get('competency_id') or competency.get('competencyId'),
+                    "competency_id": competency_id,
                     "invalid_score": score
                 }), 400
 
-            survey = UserCompetencySurveyResults(
-                user_id=assessment.user_id,
-                organization_id=assessment.organization_id,
-                competency_id=competency.get('competency_id') or competency.get('competencyId'),
-                score=score,
-                assessment_id=assessment_id
-            )
-            db.session.add(survey)
+            scores[competency_id] = score
+
+        # Roles with assessment_id (one upsert)
+        # After migration 003: role_cluster_id now references organization_roles.id directly
+        # Supports both standard-derived AND custom roles
+        org_role_ids = [role.get('role_id') or role.get('id') for role in selected_roles]
+        upsert_role_assignments([(assessment, org_role_ids)])
+        print(f"[submit_assessment] Assigned roles {org_role_ids} for assessment {assessment_id}")
+
+        # Survey results with assessment_id (one multi-row insert)
+        write_survey_results([(assessment, scores)])
+
+        # Feedback of a previous submission is outdated
+        UserCompetencySurveyFeedback.query.filter_by(assessment_id=assessment_id).delete()
+
+        # Latest scores snapshot read by the learning objectives pathways
+        refresh_latest_scores(assessment.organization_id, assessment.user_id)
+
+        # Invalidate learning objectives cache (scores and roles changed)
+        bump_input_revision(assessment.organization_id, 'assessment_submit')
 
         db.session.commit()
 
         print(f"[submit_assessment] Assessment {assessment_id} completed for user {assessment.user_id}")
 
+        # Generate LLM feedback now so the results page can serve it from the database
+        try:
+            schedule_feedback_generation(assessment_id)
+        except Exception as e:
+            print(f"[submit_assessment] Could not schedule feedback generation: {str(e)}")
+
         return jsonify({
             'message': 'Assessment submitted successfully',
             'assessment_id': assessment_id,
@@ -958,188 +900,21 @@ def get_assessment_results(assessment_id):
         ]
 
         # Fetch required competency scores based on survey type
-        if assessment.survey_type == 'known_roles':
-            # Use selected_roles from assessment (not UserRoleCluster)
-            role_cluster_ids = assessment.selected_roles or []
-
-            if not role_cluster_ids:
-                print(f"[get_assessment_results] WARNING: No role IDs found in assessment.selected_roles")
-                max_scores = []
-            else:
-                print(f"[get_assessment_results] Role-based pathway: role_ids={role_cluster_ids}, org_id={assessment.organization_id}")
-                max_scores = db.session.query(
-                    RoleCompetencyMatrix.competency_id,
-                    db.func.max(RoleCompetencyMatrix.role_competency_value).label('max_score')
-                ).filter(
-                    RoleCompetencyMatrix.organization_id == assessment.organization_id,
-                    RoleCompetencyMatrix.role_cluster_id.in_(role_cluster_ids)
-                ).group_by(RoleCompetencyMatrix.competency_id).having(
-                    db.func.max(RoleCompetencyMatrix.role_competency_value) > 0
-                ).order_by(RoleCompetencyMatrix.competency_id).all()
-                print(f"[get_assessment_results] Found {len(max_scores)} required competencies from role_competency_matrix")
-
-        elif assessment.survey_type == 'unknown_roles':
-            # For task-based, fetch from UnknownRoleCompetencyMatrix using task-based username
-            task_based_username = assessment.tasks_responsibilities.get('username') if assessment.tasks_responsibilities else None
-
-            if not task_based_username:
-                print(f"[get_assessment_results] ERROR: No task-based username found for assessment {assessment_id}")
-                return jsonify({'error': 'Task-based username not found'}), 500
-
-            max_scores = db.session.query(
-                UnknownRoleCompetencyMatrix.competency_id,
-                UnknownRoleCompetencyMatrix.role_competency_value.label('max_score')
-            ).filter(
-                UnknownRoleCompetencyMatrix.organization_id == assessment.organization_id,
-                UnknownRoleCompetencyMatrix.user_name == task_based_username,
-                UnknownRoleCompetencyMatrix.role_competency_value > 0
-            ).all()
-
-        elif assessment.survey_type == 'all_roles':
-            max_scores = db.session.query(
-                RoleCompetencyMatrix.competency_id,
-                db.func.avg(RoleCompetencyMatrix.role_competency_value).label('max_score')
-            ).filter(
-                RoleCompetencyMatrix.organization_id == assessment.organization_id
-            ).group_by(RoleCompetencyMatrix.competency_id).having(
-                db.func.avg(RoleCompetencyMatrix.role_competency_value) > 0
-            ).order_by(RoleCompetencyMatrix.competency_id).all()
-        else:
-            max_scores = []
-
-        max_scores_dict = [{'competency_id': m.competency_id, 'max_score': float(m.max_score)} for m in max_scores]
+        max_scores_dict = load_required_scores(assessment)
+        if max_scores_dict is None:
+            print(f"[get_assessment_results] ERROR: No task-based username found for assessment {assessment_id}")
+            return jsonify({'error': 'Task-based username not found'}), 500
+        print(f"[get_assessment_results] Found {len(max_scores_dict)} required competencies ({assessment.survey_type})")
 
         # Filter user_scores to only include competencies with required level > 0
         required_competency_ids = {m['competency_id'] for m in max_scores_dict}
         user_scores = [score for score in user_scores if score['competency_id'] in required_competency_ids]
 
-        # Check if feedback already exists for this assessment
-        existing_feedbacks = UserCompetencySurveyFeedback.query.filter_by(
-            assessment_id=assessment_id
-        ).all()
-
-        if existing_feedbacks:
-            # Since feedback is stored as a JSONB array in a single row, extract it directly
-            # The feedback column contains the complete feedback_list, not individual items
-            if len(existing_feedbacks) == 1:
-                feedback_list = existing_feedbacks[0].feedback
-            else:
-                # Fallback: flatten if multiple rows (shouldn't happen with current schema)
-                feedback_list = []
-                for fb in existing_feedbacks:
-                    if isinstance(fb.feedback, list):
-                        feedback_list.extend(fb.feedback)
-                    else:
-                        feedback_list.append(fb.feedback)
-            print(f"[get_assessment_results] Using cached feedback for assessment {assessment_id}")
-        else:
-            # Generate feedback using LLM
-            print(f"[get_assessment_results] No cached feedback found for assessment {assessment_id}, generating...")
-            feedback_list = []
-
-            try:
-                # Helper function to map score to level
-                def score_to_level(score):
-                    score_map = {
-                        0: '0',  # unwissend (unaware)
-                        1: '1',  # kennen (know)
-                        2: '2',  # verstehen (understand)
-                        4: '3',  # anwenden (apply)
-                        6: '4'   # beherrschen (master)
-                    }
-                    return score_map.get(score, '0')
-
-                # Helper function to get level name
-                def get_level_name(level):
-                    level_names = {
-                        '0': 'unwissend (unaware)',
-                        '1': 'kennen (know)',
-                        '2': 'verstehen (understand)',
-                        '3': 'anwenden (apply)',
-                        '4': 'beherrschen (master)'
-                    }
-                    return level_names.get(level, 'unknown')
-
-                # Helper function to get indicators for a competency at a specific level
-                def get_indicators_for_level(competency_id, level):
-                    if level == '0':
-                        return 'You are unaware or lack knowledge in this competency area'
-
-                    indicators = CompetencyIndicator.query.filter_by(
-                        competency_id=competency_id,
-                        level=level
-                    ).all()
-
-                    if not indicators:
-                        return f'No specific indicators available for level {level} ({get_level_name(level)})'
-
-                    return '. '.join([ind.indicator_en for ind in indicators if ind.indicator_en])
-
-                # Build max_scores_map for easy lookup
-                max_scores_map = {m['competency_id']: m['max_score'] for m in max_scores_dict}
-
-                # Build detailed competency results
-                aggregated_results = defaultdict(list)
-
-                for user_comp in user_competencies:
-                    competency_id = user_comp.competency_id
-                    user_score = user_comp.score
-
-                    # Get competency info
-                    competency_obj = Competency.query.get(competency_id)
-                    if not competency_obj:
-                        continue
-
-                    competency_name = competency_obj.competency_name
-                    competency_area = competency_obj.competency_area
-
-                    # Map user score to level
-                    user_level = score_to_level(user_score)
-                    user_indicators = get_indicators_for_level(competency_id, user_level)
-
-                    # Get required score and map to level
-                    required_score = max_scores_map.get(competency_id, 0)
-
-                    # Skip competencies with required level = 0
-                    if required_score == 0:
-                        continue
-
-                    required_level = score_to_level(int(required_score)) if required_score else 'unwissend'
-                    required_indicators = get_indicators_for_level(competency_id, required_level)
-
-                    # Add to aggregated results
-                    aggregated_results[competency_area].append({
-                        "competency_name": competency_name,
-                        "user_level": user_level,
-                        "user_indicator": user_indicators,
-                        "required_level": required_level,
-                        "required_indicator": required_indicators
-                    })
-
-                print(f"[get_assessment_results] Aggregated {len(aggregated_results)} areas for feedback generation")
-
-                # Generate feedback using LLM for each competency area
-                for competency_area, competencies in aggregated_results.items():
-                    print(f"[get_assessment_results] Generating feedback for {competency_area} with {len(competencies)} competencies")
-                    feedback_json = generate_feedback_with_llm(competency_area, competencies)
-                    feedback_list.append(feedback_json)
-
-                # Save feedback to database with assessment_id
-                new_feedback = UserCompetencySurveyFeedback(
-                    user_id=assessment.user_id,
-                    organization_id=assessment.organization_id,
-                    feedback=feedback_list,
-                    assessment_id=assessment_id
-                )
-                db.session.add(new_feedback)
-                db.session.commit()
-                print(f"[get_assessment_results] Generated and saved {len(feedback_list)} feedback items for assessment {assessment_id}")
-
-            except Exception as e:
-                db.session.rollback()
-                print(f"[get_assessment_results] LLM feedback generation error: {str(e)}")
-                traceback.print_exc()
-                feedback_list = []  # Return empty feedback on error
+        # Feedback is generated in the background after submission; while it is
+        # still running (or was never started) feedback_status is 'pending' and
+        # the frontend polls this endpoint
+        feedback_list, feedback_status = get_feedback_status(assessment_id)
+        print(f"[get_assessment_results] {len(feedback_list)} feedback items for assessment {assessment_id} ({feedback_status})")
 
         # Get full role objects for selected roles (for display in results)
         selected_roles_data = []
@@ -1155,6 +930,7 @@ def get_assessment_results(assessment_id):
             'user_scores': user_scores,
             'max_scores': max_scores_dict,
             'feedback_list': feedback_list,
+            'feedback_status': feedback_status,  # completed | pending | failed
             'selected_roles_data': selected_roles_data  # Full role objects for frontend display
         }), 200
 
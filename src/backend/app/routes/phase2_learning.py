@@ -29,6 +29,9 @@ if setup_path not in sys.path:
     sys.path.insert(0, setup_path)
 from setup_phase2_task3_for_org import setup_phase2_task3_strategies
 
+from app.services.input_revision import bump_input_revision
+from app.services import document_ingestion
+
 # Create blueprint
 phase2_learning_bp = Blueprint('phase2_learning', __name__)
 
@@ -104,8 +107,21 @@ def api_generate_learning_objectives():
                 "processes": "ISO 26262, ASPICE",
                 "methods": "Scrum, V-Model",
                 "tools": "DOORS, JIRA"
-            }
+            },
+            "async": false,  // Optional - true queues a background job (202)
+            "force": false   // Optional (async only) - regenerate even if cached
+        }
+
+    Response (async, job queued - 202):
+        {
+            "success": true,
+            "job_id": 17,
+            "status": "queued" | "running",
+            "deduplicated": true/false,  // true if an identical job was already active
+            "status_url": "/api/phase2/learning-objectives/jobs/17"
         }
+        An async request whose inputs are already cached returns the cached
+        result immediately (200), unless force is set.
 
     Response (Success):
         {
@@ -210,6 +226,38 @@ def api_generate_learning_objectives():
                 }
                 print(f"[api_generate_learning_objectives] PMT loaded from DB: {pmt_context is not None}")
 
+        if data.get('async'):
+            from app.services.learning_objectives_core import (
+                compute_input_hash, get_cached_objectives
+            )
+            from app.services.learning_objectives_jobs import submit_generation_job
+
+            force = bool(data.get('force', False))
+            input_hash = compute_input_hash(organization_id, selected_strategies, pmt_context)
+
+            if not force:
+                cached_result = get_cached_objectives(organization_id, input_hash)
+                if cached_result:
+                    print(f"[api_generate_learning_objectives] Cache HIT - no job needed")
+                    return jsonify(cached_result), 200
+
+            job, created = submit_generation_job(
+                org_id=organization_id,
+                input_hash=input_hash,
+                selected_strategies=selected_strategies,
+                pmt_context=pmt_context,
+                force=force
+            )
+            print(f"[api_generate_learning_objectives] Job {job.id} {'queued' if created else 'already active'} for org {organization_id}")
+
+            return jsonify({
+                'success': True,
+                'job_id': job.id,
+                'status': job.status,
+                'deduplicated': not created,
+                'status_url': f'/api/phase2/learning-objectives/jobs/{job.id}'
+            }), 202
+
         print(f"[api_generate_learning_objectives] Generating for org {organization_id}")
         print(f"[api_generate_learning_objectives] Strategies: {len(selected_strategies)}")
         print(f"[api_generate_learning_objectives] PMT customization: {pmt_context is not None}")
@@ -223,6 +271,11 @@ def api_generate_learning_objectives():
 
         print(f"[api_generate_learning_objectives] Success - Processing time: {result['metadata']['processing_time_seconds']}s")
 
+        # Pre-render the export files of the new objectives off the request
+        if not result.get('metadata', {}).get('from_cache'):
+            from app.services.learning_objectives_export import start_export_prerender
+            start_export_prerender(current_app._get_current_object(), organization_id)
+
         return jsonify(result), 200
 
     except ValueError as e:
@@ -245,6 +298,58 @@ def api_generate_learning_objectives():
         }), 500
 
 
+@phase2_learning_bp.route('/phase2/learning-objectives/jobs/<int:job_id>', methods=['GET'])
+def api_get_learning_objectives_job(job_id):
+    """
+    Status of a background learning objectives generation job
+
+    Response:
+        {
+            "success": true,
+            "job": {
+                "job_id": 17,
+                "organization_id": 28,
+                "status": "queued" | "running" | "completed" | "failed",
+                "progress": {
+                    "algorithm": 6,
+                    "algorithm_name": "Generate learning objectives",
+                    "total_algorithms": 8,
+                    "llm_calls_total": 40,
+                    "llm_calls_completed": 12,
+                    "llm_calls_cached": 8
+                },
+                "error": null,
+                ...
+            },
+            "result_url": "/api/phase2/learning-objectives/28"  // only when completed
+        }
+    """
+    try:
+        from app.services.learning_objectives_jobs import get_job, JOB_COMPLETED
+
+        job = get_job(job_id)
+        if not job:
+            return jsonify({
+                'success': False,
+                'error': f'Job {job_id} not found',
+                'error_type': 'JOB_NOT_FOUND'
+            }), 404
+
+        response = {'success': True, 'job': job.to_dict()}
+        if job.status == JOB_COMPLETED:
+            response['result_url'] = f'/api/phase2/learning-objectives/{job.organization_id}'
+        return jsonify(response), 200
+
+    except Exception as e:
+        print(f"[api_get_learning_objectives_job] Error: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Failed to load job status',
+            'error_type': 'INTERNAL_ERROR',
+            'details': str(e)
+        }), 500
+
+
 @phase2_learning_bp.route('/phase2/learning-objectives/<int:organization_id>', methods=['GET'])
 def api_get_learning_objectives(organization_id):
     """
@@ -483,6 +588,9 @@ def api_pmt_context(organization_id):
             if 'additionalContext' in data:
                 pmt.additional_context = data['additionalContext']
 
+            # Invalidate learning objectives cache
+            bump_input_revision(organization_id, 'pmt_update')
+
             db.session.commit()
 
             print(f"[api_pmt_context] Updated PMT context for org {organization_id}")
@@ -968,6 +1076,8 @@ def api_add_recommended_strategy(organization_id):
             pmt.tools = pmt_context_data['tools']
             pmt.industry_specific_context = pmt_context_data['industry_specific_context']
 
+            bump_input_revision(organization_id, 'pmt_update')
+
             db.session.commit()
 
             print(f"[api_add_recommended_strategy] PMT context updated for org {organization_id}")
@@ -985,6 +1095,9 @@ def api_add_recommended_strategy(organization_id):
 
         strategy.priority = (max_priority or 0) + 1
 
+        # Invalidate learning objectives cache
+        bump_input_revision(organization_id, 'strategy_add')
+
         db.session.commit()
 
         print(f"[api_add_recommended_strategy] Strategy '{strategy_name}' marked as selected with priority {strategy.priority}")
@@ -1039,6 +1152,12 @@ def api_export_learning_objectives(organization_id):
     """
     Export learning objectives in various formats
 
+    Exports are rendered once per (organization, input hash, format, filter
+    options, organization name) - right after generation or on the first
+    request - and stored
+    (see app/services/learning_objectives_export.py). The response carries an
+    ETag; a request with a matching If-None-Match gets 304 Not Modified.
+
     Query Parameters:
         format: 'json' | 'excel' | 'pdf' (required)
         strategy: Filter by specific strategy name (optional)
@@ -1049,14 +1168,14 @@ def api_export_learning_objectives(organization_id):
         /api/phase2/learning-objectives/28/export?format=excel&strategy=Foundation Workshop
         /api/phase2/learning-objectives/28/export?format=pdf&include_validation=true
 
-    Response: File download with appropriate Content-Type
+    Response: File download with appropriate Content-Type (X-Export-Cache: hit | rendered)
     """
     try:
-        from flask import send_file, make_response
-        from models import GeneratedLearningObjectives
-        import io
-        import json as json_lib
-        from datetime import datetime
+        from sqlalchemy.orm import defer
+        from app.services.learning_objectives_export import (
+            EXPORT_FORMATS, ExportUnavailableError, StrategyNotFoundError,
+            export_filename, export_options, find_export, get_export_content, render_export
+        )
 
         # Get query parameters
         export_format = request.args.get('format', '').lower()
@@ -1064,7 +1183,7 @@ def api_export_learning_objectives(organization_id):
         include_validation = request.args.get('include_validation', 'true').lower() == 'true'
 
         # Validate format
-        if export_format not in ['json', 'excel', 'pdf']:
+        if export_format not in EXPORT_FORMATS:
             return jsonify({
                 'success': False,
                 'error': 'Invalid format',
@@ -1080,10 +1199,10 @@ def api_export_learning_objectives(organization_id):
                 'error': f'Organization {organization_id} not found'
             }), 404
 
-        print(f"[api_export_learning_objectives] Exporting objectives for org {organization_id} in {export_format} format")
-
-        # Get cached learning objectives (prefer cached data for consistency with UI)
-        cached = GeneratedLearningObjectives.query.filter_by(organization_id=organization_id).first()
+        # Cached learning objectives - objectives_data is only loaded if the export must be rendered
+        cached = GeneratedLearningObjectives.query.options(
+            defer(GeneratedLearningObjectives.objectives_data)
+        ).filter_by(organization_id=organization_id).first()
 
         if not cached:
             return jsonify({
@@ -1092,50 +1211,66 @@ def api_export_learning_objectives(organization_id):
                 'message': 'Please generate learning objectives first from the LO dashboard'
             }), 400
 
-        # Parse cached data
-        result = cached.objectives_data
-        if isinstance(result, str):
-            result = json_lib.loads(result)
-
-        if not result.get('success', True):
-            return jsonify({
-                'success': False,
-                'error': 'Cached objectives contain errors',
-                'details': result.get('error')
-            }), 400
-
-        # Filter by strategy if specified
-        objectives_data = result.copy()
-        if strategy_filter:
-            filtered_objectives = {}
-            for strategy_id, strategy_data in result.get('learning_objectives_by_strategy', {}).items():
-                if strategy_data.get('strategy_name') == strategy_filter:
-                    filtered_objectives[strategy_id] = strategy_data
-
-            if not filtered_objectives:
-                return jsonify({
-                    'success': False,
-                    'error': 'Strategy not found',
-                    'message': f'No objectives found for strategy "{strategy_filter}"'
-                }), 404
+        options = export_options(strategy_filter, include_validation)
+        export_cache = 'hit'
 
-            objectives_data['learning_objectives_by_strategy'] = filtered_objectives
-
-        # Remove validation results if not requested
-        if not include_validation:
-            objectives_data.pop('strategy_validation', None)
-            objectives_data.pop('strategic_decisions', None)
-            objectives_data.pop('cross_strategy_coverage', None)
+        # A second pass is only needed if the objectives were regenerated
+        # between the lookup and reading the file (artifact and blob deleted)
+        for _ in range(2):
+            artifact = find_export(organization_id, cached.input_hash, export_format, options, org.organization_name)
+            if artifact is None:
+                export_cache = 'rendered'
+                result = cached.objectives_data
+                if isinstance(result, str):
+                    result = json.loads(result)
 
-        # Export based on format
-        if export_format == 'json':
-            return export_json(objectives_data, org.organization_name)
+                if not result.get('success', True):
+                    return jsonify({
+                        'success': False,
+                        'error': 'Cached objectives contain errors',
+                        'details': result.get('error')
+                    }), 400
+
+                try:
+                    artifact = render_export(cached, org.organization_name, export_format, options)
+                except StrategyNotFoundError as e:
+                    return jsonify({
+                        'success': False,
+                        'error': 'Strategy not found',
+                        'message': str(e)
+                    }), 404
+                except ExportUnavailableError as e:
+                    return jsonify({
+                        'success': False,
+                        'error': f'{export_format} export not available',
+                        'message': str(e)
+                    }), 500
+
+            # Conditional request - the artifact row is enough, the file is not read
+            if request.if_none_match.contains(artifact.content_hash):
+                response = make_response('', 304)
+                response.set_etag(artifact.content_hash)
+                return response
+
+            content = get_export_content(artifact.content_hash)
+            if content is not None:
+                break
+            db.session.refresh(cached)
+        else:
+            raise RuntimeError(f'Export file {artifact.content_hash} missing after re-render')
 
-        elif export_format == 'excel':
-            return export_excel(objectives_data, org.organization_name)
+        print(f"[api_export_learning_objectives] Org {organization_id} {export_format} export "
+              f"({export_cache}, {artifact.size_bytes} bytes)")
 
-        elif export_format == 'pdf':
-            return export_pdf(objectives_data, org.organization_name)
+        response = make_response(content)
+        response.headers['Content-Type'] = artifact.content_type
+        response.headers['Content-Disposition'] = (
+            f'attachment; filename="{export_filename(export_format, org.organization_name)}"'
+        )
+        response.headers['Cache-Control'] = 'private, no-cache'
+        response.headers['X-Export-Cache'] = export_cache
+        response.set_etag(artifact.content_hash)
+        return response
 
     except Exception as e:
         print(f"[api_export_learning_objectives] Error: {str(e)}")
@@ -1147,488 +1282,6 @@ def api_export_learning_objectives(organization_id):
             'details': str(e)
         }), 500
 
-
-def export_json(data, org_name):
-    """Export learning objectives as JSON file"""
-    from flask import make_response
-    import json as json_lib
-    from datetime import datetime
-
-    # Create JSON string with pretty printing
-    json_str = json_lib.dumps(data, indent=2, ensure_ascii=False)
-
-    # Create response
-    response = make_response(json_str)
-    response.headers['Content-Type'] = 'application/json'
-    response.headers['Content-Disposition'] = f'attachment; filename="learning_objectives_{org_name.replace(" ", "_")}_{datetime.now().strftime("%Y%m%d")}.json"'
-
-    print(f"[export_json] JSON export created for {org_name}")
-    return response
-
-
-def export_excel(data, org_name):
-    """
-    Export learning objectives as Excel file matching the Organizational View.
-
-    Single sheet with:
-    - Competency rows x Level columns (Knowing, Understanding, Applying)
-    - Color coding: Green = Achieved, Yellow = Gap (training required), Gray = Not Targeted
-    - LO texts shown as bullet points for Achieved and Training Required
-    - Not Targeted cells are gray and show only "Not Targeted" text
-    - PMT breakdown shown separately (Process, Method, Tool)
-    """
-    from flask import send_file
-    from datetime import datetime
-    import io
-    import re
-
-    try:
-        import openpyxl
-        from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-        from openpyxl.utils import get_column_letter
-    except ImportError:
-        return jsonify({
-            'success': False,
-            'error': 'Excel export not available',
-            'message': 'openpyxl library not installed. Install with: pip install openpyxl'
-        }), 500
-
-    def format_lo_as_bullets(text):
-        """Convert LO text to bullet points by splitting on sentences."""
-        if not text:
-            return ''
-        # Split on periods followed by space or end, but keep sentences meaningful
-        sentences = re.split(r'\.(?=\s|$)', text)
-        sentences = [s.strip() for s in sentences if s.strip()]
-        if len(sentences) <= 1:
-            return text  # Single sentence, return as-is
-        # Format as bullet points
-        return '\n'.join([f"* {s}." if not s.endswith('.') else f"* {s}" for s in sentences])
-
-    def extract_objective_text(lo_data):
-        """Extract clean objective text and PMT breakdown from various LO data formats."""
-        if not lo_data:
-            return '', None
-
-        if isinstance(lo_data, str):
-            return lo_data, None
-
-        if isinstance(lo_data, dict):
-            pmt_breakdown = None
-
-            # Check for PMT breakdown in the learning_objective object
-            if lo_data.get('has_pmt_breakdown') and lo_data.get('pmt_breakdown'):
-                pmt_breakdown = lo_data['pmt_breakdown']
-
-            # Check for objective_text field
-            if 'objective_text' in lo_data:
-                return lo_data['objective_text'], pmt_breakdown
-
-            # Check for direct PMT fields (process, method, tool)
-            if 'process' in lo_data or 'method' in lo_data or 'tool' in lo_data:
-                # This is the PMT breakdown itself
-                return '', {
-                    'process': lo_data.get('process', ''),
-                    'method': lo_data.get('method', ''),
-                    'tool': lo_data.get('tool', '')
-                }
-
-            # Fallback: try to get any text-like field
-            for key in ['text', 'content', 'description']:
-                if key in lo_data:
-                    return str(lo_data[key]), pmt_breakdown
-
-        return str(lo_data) if lo_data else '', None
-
-    def format_pmt_breakdown(pmt):
-        """Format PMT breakdown with clear labels."""
-        if not pmt:
-            return ''
-        parts = []
-        if pmt.get('process'):
-            parts.append(f"[PROCESS]\n{pmt['process']}")
-        if pmt.get('method'):
-            parts.append(f"[METHOD]\n{pmt['method']}")
-        if pmt.get('tool'):
-            parts.append(f"[TOOL]\n{pmt['tool']}")
-        return '\n\n'.join(parts)
-
-    # Color definitions
-    HEADER_FILL = PatternFill(start_color='4472C4', end_color='4472C4', fill_type='solid')
-    HEADER_FONT = Font(bold=True, color='FFFFFF')
-    ACHIEVED_FILL = PatternFill(start_color='C6EFCE', end_color='C6EFCE', fill_type='solid')  # Light green
-    GAP_FILL = PatternFill(start_color='FFEB9C', end_color='FFEB9C', fill_type='solid')  # Light yellow/orange
-    NOT_TARGETED_FILL = PatternFill(start_color='D9D9D9', end_color='D9D9D9', fill_type='solid')  # Gray
-    NOT_TARGETED_FONT = Font(color='808080', italic=True)  # Gray italic text
-    THIN_BORDER = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
-
-    # Level name mapping (without L1, L2, L4 suffixes)
-    LEVEL_NAMES = {
-        1: 'Knowing SE',
-        2: 'Understanding SE',
-        4: 'Applying SE'
-    }
-
-    # Create workbook - single sheet only
-    wb = openpyxl.Workbook()
-    sheet = wb.active
-    sheet.title = 'Learning Objectives'
-
-    # ========== EXTRACT DATA FROM API STRUCTURE ==========
-    selected_strategies = data.get('selected_strategies', [])
-    if not selected_strategies:
-        selected_strategies = data.get('metadata', {}).get('selected_strategies', [])
-
-    all_competencies = {}
-    total_gaps = 0
-    competencies_with_gaps = set()
-
-    # Check for NEW format (data.main_pyramid)
-    main_pyramid = data.get('data', {}).get('main_pyramid', {})
-    levels_data = main_pyramid.get('levels', {})
-
-    if levels_data:
-        print(f"[export_excel] Using NEW format (data.main_pyramid)")
-        for level_str, level_info in levels_data.items():
-            level_num = int(level_str)
-            if level_num not in [1, 2, 4]:
-                continue
-            for comp in level_info.get('competencies', []):
-                comp_id = comp.get('competency_id')
-                comp_name = comp.get('competency_name', f'Competency {comp_id}')
-                status = comp.get('status', 'achieved')
-                grayed_out = comp.get('grayed_out', False)
-                lo_data = comp.get('learning_objective', '')
-                target_level = comp.get('target_level', 0)
-                current_level = comp.get('current_level', 0)
-
-                if comp_id not in all_competencies:
-                    all_competencies[comp_id] = {
-                        'name': comp_name,
-                        'target_level': target_level,
-                        'current_level': current_level,
-                        'levels': {}
-                    }
-
-                # Get gap_data roles if available
-                gap_data = comp.get('gap_data', {})
-                roles_data = gap_data.get('roles', {}) if gap_data else {}
-
-                # Extract roles needing this level
-                roles_needing = []
-                for role_id, role_info in roles_data.items():
-                    if isinstance(role_info, dict):
-                        level_details = role_info.get('level_details', {}).get(level_num, {})
-                        if level_details or level_num in role_info.get('levels_needed', []):
-                            roles_needing.append({
-                                'role_name': role_info.get('role_name', f'Role {role_id}'),
-                                'users_needing': level_details.get('users_needing', role_info.get('users_needing_training', 0)),
-                                'total_users': level_details.get('total_users', role_info.get('total_users', 0))
-                            })
-
-                all_competencies[comp_id]['levels'][level_num] = {
-                    'status': status,
-                    'grayed_out': grayed_out,
-                    'learning_objective': lo_data,
-                    'target_level': target_level,
-                    'current_level': current_level,
-                    'roles_needing': roles_needing
-                }
-
-                if status == 'training_required' and not grayed_out:
-                    total_gaps += 1
-                    competencies_with_gaps.add(comp_id)
-    else:
-        print(f"[export_excel] No NEW format data found")
-
-    is_new_format = bool(levels_data)
-    print(f"[export_excel] Found {len(all_competencies)} competencies, {total_gaps} gaps")
-
-    # ========== HEADER SECTION ==========
-    row = 1
-    sheet.merge_cells('A1:D1')
-    sheet['A1'] = 'Learning Objectives - Organizational View'
-    sheet['A1'].font = Font(size=16, bold=True)
-    sheet['A1'].alignment = Alignment(horizontal='center')
-    row = 3
-
-    strategy_names = ', '.join([s.get('name', s.get('strategy_name', 'Unknown')) for s in selected_strategies])
-    sheet[f'A{row}'] = 'Selected Strategies:'
-    sheet[f'A{row}'].font = Font(bold=True)
-    sheet[f'B{row}'] = strategy_names if strategy_names else 'None'
-    sheet.merge_cells(f'B{row}:D{row}')
-    row += 1
-
-    sheet[f'A{row}'] = 'Levels to Advance:'
-    sheet[f'A{row}'].font = Font(bold=True)
-    sheet[f'B{row}'] = total_gaps
-    row += 1
-
-    sheet[f'A{row}'] = 'Competencies with Gap:'
-    sheet[f'A{row}'].font = Font(bold=True)
-    sheet[f'B{row}'] = len(competencies_with_gaps)
-    row += 2
-
-    # Legend
-    sheet[f'A{row}'] = 'Legend:'
-    sheet[f'A{row}'].font = Font(bold=True)
-    row += 1
-
-    sheet[f'A{row}'] = 'Green'
-    sheet[f'A{row}'].fill = ACHIEVED_FILL
-    sheet[f'B{row}'] = 'Level achieved (no training needed)'
-    row += 1
-
-    sheet[f'A{row}'] = 'Yellow'
-    sheet[f'A{row}'].fill = GAP_FILL
-    sheet[f'B{row}'] = 'Gap exists (training required)'
-    row += 1
-
-    sheet[f'A{row}'] = 'Gray'
-    sheet[f'A{row}'].fill = NOT_TARGETED_FILL
-    sheet[f'A{row}'].font = NOT_TARGETED_FONT
-    sheet[f'B{row}'] = 'Not targeted by selected strategies'
-    row += 2
-
-    # ========== COMPETENCY TABLE ==========
-    matrix_start_row = row
-    sorted_comp_ids = sorted(all_competencies.keys())
-
-    # Headers: Competency | Knowing SE | Understanding SE | Applying SE (without L1, L2, L4)
-    headers = ['Competency', 'Knowing SE', 'Understanding SE', 'Applying SE']
-    for col_idx, header in enumerate(headers, 1):
-        cell = sheet.cell(row=row, column=col_idx, value=header)
-        cell.font = HEADER_FONT
-        cell.fill = HEADER_FILL
-        cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
-        cell.border = THIN_BORDER
-    row += 1
-
-    for comp_id in sorted_comp_ids:
-        comp_data = all_competencies[comp_id]
-        comp_name = comp_data['name']
-
-        # Competency name
-        name_cell = sheet.cell(row=row, column=1, value=comp_name)
-        name_cell.font = Font(bold=True)
-        name_cell.alignment = Alignment(vertical='top', wrap_text=True)
-        name_cell.border = THIN_BORDER
-
-        if is_new_format:
-            # Level columns (1, 2, 4)
-            for col_idx, level_num in enumerate([1, 2, 4], 2):
-                level_data = comp_data.get('levels', {}).get(level_num, {})
-                cell = sheet.cell(row=row, column=col_idx)
-                cell.border = THIN_BORDER
-                cell.alignment = Alignment(vertical='top', wrap_text=True)
-
-                if not level_data:
-                    cell.value = 'Not Targeted'
-                    cell.fill = NOT_TARGETED_FILL
-                    cell.font = NOT_TARGETED_FONT
-                    continue
-
-                status = level_data.get('status', 'achieved')
-                grayed_out = level_data.get('grayed_out', False)
-                lo_data = level_data.get('learning_objective', '')
-                target_level = level_data.get('target_level', 0)
-                current_level = level_data.get('current_level', 0)
-
-                # CRITICAL FIX: Must match frontend SimpleCompetencyCard.vue logic
-                # 1. If status is already 'not_targeted', keep it
-                # 2. If target_level is 0, this level is NOT TARGETED
-                # 3. If level_num > target_level (showing higher level than target), it's NOT TARGETED
-                # 4. If current_level >= target_level (and target_level > 0), status should be achieved (no gap)
-                if status == 'not_targeted':
-                    pass  # Keep the status as is
-                elif target_level == 0:
-                    status = 'not_targeted'
-                elif level_num > target_level:
-                    # This level column is higher than the competency's target level
-                    # So this level is NOT targeted for this competency
-                    status = 'not_targeted'
-                elif current_level >= target_level:
-                    status = 'achieved'
-
-                # Determine the actual status based on backend logic
-                # status: 'training_required' | 'achieved' | 'not_targeted'
-
-                if status == 'not_targeted':
-                    # NOT TARGETED - gray cell, no LO text
-                    cell.value = 'Not Targeted'
-                    cell.fill = NOT_TARGETED_FILL
-                    cell.font = NOT_TARGETED_FONT
-
-                elif status == 'achieved' or (grayed_out and status != 'training_required'):
-                    # ACHIEVED - green cell with LO text
-                    cell.fill = ACHIEVED_FILL
-
-                    # Extract and format LO text
-                    lo_text, pmt_breakdown = extract_objective_text(lo_data)
-
-                    content_parts = []
-
-                    if pmt_breakdown:
-                        # Show PMT breakdown with clear sections
-                        content_parts.append(format_pmt_breakdown(pmt_breakdown))
-                    elif lo_text:
-                        # Format as bullet points
-                        content_parts.append(format_lo_as_bullets(lo_text))
-
-                    cell.value = '\n'.join(content_parts) if content_parts else ''
-
-                elif status == 'training_required' and not grayed_out:
-                    # TRAINING REQUIRED - yellow cell with LO text and role info
-                    cell.fill = GAP_FILL
-
-                    content_parts = []
-
-                    # Add role/user info for gaps
-                    roles = level_data.get('roles_needing', [])
-                    if roles:
-                        role_strs = [f"{r.get('role_name', '?')} ({r.get('users_needing', 0)}/{r.get('total_users', 0)})" for r in roles]
-                        content_parts.append(f"Roles: {', '.join(role_strs)}")
-                        content_parts.append('')
-
-                    # Extract and format LO text
-                    lo_text, pmt_breakdown = extract_objective_text(lo_data)
-
-                    if pmt_breakdown:
-                        # Show PMT breakdown with clear sections
-                        content_parts.append(format_pmt_breakdown(pmt_breakdown))
-                    elif lo_text:
-                        # Format as bullet points
-                        content_parts.append(format_lo_as_bullets(lo_text))
-
-                    cell.value = '\n'.join(content_parts) if content_parts else ''
-
-                else:
-                    # Fallback for any other case
-                    cell.value = '-'
-                    cell.fill = NOT_TARGETED_FILL
-
-        row += 1
-
-    # Column widths - increased for better readability
-    sheet.column_dimensions['A'].width = 30
-    sheet.column_dimensions['B'].width = 65
-    sheet.column_dimensions['C'].width = 65
-    sheet.column_dimensions['D'].width = 65
-
-    # Set row heights for wrapped text - increased to accommodate full text
-    for r in range(matrix_start_row + 1, row):
-        sheet.row_dimensions[r].height = 200  # Increased from 120 to 200
-
-    # Save to BytesIO
-    excel_file = io.BytesIO()
-    wb.save(excel_file)
-    excel_file.seek(0)
-
-    filename = f"learning_objectives_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-    print(f"[export_excel] Excel export created for {org_name} with {len(all_competencies)} competencies, {total_gaps} gaps")
-
-    return send_file(
-        excel_file,
-        mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-        as_attachment=True,
-        download_name=filename
-    )
-
-
-def export_pdf(data, org_name):
-    """Export learning objectives as PDF file"""
-    from flask import make_response
-    from datetime import datetime
-
-    # For now, return a simple text-based PDF using reportlab
-    try:
-        from reportlab.lib.pagesizes import letter, A4
-        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-        from reportlab.lib.units import inch
-        from reportlab.lib import colors
-        import io
-    except ImportError:
-        return jsonify({
-            'success': False,
-            'error': 'PDF export not available',
-            'message': 'reportlab library not installed. Install with: pip install reportlab'
-        }), 500
-
-    # Create PDF buffer
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4)
-    story = []
-
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle('CustomTitle', parent=styles['Heading1'], fontSize=24, textColor=colors.HexColor('#1976D2'))
-    heading_style = ParagraphStyle('CustomHeading', parent=styles['Heading2'], fontSize=16, textColor=colors.HexColor('#424242'))
-
-    # Title
-    story.append(Paragraph(f'Learning Objectives Report', title_style))
-    story.append(Spacer(1, 0.3*inch))
-
-    # Organization info
-    story.append(Paragraph(f'<b>Organization:</b> {org_name}', styles['Normal']))
-    story.append(Paragraph(f'<b>Pathway:</b> {data.get("pathway", "N/A")}', styles['Normal']))
-    story.append(Paragraph(f'<b>Completion Rate:</b> {data.get("completion_rate", 0):.1f}%', styles['Normal']))
-    story.append(Paragraph(f'<b>Generated:</b> {datetime.now().strftime("%Y-%m-%d %H:%M")}', styles['Normal']))
-    story.append(Spacer(1, 0.5*inch))
-
-    # Selected strategies
-    story.append(Paragraph('Selected Strategies', heading_style))
-    for strategy in data.get('selected_strategies', []):
-        story.append(Paragraph(f'• {strategy["name"]} (Priority {strategy["priority"]})', styles['Normal']))
-    story.append(Spacer(1, 0.3*inch))
-
-    # Learning objectives per strategy
-    for strategy_id, strategy_data in data.get('learning_objectives_by_strategy', {}).items():
-        story.append(PageBreak())
-
-        strategy_name = strategy_data.get('strategy_name', f'Strategy {strategy_id}')
-        story.append(Paragraph(strategy_name, heading_style))
-        story.append(Spacer(1, 0.2*inch))
-
-        # Summary
-        summary = strategy_data.get('summary', {})
-        story.append(Paragraph(f'<b>Summary:</b>', styles['Normal']))
-        story.append(Paragraph(f'• Training Required: {summary.get("competencies_requiring_training", 0)} competencies', styles['Normal']))
-        story.append(Paragraph(f'• Targets Achieved: {summary.get("competencies_targets_achieved", 0)} competencies', styles['Normal']))
-        story.append(Spacer(1, 0.3*inch))
-
-        # Trainable competencies table
-        trainable = strategy_data.get('trainable_competencies', [])
-        training_required = [c for c in trainable if c.get('status') == 'training_required']
-
-        if training_required:
-            story.append(Paragraph('<b>Learning Objectives:</b>', styles['Normal']))
-            story.append(Spacer(1, 0.1*inch))
-
-            for comp in training_required:
-                story.append(Paragraph(f'<b>{comp.get("competency_name")}</b> (Gap: {comp.get("current_level", 0)} → {comp.get("target_level", 0)})', styles['Normal']))
-                story.append(Paragraph(comp.get('learning_objective', 'N/A'), styles['BodyText']))
-                story.append(Spacer(1, 0.2*inch))
-
-    # Build PDF
-    doc.build(story)
-    buffer.seek(0)
-
-    filename = f"learning_objectives_{org_name.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}.pdf"
-
-    print(f"[export_pdf] PDF export created for {org_name}")
-
-    response = make_response(buffer.read())
-    response.headers['Content-Type'] = 'application/pdf'
-    response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
-
-    return response
-
-
 # ==============================================================================
 # PMT (Process, Method, Tool) Document Extraction Endpoints
 # ==============================================================================
@@ -1656,138 +1309,27 @@ def extract_pmt_from_document():
         if not organization_id:
             return jsonify({'success': False, 'error': 'organization_id is required'}), 400
 
-        # Get file extension
-        filename = file.filename.lower()
-        current_app.logger.info(f"[PMT Extract] Processing file: {filename}")
-
-        # Extract text based on file type
-        extracted_text = None
-
-        if filename.endswith('.txt'):
-            extracted_text = file.read().decode('utf-8', errors='ignore')
-
-        elif filename.endswith('.pdf'):
-            try:
-                import PyPDF2
-                pdf_reader = PyPDF2.PdfReader(file)
-                text_parts = []
-                for page in pdf_reader.pages:
-                    text_parts.append(page.extract_text())
-                extracted_text = '\n'.join(text_parts)
-            except Exception as e:
-                current_app.logger.error(f"[ERROR] PDF extraction failed: {str(e)}")
-                return jsonify({'success': False, 'error': f'Failed to extract text from PDF: {str(e)}'}), 500
-
-        elif filename.endswith('.docx'):
-            try:
-                import docx
-                doc = docx.Document(file)
-                text_parts = [para.text for para in doc.paragraphs]
-                # Also extract from tables
-                for table in doc.tables:
-                    for row in table.rows:
-                        for cell in row.cells:
-                            text_parts.append(cell.text)
-                extracted_text = '\n'.join(text_parts)
-            except Exception as e:
-                current_app.logger.error(f"[ERROR] DOCX extraction failed: {str(e)}")
-                return jsonify({'success': False, 'error': f'Failed to extract text from DOCX: {str(e)}'}), 500
-
-        else:
-            return jsonify({'success': False, 'error': 'Unsupported file format. Please upload PDF, DOCX, or TXT files.'}), 400
-
-        if not extracted_text or len(extracted_text.strip()) < 50:
-            return jsonify({'success': False, 'error': 'Document appears to be empty or too short'}), 400
-
-        # Use OpenAI to extract PMT information
-        from openai import OpenAI
-        client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
-
-        prompt = f"""You are an expert in analyzing Systems Engineering documentation.
-Analyze the following document and extract Process, Method, and Tool information.
-
-DEFINITIONS:
-- PROCESS: Organizational workflows, procedures, roles/responsibilities, approval gates, review cycles.
-  Examples: ISO standards followed, development lifecycle (V-model, Agile), quality procedures, RACI matrices.
-
-- METHOD: Technical techniques and approaches used to perform engineering activities.
-  Examples: Requirements analysis methods, modeling techniques (SysML, UML), trade-off analysis, design reviews.
-
-- TOOL: Specific software, platforms, or tools used to support engineering work.
-  Examples: DOORS (requirements), JIRA (project management), Catia Magic (modeling), Git (version control).
-
-Analyze the document text and extract relevant information into these categories.
-For each item extracted, provide:
-1. The name/title of the item
-2. A brief description
-3. The category (process, method, or tool)
-4. Confidence level (high, medium, low)
-
-Document text:
-{extracted_text[:12000]}
-
-Return a JSON object with this structure:
-{{
-  "document_type": "process|method|tool|mixed",
-  "document_summary": "Brief summary of what this document describes",
-  "processes": [
-    {{"name": "...", "description": "...", "confidence": "high|medium|low"}}
-  ],
-  "methods": [
-    {{"name": "...", "description": "...", "confidence": "high|medium|low"}}
-  ],
-  "tools": [
-    {{"name": "...", "description": "...", "confidence": "high|medium|low"}}
-  ],
-  "suggested_text": {{
-    "processes": "Consolidated text description of all processes found",
-    "methods": "Consolidated text description of all methods found",
-    "tools": "Consolidated text description of all tools found"
-  }}
-}}
-
-IMPORTANT: In the "suggested_text" fields:
-- If you find items in a category, write a concise summary of what was found
-- If NOTHING is found for a category, leave it as an EMPTY STRING ""
-- Do NOT write messages like "No specific methods were identified" - just use ""
-
-Return ONLY valid JSON, nothing else."""
+        current_app.logger.info(f"[PMT Extract] Processing file: {file.filename.lower()}")
 
         try:
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant that extracts Process, Method, and Tool information from Systems Engineering documents. Always respond with valid JSON only."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3
-            )
-
-            ai_response = response.choices[0].message.content.strip()
-
-            # Remove markdown code blocks if present
-            if ai_response.startswith('```'):
-                ai_response = ai_response.split('```')[1]
-                if ai_response.startswith('json'):
-                    ai_response = ai_response[4:]
-                ai_response = ai_response.strip()
-
-            # Parse JSON response
-            pmt_data = json.loads(ai_response)
+            extraction = document_ingestion.extract_pmt_from_document(file.read(), file.filename)
+        except document_ingestion.DocumentIngestionError as e:
+            current_app.logger.error(f"[ERROR] PMT extraction failed: {str(e)}")
+            return jsonify({'success': False, 'error': str(e)}), e.status_code
 
-            current_app.logger.info(f"[OK] Extracted PMT data from document - Type: {pmt_data.get('document_type')}")
-            current_app.logger.info(f"[OK] Found: {len(pmt_data.get('processes', []))} processes, {len(pmt_data.get('methods', []))} methods, {len(pmt_data.get('tools', []))} tools")
+        # Persists the fragment cache entry of a fresh extraction
+        db.session.commit()
 
-            return jsonify({
-                'success': True,
-                'filename': file.filename,
-                'pmt_data': pmt_data
-            })
+        pmt_data = extraction['result']
+        current_app.logger.info(f"[OK] Extracted PMT data from document - Type: {pmt_data.get('document_type')}")
+        current_app.logger.info(f"[OK] Found: {len(pmt_data.get('processes', []))} processes, {len(pmt_data.get('methods', []))} methods, {len(pmt_data.get('tools', []))} tools")
 
-        except json.JSONDecodeError as e:
-            current_app.logger.error(f"[ERROR] Failed to parse AI response: {str(e)}")
-            current_app.logger.error(f"[ERROR] AI response was: {ai_response}")
-            return jsonify({'success': False, 'error': 'Failed to parse PMT information from document'}), 500
+        return jsonify({
+            'success': True,
+            'filename': file.filename,
+            'pmt_data': pmt_data,
+            'ingestion': {k: extraction[k] for k in ('sha256', 'chunks', 'failed_chunks', 'truncated', 'cached')}
+        })
 
     except Exception as e:
         current_app.logger.error(f"[ERROR] PMT document extraction failed: {str(e)}")
@@ -0,0 +1,434 @@
+"""
+Assessment Feedback - Competency-area feedback generation for Phase 2 results
+==============================================================================
+
+Generates the LLM feedback shown on /assessment/<id>/results and stores it in
+user_competency_survey_feedback (one row per assessment).
+
+Previously the results endpoint generated feedback on first view, calling
+generate_feedback_with_llm() one competency area after another (new ChatOpenAI
+client per call) and querying indicators per competency and level.
+
+Now:
+- Competencies and indicators are prefetched with one query each
+- All competency areas are generated concurrently (llm_executor.run_ordered)
+  over the shared feedback chain
+- Generation starts in the background right after the assessment is
+  submitted (schedule_feedback_generation), so the results page is normally
+  served from the stored feedback. While generation is still running the
+  results endpoint never waits: it reports feedback_status 'pending' and the
+  frontend polls.
+- A row in assessment_feedback_claim (AssessmentFeedbackClaim) deduplicates
+  generation across gunicorn workers: only the process whose INSERT succeeds
+  generates. Failed and stale claims are taken over by a later request.
+
+Date: 2026-10-18
+"""
+
+import logging
+import os
+import socket
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from flask import current_app
+from sqlalchemy.exc import IntegrityError
+
+from app.generate_survey_feedback import generate_feedback_with_llm
+from app.services.llm_executor import run_ordered
+
+try:
+    from models import (
+        db, AssessmentFeedbackClaim, Competency, CompetencyIndicator, RoleCompetencyMatrix,
+        UnknownRoleCompetencyMatrix, UserAssessment,
+        UserCompetencySurveyFeedback, UserCompetencySurveyResults
+    )
+except ImportError:
+    from app.models import (
+        db, AssessmentFeedbackClaim, Competency, CompetencyIndicator, RoleCompetencyMatrix,
+        UnknownRoleCompetencyMatrix, UserAssessment,
+        UserCompetencySurveyFeedback, UserCompetencySurveyResults
+    )
+
+logger = logging.getLogger(__name__)
+
+# Background generation pool (each job fans out its own LLM calls)
+BACKGROUND_WORKERS = 2
+
+# A running claim older than this belongs to a dead worker and is taken over
+CLAIM_STALE_SECONDS = 600
+
+# Failed generations are retried by later results requests up to this many attempts
+MAX_ATTEMPTS = 3
+
+CLAIM_RUNNING = 'running'
+CLAIM_FAILED = 'failed'
+
+# feedback_status reported by the results endpoint
+FEEDBACK_COMPLETED = 'completed'
+FEEDBACK_PENDING = 'pending'
+FEEDBACK_FAILED = 'failed'
+
+SCORE_TO_LEVEL = {
+    0: '0',  # unwissend (unaware)
+    1: '1',  # kennen (know)
+    2: '2',  # verstehen (understand)
+    4: '3',  # anwenden (apply)
+    6: '4'   # beherrschen (master)
+}
+
+LEVEL_NAMES = {
+    '0': 'unwissend (unaware)',
+    '1': 'kennen (know)',
+    '2': 'verstehen (understand)',
+    '3': 'anwenden (apply)',
+    '4': 'beherrschen (master)'
+}
+
+
+def score_to_level(score) -> str:
+    return SCORE_TO_LEVEL.get(score, '0')
+
+
+# =============================================================================
+# INPUTS
+# =============================================================================
+
+def load_required_scores(assessment: UserAssessment) -> Optional[List[Dict]]:
+    """
+    Required competency scores of an assessment, depending on survey type.
+
+    Returns:
+        [{'competency_id', 'max_score'}, ...] ordered by competency, or None
+        for a task-based assessment without task-based username
+    """
+    if assessment.survey_type == 'known_roles':
+        # Use selected_roles from assessment (not UserRoleCluster)
+        role_cluster_ids = assessment.selected_roles or []
+        if not role_cluster_ids:
+            logger.warning(f"[load_required_scores] No role IDs in assessment {assessment.id} selected_roles")
+            return []
+
+        max_scores = db.session.query(
+            RoleCompetencyMatrix.competency_id,
+            db.func.max(RoleCompetencyMatrix.role_competency_value).label('max_score')
+        ).filter(
+            RoleCompetencyMatrix.organization_id == assessment.organization_id,
+            RoleCompetencyMatrix.role_cluster_id.in_(role_cluster_ids)
+        ).group_by(RoleCompetencyMatrix.competency_id).having(
+            db.func.max(RoleCompetencyMatrix.role_competency_value) > 0
+        ).order_by(RoleCompetencyMatrix.competency_id).all()
+
+    elif assessment.survey_type == 'unknown_roles':
+        # For task-based, fetch from UnknownRoleCompetencyMatrix using task-based username
+        task_based_username = assessment.tasks_responsibilities.get('username') if assessment.tasks_responsibilities else None
+        if not task_based_username:
+            return None
+
+        max_scores = db.session.query(
+            UnknownRoleCompetencyMatrix.competency_id,
+            UnknownRoleCompetencyMatrix.role_competency_value.label('max_score')
+        ).filter(
+            UnknownRoleCompetencyMatrix.organization_id == assessment.organization_id,
+            UnknownRoleCompetencyMatrix.user_name == task_based_username,
+            UnknownRoleCompetencyMatrix.role_competency_value > 0
+        ).all()
+
+    elif assessment.survey_type == 'all_roles':
+        max_scores = db.session.query(
+            RoleCompetencyMatrix.competency_id,
+            db.func.avg(RoleCompetencyMatrix.role_competency_value).label('max_score')
+        ).filter(
+            RoleCompetencyMatrix.organization_id == assessment.organization_id
+        ).group_by(RoleCompetencyMatrix.competency_id).having(
+            db.func.avg(RoleCompetencyMatrix.role_competency_value) > 0
+        ).order_by(RoleCompetencyMatrix.competency_id).all()
+    else:
+        max_scores = []
+
+    return [{'competency_id': m.competency_id, 'max_score': float(m.max_score)} for m in max_scores]
+
+
+def build_feedback_inputs(user_competencies, max_scores_map: Dict[int, float]) -> Dict[str, List[Dict]]:
+    """
+    Group the LLM inputs of every competency with a required level by area.
+
+    Competencies and indicators are loaded with one query each.
+
+    Returns:
+        {competency_area: [{competency_name, user_level, user_indicator,
+                            required_level, required_indicator}, ...]}
+    """
+    competency_ids = [u.competency_id for u in user_competencies]
+
+    competencies = {
+        c.id: c for c in Competency.query.filter(Competency.id.in_(competency_ids)).all()
+    }
+
+    indicators = defaultdict(list)
+    for indicator in CompetencyIndicator.query.filter(
+        CompetencyIndicator.competency_id.in_(competency_ids)
+    ).order_by(CompetencyIndicator.id).all():
+        indicators[(indicator.competency_id, indicator.level)].append(indicator.indicator_en)
+
+    def indicators_for_level(competency_id, level):
+        if level == '0':
+            return 'You are unaware or lack knowledge in this competency area'
+
+        texts = indicators.get((competency_id, level))
+        if not texts:
+            return f'No specific indicators available for level {level} ({LEVEL_NAMES.get(level, "unknown")})'
+
+        return '. '.join([text for text in texts if text])
+
+    aggregated_results = defaultdict(list)
+
+    for user_comp in user_competencies:
+        competency_id = user_comp.competency_id
+        competency_obj = competencies.get(competency_id)
+        if not competency_obj:
+            continue
+
+        # Skip competencies with required level = 0
+        required_score = max_scores_map.get(competency_id, 0)
+        if required_score == 0:
+            continue
+
+        user_level = score_to_level(user_comp.score)
+        required_level = score_to_level(int(required_score))
+
+        aggregated_results[competency_obj.competency_area].append({
+            "competency_name": competency_obj.competency_name,
+            "user_level": user_level,
+            "user_indicator": indicators_for_level(competency_id, user_level),
+            "required_level": required_level,
+            "required_indicator": indicators_for_level(competency_id, required_level)
+        })
+
+    return aggregated_results
+
+
+# =============================================================================
+# GENERATION AND STORAGE
+# =============================================================================
+
+def get_stored_feedback(assessment_id: int) -> Optional[List]:
+    """Stored feedback list of an assessment, or None if not generated yet"""
+    existing_feedbacks = UserCompetencySurveyFeedback.query.filter_by(
+        assessment_id=assessment_id
+    ).order_by(UserCompetencySurveyFeedback.id).all()
+
+    if not existing_feedbacks:
+        return None
+
+    # Feedback is stored as a JSON array in a single row
+    if len(existing_feedbacks) == 1:
+        return existing_feedbacks[0].feedback
+
+    # Fallback: flatten if multiple rows (shouldn't happen with current schema)
+    feedback_list = []
+    for fb in existing_feedbacks:
+        if isinstance(fb.feedback, list):
+            feedback_list.extend(fb.feedback)
+        else:
+            feedback_list.append(fb.feedback)
+    return feedback_list
+
+
+def generate_area_feedback(aggregated_results: Dict[str, List[Dict]]) -> List[Dict]:
+    """
+    Generate feedback for all competency areas concurrently.
+
+    Returns:
+        Feedback per area, in area order
+
+    Raises:
+        The first LLM error (nothing is stored for a partial result)
+    """
+    results = run_ordered(generate_feedback_with_llm, list(aggregated_results.items()))
+    for _, error in results:
+        if error is not None:
+            raise error
+    return [feedback for feedback, _ in results]
+
+
+def generate_assessment_feedback(assessment_id: int) -> List:
+    """
+    Generate and store the feedback of a submitted assessment (idempotent).
+
+    Returns:
+        Feedback list (the stored one if it already exists)
+    """
+    stored = get_stored_feedback(assessment_id)
+    if stored is not None:
+        return stored
+
+    assessment = db.session.get(UserAssessment, assessment_id)
+    if not assessment:
+        raise ValueError(f'Assessment {assessment_id} not found')
+    submitted_at = assessment.completed_at
+
+    required_scores = load_required_scores(assessment)
+    if required_scores is None:
+        raise ValueError(f'Task-based username not found for assessment {assessment_id}')
+
+    user_competencies = UserCompetencySurveyResults.query.filter_by(
+        assessment_id=assessment_id
+    ).order_by(UserCompetencySurveyResults.competency_id).all()
+
+    max_scores_map = {m['competency_id']: m['max_score'] for m in required_scores}
+    aggregated_results = build_feedback_inputs(user_competencies, max_scores_map)
+
+    # End the read transaction before the (slow) LLM calls
+    db.session.commit()
+
+    logger.info(
+        f"[generate_assessment_feedback] Assessment {assessment_id}: "
+        f"generating feedback for {len(aggregated_results)} areas"
+    )
+    feedback_list = generate_area_feedback(aggregated_results)
+
+    # Another worker may have stored feedback, or the assessment was re-submitted
+    stored = get_stored_feedback(assessment_id)
+    if stored is not None:
+        return stored
+    db.session.refresh(assessment)
+    if assessment.completed_at != submitted_at:
+        logger.info(f"[generate_assessment_feedback] Assessment {assessment_id} re-submitted - discarding")
+        return feedback_list
+
+    db.session.add(UserCompetencySurveyFeedback(
+        user_id=assessment.user_id,
+        organization_id=assessment.organization_id,
+        feedback=feedback_list,
+        assessment_id=assessment_id
+    ))
+    db.session.commit()
+    logger.info(f"[generate_assessment_feedback] Stored {len(feedback_list)} feedback items for assessment {assessment_id}")
+    return feedback_list
+
+
+# =============================================================================
+# BACKGROUND EXECUTION
+# =============================================================================
+
+_executor = ThreadPoolExecutor(max_workers=BACKGROUND_WORKERS, thread_name_prefix='feedback')
+_worker_id = f"{socket.gethostname()}:{os.getpid()}"
+
+
+def claim_feedback_generation(assessment_id: int) -> Optional[datetime]:
+    """
+    Claim the feedback generation of an assessment for this process.
+
+    The claim row is inserted (primary key = assessment); if it already
+    exists it is taken over with a conditional UPDATE when it failed (fewer
+    than MAX_ATTEMPTS), went stale, or predates the latest submission.
+
+    Returns:
+        The claim token (claimed_at) if this process should generate, else None
+    """
+    now = datetime.utcnow()
+    try:
+        db.session.execute(db.insert(AssessmentFeedbackClaim).values(
+            assessment_id=assessment_id, status=CLAIM_RUNNING,
+            worker_id=_worker_id, attempts=1, claimed_at=now
+        ))
+        db.session.commit()
+        return now
+    except IntegrityError:
+        # Claimed by another request or worker
+        db.session.rollback()
+
+    claim = db.session.get(AssessmentFeedbackClaim, assessment_id)
+    if claim is None:
+        # Released in the meantime (feedback stored or discarded)
+        return None
+
+    submitted_at = db.session.query(UserAssessment.completed_at).filter_by(id=assessment_id).scalar()
+    resubmitted = submitted_at is not None and claim.claimed_at < submitted_at
+    stale = claim.status == CLAIM_RUNNING and claim.claimed_at < now - timedelta(seconds=CLAIM_STALE_SECONDS)
+    retry = claim.status == CLAIM_FAILED and claim.attempts < MAX_ATTEMPTS
+    if not (resubmitted or stale or retry):
+        return None
+
+    claimed = AssessmentFeedbackClaim.query.filter_by(
+        assessment_id=assessment_id, claimed_at=claim.claimed_at
+    ).update({
+        AssessmentFeedbackClaim.status: CLAIM_RUNNING,
+        AssessmentFeedbackClaim.worker_id: _worker_id,
+        AssessmentFeedbackClaim.attempts: 1 if resubmitted else claim.attempts + 1,
+        AssessmentFeedbackClaim.error: None,
+        AssessmentFeedbackClaim.claimed_at: now
+    }, synchronize_session=False)
+    db.session.commit()
+
+    if not claimed:
+        return None
+    logger.info(f"[claim_feedback_generation] Took over claim of assessment {assessment_id} "
+                f"({'resubmitted' if resubmitted else 'stale' if stale else 'retry'})")
+    return now
+
+
+def _generate_in_app_context(app, assessment_id: int, claimed_at: datetime) -> None:
+    with app.app_context():
+        # Only touch the claim while it is still ours (it may have been taken over)
+        own_claim = AssessmentFeedbackClaim.query.filter_by(assessment_id=assessment_id, claimed_at=claimed_at)
+        try:
+            generate_assessment_feedback(assessment_id)
+            own_claim.delete(synchronize_session=False)
+            db.session.commit()
+        except Exception as e:
+            logger.exception(f"[assessment_feedback] Feedback generation failed for assessment {assessment_id}")
+            db.session.rollback()
+            own_claim.update({
+                AssessmentFeedbackClaim.status: CLAIM_FAILED,
+                AssessmentFeedbackClaim.error: str(e)
+            }, synchronize_session=False)
+            db.session.commit()
+        finally:
+            db.session.remove()
+
+
+def schedule_feedback_generation(assessment_id: int) -> Optional[Future]:
+    """
+    Start feedback generation in the background (call after the submit commit).
+
+    Returns:
+        The future of the started generation, or None if another request or
+        worker process holds the claim
+    """
+    claimed_at = claim_feedback_generation(assessment_id)
+    if claimed_at is None:
+        return None
+
+    app = current_app._get_current_object()
+    return _executor.submit(_generate_in_app_context, app, assessment_id, claimed_at)
+
+
+def get_feedback_status(assessment_id: int) -> Tuple[List, str]:
+    """
+    Feedback for the results page (never waits for generation).
+
+    Returns:
+        (feedback_list, feedback_status) - the stored feedback and 'completed',
+        or [] and 'pending' while generation runs (started here if nobody holds
+        the claim), or [] and 'failed' once MAX_ATTEMPTS generations failed
+    """
+    stored = get_stored_feedback(assessment_id)
+    if stored is not None:
+        return stored, FEEDBACK_COMPLETED
+
+    if schedule_feedback_generation(assessment_id) is not None:
+        return [], FEEDBACK_PENDING
+
+    claim = db.session.get(AssessmentFeedbackClaim, assessment_id)
+    if claim is not None and claim.status == CLAIM_FAILED:
+        return [], FEEDBACK_FAILED
+
+    # Generation may have finished between the two checks
+    stored = get_stored_feedback(assessment_id)
+    if stored is not None:
+        return stored, FEEDBACK_COMPLETED
+    return [], FEEDBACK_PENDING
@@ -0,0 +1,228 @@
+"""
+Assessment Submission - Bulk write path for Phase 2 assessment submits
+======================================================================
+
+/phase2/submit-assessment added one UserCompetencySurveyResults object per
+answer (with a debug print each), recreated the UserRoleCluster rows one by
+one, then re-read the rows it had just written and looked up every required
+level with a linear scan over the max scores.
+
+This module writes a submission set-based:
+
+- survey results: one DELETE and one multi-row INSERT
+- role assignments: one INSERT ... ON CONFLICT (user_id, role_cluster_id)
+  DO UPDATE, so a role already held from an earlier assessment is re-pointed
+  instead of failing on the primary key
+- latest_user_competency_score and the organization input revision are
+  maintained in the same transaction
+
+apply_submissions() accepts many assessments at once (batch endpoint for
+proctored / offline imports); nothing here commits. build_submission_results()
+computes the results payload from the in-memory answers, the reference data
+cache and a dict of required levels.
+
+Date: 2026-10-18
+"""
+
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, insert
+
+from app.services.assessment_feedback import load_required_scores
+from app.services.db_helpers import dialect_insert
+from app.services.input_revision import bump_input_revision
+from app.services.latest_scores import refresh_latest_scores
+from app.services.reference_data import get_reference_data
+
+try:
+    from models import (
+        db, UserAssessment, UserCompetencySurveyFeedback, UserCompetencySurveyResults, UserRoleCluster
+    )
+except ImportError:
+    from app.models import (
+        db, UserAssessment, UserCompetencySurveyFeedback, UserCompetencySurveyResults, UserRoleCluster
+    )
+
+logger = logging.getLogger(__name__)
+
+
+def collect_answers(answers: Sequence[Dict]) -> Dict[int, int]:
+    """
+    {competency_id: current_level} of a submit payload, in competency order.
+
+    Answers without competency_id are skipped; a repeated competency keeps
+    the last answer.
+    """
+    scores = {}
+    for answer in answers or []:
+        competency_id = answer.get('competency_id')
+        if competency_id is None:
+            continue
+        scores[int(competency_id)] = answer.get('current_level', 0)
+    return dict(sorted(scores.items()))
+
+
+def write_survey_results(submissions: Sequence[Tuple[UserAssessment, Dict[int, int]]]) -> int:
+    """
+    Replace the survey results of the given assessments.
+
+    Returns:
+        Number of rows inserted
+    """
+    table = UserCompetencySurveyResults.__table__
+    db.session.execute(delete(table).where(
+        table.c.assessment_id.in_([assessment.id for assessment, _ in submissions])
+    ))
+
+    now = datetime.utcnow()
+    rows = [
+        {
+            'user_id': assessment.user_id,
+            'organization_id': assessment.organization_id,
+            'competency_id': competency_id,
+            'score': score,
+            'submitted_at': now,
+            'assessment_id': assessment.id
+        }
+        for assessment, scores in submissions
+        for competency_id, score in scores.items()
+    ]
+    if rows:
+        db.session.execute(insert(table), rows)
+    return len(rows)
+
+
+def upsert_role_assignments(assignments: Sequence[Tuple[UserAssessment, Sequence[int]]]) -> int:
+    """
+    Point the user's role assignments at the given assessments.
+
+    Rows of a previous submission of the same assessments are removed first;
+    a (user, role) pair already assigned by another assessment is updated to
+    the newest one.
+
+    Returns:
+        Number of assignments written
+    """
+    table = UserRoleCluster.__table__
+    db.session.execute(delete(table).where(
+        table.c.assessment_id.in_([assessment.id for assessment, _ in assignments])
+    ))
+
+    # One row per (user, role) - ON CONFLICT cannot touch a row twice per statement
+    latest: Dict[Tuple[int, int], int] = {}
+    for assessment, role_ids in assignments:
+        for role_id in role_ids:
+            key = (assessment.user_id, int(role_id))
+            latest[key] = max(latest.get(key, 0), assessment.id)
+    if not latest:
+        return 0
+
+    stmt = dialect_insert(table).values([
+        {'user_id': user_id, 'role_cluster_id': role_id, 'assessment_id': assessment_id}
+        for (user_id, role_id), assessment_id in latest.items()
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['user_id', 'role_cluster_id'],
+        set_={'assessment_id': stmt.excluded.assessment_id}
+    )
+    db.session.execute(stmt)
+    return len(latest)
+
+
+def apply_submissions(submissions: Sequence[Tuple[UserAssessment, Dict[int, int]]]) -> Dict[str, int]:
+    """
+    Store the answers of one or more Phase 2 assessments and mark them completed.
+
+    Does not commit - one commit by the caller makes the whole batch visible.
+
+    Args:
+        submissions: [(assessment, {competency_id: current_level}), ...]
+
+    Returns:
+        Counts of written survey results and role assignments
+    """
+    if not submissions:
+        return {'survey_results': 0, 'role_assignments': 0}
+
+    results_written = write_survey_results(submissions)
+
+    now = datetime.utcnow()
+    for assessment, _ in submissions:
+        assessment.completed_at = now
+
+    # user_role_cluster feeds the role-based pathway (high-maturity organizations)
+    roles_written = upsert_role_assignments([
+        (assessment, assessment.selected_roles)
+        for assessment, _ in submissions
+        if assessment.survey_type == 'known_roles' and assessment.selected_roles
+    ])
+
+    # Feedback of a previous submission is outdated
+    assessment_ids = [assessment.id for assessment, _ in submissions]
+    UserCompetencySurveyFeedback.query.filter(
+        UserCompetencySurveyFeedback.assessment_id.in_(assessment_ids)
+    ).delete(synchronize_session=False)
+
+    db.session.flush()
+    for org_id, user_id in sorted({(a.organization_id, a.user_id) for a, _ in submissions}):
+        refresh_latest_scores(org_id, user_id)
+
+    # Invalidate learning objectives cache (scores and roles changed)
+    for org_id in sorted({a.organization_id for a, _ in submissions}):
+        bump_input_revision(org_id, 'assessment_submit')
+
+    logger.info(
+        f"[apply_submissions] {len(submissions)} assessment(s): {results_written} survey results, "
+        f"{roles_written} role assignments"
+    )
+    return {'survey_results': results_written, 'role_assignments': roles_written}
+
+
+def required_scores_for_submission(assessment: UserAssessment) -> List[Dict]:
+    """
+    Required levels shown right after submit: role-based and task-based
+    assessments only.
+    """
+    if assessment.survey_type not in ('known_roles', 'unknown_roles'):
+        return []
+    max_scores = load_required_scores(assessment)
+    if max_scores is None:
+        raise ValueError("Task-based username not found in assessment")
+    return max_scores
+
+
+def build_submission_results(assessment: UserAssessment, scores: Dict[int, int],
+                             max_scores: Optional[List[Dict]] = None) -> Tuple[List[Dict], List[Dict], Dict]:
+    """
+    Results payload of a submitted assessment from its in-memory answers.
+
+    Returns:
+        (user_scores, max_scores, summary) - user_scores only covers
+        competencies with a required level
+    """
+    if max_scores is None:
+        max_scores = required_scores_for_submission(assessment)
+    required = {m['competency_id']: m['max_score'] for m in max_scores}
+
+    reference = get_reference_data()
+    user_scores = []
+    for competency_id, score in sorted(scores.items()):
+        if competency_id not in required:
+            continue
+        competency = reference.competency(competency_id)
+        user_scores.append({
+            'competency_id': competency_id,
+            'score': score,
+            'competency_name': competency.competency_name if competency else None,
+            'competency_area': competency.competency_area if competency else None
+        })
+
+    proficient = sum(1 for s in user_scores if s['score'] >= required[s['competency_id']])
+    summary = {
+        'total': len(user_scores),
+        'proficient': proficient,
+        'needs_improvement': len(user_scores) - proficient
+    }
+    return user_scores, max_scores, summary
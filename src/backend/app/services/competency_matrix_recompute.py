@@ -0,0 +1,347 @@
+"""
+Competency Matrix Recompute - Incremental, set-based matrix maintenance
+======================================================================
+
+role_competency_matrix and unknown_role_competency_matrix are derived from
+the process involvement matrices and process_competency_matrix:
+
+    role_competency_value = MAX over processes of
+                            map(role_process_value * process_competency_value)
+
+with map = {0: 0, 1: 1, 2: 2, 3: 4, 4: 4, 6: 6}, anything else -100 (the same
+CASE as the update_role_competency_matrix / update_unknown_role_competency_values
+stored procedures, migration 010b).
+
+Editing one competency column of the process-competency matrix
+(PUT /process-competency-matrix/bulk) used to upsert row by row and then CALL
+update_role_competency_matrix for every organization, each of which deletes
+and rebuilds that organization's whole matrix. Only rows of the edited
+competency can change, so this module:
+
+- upserts the edited process values in one INSERT ... ON CONFLICT statement
+- recomputes that competency for all organizations (and all task-based
+  users) with one DELETE + INSERT ... SELECT per derived table
+
+Editing the process involvement of a role (PUT /role-process-matrix/bulk,
+/phase1/roles/initialize-matrix) used to CALL update_role_competency_matrix,
+deleting and re-inserting the organization's whole matrix. Only the
+(role, competency) rows of the edited roles - and, for a cell edit, only the
+competencies linked to the edited processes - can change, so
+recompute_role_competencies() upserts just those rows, skipping unchanged
+values, deletes rows that no longer have a source, and returns the number of
+rows touched. Callers only invalidate downstream caches if it is non-zero.
+
+Recomputes drop this worker's cached role matrices (role_similarity); a
+process-competency column edit also bumps the input revision of every
+organization with derived rows of the edited competency - role-based or
+task-based users, before or after the edit - since it changes their
+requirements (other workers' role matrices and the learning objectives
+cache key on that revision).
+
+Nothing here commits - the caller's commit makes the edit and the
+recomputed rows visible together.
+
+Date: 2026-10-18
+"""
+
+import logging
+from typing import Dict, Iterable, Mapping, Optional
+
+from sqlalchemy import and_, case, delete, exists, func, insert, literal, select
+
+try:
+    from models import (
+        db, ProcessCompetencyMatrix, RoleCompetencyMatrix, RoleProcessMatrix,
+        UnknownRoleCompetencyMatrix, UnknownRoleProcessMatrix
+    )
+except ImportError:
+    from app.models import (
+        db, ProcessCompetencyMatrix, RoleCompetencyMatrix, RoleProcessMatrix,
+        UnknownRoleCompetencyMatrix, UnknownRoleProcessMatrix
+    )
+
+from app.services.db_helpers import dialect_insert
+from app.services.input_revision import bump_input_revision
+from app.services.role_similarity import invalidate_role_matrix
+
+logger = logging.getLogger(__name__)
+
+# role_process_value * process_competency_value -> required competency level
+# (level 3 is not used and maps to 4, see migration 010)
+COMPETENCY_LEVEL_MAP = {0: 0, 1: 1, 2: 2, 3: 4, 4: 4, 6: 6}
+INVALID_COMPETENCY_VALUE = -100
+
+
+def competency_value_expr(role_process_value, process_competency_value):
+    """SQL expression mapping an involvement x process value product to a competency level"""
+    return case(
+        COMPETENCY_LEVEL_MAP,
+        value=role_process_value * process_competency_value,
+        else_=INVALID_COMPETENCY_VALUE
+    )
+
+
+def upsert_process_competency_values(competency_id: int, values: Mapping) -> int:
+    """
+    Write one competency column of the process-competency matrix.
+
+    Args:
+        competency_id: Edited competency
+        values: {iso_process_id: process_competency_value} (keys may be strings)
+
+    Returns:
+        Number of rows written
+    """
+    rows = [
+        {
+            'iso_process_id': int(process_id),
+            'competency_id': competency_id,
+            'process_competency_value': int(value)
+        }
+        for process_id, value in values.items()
+    ]
+    if not rows:
+        return 0
+
+    stmt = dialect_insert(ProcessCompetencyMatrix.__table__).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['iso_process_id', 'competency_id'],
+        set_={'process_competency_value': stmt.excluded.process_competency_value}
+    )
+    db.session.execute(stmt)
+    return len(rows)
+
+
+def recompute_role_competency_for_competency(competency_id: int) -> int:
+    """
+    Rebuild the role_competency_matrix rows of one competency for all organizations.
+
+    Returns:
+        Number of rows inserted
+    """
+    rpm = RoleProcessMatrix.__table__
+    pcm = ProcessCompetencyMatrix.__table__
+    rcm = RoleCompetencyMatrix.__table__
+
+    db.session.execute(delete(rcm).where(rcm.c.competency_id == competency_id))
+
+    computed = select(
+        rpm.c.role_cluster_id,
+        literal(competency_id),
+        func.max(competency_value_expr(rpm.c.role_process_value, pcm.c.process_competency_value)),
+        rpm.c.organization_id
+    ).select_from(
+        rpm.join(pcm, rpm.c.iso_process_id == pcm.c.iso_process_id)
+    ).where(
+        pcm.c.competency_id == competency_id
+    ).group_by(rpm.c.organization_id, rpm.c.role_cluster_id)
+
+    result = db.session.execute(insert(rcm).from_select(
+        ['role_cluster_id', 'competency_id', 'role_competency_value', 'organization_id'],
+        computed
+    ))
+    return result.rowcount
+
+
+def recompute_unknown_role_competency_for_competency(competency_id: int) -> int:
+    """
+    Rebuild the unknown_role_competency_matrix rows of one competency for all
+    task-based users of all organizations.
+
+    Returns:
+        Number of rows inserted
+    """
+    urpm = UnknownRoleProcessMatrix.__table__
+    pcm = ProcessCompetencyMatrix.__table__
+    urcm = UnknownRoleCompetencyMatrix.__table__
+
+    db.session.execute(delete(urcm).where(urcm.c.competency_id == competency_id))
+
+    computed = select(
+        urpm.c.user_name,
+        literal(competency_id),
+        func.max(competency_value_expr(urpm.c.role_process_value, pcm.c.process_competency_value)),
+        urpm.c.organization_id
+    ).select_from(
+        urpm.join(pcm, urpm.c.iso_process_id == pcm.c.iso_process_id)
+    ).where(
+        pcm.c.competency_id == competency_id
+    ).group_by(urpm.c.organization_id, urpm.c.user_name)
+
+    result = db.session.execute(insert(urcm).from_select(
+        ['user_name', 'competency_id', 'role_competency_value', 'organization_id'],
+        computed
+    ))
+    return result.rowcount
+
+
+def _organizations_with_competency(competency_id: int) -> set:
+    """Organizations with role or task-based user rows of the competency"""
+    rcm = RoleCompetencyMatrix.__table__
+    urcm = UnknownRoleCompetencyMatrix.__table__
+    return set(db.session.execute(
+        select(rcm.c.organization_id).where(rcm.c.competency_id == competency_id)
+        .union(select(urcm.c.organization_id).where(urcm.c.competency_id == competency_id))
+    ).scalars())
+
+
+def update_process_competency_column(competency_id: int, values: Mapping) -> Dict[str, int]:
+    """
+    Apply an edit of one process-competency column and recompute everything
+    derived from it (does not commit).
+
+    Returns:
+        {'process_rows', 'role_competency_rows', 'unknown_role_competency_rows', 'organizations'}
+    """
+    # Organizations whose derived rows are deleted by the recompute count as well
+    affected_org_ids = _organizations_with_competency(competency_id)
+
+    process_rows = upsert_process_competency_values(competency_id, values)
+    role_rows = recompute_role_competency_for_competency(competency_id)
+    unknown_rows = recompute_unknown_role_competency_for_competency(competency_id)
+
+    rcm = RoleCompetencyMatrix.__table__
+    organizations = db.session.execute(
+        select(func.count(func.distinct(rcm.c.organization_id))).where(rcm.c.competency_id == competency_id)
+    ).scalar()
+    affected_org_ids |= _organizations_with_competency(competency_id)
+
+    # Requirements changed in every affected organization: cached role
+    # matrices and learning objectives of other workers are stale
+    for org_id in sorted(affected_org_ids):
+        bump_input_revision(org_id, 'process_competency_matrix')
+    if affected_org_ids:
+        invalidate_role_matrix()
+
+    logger.info(
+        f"[update_process_competency_column] competency {competency_id}: {process_rows} process values, "
+        f"{role_rows} role rows in {organizations} orgs, {unknown_rows} task-based user rows"
+    )
+    return {
+        'process_rows': process_rows,
+        'role_competency_rows': role_rows,
+        'unknown_role_competency_rows': unknown_rows,
+        'organizations': organizations
+    }
+
+
+def upsert_role_process_values(organization_id: int, role_id: int, values: Mapping) -> list:
+    """
+    Write the process involvement of one role.
+
+    Args:
+        values: {iso_process_id: role_process_value} (keys may be strings)
+
+    Returns:
+        IDs of the processes whose value actually changed (or were added)
+    """
+    rpm = RoleProcessMatrix.__table__
+    new_values = {int(process_id): int(value) for process_id, value in values.items()}
+    if not new_values:
+        return []
+
+    current = dict(db.session.execute(
+        select(rpm.c.iso_process_id, rpm.c.role_process_value).where(
+            rpm.c.organization_id == organization_id,
+            rpm.c.role_cluster_id == role_id,
+            rpm.c.iso_process_id.in_(list(new_values))
+        )
+    ).all())
+    changed = [pid for pid, value in new_values.items() if current.get(pid) != value]
+    if not changed:
+        return []
+
+    stmt = dialect_insert(rpm).values([
+        {
+            'organization_id': organization_id,
+            'role_cluster_id': role_id,
+            'iso_process_id': process_id,
+            'role_process_value': new_values[process_id]
+        }
+        for process_id in changed
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['organization_id', 'role_cluster_id', 'iso_process_id'],
+        set_={'role_process_value': stmt.excluded.role_process_value}
+    )
+    db.session.execute(stmt)
+    return changed
+
+
+def recompute_role_competencies(organization_id: int,
+                                role_ids: Optional[Iterable[int]] = None,
+                                process_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Delta recompute of role_competency_matrix for some roles of an organization.
+
+    Equivalent to update_role_competency_matrix(organization_id) for the
+    selected rows, but only writes rows whose value changes.
+
+    Args:
+        organization_id: Organization
+        role_ids: Roles to recompute (None = all roles of the organization)
+        process_ids: Processes whose involvement changed. Limits the recompute
+            to the competencies linked to them (None = all competencies)
+
+    Returns:
+        Number of rows touched (inserted + updated + deleted)
+    """
+    rpm = RoleProcessMatrix.__table__
+    pcm = ProcessCompetencyMatrix.__table__
+    rcm = RoleCompetencyMatrix.__table__
+
+    role_ids = list(role_ids) if role_ids is not None else None
+    process_ids = list(process_ids) if process_ids is not None else None
+    if role_ids == [] or process_ids == []:
+        return 0
+
+    source_filter = [rpm.c.organization_id == organization_id]
+    target_filter = [rcm.c.organization_id == organization_id]
+    if role_ids is not None:
+        source_filter.append(rpm.c.role_cluster_id.in_(role_ids))
+        target_filter.append(rcm.c.role_cluster_id.in_(role_ids))
+    if process_ids is not None:
+        affected_competencies = select(pcm.c.competency_id).where(pcm.c.iso_process_id.in_(process_ids))
+        source_filter.append(pcm.c.competency_id.in_(affected_competencies))
+        target_filter.append(rcm.c.competency_id.in_(affected_competencies))
+
+    computed = select(
+        rpm.c.role_cluster_id,
+        pcm.c.competency_id,
+        func.max(competency_value_expr(rpm.c.role_process_value, pcm.c.process_competency_value)),
+        literal(organization_id)
+    ).select_from(
+        rpm.join(pcm, rpm.c.iso_process_id == pcm.c.iso_process_id)
+    ).where(*source_filter).group_by(rpm.c.role_cluster_id, pcm.c.competency_id)
+
+    upsert = dialect_insert(rcm).from_select(
+        ['role_cluster_id', 'competency_id', 'role_competency_value', 'organization_id'],
+        computed
+    )
+    upsert = upsert.on_conflict_do_update(
+        index_elements=['organization_id', 'role_cluster_id', 'competency_id'],
+        set_={'role_competency_value': upsert.excluded.role_competency_value},
+        where=rcm.c.role_competency_value != upsert.excluded.role_competency_value
+    )
+    written = db.session.execute(upsert).rowcount
+
+    # Rows whose role no longer reaches the competency through any process
+    has_source = exists().where(and_(
+        rpm.c.organization_id == rcm.c.organization_id,
+        rpm.c.role_cluster_id == rcm.c.role_cluster_id,
+        rpm.c.iso_process_id == pcm.c.iso_process_id,
+        pcm.c.competency_id == rcm.c.competency_id
+    ))
+    deleted = db.session.execute(
+        delete(rcm).where(*target_filter, ~has_source)
+    ).rowcount
+
+    touched = written + deleted
+    if touched:
+        invalidate_role_matrix(organization_id)
+    logger.info(
+        f"[recompute_role_competencies] org {organization_id}, "
+        f"roles {role_ids if role_ids is not None else 'all'}, "
+        f"processes {process_ids if process_ids is not None else 'all'}: {touched} rows touched"
+    )
+    return touched
@@ -34,6 +34,59 @@ DEFAULT_CONFIG = {
     "caching": {
         "enabled": True,
         "ttl_hours": 24
+    },
+    "llm_concurrency": {
+        "max_workers": 8,
+        "requests_per_second": 5,
+        "burst": 8,
+        "max_retries": 3,
+        "retry_backoff_seconds": 2.0
+    },
+    "llm_response_cache": {
+        "enabled": True,
+        "ttl_hours": 720,
+        "max_entries": 20000,
+        "memory_entries": 1024
+    },
+    "learning_objectives_jobs": {
+        "poll_interval_seconds": 2.0,
+        "heartbeat_seconds": 5.0,
+        "stale_after_seconds": 300,
+        "max_attempts": 2
+    },
+    "role_mapping": {
+        "max_workers": 6,
+        "role_timeout_seconds": 60,
+        "roles_per_prompt": 1
+    },
+    "document_ingestion": {
+        "chunk_tokens": 2500,
+        "max_chunks": 40,
+        "max_workers": 6,
+        "cache_enabled": True
+    },
+    "reference_data": {
+        "version_check_seconds": 5
+    },
+    "resource_loading": {
+        "startup_report": True,
+        "preload": ["process_identification_pipeline", "tiktoken_cl100k", "faiss_vector_store"],
+        "freeze_after_preload": True
+    },
+    "process_retrieval": {
+        "cache_entries": 256,
+        "compose_query_vectors": True
+    },
+    "embeddings": {
+        "provider": "openai",
+        "openai_model": "text-embedding-ada-002",
+        "local_model": "sentence-transformers/all-MiniLM-L6-v2",
+        "batch_size": 64
+    },
+    "learning_objectives_export": {
+        "prerender_enabled": True,
+        "prerender_formats": ["excel", "pdf", "json"],
+        "excel_write_only_min_role_entries": 1000
     }
 }
 
@@ -172,6 +225,116 @@ def is_caching_enabled() -> bool:
     return config.get('caching', {}).get('enabled', True)
 
 
+def get_llm_concurrency_settings() -> Dict[str, Any]:
+    """Get LLM concurrency / rate-limit settings (missing keys fall back to defaults)"""
+    config = load_config()
+    settings = dict(DEFAULT_CONFIG['llm_concurrency'])
+    settings.update({
+        k: v for k, v in config.get('llm_concurrency', {}).items()
+        if not k.startswith('_')
+    })
+    return settings
+
+
+def get_llm_response_cache_settings() -> Dict[str, Any]:
+    """Get LLM fragment cache settings (missing keys fall back to defaults)"""
+    config = load_config()
+    settings = dict(DEFAULT_CONFIG['llm_response_cache'])
+    settings.update({
+        k: v for k, v in config.get('llm_response_cache', {}).items()
+        if not k.startswith('_')
+    })
+    return settings
+
+
+def get_learning_objectives_job_settings() -> Dict[str, Any]:
+    """Get background job queue settings (missing keys fall back to defaults)"""
+    config = load_config()
+    settings = dict(DEFAULT_CONFIG['learning_objectives_jobs'])
+    settings.update({
+        k: v for k, v in config.get('learning_objectives_jobs', {}).items()
+        if not k.startswith('_')
+    })
+    return settings
+
+
+def get_role_mapping_settings() -> Dict[str, Any]:
+    """Get batch role mapping settings (missing keys fall back to defaults)"""
+    config = load_config()
+    settings = dict(DEFAULT_CONFIG['role_mapping'])
+    settings.update({
+        k: v for k, v in config.get('role_mapping', {}).items()
+        if not k.startswith('_')
+    })
+    return settings
+
+
+def get_document_ingestion_settings() -> Dict[str, Any]:
+    """Get document extraction chunking / cache settings (missing keys fall back to defaults)"""
+    config = load_config()
+    settings = dict(DEFAULT_CONFIG['document_ingestion'])
+    settings.update({
+        k: v for k, v in config.get('document_ingestion', {}).items()
+        if not k.startswith('_')
+    })
+    return settings
+
+
+def get_reference_data_settings() -> Dict[str, Any]:
+    """Get reference data cache settings (missing keys fall back to defaults)"""
+    config = load_config()
+    settings = dict(DEFAULT_CONFIG['reference_data'])
+    settings.update({
+        k: v for k, v in config.get('reference_data', {}).items()
+        if not k.startswith('_')
+    })
+    return settings
+
+
+def get_resource_loading_settings() -> Dict[str, Any]:
+    """Get lazy resource / preload settings (missing keys fall back to defaults)"""
+    config = load_config()
+    settings = dict(DEFAULT_CONFIG['resource_loading'])
+    settings.update({
+        k: v for k, v in config.get('resource_loading', {}).items()
+        if not k.startswith('_')
+    })
+    return settings
+
+
+def get_process_retrieval_settings() -> Dict[str, Any]:
+    """Get FAISS process retrieval cache settings (missing keys fall back to defaults)"""
+    config = load_config()
+    settings = dict(DEFAULT_CONFIG['process_retrieval'])
+    settings.update({
+        k: v for k, v in config.get('process_retrieval', {}).items()
+        if not k.startswith('_')
+    })
+    return settings
+
+
+def get_embedding_settings() -> Dict[str, Any]:
+    """Get embedding provider settings (missing keys fall back to defaults)"""
+    config = load_config()
+    settings = dict(DEFAULT_CONFIG['embeddings'])
+    settings.update({
+        k: v for k, v in config.get('embeddings', {}).items()
+        if not k.startswith('_')
+    })
+    return settings
+
+
+def get_learning_objectives_export_settings() -> Dict[str, Any]:
+    """Get export pre-rendering settings (missing keys fall back to defaults)"""
+    config = load_config()
+    settings = dict(DEFAULT_CONFIG['learning_objectives_export'])
+    settings.update({
+        k: v for k, v in config.get('learning_objectives_export', {}).items()
+        if not k.startswith('_')
+    })
+    return settings
+
+
 # =============================================================================
 # EXPORT
 # =============================================================================
@@ -181,5 +344,15 @@ __all__ = [
     'get_validation_thresholds',
     'get_priority_weights',
     'get_algorithm_parameters',
-    'is_caching_enabled'
+    'is_caching_enabled',
+    'get_llm_concurrency_settings',
+    'get_llm_response_cache_settings',
+    'get_learning_objectives_job_settings',
+    'get_role_mapping_settings',
+    'get_document_ingestion_settings',
+    'get_reference_data_settings',
+    'get_resource_loading_settings',
+    'get_process_retrieval_settings',
+    'get_embedding_settings',
+    'get_learning_objectives_export_settings'
 ]
@@ -0,0 +1,23 @@
+"""
+Database Helpers - Dialect-independent SQL building blocks
+==========================================================
+
+Shared by services that write with INSERT ... ON CONFLICT (PostgreSQL in
+production, SQLite in the unit tests).
+
+Date: 2026-10-18
+"""
+
+try:
+    from models import db
+except ImportError:
+    from app.models import db
+
+
+def dialect_insert(table):
+    """INSERT supporting on_conflict_do_update for the bound database"""
+    if db.engine.dialect.name == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as _insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert as _insert
+    return _insert(table)
@@ -0,0 +1,548 @@
+"""
+Document Ingestion - Streaming, chunked extraction of roles and PMT data
+=======================================================================
+
+Backs POST /phase1/extract-roles-from-document and
+POST /phase2/extract-pmt-from-document. Both used to read the whole PDF /
+DOCX into one string, cut it at 8000 / 12000 characters (silently dropping
+the rest of the document) and send it in one blocking LLM call.
+
+Now:
+- Pages (PDF), paragraphs and table cells (DOCX) are read one at a time
+- Text is packed into chunks of at most chunk_tokens tokens (tiktoken
+  cl100k_base, the encoder of the process identification pipeline)
+- Every chunk is submitted to the LLM as soon as it is complete, so
+  extraction overlaps with reading the rest of the document
+- Per-chunk results are merged; roles are deduplicated by title, PMT items
+  by name (within their category)
+- Merged results are stored in the LLM fragment cache (llm_response_cache)
+  keyed by the SHA-256 of the file content, so re-uploading the same
+  document returns immediately without any LLM call (the calling route
+  commits to persist the entry)
+
+Settings come from the 'document_ingestion' section of
+config/learning_objectives_config.json (see config_loader).
+
+Date: 2026-10-18
+"""
+
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from app.services.config_loader import get_document_ingestion_settings
+from app.services.lazy_resources import cl100k_encoder
+from app.services.llm_executor import chat_completion
+from app.services.llm_response_cache import compute_fragment_key, get_fragment_cache
+
+logger = logging.getLogger(__name__)
+
+EXTRACTION_MODEL = 'gpt-4o-mini'
+
+# Bump when a prompt template or the merge rules change (invalidates cached documents)
+ROLE_PROMPT_VERSION = 'roles-v1'
+PMT_PROMPT_VERSION = 'pmt-v1'
+
+# Documents with less text than this are rejected before any LLM call
+MIN_DOCUMENT_CHARS = 50
+
+SUPPORTED_EXTENSIONS = ('.txt', '.pdf', '.docx')
+
+
+class DocumentIngestionError(ValueError):
+    """Document cannot be read; status_code is the HTTP status to answer with"""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+# =============================================================================
+# READING
+# =============================================================================
+
+def iter_document_text(data: bytes, filename: str) -> Iterator[str]:
+    """
+    Yield the text of a document piece by piece (PDF page, DOCX paragraph or
+    table cell, whole TXT file).
+
+    Raises:
+        DocumentIngestionError: Unsupported format (400) or unreadable file (500)
+    """
+    filename = filename.lower()
+
+    if filename.endswith('.txt'):
+        yield data.decode('utf-8', errors='ignore')
+
+    elif filename.endswith('.pdf'):
+        try:
+            import PyPDF2
+            pdf_reader = PyPDF2.PdfReader(io.BytesIO(data))
+            pages = pdf_reader.pages
+        except Exception as e:
+            raise DocumentIngestionError(f'Failed to extract text from PDF: {str(e)}', 500)
+        for page_number in range(len(pages)):
+            try:
+                yield pages[page_number].extract_text() or ''
+            except Exception as e:
+                raise DocumentIngestionError(f'Failed to extract text from PDF: {str(e)}', 500)
+
+    elif filename.endswith('.docx'):
+        try:
+            import docx
+            doc = docx.Document(io.BytesIO(data))
+        except Exception as e:
+            raise DocumentIngestionError(f'Failed to extract text from DOCX: {str(e)}', 500)
+        for para in doc.paragraphs:
+            yield para.text
+        for table in doc.tables:
+            for row in table.rows:
+                for cell in row.cells:
+                    yield cell.text
+
+    else:
+        raise DocumentIngestionError('Unsupported file format. Please upload PDF, DOCX, or TXT files.')
+
+
+# =============================================================================
+# CHUNKING
+# =============================================================================
+
+_encoder = None
+_encoder_lock = threading.Lock()
+
+
+def _get_encoder():
+    """tiktoken cl100k_base encoder, loaded on first use (False if unavailable)"""
+    global _encoder
+    if _encoder is None:
+        with _encoder_lock:
+            if _encoder is None:
+                try:
+                    _encoder = cl100k_encoder.get()
+                except Exception as e:
+                    logger.warning(f"[document_ingestion] tiktoken unavailable, estimating 4 chars/token: {e}")
+                    _encoder = False
+    return _encoder
+
+
+def count_tokens(text: str) -> int:
+    encoder = _get_encoder()
+    if encoder:
+        return len(encoder.encode(text))
+    return (len(text) + 3) // 4
+
+
+def _split_oversized(text: str, max_tokens: int, token_counter: Callable[[str], int]) -> List[str]:
+    """Split one piece longer than max_tokens at line / word boundaries"""
+    parts = []
+    current = []
+    current_tokens = 0
+    for word in re.split(r'(?<=\s)', text):
+        word_tokens = token_counter(word)
+        if current and current_tokens + word_tokens > max_tokens:
+            parts.append(''.join(current))
+            current, current_tokens = [], 0
+        current.append(word)
+        current_tokens += word_tokens
+    if current:
+        parts.append(''.join(current))
+    return parts
+
+
+def iter_chunks(pieces: Iterable[str], max_tokens: int,
+                token_counter: Optional[Callable[[str], int]] = None) -> Iterator[str]:
+    """
+    Pack text pieces into chunks of at most max_tokens tokens.
+
+    Pieces are never reordered; a chunk is yielded as soon as the next piece
+    would not fit, so callers can start work on it while later pieces are
+    still being read. A single piece longer than max_tokens is split.
+    """
+    token_counter = token_counter or count_tokens
+    current = []
+    current_tokens = 0
+    for piece in pieces:
+        piece = piece.strip()
+        if not piece:
+            continue
+        piece_tokens = token_counter(piece)
+        subpieces = [piece] if piece_tokens <= max_tokens else _split_oversized(piece, max_tokens, token_counter)
+        for subpiece in subpieces:
+            subpiece_tokens = piece_tokens if len(subpieces) == 1 else token_counter(subpiece)
+            if current and current_tokens + subpiece_tokens > max_tokens:
+                yield '\n'.join(current)
+                current, current_tokens = [], 0
+            current.append(subpiece)
+            current_tokens += subpiece_tokens
+    if current:
+        yield '\n'.join(current)
+
+
+# =============================================================================
+# PROMPTS
+# =============================================================================
+
+ROLE_EXTRACTION_PROMPT = """You are an expert in analyzing organizational role descriptions.
+Extract all roles mentioned in the following document and structure them as a JSON array.
+
+For each role, extract:
+- title: The job title or role name
+- description: A brief description of the role
+- responsibilities: An array of key responsibilities (at least 2-3 if mentioned)
+- skills: An array of required skills/technologies (if mentioned)
+
+If a role doesn't have explicit responsibilities or skills listed, infer them from the description.
+
+Document text:
+{document_text}
+
+Return ONLY a valid JSON array of roles, nothing else. Example format:
+[
+  {{
+    "title": "Software Engineer",
+    "description": "Develops and maintains software applications",
+    "responsibilities": ["Write code", "Debug issues", "Review code"],
+    "skills": ["Python", "JavaScript", "Git"]
+  }}
+]
+"""
+
+ROLE_SYSTEM_MESSAGE = (
+    "You are a helpful assistant that extracts structured role information from documents. "
+    "Always respond with valid JSON only."
+)
+
+PMT_EXTRACTION_PROMPT = """You are an expert in analyzing Systems Engineering documentation.
+Analyze the following document and extract Process, Method, and Tool information.
+
+DEFINITIONS:
+- PROCESS: Organizational workflows, procedures, roles/responsibilities, approval gates, review cycles.
+  Examples: ISO standards followed, development lifecycle (V-model, Agile), quality procedures, RACI matrices.
+
+- METHOD: Technical techniques and approaches used to perform engineering activities.
+  Examples: Requirements analysis methods, modeling techniques (SysML, UML), trade-off analysis, design reviews.
+
+- TOOL: Specific software, platforms, or tools used to support engineering work.
+  Examples: DOORS (requirements), JIRA (project management), Catia Magic (modeling), Git (version control).
+
+Analyze the document text and extract relevant information into these categories.
+For each item extracted, provide:
+1. The name/title of the item
+2. A brief description
+3. The category (process, method, or tool)
+4. Confidence level (high, medium, low)
+
+Document text:
+{document_text}
+
+Return a JSON object with this structure:
+{{
+  "document_type": "process|method|tool|mixed",
+  "document_summary": "Brief summary of what this document describes",
+  "processes": [
+    {{"name": "...", "description": "...", "confidence": "high|medium|low"}}
+  ],
+  "methods": [
+    {{"name": "...", "description": "...", "confidence": "high|medium|low"}}
+  ],
+  "tools": [
+    {{"name": "...", "description": "...", "confidence": "high|medium|low"}}
+  ],
+  "suggested_text": {{
+    "processes": "Consolidated text description of all processes found",
+    "methods": "Consolidated text description of all methods found",
+    "tools": "Consolidated text description of all tools found"
+  }}
+}}
+
+IMPORTANT: In the "suggested_text" fields:
+- If you find items in a category, write a concise summary of what was found
+- If NOTHING is found for a category, leave it as an EMPTY STRING ""
+- Do NOT write messages like "No specific methods were identified" - just use ""
+
+Return ONLY valid JSON, nothing else."""
+
+PMT_SYSTEM_MESSAGE = (
+    "You are a helpful assistant that extracts Process, Method, and Tool information from "
+    "Systems Engineering documents. Always respond with valid JSON only."
+)
+
+
+def parse_json_response(ai_response: str) -> Any:
+    """Parse an LLM answer, removing markdown code blocks if present"""
+    ai_response = ai_response.strip()
+    if ai_response.startswith('```'):
+        ai_response = ai_response.split('```')[1]
+        if ai_response.startswith('json'):
+            ai_response = ai_response[4:]
+        ai_response = ai_response.strip()
+    return json.loads(ai_response)
+
+
+def _complete(prompt: str, system_message: str) -> str:
+    response = chat_completion(
+        os.getenv('OPENAI_API_KEY'),
+        model=EXTRACTION_MODEL,
+        messages=[
+            {"role": "system", "content": system_message},
+            {"role": "user", "content": prompt}
+        ],
+        temperature=0.3
+    )
+    return response.choices[0].message.content
+
+
+def extract_roles_from_chunk(chunk: str) -> List[Dict]:
+    roles = parse_json_response(_complete(ROLE_EXTRACTION_PROMPT.format(document_text=chunk), ROLE_SYSTEM_MESSAGE))
+    if not isinstance(roles, list):
+        raise ValueError("Expected an array of roles")
+    return roles
+
+
+def extract_pmt_from_chunk(chunk: str) -> Dict:
+    pmt_data = parse_json_response(_complete(PMT_EXTRACTION_PROMPT.format(document_text=chunk), PMT_SYSTEM_MESSAGE))
+    if not isinstance(pmt_data, dict):
+        raise ValueError("Expected a PMT object")
+    return pmt_data
+
+
+# =============================================================================
+# MERGING
+# =============================================================================
+
+PMT_CATEGORIES = ('processes', 'methods', 'tools')
+CONFIDENCE_RANK = {'low': 0, 'medium': 1, 'high': 2}
+
+
+def _normalize(name: Any) -> str:
+    return ' '.join(str(name or '').split()).casefold()
+
+
+def _union(first: Iterable, second: Iterable) -> List:
+    """Ordered union of two lists, case-insensitive for strings"""
+    merged = []
+    seen = set()
+    for item in list(first or []) + list(second or []):
+        key = _normalize(item) if isinstance(item, str) else json.dumps(item, sort_keys=True, default=str)
+        if key not in seen:
+            seen.add(key)
+            merged.append(item)
+    return merged
+
+
+def _longer(first: Optional[str], second: Optional[str]) -> Optional[str]:
+    return second if len(second or '') > len(first or '') else first
+
+
+def merge_roles(chunk_results: Iterable[List[Dict]]) -> List[Dict]:
+    """
+    Merge per-chunk role lists, deduplicating by title.
+
+    A role found in several chunks keeps the longest description and the
+    union of its responsibilities and skills, at the position where it was
+    first seen.
+    """
+    merged: Dict[str, Dict] = {}
+    for roles in chunk_results:
+        for role in roles or []:
+            if not isinstance(role, dict):
+                continue
+            key = _normalize(role.get('title'))
+            if not key:
+                continue
+            existing = merged.get(key)
+            if existing is None:
+                merged[key] = dict(role)
+                continue
+            for field in ('description', 'responsibilities', 'skills'):
+                if field not in existing and field not in role:
+                    continue
+                if field == 'description':
+                    existing[field] = _longer(existing.get(field), role.get(field))
+                else:
+                    existing[field] = _union(existing.get(field), role.get(field))
+    return list(merged.values())
+
+
+def _join_unique(texts: Iterable[Optional[str]], separator: str) -> str:
+    unique = list(dict.fromkeys(t.strip() for t in texts if t and t.strip()))
+    return separator.join(unique)
+
+
+def merge_pmt(chunk_results: List[Dict]) -> Dict:
+    """
+    Merge per-chunk PMT objects.
+
+    Items are deduplicated by name within their category (longest
+    description, highest confidence). The document type is the common type
+    of all chunks, 'mixed' otherwise; summaries and suggested texts of the
+    chunks are concatenated without repetitions.
+    """
+    chunk_results = [r for r in chunk_results if isinstance(r, dict)]
+    if len(chunk_results) == 1:
+        return chunk_results[0]
+
+    merged = {'document_type': None, 'document_summary': '', **{c: [] for c in PMT_CATEGORIES}}
+
+    types = {r.get('document_type') for r in chunk_results if r.get('document_type')}
+    if len(types) == 1:
+        merged['document_type'] = types.pop()
+    elif types:
+        merged['document_type'] = 'mixed'
+
+    merged['document_summary'] = _join_unique((r.get('document_summary') for r in chunk_results), ' ')
+
+    for category in PMT_CATEGORIES:
+        items: Dict[str, Dict] = {}
+        for result in chunk_results:
+            for item in result.get(category) or []:
+                if not isinstance(item, dict):
+                    continue
+                key = _normalize(item.get('name'))
+                if not key:
+                    continue
+                existing = items.get(key)
+                if existing is None:
+                    items[key] = dict(item)
+                    continue
+                if item.get('description'):
+                    existing['description'] = _longer(existing.get('description'), item['description'])
+                if CONFIDENCE_RANK.get(item.get('confidence'), -1) > CONFIDENCE_RANK.get(existing.get('confidence'), -1):
+                    existing['confidence'] = item.get('confidence')
+        merged[category] = list(items.values())
+
+    merged['suggested_text'] = {
+        category: _join_unique(
+            ((r.get('suggested_text') or {}).get(category) for r in chunk_results), '\n'
+        )
+        for category in PMT_CATEGORIES
+    }
+    return merged
+
+
+# =============================================================================
+# PIPELINE
+# =============================================================================
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def extract_from_document(data: bytes, filename: str, extract_chunk: Callable[[str], Any],
+                          merge: Callable[[List[Any]], Any], namespace: str, prompt_version: str,
+                          settings: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Run extract_chunk over the token-bounded chunks of a document and merge the results.
+
+    Args:
+        data: File content
+        filename: Original file name (selects the reader)
+        extract_chunk: One LLM extraction for one chunk of text
+        merge: Combines the per-chunk results (in document order)
+        namespace / prompt_version: Fragment cache key parts
+        settings: document_ingestion settings (defaults to the configuration)
+
+    Returns:
+        {'result', 'sha256', 'chunks', 'failed_chunks', 'cached'}
+
+    Raises:
+        DocumentIngestionError: Unsupported, unreadable or empty document, or
+            every chunk failed
+    """
+    settings = settings or get_document_ingestion_settings()
+    digest = content_hash(data)
+
+    if not filename.lower().endswith(SUPPORTED_EXTENSIONS):
+        raise DocumentIngestionError('Unsupported file format. Please upload PDF, DOCX, or TXT files.')
+
+    cache = get_fragment_cache() if settings['cache_enabled'] else None
+    cache_key = compute_fragment_key(
+        namespace, EXTRACTION_MODEL, prompt_version,
+        {'sha256': digest, 'chunk_tokens': settings['chunk_tokens'], 'max_chunks': settings['max_chunks']}
+    )
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"[document_ingestion] {namespace} cache hit for {digest[:12]}")
+            return {**cached, 'sha256': digest, 'cached': True}
+
+    futures = []
+    total_chars = 0
+    pending_chunk = None
+    truncated = False
+    with ThreadPoolExecutor(max_workers=max(1, settings['max_workers']),
+                            thread_name_prefix='document-extract') as pool:
+        for chunk in iter_chunks(iter_document_text(data, filename), settings['chunk_tokens']):
+            total_chars += len(chunk)
+            if len(futures) + (pending_chunk is not None) >= settings['max_chunks']:
+                truncated = True
+                break
+            # Hold back the first chunk until the document is known to be long enough
+            if total_chars < MIN_DOCUMENT_CHARS:
+                pending_chunk = chunk
+                continue
+            if pending_chunk is not None:
+                futures.append(pool.submit(extract_chunk, pending_chunk))
+                pending_chunk = None
+            futures.append(pool.submit(extract_chunk, chunk))
+
+        if total_chars < MIN_DOCUMENT_CHARS:
+            raise DocumentIngestionError('Document appears to be empty or too short')
+        if truncated:
+            logger.warning(
+                f"[document_ingestion] {filename}: more than {settings['max_chunks']} chunks, ignoring the rest"
+            )
+
+        results = []
+        errors = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                errors.append(e)
+
+    if not results:
+        logger.error(f"[document_ingestion] Every chunk of {filename} failed: {errors[0]}")
+        raise DocumentIngestionError(f'Failed to extract information from document: {errors[0]}', 500)
+
+    outcome = {
+        'result': merge(results),
+        'chunks': len(futures),
+        'failed_chunks': len(errors),
+        'truncated': truncated
+    }
+    logger.info(
+        f"[document_ingestion] {namespace}: {filename} -> {len(futures)} chunks "
+        f"({len(errors)} failed)"
+    )
+
+    if cache is not None and not errors:
+        cache.put_many({cache_key: {
+            'namespace': namespace,
+            'model': EXTRACTION_MODEL,
+            'prompt_version': prompt_version,
+            'response': outcome
+        }})
+
+    return {**outcome, 'sha256': digest, 'cached': False}
+
+
+def extract_roles_from_document(data: bytes, filename: str) -> Dict[str, Any]:
+    """Roles of a document (see extract_from_document); 'result' is the merged role list"""
+    return extract_from_document(
+        data, filename, extract_roles_from_chunk, merge_roles, 'document_roles', ROLE_PROMPT_VERSION
+    )
+
+
+def extract_pmt_from_document(data: bytes, filename: str) -> Dict[str, Any]:
+    """PMT data of a document (see extract_from_document); 'result' is the merged PMT object"""
+    return extract_from_document(
+        data, filename, extract_pmt_from_chunk, merge_pmt, 'document_pmt', PMT_PROMPT_VERSION
+    )
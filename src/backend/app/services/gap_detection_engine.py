@@ -0,0 +1,406 @@
+"""
+Gap Detection Engine - Set-based organization snapshot
+=======================================================
+
+Backs Algorithm 3 (detect_gaps) and Algorithm 5 (process_ttt_gaps) of the
+learning objectives generator.
+
+The per-competency helpers in learning_objectives_core issue one
+"latest assessment per user" subquery per competency and per role, which adds
+up to thousands of round trips for a mid-sized organization. This module loads
+everything the gap algorithms need in a handful of set-based queries:
+
+- Competencies (id order)
+- Organization roles and user -> role assignments
+- Role requirements (role_competency_matrix)
+- Latest scores per user from latest_user_competency_score
+  (users x competencies NumPy matrix)
+
+and then computes medians, means, variances and per-level "users needing"
+counts as vectorized column operations.
+
+The output of compute_gaps_by_competency() is identical to what the
+per-competency path (process_competency_with_roles /
+process_competency_organizational) produces.
+
+Date: 2026-10-18
+"""
+
+import logging
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.services.latest_scores import org_score_rows, user_score_rows
+
+try:
+    from models import db, Competency, OrganizationRoles, RoleCompetencyMatrix, UserRoleCluster
+except ImportError:
+    from app.models import db, Competency, OrganizationRoles, RoleCompetencyMatrix, UserRoleCluster
+
+logger = logging.getLogger(__name__)
+
+# Valid levels in pyramid structure (mirrors learning_objectives_core)
+VALID_LEVELS = [1, 2, 4, 6]
+
+# Valid median snap targets (mirrors calculate_median)
+MEDIAN_SNAP_LEVELS = np.array([0, 1, 2, 4, 6], dtype=float)
+
+# Valid role requirement values (mirrors get_role_competency_requirement)
+VALID_REQUIREMENT_LEVELS = (0, 1, 2, 4, 6)
+
+
+class ScoreMatrix:
+    """
+    Latest assessment scores as a dense users x competencies matrix.
+
+    Missing scores (user never answered the competency) are stored as NaN so
+    that every column statistic only considers users with a score - the same
+    semantics as the list-based helpers, which simply skip missing rows.
+    """
+
+    def __init__(self, user_ids: List[int], competency_ids: List[int], values: np.ndarray):
+        self.user_ids = user_ids
+        self.competency_ids = competency_ids
+        self.values = values
+        self.user_index = {uid: i for i, uid in enumerate(user_ids)}
+        self.competency_index = {cid: j for j, cid in enumerate(competency_ids)}
+
+    @classmethod
+    def from_rows(cls, rows, competency_ids: List[int]) -> 'ScoreMatrix':
+        """Build from (user_id, competency_id, score) rows."""
+        user_ids = sorted({r.user_id for r in rows})
+        matrix = cls(
+            user_ids,
+            competency_ids,
+            np.full((len(user_ids), len(competency_ids)), np.nan)
+        )
+        for r in rows:
+            col = matrix.competency_index.get(r.competency_id)
+            if col is None or r.score is None:
+                continue
+            matrix.values[matrix.user_index[r.user_id], col] = int(r.score)
+        return matrix
+
+    def rows_for_users(self, user_ids: List[int]) -> np.ndarray:
+        """Sub-matrix for the given users (users without scores are dropped)."""
+        idx = [self.user_index[u] for u in sorted(set(user_ids)) if u in self.user_index]
+        return self.values[idx, :]
+
+
+def column_statistics(values: np.ndarray, targets: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Vectorized per-competency statistics for a group of users.
+
+    Args:
+        values: users x competencies matrix (NaN = no score)
+        targets: target level per competency column
+
+    Returns:
+        Dict of per-column arrays: count, median, mean, variance,
+        below_target and one 'needing_<level>' count per VALID_LEVELS entry.
+    """
+    if values.shape[0] == 0:
+        values = np.full((1, len(targets)), np.nan)
+
+    present = ~np.isnan(values)
+    counts = present.sum(axis=0)
+    filled = np.where(present, values, 0.0)
+    safe_counts = np.maximum(counts, 1)
+
+    # Mean / variance accumulate row by row (axis 0), matching the sequential
+    # sums of calculate_mean() / calculate_variance().
+    means = filled.sum(axis=0) / safe_counts
+    squared_diffs = np.where(present, (filled - means) ** 2, 0.0)
+    variances = np.where(counts >= 2, squared_diffs.sum(axis=0) / safe_counts, 0.0)
+
+    # Median: NaNs sort last, so the first `count` entries of each column are
+    # the present scores in ascending order.
+    ordered = np.sort(values, axis=0)
+    upper = np.take_along_axis(ordered, (safe_counts // 2)[None, :], axis=0)[0]
+    lower = np.take_along_axis(ordered, np.maximum(safe_counts // 2 - 1, 0)[None, :], axis=0)[0]
+    raw_median = np.where(safe_counts % 2 == 0, (lower + upper) / 2, upper)
+    raw_median = np.where(counts > 0, raw_median, 0.0)
+    # argmin returns the first minimum, i.e. the same tie-break as
+    # min(valid_levels, key=...) in calculate_median()
+    snapped = MEDIAN_SNAP_LEVELS[
+        np.abs(raw_median[:, None] - MEDIAN_SNAP_LEVELS[None, :]).argmin(axis=1)
+    ]
+
+    stats = {
+        'count': counts,
+        'median': snapped,
+        'mean': means,
+        'variance': variances,
+        'below_target': (present & (filled < targets[None, :])).sum(axis=0),
+    }
+    for level in VALID_LEVELS:
+        stats[f'needing_{level}'] = (present & (filled < level)).sum(axis=0)
+    return stats
+
+
+class OrgScoreSnapshot:
+    """
+    One-shot snapshot of everything gap detection needs for an organization.
+
+    Usage:
+        snapshot = OrgScoreSnapshot.load(org_id)
+        by_competency = compute_gaps_by_competency(snapshot, main_targets)
+
+    Score matrices are loaded lazily - the role-based path and the
+    organizational path use different "latest assessment" scopes, and most
+    generations only need one of them (plus the organizational one for TTT).
+    """
+
+    def __init__(self, org_id: int):
+        self.org_id = org_id
+        self.competency_ids: List[int] = []
+        self.competency_names: Dict[int, str] = {}
+        self.roles: List = []
+        self.role_members: Dict[int, List[int]] = {}
+        self._role_requirements: Optional[np.ndarray] = None
+        self._org_scores: Optional[ScoreMatrix] = None
+        self._role_scores: Optional[ScoreMatrix] = None
+
+    @classmethod
+    def load(cls, org_id: int) -> 'OrgScoreSnapshot':
+        snapshot = cls(org_id)
+
+        competencies = db.session.query(
+            Competency.id, Competency.competency_name
+        ).order_by(Competency.id).all()
+        snapshot.competency_ids = [c.id for c in competencies]
+        snapshot.competency_names = {c.id: c.competency_name for c in competencies}
+
+        snapshot.roles = db.session.query(
+            OrganizationRoles.id, OrganizationRoles.role_name
+        ).filter(
+            OrganizationRoles.organization_id == org_id
+        ).order_by(OrganizationRoles.id).all()
+
+        role_ids = [r.id for r in snapshot.roles]
+        snapshot.role_members = {rid: [] for rid in role_ids}
+        if role_ids:
+            assignments = db.session.query(
+                UserRoleCluster.role_cluster_id, UserRoleCluster.user_id
+            ).filter(
+                UserRoleCluster.role_cluster_id.in_(role_ids)
+            ).all()
+            for a in assignments:
+                snapshot.role_members[a.role_cluster_id].append(a.user_id)
+
+        logger.info(
+            f"[OrgScoreSnapshot] Org {org_id}: {len(snapshot.competency_ids)} competencies, "
+            f"{len(role_ids)} roles, {snapshot.assignment_count} user assignments"
+        )
+        return snapshot
+
+    # ------------------------------------------------------------------
+    # Roles
+    # ------------------------------------------------------------------
+
+    @property
+    def assignment_count(self) -> int:
+        return sum(len(members) for members in self.role_members.values())
+
+    @property
+    def has_roles(self) -> bool:
+        """Same rule as check_if_org_has_roles(): roles exist AND users are assigned."""
+        return len(self.roles) > 0 and self.assignment_count > 0
+
+    @property
+    def role_requirements(self) -> np.ndarray:
+        """roles x competencies matrix of required levels (0 = no requirement)."""
+        if self._role_requirements is None:
+            role_index = {r.id: i for i, r in enumerate(self.roles)}
+            comp_index = {cid: j for j, cid in enumerate(self.competency_ids)}
+            matrix = np.zeros((len(self.roles), len(self.competency_ids)), dtype=int)
+            if role_index:
+                rows = db.session.query(
+                    RoleCompetencyMatrix.role_cluster_id,
+                    RoleCompetencyMatrix.competency_id,
+                    RoleCompetencyMatrix.role_competency_value
+                ).filter(
+                    RoleCompetencyMatrix.role_cluster_id.in_(list(role_index))
+                ).all()
+                for row in rows:
+                    col = comp_index.get(row.competency_id)
+                    value = row.role_competency_value or 0
+                    if col is None or value not in VALID_REQUIREMENT_LEVELS:
+                        continue
+                    matrix[role_index[row.role_cluster_id], col] = value
+            self._role_requirements = matrix
+        return self._role_requirements
+
+    # ------------------------------------------------------------------
+    # Scores
+    # ------------------------------------------------------------------
+
+    @property
+    def org_scores(self) -> ScoreMatrix:
+        """
+        Latest completed assessment per user WITHIN this organization
+        (scope of get_all_user_scores_for_competency).
+        """
+        if self._org_scores is None:
+            rows = org_score_rows(self.org_id)
+            self._org_scores = ScoreMatrix.from_rows(rows, self.competency_ids)
+        return self._org_scores
+
+    @property
+    def role_scores(self) -> ScoreMatrix:
+        """
+        Latest completed assessment per role-assigned user, in any organization
+        (scope of get_user_scores_for_competency).
+        """
+        if self._role_scores is None:
+            user_ids = sorted({u for members in self.role_members.values() for u in members})
+            rows = user_score_rows(user_ids)
+            self._role_scores = ScoreMatrix.from_rows(rows, self.competency_ids)
+        return self._role_scores
+
+    def target_vector(self, targets: Dict[int, int]) -> np.ndarray:
+        return np.array([targets.get(cid, 0) for cid in self.competency_ids], dtype=float)
+
+
+# =============================================================================
+# GAP COMPUTATION
+# =============================================================================
+
+def _level_details(stats: Dict, col: int, target_level: int) -> Dict:
+    total = int(stats['count'][col])
+    details = {}
+    for level in VALID_LEVELS:
+        if level > target_level:
+            continue
+        needing = int(stats[f'needing_{level}'][col])
+        if needing > 0:
+            details[level] = {
+                'users_needing': needing,
+                'total_users': total,
+                'percentage': round(needing / total * 100, 1)
+            }
+    return details
+
+
+def _group_summary(stats: Dict, col: int, level_details: Dict) -> Dict:
+    # Imported lazily - learning_objectives_core imports this module
+    from app.services.learning_objectives_core import determine_training_method
+
+    total = int(stats['count'][col])
+    below = int(stats['below_target'][col])
+    gap_percentage = below / total
+    variance = float(stats['variance'][col])
+
+    return {
+        'total_users': total,
+        'users_needing_training': below,
+        'gap_percentage': round(gap_percentage * 100, 1),
+        'median_level': int(stats['median'][col]),
+        'mean_level': round(float(stats['mean'][col]), 2),
+        'variance': round(variance, 2),
+        'level_details': level_details,
+        'training_recommendation': determine_training_method(gap_percentage, variance, total)
+    }
+
+
+def _competency_shell(snapshot: OrgScoreSnapshot, competency_id: int, target_level: int) -> Dict:
+    return {
+        'competency_id': competency_id,
+        'competency_name': snapshot.competency_names.get(competency_id, f"Competency {competency_id}"),
+        'target_level': target_level,
+        'has_gap': False,
+        'levels_needed': [],
+    }
+
+
+def compute_gaps_by_competency(snapshot: OrgScoreSnapshot, main_targets: Dict[int, int]) -> Dict[int, Dict]:
+    """
+    Compute the detect_gaps()['by_competency'] structure from a snapshot.
+
+    Role-based when snapshot.has_roles, organizational otherwise - same
+    branching as detect_gaps().
+    """
+    targets = snapshot.target_vector(main_targets)
+    by_competency = {}
+
+    if snapshot.has_roles:
+        scores = snapshot.role_scores
+        role_stats = []
+        for role in snapshot.roles:
+            members = snapshot.role_members.get(role.id, [])
+            role_stats.append(column_statistics(scores.rows_for_users(members), targets) if members else None)
+
+        for col, competency_id in enumerate(snapshot.competency_ids):
+            target_level = main_targets.get(competency_id, 0)
+            data = _competency_shell(snapshot, competency_id, target_level)
+            data['roles'] = {}
+            if target_level == 0:
+                by_competency[competency_id] = data
+                continue
+
+            for role, stats in zip(snapshot.roles, role_stats):
+                if stats is None or stats['count'][col] == 0:
+                    continue
+                details = _level_details(stats, col, target_level)
+                if not details:
+                    continue
+
+                data['has_gap'] = True
+                for level in details:
+                    if level not in data['levels_needed']:
+                        data['levels_needed'].append(level)
+
+                summary = _group_summary(stats, col, details)
+                data['roles'][role.id] = {
+                    'role_id': role.id,
+                    'role_name': role.role_name,
+                    'total_users': summary['total_users'],
+                    'users_needing_training': summary['users_needing_training'],
+                    'gap_percentage': summary['gap_percentage'],
+                    'median_level': summary['median_level'],
+                    'mean_level': summary['mean_level'],
+                    'variance': summary['variance'],
+                    'levels_needed': sorted(details),
+                    'level_details': details,
+                    'training_recommendation': summary['training_recommendation']
+                }
+
+            data['levels_needed'] = sorted(data['levels_needed'])
+            by_competency[competency_id] = data
+    else:
+        stats = column_statistics(snapshot.org_scores.values, targets)
+
+        for col, competency_id in enumerate(snapshot.competency_ids):
+            target_level = main_targets.get(competency_id, 0)
+            data = _competency_shell(snapshot, competency_id, target_level)
+            data['organizational_stats'] = None
+            if target_level == 0 or stats['count'][col] == 0:
+                by_competency[competency_id] = data
+                continue
+
+            details = _level_details(stats, col, target_level)
+            if details:
+                data['has_gap'] = True
+                data['organizational_stats'] = _group_summary(stats, col, details)
+            data['levels_needed'] = sorted(details)
+            by_competency[competency_id] = data
+
+    return by_competency
+
+
+def compute_ttt_counts(snapshot: OrgScoreSnapshot) -> Dict[int, Dict[str, int]]:
+    """
+    Per-competency Level 6 counts for process_ttt_gaps() (organizational scope).
+
+    Returns:
+        {competency_id: {'total_users': int, 'users_needing': int}}
+    """
+    values = snapshot.org_scores.values
+    present = ~np.isnan(values)
+    totals = present.sum(axis=0)
+    needing = (present & (np.where(present, values, 0.0) < 6)).sum(axis=0)
+    return {
+        cid: {'total_users': int(totals[j]), 'users_needing': int(needing[j])}
+        for j, cid in enumerate(snapshot.competency_ids)
+    }
@@ -0,0 +1,88 @@
+"""
+Generation Progress - Progress reporting for learning objectives generation
+===========================================================================
+
+generate_complete_learning_objectives() reports which of the 8 algorithms is
+running, and run_cached_customizations() reports how many LLM calls are
+pending / completed. The background job worker (learning_objectives_jobs.py)
+periodically persists snapshot() to the job row so the status endpoint can
+show it.
+
+The active GenerationProgress is kept in a context variable, so nested
+helpers can report without threading a parameter through every signature.
+LLM worker threads only receive the object itself (it is thread-safe).
+
+Date: 2026-10-18
+"""
+
+import threading
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+ALGORITHM_NAMES = {
+    1: 'Calculate combined targets',
+    2: 'Validate mastery requirements',
+    3: 'Detect gaps and training methods',
+    5: 'Process TTT gaps',
+    6: 'Generate learning objectives',
+    7: 'Structure pyramid output',
+    8: 'Generate strategy comparison'
+}
+TOTAL_ALGORITHMS = 8
+
+
+class GenerationProgress:
+    """Thread-safe progress counters of one generation run"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.algorithm = None
+        self.llm_calls_total = 0
+        self.llm_calls_completed = 0
+        self.llm_calls_cached = 0
+        self.version = 0  # Incremented on every change (cheap dirty check)
+
+    def start_algorithm(self, number: int) -> None:
+        with self._lock:
+            self.algorithm = number
+            self.version += 1
+
+    def add_llm_calls(self, pending: int, cached: int = 0) -> None:
+        with self._lock:
+            self.llm_calls_total += pending
+            self.llm_calls_cached += cached
+            self.version += 1
+
+    def llm_call_done(self) -> None:
+        with self._lock:
+            self.llm_calls_completed += 1
+            self.version += 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                'algorithm': self.algorithm,
+                'algorithm_name': ALGORITHM_NAMES.get(self.algorithm),
+                'total_algorithms': TOTAL_ALGORITHMS,
+                'llm_calls_total': self.llm_calls_total,
+                'llm_calls_completed': self.llm_calls_completed,
+                'llm_calls_cached': self.llm_calls_cached
+            }
+
+
+_current_progress: ContextVar[Optional[GenerationProgress]] = ContextVar(
+    'generation_progress', default=None
+)
+
+
+def set_current_progress(progress: Optional[GenerationProgress]):
+    """Activate progress for the current context. Returns a token for reset."""
+    return _current_progress.set(progress)
+
+
+def reset_current_progress(token) -> None:
+    _current_progress.reset(token)
+
+
+def current_progress() -> Optional[GenerationProgress]:
+    return _current_progress.get()
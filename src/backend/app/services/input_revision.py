@@ -0,0 +1,83 @@
+"""
+Organization Input Revision - Cheap freshness check for learning objectives
+===========================================================================
+
+The learning objectives cache (generated_learning_objectives) is keyed by an
+input hash. Hashing every latest survey result and role assignment of an
+organization made the freshness check grow with users x competencies, so the
+volatile inputs are represented by a per-organization monotonic counter
+(organization_input_revision) instead.
+
+Every write path that changes an input of the generator calls
+bump_input_revision() BEFORE its db.session.commit(), so the bump is part of
+the same transaction:
+
+- /phase2/submit-assessment and /assessment/<id>/submit (scores, user roles)
+- /phase1/roles/save (organization roles; deletions cascade to user roles)
+- /phase1/strategies/save and add-recommended-strategy (selected strategies)
+- PMT context PATCH (processes/methods/tools)
+
+Date: 2026-10-18
+"""
+
+import logging
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy.exc import IntegrityError
+
+try:
+    from models import db, OrganizationInputRevision
+except ImportError:
+    from app.models import db, OrganizationInputRevision
+
+logger = logging.getLogger(__name__)
+
+
+def bump_input_revision(org_id: Optional[int], reason: str) -> None:
+    """
+    Increment the input revision of an organization.
+
+    Does not commit - the caller's commit persists the bump together with
+    the data change that caused it.
+
+    Args:
+        org_id: Organization ID (no-op if None)
+        reason: Short label of the triggering write (for debugging)
+    """
+    if org_id is None:
+        return
+
+    values = {
+        OrganizationInputRevision.revision: OrganizationInputRevision.revision + 1,
+        OrganizationInputRevision.last_reason: reason,
+        OrganizationInputRevision.updated_at: datetime.utcnow()
+    }
+    updated = OrganizationInputRevision.query.filter_by(
+        organization_id=org_id
+    ).update(values, synchronize_session=False)
+
+    if not updated:
+        try:
+            with db.session.begin_nested():
+                db.session.add(OrganizationInputRevision(
+                    organization_id=org_id,
+                    revision=1,
+                    last_reason=reason,
+                    updated_at=datetime.utcnow()
+                ))
+        except IntegrityError:
+            # Another request created the row concurrently - increment it
+            OrganizationInputRevision.query.filter_by(
+                organization_id=org_id
+            ).update(values, synchronize_session=False)
+
+    logger.debug(f"[bump_input_revision] org {org_id} bumped ({reason})")
+
+
+def get_input_revision(org_id: int) -> int:
+    """Current input revision of an organization (0 if never bumped)."""
+    revision = db.session.query(OrganizationInputRevision.revision).filter_by(
+        organization_id=org_id
+    ).scalar()
+    return revision or 0
@@ -0,0 +1,173 @@
+"""
+Latest Scores - Materialized scores of each user's latest assessment
+====================================================================
+
+The learning objectives pathways only ever look at a user's LATEST completed
+assessment. Resolving it meant a max(user_assessment.id) GROUP BY user_id
+subquery joined to user_se_competency_survey_results - rebuilt in
+get_user_scores_for_competency() / get_all_user_scores_for_competency() once
+per competency and again for every OrgScoreSnapshot.
+
+latest_user_competency_score keeps the result of that subquery as a table
+keyed by (organization_id, user_id, competency_id):
+
+- refresh_latest_scores() replaces the rows of one (organization, user) from
+  their latest completed assessment. The submit routes call it before their
+  commit, so the table changes in the same transaction as the survey results
+- rebuild_latest_scores() recomputes the table (or one organization) from
+  scratch, for data written outside the submit routes
+- org_score_rows() / user_score_rows() are the readers: an index range scan on
+  (organization_id, competency_id) resp. (user_id, assessment_id)
+
+Neither write helper commits.
+
+Date: 2026-10-18
+"""
+
+import logging
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import and_, delete, func, insert, literal, select
+
+try:
+    from models import db, LatestUserCompetencyScore, UserAssessment, UserCompetencySurveyResult
+except ImportError:
+    from app.models import db, LatestUserCompetencyScore, UserAssessment, UserCompetencySurveyResult
+
+logger = logging.getLogger(__name__)
+
+_INSERT_COLUMNS = ['organization_id', 'user_id', 'competency_id', 'assessment_id', 'score', 'updated_at']
+
+
+def _latest_assessments(org_id: Optional[int] = None, user_id: Optional[int] = None):
+    """Latest completed assessment id per (organization, user)"""
+    query = select(
+        UserAssessment.organization_id,
+        UserAssessment.user_id,
+        func.max(UserAssessment.id).label('assessment_id')
+    ).where(UserAssessment.completed_at.isnot(None))
+    if org_id is not None:
+        query = query.where(UserAssessment.organization_id == org_id)
+    if user_id is not None:
+        query = query.where(UserAssessment.user_id == user_id)
+    return query.group_by(UserAssessment.organization_id, UserAssessment.user_id).subquery()
+
+
+def _score_rows_select(latest):
+    """Survey results of the given latest assessments, one row per competency"""
+    result = UserCompetencySurveyResult
+    return select(
+        latest.c.organization_id,
+        latest.c.user_id,
+        result.competency_id,
+        latest.c.assessment_id,
+        # A submit payload may repeat a competency; the key allows one score
+        func.max(result.score),
+        literal(datetime.utcnow())
+    ).select_from(result).join(
+        latest,
+        and_(
+            result.assessment_id == latest.c.assessment_id,
+            result.user_id == latest.c.user_id,
+            result.organization_id == latest.c.organization_id
+        )
+    ).where(
+        result.competency_id.isnot(None)
+    ).group_by(
+        latest.c.organization_id, latest.c.user_id, result.competency_id, latest.c.assessment_id
+    )
+
+
+def refresh_latest_scores(org_id: int, user_id: int) -> int:
+    """
+    Re-materialize the latest scores of one user in one organization.
+
+    Does not commit - call it after writing the survey results and marking
+    the assessment completed, before the caller's commit.
+
+    Returns:
+        Number of score rows written
+    """
+    db.session.flush()
+    table = LatestUserCompetencyScore.__table__
+    db.session.execute(delete(table).where(
+        table.c.organization_id == org_id,
+        table.c.user_id == user_id
+    ))
+    written = db.session.execute(
+        insert(table).from_select(_INSERT_COLUMNS, _score_rows_select(_latest_assessments(org_id, user_id)))
+    ).rowcount
+    logger.debug(f"[refresh_latest_scores] Org {org_id}, user {user_id}: {written} latest scores")
+    return written
+
+
+def rebuild_latest_scores(org_id: Optional[int] = None) -> int:
+    """
+    Recompute latest_user_competency_score from the survey results.
+
+    Does not commit.
+
+    Args:
+        org_id: Rebuild only this organization (all organizations if None)
+
+    Returns:
+        Number of score rows written
+    """
+    db.session.flush()
+    table = LatestUserCompetencyScore.__table__
+    stale = delete(table)
+    if org_id is not None:
+        stale = stale.where(table.c.organization_id == org_id)
+    db.session.execute(stale)
+    written = db.session.execute(
+        insert(table).from_select(_INSERT_COLUMNS, _score_rows_select(_latest_assessments(org_id)))
+    ).rowcount
+    logger.info(f"[rebuild_latest_scores] {'Org ' + str(org_id) if org_id is not None else 'All organizations'}: {written} latest scores")
+    return written
+
+
+def _org_score_select(org_id: int, competency_id: Optional[int] = None):
+    latest = LatestUserCompetencyScore
+    query = select(latest.user_id, latest.competency_id, latest.score).where(
+        latest.organization_id == org_id
+    )
+    if competency_id is not None:
+        query = query.where(latest.competency_id == competency_id)
+    return query
+
+
+def _user_score_select(user_ids: List[int], competency_id: Optional[int] = None):
+    latest = LatestUserCompetencyScore
+    newest = select(
+        latest.user_id,
+        func.max(latest.assessment_id).label('assessment_id')
+    ).where(
+        latest.user_id.in_(user_ids)
+    ).group_by(latest.user_id).subquery()
+
+    query = select(latest.user_id, latest.competency_id, latest.score).join(
+        newest,
+        and_(latest.user_id == newest.c.user_id, latest.assessment_id == newest.c.assessment_id)
+    )
+    if competency_id is not None:
+        query = query.where(latest.competency_id == competency_id)
+    return query
+
+
+def org_score_rows(org_id: int, competency_id: Optional[int] = None) -> List:
+    """
+    (user_id, competency_id, score) rows of every user's latest completed
+    assessment within the organization.
+    """
+    return db.session.execute(_org_score_select(org_id, competency_id)).all()
+
+
+def user_score_rows(user_ids: List[int], competency_id: Optional[int] = None) -> List:
+    """
+    (user_id, competency_id, score) rows of each user's latest completed
+    assessment in any organization.
+    """
+    if not user_ids:
+        return []
+    return db.session.execute(_user_score_select(user_ids, competency_id)).all()
@@ -0,0 +1,283 @@
+"""
+Lazy Resources - Deferred loading of heavy shared objects
+=========================================================
+
+create_app() registers derik_integration, which imported the process
+identification pipeline at module import time: LangChain, the tiktoken
+cl100k_base encoding, an OpenAIEmbeddings client and the FAISS index
+(FAISS.load_local of app/faiss_index) were loaded in every gunicorn worker,
+every lo_worker process and every setup script that builds the app, whether
+or not a request ever ran the pipeline.
+
+This module keeps a process-wide registry of such resources:
+
+- register_resource(): a named loader, run once on first get() (thread-safe)
+  and timed. The returned LazyResource forwards attribute access to the
+  loaded object, so it can stand in for a module-level global
+  (``encoder.encode(...)``)
+- preload_resources(): loads resources eagerly. With gunicorn preload_app
+  (gunicorn.conf.py, SEQPT_PRELOAD=1) this runs once in the master, and the
+  forked workers share the loaded pages copy-on-write instead of each loading
+  them again. Resources registered with fork_safe=False (HTTP clients, torch
+  models - sockets and threads do not survive fork) are never preloaded
+- measure_import(): records wall time and number of new modules of an import
+  per subsystem; format_startup_report() lists them with the resource load
+  times (printed by create_app)
+
+Date: 2026-10-18
+"""
+
+import gc
+import logging
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_NOT_LOADED = object()
+
+
+class LazyResource:
+    """A named object built by its loader on first use"""
+
+    def __init__(self, name: str, loader: Callable[[], Any], subsystem: str, fork_safe: bool = True):
+        self.name = name
+        self.subsystem = subsystem
+        self.fork_safe = fork_safe
+        self._loader = loader
+        self._value = _NOT_LOADED
+        self._lock = threading.Lock()
+        self.load_seconds: Optional[float] = None
+        self.error: Optional[str] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._value is not _NOT_LOADED
+
+    def get(self) -> Any:
+        """The loaded object (loads it on first call; a failed load is retried next time)"""
+        value = self._value
+        if value is not _NOT_LOADED:
+            return value
+
+        with self._lock:
+            if self._value is _NOT_LOADED:
+                started = time.perf_counter()
+                try:
+                    self._value = self._loader()
+                    self.error = None
+                except Exception as e:
+                    self.error = f"{type(e).__name__}: {e}"
+                    raise
+                finally:
+                    self.load_seconds = round(time.perf_counter() - started, 3)
+                logger.info(f"[lazy_resources] Loaded {self.name} in {self.load_seconds}s")
+            return self._value
+
+    def reset(self) -> None:
+        """Forget the loaded object (next get() loads it again)"""
+        with self._lock:
+            self._value = _NOT_LOADED
+            self.load_seconds = None
+            self.error = None
+
+    def __getattr__(self, attr):
+        # Only reached for attributes LazyResource does not define itself
+        if attr.startswith('_'):
+            raise AttributeError(attr)
+        return getattr(self.get(), attr)
+
+    def __repr__(self):
+        state = 'loaded' if self.loaded else 'not loaded'
+        return f"<LazyResource {self.name} ({state})>"
+
+
+class ResourceRegistry:
+    """Named LazyResources of this process"""
+
+    def __init__(self):
+        self._resources: Dict[str, LazyResource] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, loader: Callable[[], Any], subsystem: Optional[str] = None,
+                 fork_safe: bool = True) -> LazyResource:
+        """Register a loader; registering a name again returns the existing resource"""
+        with self._lock:
+            resource = self._resources.get(name)
+            if resource is None:
+                resource = LazyResource(name, loader, subsystem or name, fork_safe)
+                self._resources[name] = resource
+            return resource
+
+    def resource(self, name: str) -> LazyResource:
+        try:
+            return self._resources[name]
+        except KeyError:
+            raise KeyError(f"Resource not registered: {name}") from None
+
+    def names(self) -> List[str]:
+        with self._lock:
+            return list(self._resources)
+
+    def preload(self, names: Optional[Iterable[str]] = None) -> Dict[str, Optional[str]]:
+        """
+        Load the given resources (all fork-safe registered ones if None).
+
+        Failures are logged, not raised - the resource is then loaded lazily
+        again by the first request that needs it. Resources that are not
+        fork-safe are refused: they are created in each worker after fork.
+
+        Returns:
+            {name: None if loaded else error message}
+        """
+        results = {}
+        if names is None:
+            names = [name for name in self.names() if self._resources[name].fork_safe]
+        for name in names:
+            if name not in self._resources:
+                results[name] = 'not registered'
+                logger.warning(f"[lazy_resources] Cannot preload {name}: not registered")
+                continue
+            if not self._resources[name].fork_safe:
+                results[name] = 'not fork-safe (created after fork)'
+                logger.warning(f"[lazy_resources] Not preloading {name}: not fork-safe")
+                continue
+            try:
+                self._resources[name].get()
+                results[name] = None
+            except Exception as e:
+                results[name] = f"{type(e).__name__}: {e}"
+                logger.warning(f"[lazy_resources] Preloading {name} failed: {results[name]}")
+        return results
+
+    def report(self) -> List[Dict]:
+        with self._lock:
+            resources = list(self._resources.values())
+        return [
+            {
+                'name': resource.name,
+                'subsystem': resource.subsystem,
+                'loaded': resource.loaded,
+                'load_seconds': resource.load_seconds,
+                'error': resource.error
+            }
+            for resource in resources
+        ]
+
+
+_registry = ResourceRegistry()
+
+# {subsystem: {'seconds', 'modules'}} of measure_import() blocks
+_import_costs: Dict[str, Dict[str, float]] = {}
+_import_costs_lock = threading.Lock()
+
+
+def get_registry() -> ResourceRegistry:
+    """Process-wide resource registry."""
+    return _registry
+
+
+def register_resource(name: str, loader: Callable[[], Any], subsystem: Optional[str] = None,
+                      fork_safe: bool = True) -> LazyResource:
+    """
+    Register a lazily loaded resource in the process-wide registry.
+
+    fork_safe=False for objects that must not be created in a pre-fork master
+    (network clients, models with native threads) - preloading skips them.
+    """
+    return _registry.register(name, loader, subsystem, fork_safe)
+
+
+def get_resource(name: str) -> Any:
+    """Loaded object of a registered resource."""
+    return _registry.resource(name).get()
+
+
+def preload_resources(names: Optional[Iterable[str]] = None, freeze: bool = False) -> Dict[str, Optional[str]]:
+    """
+    Load resources now instead of on first use (see ResourceRegistry.preload).
+
+    Args:
+        freeze: Move everything allocated so far into the permanent GC
+            generation (gc.freeze()). Use in a pre-fork master: otherwise the
+            workers' cyclic GC touches the object headers of the preloaded
+            data and un-shares their copy-on-write pages.
+    """
+    results = _registry.preload(names)
+    if freeze:
+        gc.collect()
+        gc.freeze()
+    return results
+
+
+def preload_configured_resources() -> Dict[str, Optional[str]]:
+    """
+    preload_resources() with the 'resource_loading' settings (preload list,
+    freeze_after_preload) - called in the gunicorn master and by run.py --preload.
+    """
+    from app.services.config_loader import get_resource_loading_settings
+
+    settings = get_resource_loading_settings()
+    results = preload_resources(settings.get('preload') or None, freeze=settings.get('freeze_after_preload', True))
+    loaded = [name for name, error in results.items() if error is None]
+    logger.info(f"[lazy_resources] Preloaded {len(loaded)}/{len(results)} resources: {', '.join(loaded)}")
+    return results
+
+
+@contextmanager
+def measure_import(subsystem: str):
+    """Record the import cost of the enclosed block for the startup report"""
+    modules_before = len(sys.modules)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - started
+        with _import_costs_lock:
+            cost = _import_costs.setdefault(subsystem, {'seconds': 0.0, 'modules': 0})
+            cost['seconds'] += seconds
+            cost['modules'] += max(len(sys.modules) - modules_before, 0)
+
+
+def startup_report() -> Dict[str, List[Dict]]:
+    """Import cost per subsystem and state of the registered resources"""
+    with _import_costs_lock:
+        imports = [
+            {'subsystem': subsystem, 'seconds': round(cost['seconds'], 3), 'modules': cost['modules']}
+            for subsystem, cost in _import_costs.items()
+        ]
+    return {'imports': imports, 'resources': _registry.report()}
+
+
+def format_startup_report() -> str:
+    report = startup_report()
+    lines = ["Startup import cost per subsystem:"]
+    for entry in report['imports']:
+        lines.append(f"  - {entry['subsystem']}: {entry['seconds']:.3f}s ({entry['modules']} modules)")
+    lines.append("Lazy resources:")
+    for entry in report['resources']:
+        if entry['loaded']:
+            state = f"loaded in {entry['load_seconds']:.3f}s"
+        elif entry['error']:
+            state = f"failed ({entry['error']})"
+        else:
+            state = "deferred until first use"
+        lines.append(f"  - {entry['name']} [{entry['subsystem']}]: {state}")
+    return "\n".join(lines)
+
+
+# =============================================================================
+# SHARED RESOURCES
+# =============================================================================
+
+def _load_cl100k_encoder():
+    with measure_import('tiktoken'):
+        import tiktoken
+    return tiktoken.get_encoding('cl100k_base')
+
+
+# tiktoken cl100k_base (GPT-4 family) - process identification pipeline and document ingestion
+cl100k_encoder = register_resource('tiktoken_cl100k', _load_cl100k_encoder, 'tiktoken')
@@ -0,0 +1,201 @@
+"""
+Learning Objective Templates - Process-wide template registry
+==============================================================
+
+The learning objective template JSON (se_qpt_learning_objectives_template_v2.json)
+used to be opened and parsed on every lookup. The role-based pathway looks up
+templates per strategy x competency x level, so one generation parsed the file
+hundreds of times.
+
+get_template_registry() parses the file once per process and pre-indexes it:
+- (competency_name, level) -> TemplateEntry (unified text + PMT breakdown)
+- strategy name (exact and lower-case) -> archetype competency target levels
+
+The registry is immutable; when the file's mtime changes (checked at most
+every RELOAD_CHECK_SECONDS) a new registry is built and swapped in, so
+lookups on the hot path do no I/O.
+
+Used by learning_objectives_text_generator.py and learning_objectives_core.py.
+
+Date: 2026-10-18
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_FILENAME = 'se_qpt_learning_objectives_template_v2.json'
+
+# Seconds between mtime checks of the template file
+RELOAD_CHECK_SECONDS = 2.0
+
+_backend_root = Path(__file__).resolve().parent.parent.parent  # services -> app -> backend
+
+
+def resolve_template_path() -> Path:
+    """
+    Get path to LO template file.
+
+    Path resolution order:
+    1. Local to backend (Docker): src/backend/data/templates/se_qpt_learning_objectives_template_v2.json
+    2. Project root (Local dev): data/source/Phase 2/se_qpt_learning_objectives_template_v2.json
+    """
+    # Path 1: Docker path (template inside backend)
+    docker_path = _backend_root / 'data' / 'templates' / TEMPLATE_FILENAME
+    if docker_path.exists():
+        return docker_path
+
+    # Path 2: Local dev path (template at project root)
+    project_root = _backend_root.parent.parent  # backend -> src -> project_root
+    dev_path = project_root / 'data' / 'source' / 'Phase 2' / TEMPLATE_FILENAME
+    if dev_path.exists():
+        return dev_path
+
+    # Return Docker path as default (will show appropriate error if missing)
+    return docker_path
+
+
+TEMPLATE_PATH = resolve_template_path()
+
+
+@dataclass(frozen=True)
+class TemplateEntry:
+    """One competency/level template with its PMT breakdown already split out"""
+    competency_name: str
+    level: int
+    objective_text: Optional[str]
+    pmt_breakdown: Optional[Mapping[str, str]]  # read-only {'process'|'method'|'tool': text}
+
+    @property
+    def has_pmt(self) -> bool:
+        return self.pmt_breakdown is not None
+
+    def pmt_breakdown_dict(self) -> Optional[Dict[str, str]]:
+        """Mutable/JSON-serializable copy of the PMT breakdown"""
+        return dict(self.pmt_breakdown) if self.pmt_breakdown is not None else None
+
+
+def _build_entry(competency_name: str, level: int, template_data) -> TemplateEntry:
+    # Template v2 format supports both:
+    # - Simple string: "The participant knows..."
+    # - Dict with PMT: {"unified": "...", "pmt_breakdown": {...}}
+    if isinstance(template_data, dict):
+        text = template_data.get('unified', template_data.get('base_template'))
+        breakdown = template_data.get('pmt_breakdown')
+        return TemplateEntry(
+            competency_name=competency_name,
+            level=level,
+            objective_text=text,
+            pmt_breakdown=MappingProxyType(dict(breakdown or {})) if 'pmt_breakdown' in template_data else None
+        )
+    return TemplateEntry(competency_name, level, template_data, None)
+
+
+class TemplateRegistry:
+    """Immutable, pre-indexed view of one version of the template file"""
+
+    def __init__(self, data: Dict, path: Path, mtime: float):
+        self.path = path
+        self.mtime = mtime
+        # Raw parsed JSON - shared by all callers, treat as read-only
+        self.data = data
+
+        entries = {}
+        competency_levels = {}
+        for competency_name, levels in data.get('learningObjectiveTemplates', {}).items():
+            competency_levels[competency_name] = frozenset(int(level) for level in levels)
+            for level_str, template_data in levels.items():
+                level = int(level_str)
+                entries[(competency_name, level)] = _build_entry(competency_name, level, template_data)
+        self._entries: Mapping[Tuple[str, int], TemplateEntry] = MappingProxyType(entries)
+        self._competency_levels = MappingProxyType(competency_levels)
+
+        targets = data.get('archetypeCompetencyTargetLevels', {})
+        self._archetype_targets = MappingProxyType({
+            name: MappingProxyType(dict(levels)) for name, levels in targets.items()
+        })
+        self._archetype_targets_lower = MappingProxyType({name.lower(): name for name in targets})
+
+    def has_competency(self, competency_name: str) -> bool:
+        return competency_name in self._competency_levels
+
+    def get(self, competency_name: str, level: int) -> Optional[TemplateEntry]:
+        """O(1) lookup of a competency/level template (None if missing)"""
+        return self._entries.get((competency_name, int(level)))
+
+    def archetype_targets(self, strategy_name: str) -> Optional[Mapping[str, int]]:
+        """Read-only competency target levels of a strategy (exact, then case-insensitive match)"""
+        key = strategy_name if strategy_name in self._archetype_targets \
+            else self._archetype_targets_lower.get(strategy_name.lower())
+        if key is None:
+            return None
+        return self._archetype_targets[key]
+
+    @property
+    def competency_count(self) -> int:
+        return len(self._competency_levels)
+
+
+_registry: Optional[TemplateRegistry] = None
+_registry_lock = threading.Lock()
+_next_check = 0.0
+
+
+def _load_registry(path: Path) -> TemplateRegistry:
+    mtime = os.stat(path).st_mtime
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    registry = TemplateRegistry(data, path, mtime)
+    logger.info(
+        f"[TemplateRegistry] Loaded {registry.competency_count} competencies from {path}"
+    )
+    return registry
+
+
+def get_template_registry() -> TemplateRegistry:
+    """
+    Process-wide template registry, reloaded when the file changes.
+
+    Raises:
+        FileNotFoundError / json.JSONDecodeError if the file cannot be loaded
+        the first time. Later reload failures keep serving the last good version.
+    """
+    global _registry, _next_check
+
+    registry = _registry
+    if registry is not None and time.monotonic() < _next_check:
+        return registry
+
+    with _registry_lock:
+        registry = _registry
+        now = time.monotonic()
+        if registry is not None and now < _next_check:
+            return registry
+
+        _next_check = now + RELOAD_CHECK_SECONDS
+        try:
+            if registry is not None and os.stat(TEMPLATE_PATH).st_mtime == registry.mtime:
+                return registry
+            _registry = _load_registry(TEMPLATE_PATH)
+        except (OSError, ValueError) as e:
+            if registry is None:
+                logger.error(f"[TemplateRegistry] Cannot load templates from {TEMPLATE_PATH}: {e}")
+                raise
+            logger.warning(f"[TemplateRegistry] Reload failed, keeping previous templates: {e}")
+        return _registry
+
+
+def reset_template_registry() -> None:
+    """Drop the cached registry (next access reloads the file)"""
+    global _registry, _next_check
+    with _registry_lock:
+        _registry = None
+        _next_check = 0.0
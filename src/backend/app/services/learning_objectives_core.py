@@ -26,29 +26,48 @@ import hashlib
 import json
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
-from sqlalchemy import func
 
 # Import models - use direct import to work both in app context and testing
 try:
     from models import (
-        db, Organization, Competency, StrategyTemplate, StrategyTemplateCompetency,
-        OrganizationRoles, UserCompetencySurveyResult, UserAssessment,
+        db, Organization, OrganizationRoles,
         RoleCompetencyMatrix, UserRoleCluster, GeneratedLearningObjectives,
         OrganizationPMTContext
     )
 except ImportError:
     from app.models import (
-        db, Organization, Competency, StrategyTemplate, StrategyTemplateCompetency,
-        OrganizationRoles, UserCompetencySurveyResult, UserAssessment,
+        db, Organization, OrganizationRoles,
         RoleCompetencyMatrix, UserRoleCluster, GeneratedLearningObjectives,
         OrganizationPMTContext
     )
 
+from app.services.gap_detection_engine import (
+    OrgScoreSnapshot, compute_gaps_by_competency, compute_ttt_counts
+)
+from app.services.generation_progress import (
+    GenerationProgress, current_progress, set_current_progress, reset_current_progress
+)
+from app.services.input_revision import get_input_revision
+from app.services.latest_scores import org_score_rows, user_score_rows
+from app.services.learning_objective_templates import (
+    TEMPLATE_PATH, TemplateRegistry, get_template_registry
+)
+from app.services.learning_objectives_export import delete_exports
+from app.services.llm_executor import chat_completion, run_ordered
+from app.services.llm_response_cache import compute_fragment_key, get_fragment_cache
+from app.services.reference_data import get_reference_data
+
 logger = logging.getLogger(__name__)
 
 # Valid levels in pyramid structure
 VALID_LEVELS = [1, 2, 4, 6]
 
+# LLM used for PMT customization. Bump the prompt versions whenever the
+# corresponding prompt text changes - they are part of the fragment cache key.
+PMT_CUSTOMIZATION_MODEL = "gpt-4o-mini"
+PMT_BREAKDOWN_PROMPT_VERSION = "v1"
+TTT_OBJECTIVE_PROMPT_VERSION = "v1"
+
 
 # =============================================================================
 # CACHING FUNCTIONS - Avoid unnecessary LLM calls
@@ -65,8 +84,9 @@ def compute_input_hash(
     Hash components:
     1. Selected strategies (IDs and names)
     2. PMT context (if present)
-    3. Assessment scores (latest per user per competency)
-    4. Strategy template targets
+    3. Organization input revision - bumped on every assessment submission,
+       role save, strategy save and PMT update (see input_revision.py), so
+       score and role-assignment changes are covered by a single-row lookup
 
     Returns:
         64-character hex string (SHA-256 hash)
@@ -93,70 +113,13 @@ def compute_input_hash(
     hash_input = {
         'org_id': org_id,
         'strategies': normalized_strategies,
-        'pmt': normalized_pmt
+        'pmt': normalized_pmt,
+        'input_revision': get_input_revision(org_id)
     }
 
     print(f"[compute_input_hash] Strategies: {normalized_strategies}")
     print(f"[compute_input_hash] PMT: {normalized_pmt}")
-
-    # Add assessment scores snapshot - ONLY from latest assessment per user
-    # This ensures cache invalidates when user retakes assessment
-    assessment_scores = []
-
-    # Get latest assessment_id per user for this organization
-    from sqlalchemy import func
-    latest_assessments = db.session.query(
-        UserAssessment.user_id,
-        func.max(UserAssessment.id).label('latest_assessment_id')
-    ).filter(
-        UserAssessment.organization_id == org_id,
-        UserAssessment.completed_at.isnot(None)
-    ).group_by(UserAssessment.user_id).subquery()
-
-    # Get scores only from latest assessments
-    results = db.session.query(UserCompetencySurveyResult).join(
-        latest_assessments,
-        db.and_(
-            UserCompetencySurveyResult.user_id == latest_assessments.c.user_id,
-            UserCompetencySurveyResult.assessment_id == latest_assessments.c.latest_assessment_id
-        )
-    ).filter(
-        UserCompetencySurveyResult.organization_id == org_id
-    ).all()
-
-    for r in results:
-        assessment_scores.append({
-            'user_id': r.user_id,
-            'comp_id': r.competency_id,
-            'score': r.score,
-            'assessment_id': r.assessment_id
-        })
-
-    hash_input['assessments'] = sorted(
-        assessment_scores,
-        key=lambda x: (x['user_id'], x['comp_id'])
-    )
-
-    # Add user-role assignments snapshot
-    # This ensures cache invalidates when user roles change
-    role_assignments = []
-    user_roles = UserRoleCluster.query.join(
-        OrganizationRoles,
-        UserRoleCluster.role_cluster_id == OrganizationRoles.id
-    ).filter(
-        OrganizationRoles.organization_id == org_id
-    ).all()
-
-    for ur in user_roles:
-        role_assignments.append({
-            'user_id': ur.user_id,
-            'role_id': ur.role_cluster_id
-        })
-
-    hash_input['role_assignments'] = sorted(
-        role_assignments,
-        key=lambda x: (x['user_id'], x['role_id'])
-    )
+    print(f"[compute_input_hash] Input revision: {hash_input['input_revision']}")
 
     # Create deterministic JSON string
     hash_string = json.dumps(hash_input, sort_keys=True, default=str)
@@ -264,6 +227,8 @@ def save_to_cache(
             db.session.add(cached)
             print(f"[save_to_cache] Created new cache for org {org_id}")
 
+        # Exports of the previous objectives (re-rendered by prerender_exports)
+        delete_exports(org_id)
         db.session.commit()
         return True
 
@@ -295,6 +260,7 @@ def invalidate_cache(org_id: int) -> bool:
 
         if cached:
             db.session.delete(cached)
+            delete_exports(org_id)
             db.session.commit()
             logger.info(f"[invalidate_cache] Cache invalidated for org {org_id}")
             return True
@@ -339,6 +305,7 @@ def get_all_competency_ids() -> List[int]:
 
     This replaces the hardcoded ALL_16_COMPETENCY_IDS constant to handle
     databases with different numbers of competencies (e.g., 16, 18, etc.)
+    Served from the process-wide reference data cache.
 
     Returns:
         List of competency IDs in ascending order
@@ -346,8 +313,7 @@ def get_all_competency_ids() -> List[int]:
     Example:
         [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16, 17, 18]
     """
-    competencies = Competency.query.order_by(Competency.id).all()
-    return [c.id for c in competencies]
+    return get_reference_data().competency_ids()
 
 
 # =============================================================================
@@ -428,7 +394,7 @@ def calculate_combined_targets(selected_strategies: List[Dict]) -> Dict:
             strategy_name = strategy.get('strategy_name', 'Unknown')
 
             # Get strategy template from database
-            strategy_template = StrategyTemplate.query.get(strategy_id)
+            strategy_template = get_reference_data().strategy_template(strategy_id)
 
             if not strategy_template:
                 logger.warning(f"[calculate_combined_targets] No template found for strategy {strategy_id} ({strategy_name})")
@@ -481,18 +447,13 @@ def get_strategy_template_target_level(strategy_template_id: int, competency_id:
     Returns:
         Target level (0, 1, 2, 4, or 6)
     """
-    # Query the strategy_template_competency table
-    template_comp = StrategyTemplateCompetency.query.filter_by(
-        strategy_template_id=strategy_template_id,
-        competency_id=competency_id
-    ).first()
+    # strategy_template_competency, from the reference data cache
+    target = get_reference_data().template_target_level(strategy_template_id, competency_id)
 
-    if not template_comp:
+    if target is None:
         logger.warning(f"[get_strategy_template_target_level] No target found for template {strategy_template_id}, competency {competency_id} - defaulting to 0")
         return 0
 
-    target = template_comp.target_level
-
     # Validate level (should be 0, 1, 2, 4, or 6)
     if target not in [0, 1, 2, 4, 6]:
         logger.warning(f"[get_strategy_template_target_level] Invalid target level {target} for competency {competency_id} - defaulting to 0")
@@ -508,7 +469,8 @@ def get_strategy_template_target_level(strategy_template_id: int, competency_id:
 def validate_mastery_requirements(
     org_id: int,
     selected_strategies: List[Dict],
-    main_targets: Dict[int, int]
+    main_targets: Dict[int, int],
+    snapshot: Optional[OrgScoreSnapshot] = None
 ) -> Dict:
     """
     Validate that selected strategies can meet role requirements.
@@ -525,6 +487,8 @@ def validate_mastery_requirements(
         org_id: Organization ID
         selected_strategies: List of selected strategy dicts
         main_targets: Target levels from non-TTT strategies
+        snapshot: Preloaded OrgScoreSnapshot (loaded here if omitted). Role
+                  requirements are read from its role x competency matrix
 
     Returns:
         {
@@ -545,8 +509,11 @@ def validate_mastery_requirements(
 
     logger.info(f"[validate_mastery_requirements] Validating for org {org_id}")
 
+    if snapshot is None:
+        snapshot = OrgScoreSnapshot.load(org_id)
+
     # Check if organization has roles defined
-    has_roles = check_if_org_has_roles(org_id)
+    has_roles = snapshot.has_roles
 
     if not has_roles:
         logger.info("[validate_mastery_requirements] Low maturity - no role requirements to validate")
@@ -567,7 +534,7 @@ def validate_mastery_requirements(
     logger.info(f"[validate_mastery_requirements] TTT selected: {ttt_selected}")
 
     # Get all roles for this organization
-    roles = OrganizationRoles.query.filter_by(organization_id=org_id).all()
+    roles = snapshot.roles
 
     if len(roles) == 0:
         logger.warning(f"[validate_mastery_requirements] No roles found for org {org_id} despite has_roles=True")
@@ -582,13 +549,13 @@ def validate_mastery_requirements(
     logger.info(f"[validate_mastery_requirements] Checking {len(roles)} roles")
 
     affected_combinations = []
-    all_competency_ids = get_all_competency_ids()  # FIXED: Dynamic competency loading
+    requirements = snapshot.role_requirements  # roles x competencies
 
     # Check each role-competency combination
-    for role in roles:
-        for competency_id in all_competency_ids:
+    for role_idx, role in enumerate(roles):
+        for comp_idx, competency_id in enumerate(snapshot.competency_ids):
             # Get role requirement level from role-competency matrix
-            role_requirement = get_role_competency_requirement(role.id, competency_id)
+            role_requirement = int(requirements[role_idx, comp_idx])
 
             if role_requirement == 0:
                 continue  # No requirement for this combination
@@ -599,13 +566,11 @@ def validate_mastery_requirements(
             # Check if requirement exceeds what strategy provides
             if role_requirement > strategy_target:
                 # INADEQUACY DETECTED
-                competency = Competency.query.get(competency_id)
-
                 affected_combinations.append({
                     'role_id': role.id,
                     'role_name': role.role_name,
                     'competency_id': competency_id,
-                    'competency_name': competency.competency_name if competency else f"Competency {competency_id}",
+                    'competency_name': snapshot.competency_names[competency_id],
                     'required_level': role_requirement,
                     'strategy_provides': strategy_target,
                     'gap': role_requirement - strategy_target
@@ -746,7 +711,8 @@ def get_role_competency_requirement(role_id: int, competency_id: int) -> int:
 def detect_gaps(
     org_id: int,
     main_targets: Dict[int, int],
-    ttt_targets: Optional[Dict[int, int]] = None
+    ttt_targets: Optional[Dict[int, int]] = None,
+    snapshot: Optional[OrgScoreSnapshot] = None
 ) -> Dict:
     """
     Detect training gaps for all competencies.
@@ -756,10 +722,17 @@ def detect_gaps(
     - Process by role if high maturity, organizationally if low maturity
     - Progressive levels: Current=0, Target=4 → Generate 1, 2, AND 4
 
+    Scores, roles and assignments are loaded once per organization via
+    OrgScoreSnapshot and evaluated as vectorized column statistics. The
+    per-competency helpers below (process_competency_with_roles /
+    process_competency_organizational) produce the same structure one
+    competency at a time.
+
     Args:
         org_id: Organization ID
         main_targets: Target levels per competency (excluding TTT)
         ttt_targets: TTT targets (if selected) - all level 6
+        snapshot: Preloaded OrgScoreSnapshot (loaded here if omitted)
 
     Returns:
         {
@@ -777,8 +750,11 @@ def detect_gaps(
 
     logger.info(f"[detect_gaps] Processing org {org_id}")
 
+    if snapshot is None:
+        snapshot = OrgScoreSnapshot.load(org_id)
+
     # Check if organization has roles
-    has_roles = check_if_org_has_roles(org_id)
+    has_roles = snapshot.has_roles
 
     logger.info(f"[detect_gaps] Has roles: {has_roles}")
 
@@ -793,35 +769,16 @@ def detect_gaps(
         }
     }
 
-    # Process each competency (dynamic, not hardcoded)
-    all_competency_ids = get_all_competency_ids()  # FIXED: Dynamic competency loading
-    for competency_id in all_competency_ids:
-        target_level = main_targets.get(competency_id, 0)
-
-        if has_roles:
-            # HIGH MATURITY: Process by role
-            competency_gaps = process_competency_with_roles(
-                org_id,
-                competency_id,
-                target_level
-            )
-        else:
-            # LOW MATURITY: Process organizationally
-            competency_gaps = process_competency_organizational(
-                org_id,
-                competency_id,
-                target_level
-            )
-
-        gaps['by_competency'][competency_id] = competency_gaps
+    # Role-based (high maturity) or organizational (low maturity) processing
+    gaps['by_competency'] = compute_gaps_by_competency(snapshot, main_targets)
 
-        # Organize by level for pyramid structure
+    # Organize by level for pyramid structure
+    for competency_id, competency_gaps in gaps['by_competency'].items():
         for level in competency_gaps.get('levels_needed', []):
             if level in VALID_LEVELS:
-                competency = Competency.query.get(competency_id)
                 gaps['by_level'][level].append({
                     'competency_id': competency_id,
-                    'competency_name': competency.competency_name if competency else f"Competency {competency_id}",
+                    'competency_name': competency_gaps['competency_name'],
                     'gap_data': competency_gaps
                 })
 
@@ -852,7 +809,7 @@ def process_competency_with_roles(
     logger.debug(f"[process_competency_with_roles] Org {org_id}, Comp {competency_id}, Target {target_level}")
 
     roles = OrganizationRoles.query.filter_by(organization_id=org_id).all()
-    competency = Competency.query.get(competency_id)
+    competency = get_reference_data().competency(competency_id)
 
     competency_data = {
         'competency_id': competency_id,
@@ -977,7 +934,7 @@ def process_competency_organizational(
 
     logger.debug(f"[process_competency_organizational] Org {org_id}, Comp {competency_id}, Target {target_level}")
 
-    competency = Competency.query.get(competency_id)
+    competency = get_reference_data().competency(competency_id)
 
     competency_data = {
         'competency_id': competency_id,
@@ -1075,6 +1032,7 @@ def get_user_scores_for_competency(user_ids: List[int], competency_id: int) -> L
     Get competency scores for specific users from their LATEST assessments only.
 
     When a user retakes an assessment, we only use their most recent scores.
+    Reads the materialized latest_user_competency_score table.
 
     Args:
         user_ids: List of user IDs to query
@@ -1086,33 +1044,7 @@ def get_user_scores_for_competency(user_ids: List[int], competency_id: int) -> L
     if not user_ids:
         return []
 
-    from sqlalchemy import func
-
-    # Get latest assessment_id per user
-    latest_assessments = db.session.query(
-        UserAssessment.user_id,
-        func.max(UserAssessment.id).label('latest_assessment_id')
-    ).filter(
-        UserAssessment.user_id.in_(user_ids),
-        UserAssessment.completed_at.isnot(None)
-    ).group_by(UserAssessment.user_id).subquery()
-
-    # Get scores only from latest assessments
-    results = db.session.query(UserCompetencySurveyResult).join(
-        latest_assessments,
-        db.and_(
-            UserCompetencySurveyResult.user_id == latest_assessments.c.user_id,
-            UserCompetencySurveyResult.assessment_id == latest_assessments.c.latest_assessment_id
-        )
-    ).filter(
-        UserCompetencySurveyResult.user_id.in_(user_ids),
-        UserCompetencySurveyResult.competency_id == competency_id
-    ).all()
-
-    scores = []
-    for result in results:
-        if result.score is not None:
-            scores.append(int(result.score))
+    scores = [int(row.score) for row in user_score_rows(user_ids, competency_id) if row.score is not None]
 
     logger.debug(f"[get_user_scores_for_competency] Found {len(scores)} scores for competency {competency_id} (latest assessments only)")
     return scores
@@ -1123,6 +1055,7 @@ def get_all_user_scores_for_competency(org_id: int, competency_id: int) -> List[
     Get all user scores for a competency in an organization from LATEST assessments only.
 
     When users retake assessments, we only use their most recent scores.
+    Reads the materialized latest_user_competency_score table.
 
     Args:
         org_id: Organization ID
@@ -1131,33 +1064,7 @@ def get_all_user_scores_for_competency(org_id: int, competency_id: int) -> List[
     Returns:
         List of integer scores for all users in the organization (one per user)
     """
-    from sqlalchemy import func
-
-    # Get latest assessment_id per user for this organization
-    latest_assessments = db.session.query(
-        UserAssessment.user_id,
-        func.max(UserAssessment.id).label('latest_assessment_id')
-    ).filter(
-        UserAssessment.organization_id == org_id,
-        UserAssessment.completed_at.isnot(None)
-    ).group_by(UserAssessment.user_id).subquery()
-
-    # Get scores only from latest assessments
-    results = db.session.query(UserCompetencySurveyResult).join(
-        latest_assessments,
-        db.and_(
-            UserCompetencySurveyResult.user_id == latest_assessments.c.user_id,
-            UserCompetencySurveyResult.assessment_id == latest_assessments.c.latest_assessment_id
-        )
-    ).filter(
-        UserCompetencySurveyResult.organization_id == org_id,
-        UserCompetencySurveyResult.competency_id == competency_id
-    ).all()
-
-    scores = []
-    for result in results:
-        if result.score is not None:
-            scores.append(int(result.score))
+    scores = [int(row.score) for row in org_score_rows(org_id, competency_id) if row.score is not None]
 
     logger.debug(f"[get_all_user_scores_for_competency] Org {org_id}, Competency {competency_id}: {len(scores)} scores (latest assessments only)")
     return scores
@@ -1350,7 +1257,8 @@ def determine_training_method(
 
 def process_ttt_gaps(
     org_id: int,
-    ttt_targets: Optional[Dict[int, int]]
+    ttt_targets: Optional[Dict[int, int]],
+    snapshot: Optional[OrgScoreSnapshot] = None
 ) -> Optional[Dict]:
     """
     Process Train the Trainer gaps.
@@ -1367,6 +1275,7 @@ def process_ttt_gaps(
         org_id: Organization ID
         ttt_targets: Dictionary {competency_id: 6} for all competencies
                      None if TTT strategy not selected
+        snapshot: Preloaded OrgScoreSnapshot (loaded here if omitted)
 
     Returns:
         {
@@ -1411,10 +1320,12 @@ def process_ttt_gaps(
         'competencies': []
     }
 
-    # Process each competency
-    all_competency_ids = get_all_competency_ids()
+    if snapshot is None:
+        snapshot = OrgScoreSnapshot.load(org_id)
+    level_6_counts = compute_ttt_counts(snapshot)
 
-    for competency_id in all_competency_ids:
+    # Process each competency
+    for competency_id in snapshot.competency_ids:
         target_level = ttt_targets.get(competency_id, 0)
 
         # Validate: TTT should always target Level 6
@@ -1425,46 +1336,37 @@ def process_ttt_gaps(
             )
             continue
 
-        # Get competency details
-        competency = Competency.query.get(competency_id)
-        competency_name = competency.competency_name if competency else f"Competency {competency_id}"
+        competency_name = snapshot.competency_names[competency_id]
 
-        # Get all user scores for this competency
-        all_user_scores = get_all_user_scores_for_competency(org_id, competency_id)
+        # Latest scores for this competency (organizational scope)
+        total_users = level_6_counts[competency_id]['total_users']
+        users_needing_mastery = level_6_counts[competency_id]['users_needing']
 
-        if len(all_user_scores) == 0:
+        if total_users == 0:
             # No assessment data - assume gap exists
             logger.debug(
                 f"[process_ttt_gaps] No assessment data for competency {competency_id} "
                 f"- assuming gap exists"
             )
-            users_needing_mastery = []
             gap_percentage = 1.0  # 100% need training (unknown state)
-            total_users = 0
         else:
-            # Count users below Level 6
-            users_needing_mastery = [
-                score for score in all_user_scores
-                if score < 6
-            ]
-            total_users = len(all_user_scores)
-            gap_percentage = len(users_needing_mastery) / total_users
+            gap_percentage = users_needing_mastery / total_users
 
             logger.debug(
                 f"[process_ttt_gaps] Competency {competency_id}: "
-                f"{len(users_needing_mastery)}/{total_users} users need Level 6 "
+                f"{users_needing_mastery}/{total_users} users need Level 6 "
                 f"({gap_percentage:.1%})"
             )
 
         # If ANY user needs Level 6 (or no data) → Include in TTT
         # This follows the "ANY gap" principle
-        if len(all_user_scores) == 0 or len(users_needing_mastery) > 0:
+        if total_users == 0 or users_needing_mastery > 0:
             ttt_data['competencies'].append({
                 'competency_id': competency_id,
                 'competency_name': competency_name,
                 'level': 6,
                 'level_name': 'Mastering SE',
-                'users_needing': len(users_needing_mastery),
+                'users_needing': users_needing_mastery,
                 'total_users': total_users,
                 'gap_percentage': round(gap_percentage * 100, 1)
             })
@@ -1562,6 +1464,10 @@ def generate_learning_objectives(
     # Generate for ALL levels up to target (not just gaps) so grayed items show objectives too
     all_objectives = {}
 
+    # PMT customizations are collected first and run concurrently afterwards
+    # (competency_id, level, competency_name, template_pmt) per LLM call
+    customization_jobs = []
+
     for competency_id, gap_data in gaps_by_competency.items():
         target_level = gap_data.get('target_level', 0)
         if target_level == 0:
@@ -1598,45 +1504,13 @@ def generate_learning_objectives(
             # PMT Customization Logic:
             # - Templates WITH pmt_breakdown -> customize each breakdown section (process/method/tool)
             # - Templates WITHOUT pmt_breakdown -> use template text as-is (no LLM call needed)
-            customized = False
-            final_text = template_text
-            final_pmt_breakdown = template_pmt
-
             if use_pmt and has_template_pmt and template_pmt:
-                # This template has PMT breakdown - customize each section with LLM
+                # This template has PMT breakdown - queue LLM customization
                 print(
                     f"[generate_learning_objectives] Customizing PMT breakdown for "
                     f"{competency_name} Level {level}"
                 )
-                try:
-                    customized_breakdown = customize_pmt_breakdown(
-                        competency_name,
-                        level,
-                        template_pmt,
-                        pmt_context
-                    )
-
-                    if customized_breakdown:
-                        final_pmt_breakdown = customized_breakdown
-                        customized = True
-                        # Also update the unified text to reflect customization
-                        # by combining the customized breakdown sections
-                        combined_sections = []
-                        if customized_breakdown.get('process'):
-                            combined_sections.append(customized_breakdown['process'])
-                        if customized_breakdown.get('method'):
-                            combined_sections.append(customized_breakdown['method'])
-                        if customized_breakdown.get('tool'):
-                            combined_sections.append(customized_breakdown['tool'])
-                        if combined_sections:
-                            final_text = ' '.join(combined_sections)
-
-                except Exception as e:
-                    logger.error(
-                        f"[generate_learning_objectives] PMT breakdown customization failed "
-                        f"for {competency_name} Level {level}: {e}"
-                    )
-                    # Fallback to standard template breakdown
+                customization_jobs.append((competency_id, level, competency_name, template_pmt))
             elif use_pmt and not has_template_pmt:
                 # No PMT breakdown in template - just use template text as-is
                 # These competencies don't have process/method/tool structure
@@ -1645,24 +1519,65 @@ def generate_learning_objectives(
                     f"{competency_name} Level {level} - using template text"
                 )
 
-            # Store objective with PMT breakdown from template (or customized)
+            # Store objective with PMT breakdown from template
+            # (replaced below if customization succeeds)
             objective_entry = {
                 'level': level,
                 'level_name': get_level_name(level),
-                'objective_text': final_text,
-                'customized': customized,
-                'source': 'pmt_customized' if customized else 'template',
+                'objective_text': template_text,
+                'customized': False,
+                'source': 'template',
                 'has_pmt_breakdown': has_template_pmt
             }
 
             # Include PMT breakdown if available (original or customized)
-            if has_template_pmt and final_pmt_breakdown:
-                objective_entry['pmt_breakdown'] = final_pmt_breakdown
+            if has_template_pmt and template_pmt:
+                objective_entry['pmt_breakdown'] = template_pmt
 
             competency_objectives[level] = objective_entry
 
         all_objectives[competency_id] = competency_objectives
 
+    # Run all PMT customizations concurrently (bounded pool, results in job order).
+    # Fragments already customized for the same template + PMT wording are
+    # served from the content-addressed cache without an LLM call.
+    customization_results = run_cached_customizations(
+        'pmt_breakdown',
+        PMT_BREAKDOWN_PROMPT_VERSION,
+        customize_pmt_breakdown,
+        [(name, level, template_pmt, pmt_context) for _, level, name, template_pmt in customization_jobs]
+    )
+
+    for (competency_id, level, competency_name, _), (customized_breakdown, error) in zip(
+        customization_jobs, customization_results
+    ):
+        if error is not None:
+            logger.error(
+                f"[generate_learning_objectives] PMT breakdown customization failed "
+                f"for {competency_name} Level {level}: {error}"
+            )
+            continue  # Fallback to standard template breakdown
+
+        if not customized_breakdown:
+            continue
+
+        objective_entry = all_objectives[competency_id][level]
+        objective_entry['pmt_breakdown'] = customized_breakdown
+        objective_entry['customized'] = True
+        objective_entry['source'] = 'pmt_customized'
+
+        # Also update the unified text to reflect customization
+        # by combining the customized breakdown sections
+        combined_sections = []
+        if customized_breakdown.get('process'):
+            combined_sections.append(customized_breakdown['process'])
+        if customized_breakdown.get('method'):
+            combined_sections.append(customized_breakdown['method'])
+        if customized_breakdown.get('tool'):
+            combined_sections.append(customized_breakdown['tool'])
+        if combined_sections:
+            objective_entry['objective_text'] = ' '.join(combined_sections)
+
     logger.info(
         f"[generate_learning_objectives] Complete - generated objectives for "
         f"{len(all_objectives)} competencies"
@@ -1671,50 +1586,21 @@ def generate_learning_objectives(
     return all_objectives
 
 
-def load_learning_objective_templates() -> Optional[Dict]:
+def load_learning_objective_templates() -> Optional[TemplateRegistry]:
     """
-    Load learning objective templates from JSON file.
+    Get the process-wide learning objective template registry.
+
+    The template JSON is parsed once per process and re-parsed only when the
+    file changes (see learning_objective_templates.py); lookups are O(1).
 
     Returns:
-        {
-            'competencies': [...],
-            'learningObjectiveTemplates': {
-                'Systems Thinking': {
-                    '1': 'The participant knows...',
-                    '2': 'The participant understands...',
-                    '4': 'The participant is able to...',
-                    '6': 'The participant is able to...'
-                },
-                ...
-            }
-        } or None if loading fails
+        TemplateRegistry indexed by (competency_name, level), or None if
+        the template file cannot be loaded
     """
-    import json
-    import os
-    from pathlib import Path
-
-    # Path to template JSON (v2 with PMT breakdown structure)
-    # Supports both Docker deployment and local development
-    _current_file = Path(__file__).resolve()
-    _backend_root = _current_file.parent.parent.parent  # services -> app -> backend
-
-    # Path 1: Docker path (template inside backend)
-    docker_path = _backend_root / 'data' / 'templates' / 'se_qpt_learning_objectives_template_v2.json'
-    if docker_path.exists():
-        template_path = str(docker_path)
-    else:
-        # Path 2: Local dev path (template at project root)
-        _project_root = _backend_root.parent.parent  # backend -> src -> project_root
-        template_path = str(_project_root / 'data' / 'source' / 'Phase 2' / 'se_qpt_learning_objectives_template_v2.json')
-
     try:
-        with open(template_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            logger.info(f"[load_learning_objective_templates] Loaded templates from {template_path}")
-            return data
-
+        return get_template_registry()
     except FileNotFoundError:
-        logger.error(f"[load_learning_objective_templates] Template file not found: {template_path}")
+        logger.error(f"[load_learning_objective_templates] Template file not found: {TEMPLATE_PATH}")
         return None
 
     except json.JSONDecodeError as e:
@@ -1726,12 +1612,12 @@ def load_learning_objective_templates() -> Optional[Dict]:
         return None
 
 
-def get_template_objective(templates: Dict, competency_name: str, level: int) -> Optional[str]:
+def get_template_objective(templates: TemplateRegistry, competency_name: str, level: int) -> Optional[str]:
     """
     Get learning objective template text for a competency and level.
 
     Args:
-        templates: Loaded template data
+        templates: Template registry (load_learning_objective_templates())
         competency_name: Name of competency (e.g., 'Systems Thinking')
         level: Level (1, 2, 4, or 6)
 
@@ -1746,40 +1632,31 @@ def get_template_objective(templates: Dict, competency_name: str, level: int) ->
         This function returns the unified/simple text for backward compatibility.
         Use get_template_objective_with_pmt() to get full PMT breakdown.
     """
-    template_dict = templates.get('learningObjectiveTemplates', {})
-
-    if competency_name not in template_dict:
+    if not templates.has_competency(competency_name):
         logger.warning(
             f"[get_template_objective] Competency '{competency_name}' "
             f"not found in templates"
         )
         return None
 
-    competency_templates = template_dict[competency_name]
-    level_str = str(level)
+    entry = templates.get(competency_name, level)
 
-    if level_str not in competency_templates:
+    if entry is None:
         logger.warning(
             f"[get_template_objective] Level {level} not found for "
             f"competency '{competency_name}'"
         )
         return None
 
-    template_data = competency_templates[level_str]
-
-    # Handle both string and dict (with PMT breakdown) formats
-    if isinstance(template_data, dict):
-        return template_data.get('unified', '')
-    else:
-        return template_data
+    return entry.objective_text if entry.objective_text is not None else ''
 
 
-def get_template_objective_with_pmt(templates: Dict, competency_name: str, level: int) -> Dict:
+def get_template_objective_with_pmt(templates: TemplateRegistry, competency_name: str, level: int) -> Dict:
     """
     Get learning objective template with PMT breakdown for a competency and level.
 
     Args:
-        templates: Loaded template data
+        templates: Template registry (load_learning_objective_templates())
         competency_name: Name of competency (e.g., 'Systems Thinking')
         level: Level (1, 2, 4, or 6)
 
@@ -1795,41 +1672,32 @@ def get_template_objective_with_pmt(templates: Dict, competency_name: str, level
             }
         }
     """
-    template_dict = templates.get('learningObjectiveTemplates', {})
-
     result = {
         'objective_text': None,
         'has_pmt': False,
         'pmt_breakdown': None
     }
 
-    if competency_name not in template_dict:
+    if not templates.has_competency(competency_name):
         logger.warning(
             f"[get_template_objective_with_pmt] Competency '{competency_name}' "
             f"not found in templates"
         )
         return result
 
-    competency_templates = template_dict[competency_name]
-    level_str = str(level)
+    entry = templates.get(competency_name, level)
 
-    if level_str not in competency_templates:
+    if entry is None:
         logger.warning(
             f"[get_template_objective_with_pmt] Level {level} not found for "
             f"competency '{competency_name}'"
         )
         return result
 
-    template_data = competency_templates[level_str]
-
-    # Handle both string and dict (with PMT breakdown) formats
-    if isinstance(template_data, dict):
-        result['objective_text'] = template_data.get('unified', '')
-        if 'pmt_breakdown' in template_data:
-            result['has_pmt'] = True
-            result['pmt_breakdown'] = template_data['pmt_breakdown']
-    else:
-        result['objective_text'] = template_data
+    result['objective_text'] = entry.objective_text if entry.objective_text is not None else ''
+    if entry.has_pmt:
+        result['has_pmt'] = True
+        result['pmt_breakdown'] = entry.pmt_breakdown_dict()
 
     return result
 
@@ -2097,12 +1965,10 @@ Instructions:
 Return ONLY the customized learning objective text (or the original if PMT doesn't apply), nothing else."""
 
     try:
-        # Call OpenAI GPT-4 using new SDK (v1.x)
-        from openai import OpenAI
-        client = OpenAI(api_key=api_key)
-
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
+        # Call OpenAI GPT-4 via the pooled, rate-limited client
+        response = chat_completion(
+            api_key,
+            model=PMT_CUSTOMIZATION_MODEL,
             messages=[
                 {"role": "system", "content": "You are an expert in Systems Engineering education. Stay strictly within the competency topic provided."},
                 {"role": "user", "content": prompt}
@@ -2243,13 +2109,10 @@ Otherwise, return the customized sections in this EXACT JSON format:
 Return ONLY the JSON object, nothing else."""
 
     try:
-        # Call OpenAI GPT-4 using new SDK (v1.x)
-        from openai import OpenAI
-        import json
-        client = OpenAI(api_key=api_key)
-
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
+        # Call OpenAI GPT-4 via the pooled, rate-limited client
+        response = chat_completion(
+            api_key,
+            model=PMT_CUSTOMIZATION_MODEL,
             messages=[
                 {"role": "system", "content": "You are an expert in Systems Engineering education. Return only valid JSON. Stay strictly within the competency topic provided."},
                 {"role": "user", "content": prompt}
@@ -2328,6 +2191,96 @@ Return ONLY the JSON object, nothing else."""
         return None
 
 
+def pmt_fragment_inputs(
+    competency_name: str,
+    level: int,
+    template: object,
+    pmt_context: Dict
+) -> Dict:
+    """
+    Exact prompt inputs of a PMT customization call (fragment cache key).
+
+    Mirrors the values interpolated into the customize_* prompts, so two
+    organizations with the same PMT wording map to the same key.
+    """
+    return {
+        'competency_name': competency_name,
+        'level': level,
+        'template': template,
+        'processes': pmt_context.get('processes', 'company processes'),
+        'methods': pmt_context.get('methods', 'current methods'),
+        'tools': pmt_context.get('tools', 'existing tools')
+    }
+
+
+def run_cached_customizations(
+    namespace: str,
+    prompt_version: str,
+    customize_fn,
+    arg_tuples: List[Tuple]
+) -> List[Tuple]:
+    """
+    Run customize_fn(competency_name, level, template, pmt_context) for every
+    args tuple, serving repeated fragments from the LLM response cache.
+
+    Cache lookups and stores run in the calling thread (database access);
+    only cache misses are dispatched to the concurrent LLM executor. Stored
+    fragments are persisted by the caller's commit (save_to_cache).
+
+    Returns:
+        [(result, None) | (None, exception), ...] in input order
+    """
+    if not arg_tuples:
+        return []
+
+    cache = get_fragment_cache()
+    keys = [
+        compute_fragment_key(
+            namespace, PMT_CUSTOMIZATION_MODEL, prompt_version,
+            pmt_fragment_inputs(*args)
+        )
+        for args in arg_tuples
+    ]
+    cached = cache.get_many(keys) if cache else {}
+
+    miss_indices = [i for i, key in enumerate(keys) if key not in cached]
+
+    # Report LLM call counts to a background job, if one is tracking progress
+    progress = current_progress()
+    call_fn = customize_fn
+    if progress is not None:
+        progress.add_llm_calls(pending=len(miss_indices), cached=len(keys) - len(miss_indices))
+
+        def call_fn(*args):
+            try:
+                return customize_fn(*args)
+            finally:
+                progress.llm_call_done()
+
+    fresh_results = run_ordered(call_fn, [arg_tuples[i] for i in miss_indices])
+
+    results = [(cached.get(key), None) for key in keys]
+    to_store = {}
+    for i, (value, error) in zip(miss_indices, fresh_results):
+        results[i] = (value, error)
+        if error is None and value:
+            to_store[keys[i]] = {
+                'namespace': namespace,
+                'model': PMT_CUSTOMIZATION_MODEL,
+                'prompt_version': prompt_version,
+                'response': value
+            }
+
+    if cache:
+        cache.put_many(to_store)
+        logger.info(
+            f"[run_cached_customizations] {namespace}: {len(keys) - len(miss_indices)} cached, "
+            f"{len(miss_indices)} LLM calls - cache stats {cache.stats()}"
+        )
+
+    return results
+
+
 # =============================================================================
 # ALGORITHM 7: Structure Pyramid Output
 # =============================================================================
@@ -2420,7 +2373,7 @@ def structure_pyramid_output(
 
         # Process all competencies (show all 16, even if grayed)
         for competency_id in all_competency_ids:
-            competency = Competency.query.get(competency_id)
+            competency = get_reference_data().competency(competency_id)
             competency_name = competency.competency_name if competency else f"Competency {competency_id}"
 
             target_level = main_targets.get(competency_id, 0)
@@ -2628,7 +2581,7 @@ def generate_strategy_comparison(
 
     # Process each competency
     for competency_id in all_competency_ids:
-        competency = Competency.query.get(competency_id)
+        competency = get_reference_data().competency(competency_id)
         competency_name = competency.competency_name if competency else f"Competency {competency_id}"
 
         target_level = main_targets.get(competency_id, 0)
@@ -2711,7 +2664,9 @@ def generate_strategy_comparison(
 def generate_complete_learning_objectives(
     org_id: int,
     selected_strategies: List[Dict],
-    pmt_context: Optional[Dict] = None
+    pmt_context: Optional[Dict] = None,
+    force: bool = False,
+    progress: Optional[GenerationProgress] = None
 ) -> Dict:
     """
     Master orchestration function - Generate complete learning objectives.
@@ -2742,6 +2697,9 @@ def generate_complete_learning_objectives(
                 'methods': 'Scrum, V-Model',
                 'tools': 'DOORS, JIRA, Git'
             }
+        force: Skip the cached-result check and regenerate
+        progress: Optional GenerationProgress updated with the running
+            algorithm and LLM call counts (used by background jobs)
 
     Returns:
         {
@@ -2798,6 +2756,11 @@ def generate_complete_learning_objectives(
     )
 
     start_time = datetime.utcnow()
+    progress_token = set_current_progress(progress)
+
+    def report_algorithm(number: int) -> None:
+        if progress is not None:
+            progress.start_algorithm(number)
 
     try:
         # =================================================================
@@ -2806,16 +2769,18 @@ def generate_complete_learning_objectives(
         input_hash = compute_input_hash(org_id, selected_strategies, pmt_context)
         print(f"[CACHING] Computed input hash: {input_hash[:16]}...")
 
-        cached_result = get_cached_objectives(org_id, input_hash)
-        if cached_result:
-            print(f"[CACHING] Returning CACHED result for org {org_id}")
-            return cached_result
+        if not force:
+            cached_result = get_cached_objectives(org_id, input_hash)
+            if cached_result:
+                print(f"[CACHING] Returning CACHED result for org {org_id}")
+                return cached_result
 
         print(f"[CACHING] No valid cache, generating NEW objectives...")
 
         # =================================================================
         # ALGORITHM 1: Calculate Combined Targets
         # =================================================================
+        report_algorithm(1)
         logger.info("[ALGORITHM 1] Calculating combined targets...")
         targets_result = calculate_combined_targets(selected_strategies)
 
@@ -2828,11 +2793,17 @@ def generate_complete_learning_objectives(
         # =================================================================
         # ALGORITHM 2: Validate Mastery Requirements
         # =================================================================
+        # One set-based snapshot of roles, requirements and latest scores,
+        # shared by Algorithms 2, 3 and 5
+        report_algorithm(2)
+        snapshot = OrgScoreSnapshot.load(org_id)
+
         logger.info("[ALGORITHM 2] Validating mastery requirements...")
         validation_result = validate_mastery_requirements(
             org_id,
             selected_strategies,
-            main_targets
+            main_targets,
+            snapshot=snapshot
         )
 
         logger.info(
@@ -2843,8 +2814,9 @@ def generate_complete_learning_objectives(
         # =================================================================
         # ALGORITHM 3 + 4: Detect Gaps (includes Training Method determination)
         # =================================================================
+        report_algorithm(3)
         logger.info("[ALGORITHM 3+4] Detecting gaps and determining training methods...")
-        gaps_data = detect_gaps(org_id, main_targets, ttt_targets)
+        gaps_data = detect_gaps(org_id, main_targets, ttt_targets, snapshot=snapshot)
 
         has_roles = gaps_data['metadata']['has_roles']
         logger.info(
@@ -2855,8 +2827,9 @@ def generate_complete_learning_objectives(
         # =================================================================
         # ALGORITHM 5: Process TTT Gaps
         # =================================================================
+        report_algorithm(5)
         logger.info("[ALGORITHM 5] Processing TTT gaps...")
-        ttt_data = process_ttt_gaps(org_id, ttt_targets)
+        ttt_data = process_ttt_gaps(org_id, ttt_targets, snapshot=snapshot)
 
         if ttt_data:
             logger.info(
@@ -2869,6 +2842,7 @@ def generate_complete_learning_objectives(
         # =================================================================
         # ALGORITHM 6: Generate Learning Objectives
         # =================================================================
+        report_algorithm(6)
         logger.info("[ALGORITHM 6] Generating learning objectives...")
         objectives = generate_learning_objectives(
             gaps_data['by_competency'],
@@ -2888,31 +2862,46 @@ def generate_complete_learning_objectives(
             ttt_objectives = {}
             templates = load_learning_objective_templates()
 
+            ttt_templates = []
             for comp_data in ttt_data['competencies']:
-                comp_id = comp_data['competency_id']
                 comp_name = comp_data['competency_name']
 
                 # Get Level 6 template
                 template_text = get_template_objective(templates, comp_name, 6)
                 if not template_text:
                     template_text = generate_generic_objective(comp_name, 6)
+                ttt_templates.append(template_text)
+
+            # PMT customization for TTT (optional) - run concurrently
+            if pmt_context:
+                ttt_customizations = run_cached_customizations(
+                    'ttt_objective',
+                    TTT_OBJECTIVE_PROMPT_VERSION,
+                    customize_objective_with_pmt,
+                    [
+                        (comp_data['competency_name'], 6, template_text, pmt_context)
+                        for comp_data, template_text in zip(ttt_data['competencies'], ttt_templates)
+                    ]
+                )
+            else:
+                ttt_customizations = [(None, None)] * len(ttt_templates)
+
+            for comp_data, template_text, (customized_text, error) in zip(
+                ttt_data['competencies'], ttt_templates, ttt_customizations
+            ):
+                comp_id = comp_data['competency_id']
+                comp_name = comp_data['competency_name']
 
-                # PMT customization for TTT (optional)
                 customized = False
                 final_text = template_text
 
-                if pmt_context:
-                    try:
-                        customized_text = customize_objective_with_pmt(
-                            comp_name, 6, template_text, pmt_context
-                        )
-                        if customized_text:
-                            final_text = customized_text
-                            customized = True
-                    except Exception as e:
-                        logger.warning(
-                            f"[ALGORITHM 6] TTT customization failed for {comp_name}: {e}"
-                        )
+                if error is not None:
+                    logger.warning(
+                        f"[ALGORITHM 6] TTT customization failed for {comp_name}: {error}"
+                    )
+                elif customized_text:
+                    final_text = customized_text
+                    customized = True
 
                 ttt_objectives[comp_id] = {
                     'level': 6,
@@ -2932,6 +2921,7 @@ def generate_complete_learning_objectives(
         # =================================================================
         # ALGORITHM 7: Structure Pyramid Output
         # =================================================================
+        report_algorithm(7)
         logger.info("[ALGORITHM 7] Structuring pyramid output...")
         main_pyramid = structure_pyramid_output(
             org_id,
@@ -2949,6 +2939,7 @@ def generate_complete_learning_objectives(
         # =================================================================
         # ALGORITHM 8: Strategy Comparison
         # =================================================================
+        report_algorithm(8)
         logger.info("[ALGORITHM 8] Generating strategy comparison...")
         strategy_comparison = generate_strategy_comparison(
             org_id,
@@ -3036,3 +3027,6 @@ def generate_complete_learning_objectives(
             exc_info=True
         )
         raise
+
+    finally:
+        reset_current_progress(progress_token)
@@ -0,0 +1,811 @@
+"""
+Learning Objectives Export - Pre-rendered, content-addressed export artifacts
+============================================================================
+
+GET /phase2/learning-objectives/<org_id>/export used to rebuild the openpyxl
+workbook or reportlab document from GeneratedLearningObjectives.objectives_data
+in memory on every click.
+
+Exports are now rendered once per
+
+    (organization, input_hash, format, filter options + organization name
+     + EXPORT_RENDER_VERSION)
+
+and stored in two tables:
+- learning_objectives_export (LearningObjectivesExport): one row per key,
+  pointing to the content hash - small, so conditional requests never load
+  the file itself
+- export_blob (ExportBlob): the rendered bytes, keyed by their SHA-256
+  (content-addressed; identical renders are stored once)
+
+The content hash is the ETag, so a repeated download with If-None-Match is a
+304 without rendering or reading the blob.
+
+Rendering happens right after generation (prerender_exports() - inline in
+lo_worker.py jobs, on a background thread for synchronous generation) for
+the configured formats with the default filter options; other options are
+rendered on first request and stored the same way. save_to_cache() deletes
+the organization's artifacts in the same transaction as the new objectives,
+unreferenced blobs are pruned after each prerender (the foreign key from
+learning_objectives_export.content_hash keeps a prune in another worker from
+deleting a blob that is referenced meanwhile).
+
+Large organizations (many role gap entries) get the Excel sheet streamed
+with openpyxl's write-only mode; both modes write the same row layout.
+
+Renders are byte-for-byte reproducible, so equal content really shares one
+blob and the ETag only changes with the objectives: the workbook properties
+and zip entry times are set to the generation time, and reportlab runs in
+invariant mode (fixed CreationDate and document /ID).
+
+Bump EXPORT_RENDER_VERSION whenever the rendered output changes - it is part
+of the options key, so stored artifacts are re-rendered.
+
+Date: 2026-10-18
+"""
+
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+import zipfile
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+from app.services.config_loader import get_learning_objectives_export_settings
+
+try:
+    from models import db, ExportBlob, GeneratedLearningObjectives, LearningObjectivesExport, Organization
+except ImportError:
+    from app.models import db, ExportBlob, GeneratedLearningObjectives, LearningObjectivesExport, Organization
+
+logger = logging.getLogger(__name__)
+
+EXPORT_RENDER_VERSION = "v2"
+
+# format -> (content type, file extension)
+EXPORT_FORMATS = {
+    'json': ('application/json', 'json'),
+    'excel': ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'xlsx'),
+    'pdf': ('application/pdf', 'pdf')
+}
+
+
+class ExportUnavailableError(RuntimeError):
+    """The library needed for a format is not installed"""
+
+
+class StrategyNotFoundError(LookupError):
+    """The strategy filter matches no strategy in the objectives"""
+
+
+# =============================================================================
+# KEYS AND FILTERING
+# =============================================================================
+
+def export_options(strategy: Optional[str] = None, include_validation: bool = True) -> Dict:
+    """Filter options of an export (part of the artifact key)"""
+    return {'strategy': strategy or None, 'include_validation': bool(include_validation)}
+
+
+def options_key(options: Dict, org_name: str) -> str:
+    """
+    SHA-256 of the options, the organization name (printed in the PDF - a
+    renamed organization gets new artifacts) and the render version
+    """
+    key_input = json.dumps({
+        'options': options, 'org_name': org_name, 'render_version': EXPORT_RENDER_VERSION
+    }, sort_keys=True)
+    return hashlib.sha256(key_input.encode('utf-8')).hexdigest()
+
+
+def filter_objectives(result: Dict, options: Dict) -> Dict:
+    """
+    Apply the export filter options to the cached objectives.
+
+    Raises:
+        StrategyNotFoundError: the strategy filter matches no strategy
+    """
+    objectives_data = result.copy()
+    strategy_filter = options.get('strategy')
+    if strategy_filter:
+        filtered_objectives = {
+            strategy_id: strategy_data
+            for strategy_id, strategy_data in result.get('learning_objectives_by_strategy', {}).items()
+            if strategy_data.get('strategy_name') == strategy_filter
+        }
+        if not filtered_objectives:
+            raise StrategyNotFoundError(f'No objectives found for strategy "{strategy_filter}"')
+        objectives_data['learning_objectives_by_strategy'] = filtered_objectives
+
+    # Remove validation results if not requested
+    if not options.get('include_validation', True):
+        objectives_data.pop('strategy_validation', None)
+        objectives_data.pop('strategic_decisions', None)
+        objectives_data.pop('cross_strategy_coverage', None)
+
+    return objectives_data
+
+
+def export_filename(export_format: str, org_name: str) -> str:
+    """Download file name (not part of the stored artifact)"""
+    extension = EXPORT_FORMATS[export_format][1]
+    if export_format == 'excel':
+        return f"learning_objectives_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
+    return f"learning_objectives_{org_name.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}.{extension}"
+
+
+# =============================================================================
+# RENDERERS - bytes of one export file
+# =============================================================================
+
+def render_json(data: Dict, org_name: str, generated_at: Optional[datetime]) -> bytes:
+    """Learning objectives as pretty-printed JSON"""
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+# Timestamp of renders without a generation time (keeps them reproducible)
+RENDER_EPOCH = datetime(2000, 1, 1)
+
+
+# ----- Excel (Organizational View) -----
+
+EXCEL_SHEET_TITLE = 'Learning Objectives'
+EXCEL_COLUMN_WIDTHS = {'A': 30, 'B': 65, 'C': 65, 'D': 65}
+EXCEL_MERGES = ('A1:D1', 'B3:D3')
+EXCEL_MATRIX_ROW_HEIGHT = 200
+
+# Level columns (without L1, L2, L4 suffixes)
+EXCEL_LEVELS = [1, 2, 4]
+EXCEL_HEADERS = ['Competency', 'Knowing SE', 'Understanding SE', 'Applying SE']
+
+
+def _excel_styles() -> Dict[str, Dict]:
+    """Named cell styles (openpyxl is imported here so the module imports without it)"""
+    from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+
+    header_fill = PatternFill(start_color='4472C4', end_color='4472C4', fill_type='solid')
+    achieved_fill = PatternFill(start_color='C6EFCE', end_color='C6EFCE', fill_type='solid')  # Light green
+    gap_fill = PatternFill(start_color='FFEB9C', end_color='FFEB9C', fill_type='solid')  # Light yellow/orange
+    not_targeted_fill = PatternFill(start_color='D9D9D9', end_color='D9D9D9', fill_type='solid')  # Gray
+    not_targeted_font = Font(color='808080', italic=True)  # Gray italic text
+    thin_border = Border(
+        left=Side(style='thin'),
+        right=Side(style='thin'),
+        top=Side(style='thin'),
+        bottom=Side(style='thin')
+    )
+    matrix_alignment = Alignment(vertical='top', wrap_text=True)
+
+    return {
+        'title': {'font': Font(size=16, bold=True), 'alignment': Alignment(horizontal='center')},
+        'label': {'font': Font(bold=True)},
+        'legend_achieved': {'fill': achieved_fill},
+        'legend_gap': {'fill': gap_fill},
+        'legend_not_targeted': {'fill': not_targeted_fill, 'font': not_targeted_font},
+        'header': {
+            'font': Font(bold=True, color='FFFFFF'),
+            'fill': header_fill,
+            'alignment': Alignment(horizontal='center', vertical='center', wrap_text=True),
+            'border': thin_border
+        },
+        'competency': {'font': Font(bold=True), 'alignment': matrix_alignment, 'border': thin_border},
+        'achieved': {'fill': achieved_fill, 'alignment': matrix_alignment, 'border': thin_border},
+        'gap': {'fill': gap_fill, 'alignment': matrix_alignment, 'border': thin_border},
+        'not_targeted': {
+            'fill': not_targeted_fill, 'font': not_targeted_font,
+            'alignment': matrix_alignment, 'border': thin_border
+        },
+        'fallback': {'fill': not_targeted_fill, 'alignment': matrix_alignment, 'border': thin_border}
+    }
+
+
+def _format_lo_as_bullets(text):
+    """Convert LO text to bullet points by splitting on sentences."""
+    if not text:
+        return ''
+    # Split on periods followed by space or end, but keep sentences meaningful
+    sentences = re.split(r'\.(?=\s|$)', text)
+    sentences = [s.strip() for s in sentences if s.strip()]
+    if len(sentences) <= 1:
+        return text  # Single sentence, return as-is
+    # Format as bullet points
+    return '\n'.join([f"* {s}." if not s.endswith('.') else f"* {s}" for s in sentences])
+
+
+def _extract_objective_text(lo_data):
+    """Extract clean objective text and PMT breakdown from various LO data formats."""
+    if not lo_data:
+        return '', None
+
+    if isinstance(lo_data, str):
+        return lo_data, None
+
+    if isinstance(lo_data, dict):
+        pmt_breakdown = None
+
+        # Check for PMT breakdown in the learning_objective object
+        if lo_data.get('has_pmt_breakdown') and lo_data.get('pmt_breakdown'):
+            pmt_breakdown = lo_data['pmt_breakdown']
+
+        # Check for objective_text field
+        if 'objective_text' in lo_data:
+            return lo_data['objective_text'], pmt_breakdown
+
+        # Check for direct PMT fields (process, method, tool)
+        if 'process' in lo_data or 'method' in lo_data or 'tool' in lo_data:
+            # This is the PMT breakdown itself
+            return '', {
+                'process': lo_data.get('process', ''),
+                'method': lo_data.get('method', ''),
+                'tool': lo_data.get('tool', '')
+            }
+
+        # Fallback: try to get any text-like field
+        for key in ['text', 'content', 'description']:
+            if key in lo_data:
+                return str(lo_data[key]), pmt_breakdown
+
+    return str(lo_data) if lo_data else '', None
+
+
+def _format_pmt_breakdown(pmt):
+    """Format PMT breakdown with clear labels."""
+    if not pmt:
+        return ''
+    parts = []
+    if pmt.get('process'):
+        parts.append(f"[PROCESS]\n{pmt['process']}")
+    if pmt.get('method'):
+        parts.append(f"[METHOD]\n{pmt['method']}")
+    if pmt.get('tool'):
+        parts.append(f"[TOOL]\n{pmt['tool']}")
+    return '\n\n'.join(parts)
+
+
+def _lo_content(lo_data) -> str:
+    lo_text, pmt_breakdown = _extract_objective_text(lo_data)
+    if pmt_breakdown:
+        # Show PMT breakdown with clear sections
+        return _format_pmt_breakdown(pmt_breakdown)
+    if lo_text:
+        return _format_lo_as_bullets(lo_text)
+    return ''
+
+
+def _collect_competencies(data: Dict) -> Tuple[Dict, int, set, int]:
+    """
+    Competency x level matrix from the main pyramid (data.main_pyramid).
+
+    Returns:
+        (competencies by id, levels to advance, competency ids with a gap,
+        number of role gap entries)
+    """
+    all_competencies = {}
+    total_gaps = 0
+    competencies_with_gaps = set()
+    role_entries = 0
+
+    levels_data = data.get('data', {}).get('main_pyramid', {}).get('levels', {})
+
+    for level_str, level_info in levels_data.items():
+        level_num = int(level_str)
+        if level_num not in EXCEL_LEVELS:
+            continue
+        for comp in level_info.get('competencies', []):
+            comp_id = comp.get('competency_id')
+            status = comp.get('status', 'achieved')
+            grayed_out = comp.get('grayed_out', False)
+            target_level = comp.get('target_level', 0)
+            current_level = comp.get('current_level', 0)
+
+            if comp_id not in all_competencies:
+                all_competencies[comp_id] = {
+                    'name': comp.get('competency_name', f'Competency {comp_id}'),
+                    'target_level': target_level,
+                    'current_level': current_level,
+                    'levels': {}
+                }
+
+            # Get gap_data roles if available
+            gap_data = comp.get('gap_data', {})
+            roles_data = gap_data.get('roles', {}) if gap_data else {}
+
+            # Extract roles needing this level
+            roles_needing = []
+            for role_id, role_info in roles_data.items():
+                if isinstance(role_info, dict):
+                    level_details = role_info.get('level_details', {}).get(level_num, {})
+                    if level_details or level_num in role_info.get('levels_needed', []):
+                        roles_needing.append({
+                            'role_name': role_info.get('role_name', f'Role {role_id}'),
+                            'users_needing': level_details.get('users_needing', role_info.get('users_needing_training', 0)),
+                            'total_users': level_details.get('total_users', role_info.get('total_users', 0))
+                        })
+            role_entries += len(roles_needing)
+
+            all_competencies[comp_id]['levels'][level_num] = {
+                'status': status,
+                'grayed_out': grayed_out,
+                'learning_objective': comp.get('learning_objective', ''),
+                'target_level': target_level,
+                'current_level': current_level,
+                'roles_needing': roles_needing
+            }
+
+            if status == 'training_required' and not grayed_out:
+                total_gaps += 1
+                competencies_with_gaps.add(comp_id)
+
+    return all_competencies, total_gaps, competencies_with_gaps, role_entries
+
+
+def _matrix_cell(level_num: int, level_data: Dict) -> Tuple[str, str]:
+    """(value, style) of one competency/level cell"""
+    if not level_data:
+        return 'Not Targeted', 'not_targeted'
+
+    status = level_data.get('status', 'achieved')
+    grayed_out = level_data.get('grayed_out', False)
+    target_level = level_data.get('target_level', 0)
+    current_level = level_data.get('current_level', 0)
+
+    # Must match frontend SimpleCompetencyCard.vue logic
+    # 1. If status is already 'not_targeted', keep it
+    # 2. If target_level is 0, this level is NOT TARGETED
+    # 3. If level_num > target_level (showing higher level than target), it's NOT TARGETED
+    # 4. If current_level >= target_level (and target_level > 0), status should be achieved (no gap)
+    if status == 'not_targeted':
+        pass
+    elif target_level == 0:
+        status = 'not_targeted'
+    elif level_num > target_level:
+        status = 'not_targeted'
+    elif current_level >= target_level:
+        status = 'achieved'
+
+    if status == 'not_targeted':
+        # NOT TARGETED - gray cell, no LO text
+        return 'Not Targeted', 'not_targeted'
+
+    if status == 'achieved' or (grayed_out and status != 'training_required'):
+        # ACHIEVED - green cell with LO text
+        return _lo_content(level_data.get('learning_objective', '')), 'achieved'
+
+    if status == 'training_required' and not grayed_out:
+        # TRAINING REQUIRED - yellow cell with role info and LO text
+        content_parts = []
+        roles = level_data.get('roles_needing', [])
+        if roles:
+            role_strs = [f"{r.get('role_name', '?')} ({r.get('users_needing', 0)}/{r.get('total_users', 0)})" for r in roles]
+            content_parts.append(f"Roles: {', '.join(role_strs)}")
+            content_parts.append('')
+        lo_content = _lo_content(level_data.get('learning_objective', ''))
+        if lo_content:
+            content_parts.append(lo_content)
+        return '\n'.join(content_parts), 'gap'
+
+    # Fallback for any other case
+    return '-', 'fallback'
+
+
+ExcelRow = Tuple[List[Tuple[object, Optional[str]]], Optional[float]]
+
+
+def _excel_rows(data: Dict, all_competencies: Dict, total_gaps: int, competencies_with_gaps: set) -> Iterator[ExcelRow]:
+    """Sheet rows as ([(value, style name)], row height) - generated lazily for the write-only mode"""
+    selected_strategies = data.get('selected_strategies', [])
+    if not selected_strategies:
+        selected_strategies = data.get('metadata', {}).get('selected_strategies', [])
+    strategy_names = ', '.join([s.get('name', s.get('strategy_name', 'Unknown')) for s in selected_strategies])
+
+    # Header section (rows 1-5) and legend (rows 7-10)
+    yield [('Learning Objectives - Organizational View', 'title')], None
+    yield [], None
+    yield [('Selected Strategies:', 'label'), (strategy_names if strategy_names else 'None', None)], None
+    yield [('Levels to Advance:', 'label'), (total_gaps, None)], None
+    yield [('Competencies with Gap:', 'label'), (len(competencies_with_gaps), None)], None
+    yield [], None
+    yield [('Legend:', 'label')], None
+    yield [('Green', 'legend_achieved'), ('Level achieved (no training needed)', None)], None
+    yield [('Yellow', 'legend_gap'), ('Gap exists (training required)', None)], None
+    yield [('Gray', 'legend_not_targeted'), ('Not targeted by selected strategies', None)], None
+    yield [], None
+
+    # Competency table
+    yield [(header, 'header') for header in EXCEL_HEADERS], None
+    for comp_id in sorted(all_competencies.keys()):
+        comp_data = all_competencies[comp_id]
+        cells = [(comp_data['name'], 'competency')]
+        for level_num in EXCEL_LEVELS:
+            cells.append(_matrix_cell(level_num, comp_data['levels'].get(level_num, {})))
+        yield cells, EXCEL_MATRIX_ROW_HEIGHT
+
+
+def _styled(cell, style: Optional[Dict]):
+    for attribute, value in (style or {}).items():
+        setattr(cell, attribute, value)
+    return cell
+
+
+class _FixedTimeZipFile(zipfile.ZipFile):
+    """Deflated archive dating every entry timestamp (zipfile stamps the current time)"""
+
+    def __init__(self, file, timestamp: datetime):
+        super().__init__(file, 'w', zipfile.ZIP_DEFLATED, allowZip64=True)
+        self.date_time = max(timestamp, datetime(1980, 1, 1)).timetuple()[:6]
+
+    def _entry(self, name: str) -> zipfile.ZipInfo:
+        info = zipfile.ZipInfo(name, date_time=self.date_time)
+        info.compress_type = self.compression
+        return info
+
+    def writestr(self, zinfo_or_arcname, data, compress_type=None, compresslevel=None):
+        if not isinstance(zinfo_or_arcname, zipfile.ZipInfo):
+            zinfo_or_arcname = self._entry(zinfo_or_arcname)
+        super().writestr(zinfo_or_arcname, data, compress_type, compresslevel)
+
+    def write(self, filename, arcname=None, compress_type=None, compresslevel=None):
+        # Write-only worksheets are streamed from a temporary file
+        info = self._entry(arcname or os.path.basename(filename))
+        info.file_size = os.path.getsize(filename)
+        with open(filename, 'rb') as source, self.open(info, 'w') as target:
+            shutil.copyfileobj(source, target)
+
+
+def _write_excel(rows: Iterator[ExcelRow], write_only: bool, timestamp: datetime) -> bytes:
+    """
+    Write the sheet rows with a regular or a write-only (streaming) workbook.
+
+    timestamp is used as created/modified date of the workbook and of the
+    archive entries, so the same rows always give the same bytes.
+    """
+    import openpyxl
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.worksheet.cell_range import CellRange
+    from openpyxl.writer.excel import ExcelWriter
+
+    styles = _excel_styles()
+    workbook = openpyxl.Workbook(write_only=write_only)
+    if write_only:
+        sheet = workbook.create_sheet(EXCEL_SHEET_TITLE)
+    else:
+        sheet = workbook.active
+        sheet.title = EXCEL_SHEET_TITLE
+
+    # Column and row dimensions must be set before a write-only row is appended
+    for column, width in EXCEL_COLUMN_WIDTHS.items():
+        sheet.column_dimensions[column].width = width
+
+    for row_idx, (cells, height) in enumerate(rows, 1):
+        if height:
+            sheet.row_dimensions[row_idx].height = height
+        if write_only:
+            sheet.append([_styled(WriteOnlyCell(sheet, value=value), styles.get(style)) for value, style in cells])
+        else:
+            for col_idx, (value, style) in enumerate(cells, 1):
+                _styled(sheet.cell(row=row_idx, column=col_idx, value=value), styles.get(style))
+
+    for cell_range in EXCEL_MERGES:
+        if write_only:
+            sheet.merged_cells.add(CellRange(cell_range))
+        else:
+            sheet.merge_cells(cell_range)
+
+    # ExcelWriter directly - Workbook.save() overwrites the modified date with the current time
+    workbook.properties.created = timestamp
+    workbook.properties.modified = timestamp
+    buffer = io.BytesIO()
+    with _FixedTimeZipFile(buffer, timestamp) as archive:
+        ExcelWriter(workbook, archive).save()
+    return buffer.getvalue()
+
+
+def render_excel(data: Dict, org_name: str, generated_at: Optional[datetime],
+                 write_only: Optional[bool] = None) -> bytes:
+    """
+    Learning objectives as an Excel file matching the Organizational View.
+
+    Single sheet with:
+    - Competency rows x Level columns (Knowing, Understanding, Applying)
+    - Color coding: Green = Achieved, Yellow = Gap (training required), Gray = Not Targeted
+    - LO texts shown as bullet points for Achieved and Training Required
+    - Not Targeted cells are gray and show only "Not Targeted" text
+    - PMT breakdown shown separately (Process, Method, Tool)
+
+    Args:
+        write_only: stream rows with openpyxl's write-only mode; default from
+            the number of role gap entries (excel_write_only_min_role_entries)
+    """
+    try:
+        import openpyxl  # noqa: F401
+    except ImportError:
+        raise ExportUnavailableError('openpyxl library not installed. Install with: pip install openpyxl')
+
+    all_competencies, total_gaps, competencies_with_gaps, role_entries = _collect_competencies(data)
+    if write_only is None:
+        threshold = get_learning_objectives_export_settings()['excel_write_only_min_role_entries']
+        write_only = role_entries >= threshold
+
+    content = _write_excel(
+        _excel_rows(data, all_competencies, total_gaps, competencies_with_gaps),
+        write_only, generated_at or RENDER_EPOCH
+    )
+    logger.info(
+        f"[render_excel] {org_name}: {len(all_competencies)} competencies, {total_gaps} gaps, "
+        f"{role_entries} role entries ({'write-only' if write_only else 'regular'} workbook)"
+    )
+    return content
+
+
+# ----- PDF -----
+
+def render_pdf(data: Dict, org_name: str, generated_at: Optional[datetime]) -> bytes:
+    """Learning objectives report as PDF (reportlab)"""
+    try:
+        from reportlab.lib.pagesizes import A4
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.lib.units import inch
+        from reportlab.lib import colors
+    except ImportError:
+        raise ExportUnavailableError('reportlab library not installed. Install with: pip install reportlab')
+
+    buffer = io.BytesIO()
+    # invariant: fixed CreationDate and document /ID instead of the current time and a random ID
+    doc = SimpleDocTemplate(buffer, pagesize=A4, invariant=1)
+    story = []
+
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle('CustomTitle', parent=styles['Heading1'], fontSize=24, textColor=colors.HexColor('#1976D2'))
+    heading_style = ParagraphStyle('CustomHeading', parent=styles['Heading2'], fontSize=16, textColor=colors.HexColor('#424242'))
+
+    # Title
+    story.append(Paragraph('Learning Objectives Report', title_style))
+    story.append(Spacer(1, 0.3*inch))
+
+    # Organization info - the generation time, so the file only changes with the objectives
+    generated = generated_at or RENDER_EPOCH
+    story.append(Paragraph(f'<b>Organization:</b> {org_name}', styles['Normal']))
+    story.append(Paragraph(f'<b>Pathway:</b> {data.get("pathway", "N/A")}', styles['Normal']))
+    story.append(Paragraph(f'<b>Completion Rate:</b> {data.get("completion_rate", 0):.1f}%', styles['Normal']))
+    story.append(Paragraph(f'<b>Generated:</b> {generated.strftime("%Y-%m-%d %H:%M")}', styles['Normal']))
+    story.append(Spacer(1, 0.5*inch))
+
+    # Selected strategies
+    story.append(Paragraph('Selected Strategies', heading_style))
+    for strategy in data.get('selected_strategies', []):
+        story.append(Paragraph(f'• {strategy["name"]} (Priority {strategy["priority"]})', styles['Normal']))
+    story.append(Spacer(1, 0.3*inch))
+
+    # Learning objectives per strategy
+    for strategy_id, strategy_data in data.get('learning_objectives_by_strategy', {}).items():
+        story.append(PageBreak())
+
+        strategy_name = strategy_data.get('strategy_name', f'Strategy {strategy_id}')
+        story.append(Paragraph(strategy_name, heading_style))
+        story.append(Spacer(1, 0.2*inch))
+
+        # Summary
+        summary = strategy_data.get('summary', {})
+        story.append(Paragraph('<b>Summary:</b>', styles['Normal']))
+        story.append(Paragraph(f'• Training Required: {summary.get("competencies_requiring_training", 0)} competencies', styles['Normal']))
+        story.append(Paragraph(f'• Targets Achieved: {summary.get("competencies_targets_achieved", 0)} competencies', styles['Normal']))
+        story.append(Spacer(1, 0.3*inch))
+
+        # Trainable competencies
+        trainable = strategy_data.get('trainable_competencies', [])
+        training_required = [c for c in trainable if c.get('status') == 'training_required']
+
+        if training_required:
+            story.append(Paragraph('<b>Learning Objectives:</b>', styles['Normal']))
+            story.append(Spacer(1, 0.1*inch))
+
+            for comp in training_required:
+                story.append(Paragraph(f'<b>{comp.get("competency_name")}</b> (Gap: {comp.get("current_level", 0)} → {comp.get("target_level", 0)})', styles['Normal']))
+                story.append(Paragraph(comp.get('learning_objective', 'N/A'), styles['BodyText']))
+                story.append(Spacer(1, 0.2*inch))
+
+    doc.build(story)
+    return buffer.getvalue()
+
+
+RENDERERS = {
+    'json': render_json,
+    'excel': render_excel,
+    'pdf': render_pdf
+}
+
+
+# =============================================================================
+# ARTIFACT STORE
+# =============================================================================
+
+def find_export(org_id: int, input_hash: str, export_format: str,
+                options: Dict, org_name: str) -> Optional[LearningObjectivesExport]:
+    """Stored artifact for the key, if any (does not load the file)"""
+    return LearningObjectivesExport.query.filter_by(
+        organization_id=org_id,
+        input_hash=input_hash,
+        export_format=export_format,
+        options_key=options_key(options, org_name)
+    ).first()
+
+
+def get_export_content(content_hash: str) -> Optional[bytes]:
+    blob = db.session.get(ExportBlob, content_hash)
+    return blob.content if blob else None
+
+
+def _store_blob(content: bytes) -> str:
+    content_hash = hashlib.sha256(content).hexdigest()
+    if db.session.get(ExportBlob, content_hash) is None:
+        db.session.add(ExportBlob(
+            content_hash=content_hash,
+            content=content,
+            size_bytes=len(content),
+            created_at=datetime.utcnow()
+        ))
+    return content_hash
+
+
+def render_export(cached: GeneratedLearningObjectives, org_name: str, export_format: str,
+                  options: Dict) -> LearningObjectivesExport:
+    """
+    Render one export of the cached objectives and store it.
+
+    Raises:
+        StrategyNotFoundError: the strategy filter matches no strategy
+        ExportUnavailableError: the format's library is not installed
+    """
+    result = cached.objectives_data
+    if isinstance(result, str):
+        result = json.loads(result)
+    data = filter_objectives(result, options)
+
+    started = time.perf_counter()
+    content = RENDERERS[export_format](data, org_name, cached.generated_at)
+    render_seconds = time.perf_counter() - started
+
+    for attempt in range(2):
+        artifact = LearningObjectivesExport(
+            organization_id=cached.organization_id,
+            input_hash=cached.input_hash,
+            export_format=export_format,
+            options_key=options_key(options, org_name),
+            options=options,
+            content_hash=_store_blob(content),
+            content_type=EXPORT_FORMATS[export_format][0],
+            size_bytes=len(content),
+            render_seconds=round(render_seconds, 3),
+            created_at=datetime.utcnow()
+        )
+        db.session.add(artifact)
+        try:
+            db.session.commit()
+            break
+        except IntegrityError:
+            # Rendered concurrently by another worker - keep the stored one
+            db.session.rollback()
+            existing = find_export(cached.organization_id, cached.input_hash, export_format, options, org_name)
+            if existing:
+                return existing
+            if attempt:
+                raise
+            # Otherwise the existing blob was pruned before the insert (foreign key) - store it again
+
+    logger.info(
+        f"[render_export] Org {cached.organization_id} {export_format} {options}: "
+        f"{len(content)} bytes in {render_seconds:.2f}s"
+    )
+    return artifact
+
+
+def delete_exports(org_id: int) -> int:
+    """
+    Delete the organization's artifacts (no commit - called by save_to_cache()
+    in the transaction that replaces the objectives). Blobs are pruned later.
+    """
+    return LearningObjectivesExport.query.filter_by(
+        organization_id=org_id
+    ).delete(synchronize_session=False)
+
+
+def prune_export_blobs() -> int:
+    """Delete blobs no artifact refers to"""
+    referenced = select(LearningObjectivesExport.content_hash)
+    try:
+        deleted = ExportBlob.query.filter(
+            ExportBlob.content_hash.not_in(referenced)
+        ).delete(synchronize_session=False)
+        db.session.commit()
+    except IntegrityError:
+        # A concurrent render started referring to one of them - pruned next time
+        db.session.rollback()
+        return 0
+    return deleted
+
+
+# =============================================================================
+# PRE-RENDERING AFTER GENERATION
+# =============================================================================
+
+def prerender_exports(org_id: int) -> int:
+    """
+    Render the configured formats (default filter options) of the
+    organization's current objectives. Never raises - export rendering must
+    not fail a generation.
+
+    Returns:
+        Number of artifacts rendered
+    """
+    settings = get_learning_objectives_export_settings()
+    if not settings['prerender_enabled']:
+        return 0
+
+    rendered = 0
+    try:
+        cached = GeneratedLearningObjectives.query.filter_by(organization_id=org_id).first()
+        org = db.session.get(Organization, org_id)
+        if not cached or not org:
+            return 0
+
+        options = export_options()
+        for export_format in settings['prerender_formats']:
+            if export_format not in RENDERERS:
+                logger.warning(f"[prerender_exports] Unknown export format '{export_format}' in config")
+                continue
+            if find_export(org_id, cached.input_hash, export_format, options, org.organization_name):
+                continue
+            try:
+                render_export(cached, org.organization_name, export_format, options)
+                rendered += 1
+            except ExportUnavailableError as e:
+                logger.info(f"[prerender_exports] Skipping {export_format}: {e}")
+
+        pruned = prune_export_blobs()
+        logger.info(f"[prerender_exports] Org {org_id}: {rendered} exports rendered, {pruned} blobs pruned")
+    except Exception as e:
+        logger.error(f"[prerender_exports] Org {org_id} failed: {e}", exc_info=True)
+        db.session.rollback()
+    return rendered
+
+
+_prerendering = set()
+_prerendering_lock = threading.Lock()
+
+
+def start_export_prerender(app, org_id: int) -> bool:
+    """
+    prerender_exports() on a background thread with its own app context (for
+    objectives generated inside a request). One thread per organization at a time.
+
+    Returns:
+        False if a prerender for the organization is already running
+    """
+    with _prerendering_lock:
+        if org_id in _prerendering:
+            return False
+        _prerendering.add(org_id)
+
+    def run():
+        try:
+            with app.app_context():
+                try:
+                    prerender_exports(org_id)
+                finally:
+                    db.session.remove()
+        finally:
+            with _prerendering_lock:
+                _prerendering.discard(org_id)
+
+    threading.Thread(target=run, name=f'lo-export-{org_id}', daemon=True).start()
+    return True
@@ -0,0 +1,308 @@
+"""
+Learning Objectives Jobs - Database-backed background job queue
+================================================================
+
+Runs generate_complete_learning_objectives() outside the gunicorn workers.
+The learning_objectives_job table (LearningObjectivesJob model) is the queue,
+so no extra broker is needed - PostgreSQL in production, SQLite in tests.
+
+Flow:
+1. POST /phase2/learning-objectives/generate with "async": true calls
+   submit_generation_job(). A queued/running job for the same organization
+   and input hash is returned instead of creating a duplicate.
+2. Worker processes (lo_worker.py -> run_worker()) claim the oldest queued
+   job (SELECT ... FOR UPDATE SKIP LOCKED + conditional UPDATE), run the
+   8 algorithms and store the result in the generated_learning_objectives cache.
+   The export files are pre-rendered right after a completed job
+   (learning_objectives_export.prerender_exports()).
+3. While running, a heartbeat thread persists the GenerationProgress snapshot
+   (current algorithm, LLM calls completed) to the job row every
+   heartbeat_seconds. GET /phase2/learning-objectives/jobs/<id> reads it.
+4. Running jobs whose heartbeat is older than stale_after_seconds (worker
+   killed) are re-queued, or failed after max_attempts.
+
+Date: 2026-10-18
+"""
+
+import logging
+import os
+import socket
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from flask import current_app
+from sqlalchemy.exc import IntegrityError
+
+from app.services.config_loader import get_learning_objectives_job_settings
+from app.services.generation_progress import GenerationProgress
+from app.services.learning_objectives_export import prerender_exports
+
+try:
+    from models import db, LearningObjectivesJob
+except ImportError:
+    from app.models import db, LearningObjectivesJob
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_COMPLETED = 'completed'
+JOB_FAILED = 'failed'
+ACTIVE_STATUSES = (JOB_QUEUED, JOB_RUNNING)
+
+
+# =============================================================================
+# SUBMISSION AND STATUS (web process)
+# =============================================================================
+
+def find_active_job(org_id: int, input_hash: str) -> Optional[LearningObjectivesJob]:
+    """Queued or running job for the same organization and inputs, if any"""
+    return LearningObjectivesJob.query.filter(
+        LearningObjectivesJob.organization_id == org_id,
+        LearningObjectivesJob.input_hash == input_hash,
+        LearningObjectivesJob.status.in_(ACTIVE_STATUSES)
+    ).first()
+
+
+def submit_generation_job(
+    org_id: int,
+    input_hash: str,
+    selected_strategies: List[Dict],
+    pmt_context: Optional[Dict],
+    force: bool = False,
+    requested_by_user_id: Optional[int] = None
+) -> Tuple[LearningObjectivesJob, bool]:
+    """
+    Queue a generation job, deduplicated by (organization, input hash).
+
+    Returns:
+        (job, created) - created is False if an active job was reused
+    """
+    existing = find_active_job(org_id, input_hash)
+    if existing:
+        logger.info(f"[submit_generation_job] Reusing active job {existing.id} for org {org_id}")
+        return existing, False
+
+    job = LearningObjectivesJob(
+        organization_id=org_id,
+        input_hash=input_hash,
+        status=JOB_QUEUED,
+        force=force,
+        request_payload={
+            'selected_strategies': selected_strategies,
+            'pmt_context': pmt_context
+        },
+        progress={},
+        requested_by_user_id=requested_by_user_id,
+        created_at=datetime.utcnow()
+    )
+    db.session.add(job)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # Another request queued the same inputs concurrently (partial unique index)
+        db.session.rollback()
+        existing = find_active_job(org_id, input_hash)
+        if existing:
+            return existing, False
+        raise
+
+    logger.info(f"[submit_generation_job] Queued job {job.id} for org {org_id}")
+    return job, True
+
+
+def get_job(job_id: int) -> Optional[LearningObjectivesJob]:
+    return db.session.get(LearningObjectivesJob, job_id)
+
+
+# =============================================================================
+# WORKER SIDE
+# =============================================================================
+
+def requeue_stale_jobs(stale_after_seconds: float, max_attempts: int) -> int:
+    """
+    Re-queue running jobs whose worker stopped sending heartbeats.
+
+    Returns:
+        Number of jobs re-queued or failed
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=stale_after_seconds)
+    stale_jobs = LearningObjectivesJob.query.filter(
+        LearningObjectivesJob.status == JOB_RUNNING,
+        LearningObjectivesJob.heartbeat_at < cutoff
+    ).all()
+
+    for job in stale_jobs:
+        if job.attempts >= max_attempts:
+            job.status = JOB_FAILED
+            job.error = f'Worker stopped responding ({job.attempts} attempts)'
+            job.finished_at = datetime.utcnow()
+            logger.warning(f"[requeue_stale_jobs] Job {job.id} failed after {job.attempts} attempts")
+        else:
+            logger.warning(f"[requeue_stale_jobs] Job {job.id} re-queued (worker {job.worker_id} stale)")
+            job.status = JOB_QUEUED
+            job.worker_id = None
+
+    if stale_jobs:
+        db.session.commit()
+    return len(stale_jobs)
+
+
+def claim_next_job(worker_id: str) -> Optional[LearningObjectivesJob]:
+    """
+    Atomically move the oldest queued job to 'running' for this worker.
+
+    SKIP LOCKED keeps concurrent workers off the same row on PostgreSQL; the
+    conditional UPDATE makes the claim safe on databases without row locks.
+    """
+    candidate = LearningObjectivesJob.query.filter_by(
+        status=JOB_QUEUED
+    ).order_by(
+        LearningObjectivesJob.created_at.asc(),
+        LearningObjectivesJob.id.asc()
+    ).with_for_update(skip_locked=True).first()
+
+    if candidate is None:
+        db.session.rollback()
+        return None
+
+    now = datetime.utcnow()
+    claimed = LearningObjectivesJob.query.filter(
+        LearningObjectivesJob.id == candidate.id,
+        LearningObjectivesJob.status == JOB_QUEUED
+    ).update({
+        LearningObjectivesJob.status: JOB_RUNNING,
+        LearningObjectivesJob.worker_id: worker_id,
+        LearningObjectivesJob.started_at: now,
+        LearningObjectivesJob.heartbeat_at: now,
+        LearningObjectivesJob.attempts: LearningObjectivesJob.attempts + 1
+    }, synchronize_session=False)
+    db.session.commit()
+
+    if not claimed:
+        return None
+    return get_job(candidate.id)
+
+
+class _JobHeartbeat(threading.Thread):
+    """Persists progress + heartbeat of one running job from its own app context"""
+
+    def __init__(self, app, job_id: int, progress: GenerationProgress, interval: float):
+        super().__init__(name=f'lo-job-{job_id}-heartbeat', daemon=True)
+        self.app = app
+        self.job_id = job_id
+        self.progress = progress
+        self.interval = interval
+        self._stop_event = threading.Event()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def run(self) -> None:
+        with self.app.app_context():
+            try:
+                while not self._stop_event.wait(self.interval):
+                    try:
+                        LearningObjectivesJob.query.filter_by(id=self.job_id).update({
+                            LearningObjectivesJob.progress: self.progress.snapshot(),
+                            LearningObjectivesJob.heartbeat_at: datetime.utcnow()
+                        }, synchronize_session=False)
+                        db.session.commit()
+                    except Exception as e:
+                        logger.warning(f"[JobHeartbeat] Job {self.job_id} update failed: {e}")
+                        db.session.rollback()
+            finally:
+                db.session.remove()
+
+
+def execute_job(job_id: int, heartbeat_seconds: float) -> LearningObjectivesJob:
+    """Run one claimed job to completion (or failure) and record the outcome"""
+    from app.services.learning_objectives_core import generate_complete_learning_objectives
+
+    job = get_job(job_id)
+    payload = job.request_payload or {}
+    progress = GenerationProgress()
+    heartbeat = _JobHeartbeat(current_app._get_current_object(), job_id, progress, heartbeat_seconds)
+    heartbeat.start()
+
+    status, error, pathway = JOB_COMPLETED, None, None
+    started = time.monotonic()
+    try:
+        result = generate_complete_learning_objectives(
+            org_id=job.organization_id,
+            selected_strategies=payload.get('selected_strategies', []),
+            pmt_context=payload.get('pmt_context'),
+            force=job.force,
+            progress=progress
+        )
+        pathway = result.get('pathway')
+    except Exception as e:
+        logger.error(f"[execute_job] Job {job_id} failed: {e}", exc_info=True)
+        db.session.rollback()
+        status, error = JOB_FAILED, str(e)
+    finally:
+        heartbeat.stop()
+        heartbeat.join()
+
+    job = get_job(job_id)
+    now = datetime.utcnow()
+    job.status = status
+    job.error = error
+    job.pathway = pathway
+    job.progress = progress.snapshot()
+    job.heartbeat_at = now
+    job.finished_at = now
+    db.session.commit()
+
+    logger.info(
+        f"[execute_job] Job {job_id} {status} in {time.monotonic() - started:.1f}s "
+        f"- progress {job.progress}"
+    )
+
+    # After the job is marked completed, so clients polling it are not delayed
+    if status == JOB_COMPLETED:
+        prerender_exports(job.organization_id)
+    return job
+
+
+def run_worker(worker_id: Optional[str] = None, once: bool = False) -> int:
+    """
+    Worker loop - must run inside an application context.
+
+    Args:
+        worker_id: Identifier stored on claimed jobs (default host:pid)
+        once: Exit as soon as the queue is empty (for cron/tests)
+
+    Returns:
+        Number of jobs executed
+    """
+    settings = get_learning_objectives_job_settings()
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    executed = 0
+    last_stale_check = 0.0
+
+    logger.info(f"[run_worker] Worker {worker_id} started")
+
+    while True:
+        try:
+            if time.monotonic() - last_stale_check >= settings['heartbeat_seconds']:
+                requeue_stale_jobs(settings['stale_after_seconds'], settings['max_attempts'])
+                last_stale_check = time.monotonic()
+
+            job = claim_next_job(worker_id)
+        except Exception as e:
+            logger.error(f"[run_worker] Queue access failed: {e}")
+            db.session.rollback()
+            job = None
+
+        if job is not None:
+            logger.info(f"[run_worker] Worker {worker_id} picked job {job.id} (org {job.organization_id})")
+            execute_job(job.id, settings['heartbeat_seconds'])
+            executed += 1
+            continue
+
+        if once:
+            return executed
+        time.sleep(settings['poll_interval_seconds'])
@@ -29,34 +29,9 @@ from openai import OpenAI
 
 logger = logging.getLogger(__name__)
 
-# Template file path (v2 with PMT breakdown structure)
-# Supports both Docker deployment and local development
-_current_file = Path(__file__).resolve()
-_backend_root = _current_file.parent.parent.parent  # services -> app -> backend
-
-def _get_template_path():
-    """
-    Get path to LO template file.
-
-    Path resolution order:
-    1. Local to backend (Docker): src/backend/data/templates/se_qpt_learning_objectives_template_v2.json
-    2. Project root (Local dev): data/source/Phase 2/se_qpt_learning_objectives_template_v2.json
-    """
-    # Path 1: Docker path (template inside backend)
-    docker_path = _backend_root / 'data' / 'templates' / 'se_qpt_learning_objectives_template_v2.json'
-    if docker_path.exists():
-        return docker_path
-
-    # Path 2: Local dev path (template at project root)
-    project_root = _backend_root.parent.parent  # backend -> src -> project_root
-    dev_path = project_root / 'data' / 'source' / 'Phase 2' / 'se_qpt_learning_objectives_template_v2.json'
-    if dev_path.exists():
-        return dev_path
-
-    # Return Docker path as default (will show appropriate error if missing)
-    return docker_path
-
-TEMPLATE_PATH = _get_template_path()
+# Template file (v2 with PMT breakdown structure) is parsed once per process
+# by the shared registry - see learning_objective_templates.py
+from app.services.learning_objective_templates import TEMPLATE_PATH, get_template_registry
 
 # Strategies requiring deep customization with PMT (use normalized canonical names)
 DEEP_CUSTOMIZATION_STRATEGIES = [
@@ -154,6 +129,9 @@ def load_learning_objective_templates() -> Dict:
     """
     Load learning objective templates from JSON file
 
+    Served from the process-wide template registry (parsed once, reloaded
+    when the file changes). The returned dict is shared - do not modify it.
+
     Returns:
         Dict with keys:
         - archetypeCompetencyTargetLevels
@@ -161,15 +139,7 @@ def load_learning_objective_templates() -> Dict:
         - competencies
         - metadata
     """
-    if not TEMPLATE_PATH.exists():
-        logger.error(f"Template file not found: {TEMPLATE_PATH}")
-        raise FileNotFoundError(f"Template file not found: {TEMPLATE_PATH}")
-
-    with open(TEMPLATE_PATH, 'r', encoding='utf-8') as f:
-        templates = json.load(f)
-
-    logger.info(f"[OK] Loaded learning objective templates from {TEMPLATE_PATH}")
-    return templates
+    return get_template_registry().data
 
 
 # ============================================================================
@@ -196,30 +166,26 @@ def get_template_objective(competency_id: int, level: int) -> str:
         This function returns the unified/simple text for backward compatibility.
         Use get_template_objective_full() to get full PMT breakdown.
     """
-    templates = load_learning_objective_templates()
+    registry = get_template_registry()
 
     competency_name = COMPETENCY_ID_TO_NAME.get(competency_id)
     if not competency_name:
         logger.warning(f"Unknown competency ID: {competency_id}")
         return f"[Template missing - unknown competency ID: {competency_id}]"
 
-    if competency_name not in templates['learningObjectiveTemplates']:
+    if not registry.has_competency(competency_name):
         logger.warning(f"No templates found for competency: {competency_name}")
         return f"[Template missing for {competency_name}]"
 
-    level_str = str(level)
-    template_data = templates['learningObjectiveTemplates'][competency_name].get(level_str)
+    entry = registry.get(competency_name, level)
 
-    if template_data is None:
+    if entry is None:
         logger.warning(f"No template for {competency_name} level {level}")
         return f"[Template missing for {competency_name} level {level}]"
 
-    # Handle both string templates and dict templates (with PMT breakdown)
-    if isinstance(template_data, dict):
-        # v2 format uses 'unified' key, fallback to 'base_template' for older format
-        return template_data.get('unified', template_data.get('base_template', '[Template structure error]'))
-    else:
-        return template_data
+    if entry.objective_text is None:
+        return '[Template structure error]'
+    return entry.objective_text
 
 
 def get_template_objective_full(competency_id: int, level: int) -> Dict:
@@ -242,8 +208,6 @@ def get_template_objective_full(competency_id: int, level: int) -> Dict:
             }
         }
     """
-    templates = load_learning_objective_templates()
-
     result = {
         'objective_text': None,
         'has_pmt': False,
@@ -251,30 +215,16 @@ def get_template_objective_full(competency_id: int, level: int) -> Dict:
     }
 
     competency_name = COMPETENCY_ID_TO_NAME.get(competency_id)
-    if not competency_name:
-        result['objective_text'] = "[Template missing]"
-        return result
+    entry = get_template_registry().get(competency_name, level) if competency_name else None
 
-    if competency_name not in templates['learningObjectiveTemplates']:
+    if entry is None:
         result['objective_text'] = "[Template missing]"
         return result
 
-    level_str = str(level)
-    template_data = templates['learningObjectiveTemplates'][competency_name].get(level_str)
-
-    if template_data is None:
-        result['objective_text'] = "[Template missing]"
-        return result
-
-    # Handle both string and dict (with PMT breakdown) formats
-    if isinstance(template_data, dict):
-        # v2 format uses 'unified' key
-        result['objective_text'] = template_data.get('unified', template_data.get('base_template', ''))
-        if 'pmt_breakdown' in template_data:
-            result['has_pmt'] = True
-            result['pmt_breakdown'] = template_data['pmt_breakdown']
-    else:
-        result['objective_text'] = template_data
+    result['objective_text'] = entry.objective_text if entry.objective_text is not None else ''
+    if entry.has_pmt:
+        result['has_pmt'] = True
+        result['pmt_breakdown'] = entry.pmt_breakdown_dict()
 
     return result
 
@@ -289,21 +239,15 @@ def get_archetype_targets_for_strategy(strategy_name: str) -> Dict[str, int]:
     Returns:
         Dict mapping competency name → target level
     """
-    templates = load_learning_objective_templates()
-
     # Normalize strategy name to match template JSON canonical names
     normalized_name = normalize_strategy_name(strategy_name)
 
-    # Try exact match with normalized name
-    if normalized_name in templates['archetypeCompetencyTargetLevels']:
+    # Exact match with normalized name, then case-insensitive fallback
+    targets = get_template_registry().archetype_targets(normalized_name)
+    if targets is not None:
         logger.debug(f"[get_archetype_targets] Found targets for '{normalized_name}'")
-        return templates['archetypeCompetencyTargetLevels'][normalized_name]
-
-    # Fallback: Try case-insensitive match (should not be needed after normalization)
-    for key in templates['archetypeCompetencyTargetLevels'].keys():
-        if key.lower() == normalized_name.lower():
-            logger.debug(f"[get_archetype_targets] Found targets for '{key}' (case-insensitive)")
-            return templates['archetypeCompetencyTargetLevels'][key]
+        # Copy - the registry is shared by the whole process
+        return dict(targets)
 
     logger.warning(f"No archetype targets found for strategy: {strategy_name} (normalized: {normalized_name})")
     return {}
@@ -0,0 +1,200 @@
+"""
+LLM Executor - Pooled OpenAI client, rate limiting and bounded concurrency
+==========================================================================
+
+Shared infrastructure for services that issue many independent OpenAI calls
+(e.g. PMT customization in learning_objectives_core, which used to run up to
+16 competencies x 4 levels blocking round trips one after another and build a
+brand-new OpenAI client for every call).
+
+Provides:
+- get_openai_client(): one process-wide OpenAI client per API key, so every
+  call reuses the same pooled HTTP connections
+- TokenBucket: request-rate limiter that is drained on HTTP 429 responses
+- chat_completion(): rate-limited chat completion with 429 retry/backoff
+- run_ordered(): runs calls on a bounded thread pool and returns results in
+  input order (deterministic output regardless of completion order)
+
+Settings come from the 'llm_concurrency' section of
+config/learning_objectives_config.json (see config_loader).
+
+Date: 2026-10-18
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.services.config_loader import get_llm_concurrency_settings
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# POOLED CLIENT
+# =============================================================================
+
+_clients: Dict[str, Any] = {}
+_clients_lock = threading.Lock()
+
+
+def get_openai_client(api_key: str):
+    """
+    Get the shared OpenAI client for an API key.
+
+    The OpenAI v1 client is thread-safe and keeps a pooled httpx client, so
+    one instance per process serves all worker threads. SDK-level retries are
+    disabled - chat_completion() handles 429s through the token bucket.
+    """
+    client = _clients.get(api_key)
+    if client is not None:
+        return client
+
+    with _clients_lock:
+        client = _clients.get(api_key)
+        if client is None:
+            from openai import OpenAI
+            client = OpenAI(api_key=api_key, max_retries=0)
+            _clients[api_key] = client
+            logger.info("[llm_executor] Created pooled OpenAI client")
+        return client
+
+
+# =============================================================================
+# RATE LIMITING
+# =============================================================================
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Tokens refill continuously at `rate` per second up to `capacity`. Every
+    request takes one token; when the API answers 429 the bucket is drained
+    and refilling is paused for the backoff period, which throttles all
+    concurrent workers at once instead of each retrying blindly.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        if now > self._updated:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def acquire(self) -> None:
+        """Block until a token is available, then take it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate if self.rate > 0 else 1.0
+                wait = max(wait, self._updated - now)
+            time.sleep(wait)
+
+    def penalize(self, seconds: float) -> None:
+        """Empty the bucket and pause refilling for `seconds` (after a 429)."""
+        with self._lock:
+            self._tokens = 0.0
+            self._updated = max(self._updated, time.monotonic() + seconds)
+
+
+_bucket: Optional[TokenBucket] = None
+_bucket_lock = threading.Lock()
+
+
+def get_rate_limiter() -> TokenBucket:
+    """Process-wide token bucket shared by all LLM callers."""
+    global _bucket
+    if _bucket is None:
+        with _bucket_lock:
+            if _bucket is None:
+                settings = get_llm_concurrency_settings()
+                _bucket = TokenBucket(settings['requests_per_second'], settings['burst'])
+    return _bucket
+
+
+def chat_completion(api_key: str, **kwargs):
+    """
+    Rate-limited client.chat.completions.create() on the pooled client.
+
+    Retries HTTP 429 responses with exponential backoff (draining the shared
+    token bucket); re-raises openai.RateLimitError once retries are exhausted.
+    All other errors propagate unchanged so callers keep their existing
+    timeout / error handling.
+    """
+    import openai
+
+    settings = get_llm_concurrency_settings()
+    client = get_openai_client(api_key)
+    bucket = get_rate_limiter()
+
+    attempt = 0
+    while True:
+        bucket.acquire()
+        try:
+            return client.chat.completions.create(**kwargs)
+        except openai.RateLimitError:
+            if attempt >= settings['max_retries']:
+                raise
+            backoff = settings['retry_backoff_seconds'] * (2 ** attempt)
+            logger.warning(f"[llm_executor] Rate limited - backing off {backoff:.1f}s (attempt {attempt + 1})")
+            bucket.penalize(backoff)
+            attempt += 1
+
+
+# =============================================================================
+# BOUNDED CONCURRENCY
+# =============================================================================
+
+def run_ordered(
+    func: Callable[..., Any],
+    arg_tuples: Sequence[Tuple],
+    max_workers: Optional[int] = None
+) -> List[Tuple[Any, Optional[BaseException]]]:
+    """
+    Run func(*args) for every args tuple on a bounded thread pool.
+
+    Args:
+        func: Callable to run (must not rely on Flask request/app context)
+        arg_tuples: One positional-args tuple per call
+        max_workers: Concurrency cap (defaults to llm_concurrency.max_workers)
+
+    Returns:
+        [(result, None) | (None, exception), ...] in the same order as
+        arg_tuples - completion order never leaks into the output.
+    """
+    if not arg_tuples:
+        return []
+
+    if max_workers is None:
+        max_workers = get_llm_concurrency_settings()['max_workers']
+    max_workers = max(1, min(max_workers, len(arg_tuples)))
+
+    def _call(args):
+        try:
+            return func(*args), None
+        except Exception as e:
+            return None, e
+
+    if max_workers == 1:
+        return [_call(args) for args in arg_tuples]
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='llm') as pool:
+        results = list(pool.map(_call, arg_tuples))
+
+    logger.info(
+        f"[llm_executor] {len(arg_tuples)} calls on {max_workers} workers "
+        f"in {time.monotonic() - started:.2f}s"
+    )
+    return results
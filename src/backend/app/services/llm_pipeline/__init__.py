@@ -1,8 +1,9 @@
 """
 LLM Pipeline package for SE-QPT
 Provides process identification pipeline for task-based role mapping
-"""
 
-from . import llm_process_identification_pipeline
+The pipeline module (LangChain, tiktoken, vector index) is not imported here;
+it is loaded on first use through resources.pipeline_module.
+"""
 
-__all__ = ['llm_process_identification_pipeline']
+__all__ = ['embeddings', 'llm_process_identification_pipeline', 'resources', 'retrieval', 'vector_index']
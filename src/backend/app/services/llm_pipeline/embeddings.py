@@ -0,0 +1,135 @@
+"""
+Embedding Providers - Pluggable text embeddings for process retrieval
+=====================================================================
+
+The RAG path was hard-wired to LangChain's OpenAIEmbeddings with the remote
+text-embedding-ada-002 model, both for the FAISS index and for every query.
+
+An EmbeddingProvider exposes the two methods the retrieval code uses
+(embed_documents / embed_query, the same duck type as LangChain
+Embeddings) and identifies itself by (provider, model), which the vector
+index records in its manifest - an index can only be queried with the
+provider that built it:
+
+- OpenAIEmbeddingProvider ('openai'): remote model on the pooled OpenAI
+  client of llm_executor, rate-limited by its token bucket
+- LocalEmbeddingProvider ('local'): sentence-transformers model on the CPU
+  (optional dependency, `pip install sentence-transformers`); queries take
+  milliseconds and need no network
+
+Settings come from the 'embeddings' section of
+config/learning_objectives_config.json (see config_loader).
+
+Date: 2026-10-18
+"""
+
+import logging
+import os
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Sequence
+
+from app.services.config_loader import get_embedding_settings
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingProvider(ABC):
+    """Base class: subclasses implement _embed() for one batch"""
+
+    name = None
+
+    def __init__(self, model: str, batch_size: int = 64):
+        self.model = model
+        self.batch_size = max(1, int(batch_size))
+
+    @property
+    def identity(self) -> Dict[str, str]:
+        """(provider, model) recorded in and checked against the vector index manifest"""
+        return {'provider': self.name, 'model': self.model}
+
+    def embed_documents(self, texts: Sequence[str]) -> List[List[float]]:
+        vectors = []
+        for start in range(0, len(texts), self.batch_size):
+            vectors.extend(self._embed(list(texts[start:start + self.batch_size])))
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed([text])[0]
+
+    @abstractmethod
+    def _embed(self, texts: List[str]) -> List[List[float]]:
+        """Embeddings of one batch, in input order"""
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self.model}>"
+
+
+class OpenAIEmbeddingProvider(EmbeddingProvider):
+    """Remote OpenAI embeddings model"""
+
+    name = 'openai'
+
+    def _embed(self, texts: List[str]) -> List[List[float]]:
+        from app.services.llm_executor import get_openai_client, get_rate_limiter
+
+        client = get_openai_client(os.getenv('OPENAI_API_KEY'))
+        get_rate_limiter().acquire()
+        response = client.embeddings.create(model=self.model, input=texts)
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+
+class LocalEmbeddingProvider(EmbeddingProvider):
+    """sentence-transformers model on the CPU (model name or local path)"""
+
+    name = 'local'
+
+    def __init__(self, model: str, batch_size: int = 64):
+        super().__init__(model, batch_size)
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError(
+                "Local embeddings need the sentence-transformers package "
+                "(pip install sentence-transformers)"
+            ) from e
+        self._model = SentenceTransformer(model, device='cpu')
+        logger.info(f"[embeddings] Loaded local embedding model {model}")
+
+    def _embed(self, texts: List[str]) -> List[List[float]]:
+        vectors = self._model.encode(
+            texts, batch_size=self.batch_size, normalize_embeddings=True, convert_to_numpy=True
+        )
+        return vectors.tolist()
+
+
+PROVIDERS = {
+    OpenAIEmbeddingProvider.name: OpenAIEmbeddingProvider,
+    LocalEmbeddingProvider.name: LocalEmbeddingProvider,
+}
+
+
+def configured_identity(provider: Optional[str] = None, model: Optional[str] = None) -> Dict[str, str]:
+    """
+    (provider, model) of the settings (arguments override them), without
+    creating the provider.
+
+    Raises:
+        ValueError: unknown provider
+    """
+    settings = get_embedding_settings()
+    provider = provider or settings['provider']
+    if provider not in PROVIDERS:
+        raise ValueError(f"Unknown embedding provider '{provider}' (available: {', '.join(sorted(PROVIDERS))})")
+    return {'provider': provider, 'model': model or settings[f'{provider}_model']}
+
+
+def create_embedding_provider(provider: Optional[str] = None, model: Optional[str] = None) -> EmbeddingProvider:
+    """
+    Embedding provider from the settings (arguments override them).
+
+    Raises:
+        ValueError: unknown provider
+    """
+    identity = configured_identity(provider, model)
+    batch_size = get_embedding_settings().get('batch_size', 64)
+    return PROVIDERS[identity['provider']](identity['model'], batch_size=batch_size)
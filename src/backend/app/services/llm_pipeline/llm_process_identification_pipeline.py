@@ -1,13 +1,23 @@
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pydantic import BaseModel, Field
 import psycopg2
 from psycopg2.extras import DictCursor
 from typing import List
 from langchain.prompts import ChatPromptTemplate
 from langchain_openai import ChatOpenAI
-import tiktoken  # Import tiktoken for token counting
 # from langchain.chat_models import init_chat_model
-from langchain_openai import OpenAIEmbeddings
+
+# tiktoken encoder, embedding provider and vector index are loaded on first
+# use (lazy resources, see resources.py)
+from app.services.lazy_resources import cl100k_encoder
+from app.services.llm_pipeline.resources import embedding_provider, vector_store
+from app.services.llm_pipeline.retrieval import (
+    ProcessEmbeddingTable, get_retrieval_cache, retrieve_documents
+)
+from app.services.llm_pipeline.token_budget import DOCUMENT_SEPARATOR, TokenBudgetPacker
 
 # Set your Azure OpenAI configurations using environment variables
 #api_key = os.getenv("AZURE_OPENAI_API_KEY")
@@ -27,6 +37,7 @@ def fetch_processes_from_db():
         raise ValueError("DATABASE_URL environment variable is not set.")
 
     # Connect to the PostgreSQL database
+    connection = None
     try:
         connection = psycopg2.connect(database_url)
         cursor = connection.cursor(cursor_factory=DictCursor)
@@ -60,9 +71,40 @@ def fetch_processes_from_db():
             connection.close()
 
 
+def fetch_processes_fingerprint():
+    """
+    Cheap change marker of the iso_processes table (row count + content hash).
+
+    Returns:
+        Fingerprint string, or None if the database cannot be queried
+    """
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        return None
+
+    connection = None
+    try:
+        connection = psycopg2.connect(database_url)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT count(*), md5(coalesce(string_agg("
+                "name || chr(31) || coalesce(description, ''), chr(30) ORDER BY id), '')) "
+                "FROM iso_processes"
+            )
+            count, digest = cursor.fetchone()
+        return f"{count}:{digest}"
+
+    except Exception as e:
+        print(f"Error fetching process fingerprint from database: {e}")
+        return None
+
+    finally:
+        if connection:
+            connection.close()
+
 
-# --- Initialize tiktoken encoder ---
-encoder = tiktoken.get_encoding("cl100k_base")  # Standard encoding for GPT-4 models
+# --- tiktoken encoder (cl100k_base, standard encoding for GPT-4 models) ---
+encoder = cl100k_encoder
 
 # --- Define Pydantic models ---
 class InputValidationModel(BaseModel):
@@ -372,208 +414,371 @@ def create_role_selection_chain(llm):
     structured_llm = llm.with_structured_output(RoleSelectionModel)
     return prompt | structured_llm
 
-# --- Initialize the FAISS retriever ---
-from langchain_openai import AzureOpenAIEmbeddings
-from langchain_community.vectorstores import FAISS
+# --- Process retrieval ---
+# embedding_provider and vector_store (imported above) load on first use; the
+# index in app/faiss_index is memory-mapped (vector_index.py). Retrieval goes
+# through retrieval.retrieve_documents() (cached per identified process set).
 
-openai_embeddings = OpenAIEmbeddings(
-    openai_api_key=openai_api_key,
-    model="text-embedding-ada-002"
-)
+# --- Helper function to format retrieved documents ---
+def format_docs(docs):
+    return DOCUMENT_SEPARATOR.join(doc.page_content for doc in docs)
 
-# Use absolute path based on module location for Docker/deployment compatibility
-# This file is at: src/backend/app/services/llm_pipeline/llm_process_identification_pipeline.py
-# FAISS index is at: src/backend/app/faiss_index/
-_current_dir = os.path.dirname(os.path.abspath(__file__))
-_faiss_index_path = os.path.join(_current_dir, '..', '..', 'faiss_index')
 
-vector_store = FAISS.load_local(
-    _faiss_index_path,
-    openai_embeddings,
-    allow_dangerous_deserialization=True
-)
+# Maximum tokens of the reasoning prompt; retrieved documents beyond it are dropped
+REASONING_TOKEN_BUDGET = 6000
 
-retriever = vector_store.as_retriever(
-    search_type="similarity",
-    search_kwargs={"k": 10}  # Set a higher k initially
-)
+# Per-document token counts are cached across requests (fixed ISO catalogue)
+reasoning_packer = TokenBudgetPacker(encoder)
 
-# --- Helper function to format retrieved documents ---
-def format_docs(docs):
-    return "\n\n".join(doc.page_content for doc in docs)
+# --- Warm, reusable pipeline ---
+# Chains, prompts and the process catalogue are built once per worker process
+# (on first use) instead of on every request. The catalogue is re-read only
+# when iso_processes changes; the table fingerprint is checked at most every
+# CATALOGUE_CHECK_SECONDS, so a request normally does no database access.
+CATALOGUE_CHECK_SECONDS = 60.0
 
-# --- Create the modified pipeline with token check ---
-def create_pipeline():
-    llm = init_llm()
-    llm_creative = init_creative_llm()
-    validation_chain = create_validation_chain(llm)
-    language_detection_chain = create_language_detection_chain(llm)
-    translation_chain = create_translation_chain(llm)
-    #process_identification_chain = create_process_identification_chain(llm_creative)
-    reasoning_chain = create_reasoning_chain(llm)
-    role_selection_chain = create_role_selection_chain(llm)
-
-    # Fetch process data from the database
-    process_data = fetch_processes_from_db()
-    if not process_data:
-        raise ValueError("Failed to fetch process data from the database.")
-    
-    def process_tasks(user_tasks_dict: dict):
-        tasks_text = "\n".join(
-            ["Responsible For:"] + user_tasks_dict.get("responsible_for", []) +
-            ["Supporting:"] + user_tasks_dict.get("supporting", []) +
-            ["Designing:"] + user_tasks_dict.get("designing", [])
+# Threads for the concurrently running LLM stages (shared by all requests)
+PIPELINE_WORKERS = 12
+
+
+def _timed(timings, stage, func, *args):
+    """Call func(*args), recording its wall time in seconds as timings[stage]"""
+    started = time.perf_counter()
+    try:
+        return func(*args)
+    finally:
+        timings[stage] = round(time.perf_counter() - started, 3)
+
+
+class ProcessCatalogue:
+    """Immutable snapshot of iso_processes with its pre-rendered prompt and chain
+    (per-process retrieval embeddings are computed on first retrieval)"""
+
+    def __init__(self, process_data, fingerprint, llm_creative):
+        self.process_data = process_data
+        self.fingerprint = fingerprint
+        self.identification_prompt = create_process_identification_prompt(process_data)
+        self.identification_chain = self.identification_prompt | llm_creative.with_structured_output(
+            ProcessIdentificationOutput
         )
+        # (lower-case name, retrieval text) in table order for the FAISS query
+        self.retrieval_snippets = [
+            (process["name"].lower(), f"{process['name']} {process['description'][:200]}")
+            for process in process_data
+        ]
+
+        self._embedding_table = None
+        self._embedding_table_lock = threading.Lock()
+
+    def retrieval_query(self, identified_processes):
+        identified = {p.lower() for p in identified_processes}
+        return " ".join(text for name, text in self.retrieval_snippets if name in identified)
+
+    def embedding_table(self, embeddings):
+        """Per-process embeddings of the retrieval snippets (one embedding call per catalogue)"""
+        if self._embedding_table is None:
+            with self._embedding_table_lock:
+                if self._embedding_table is None:
+                    self._embedding_table = ProcessEmbeddingTable.build(self.retrieval_snippets, embeddings)
+                    get_retrieval_cache().count('table_builds')
+        return self._embedding_table
 
-        # Step 1: Language Detection
-        language_detection_result = language_detection_chain.invoke({"tasks": tasks_text})
-        print("Language detection result:", language_detection_result)
-
-        # Step 2: Translation if necessary
-        if language_detection_result.is_german:
-            translation_result = translation_chain.invoke({"tasks": tasks_text})
-            # Reassemble the translated tasks from the structured output into the expected text format.
-            translated = translation_result.translated_tasks
-            translated_tasks_text = (
-                "Responsible For:\n" + "\n".join(translated.responsible_for) + "\n" +
-                "Supporting:\n" + "\n".join(translated.supporting) + "\n" +
-                "Designing:\n" + "\n".join(translated.designing)
-            )
-            print("Translated tasks:", translated_tasks_text)
-        else:
-            translated_tasks_text = tasks_text
-
-        # Step 3: Validation
-        validation_result = validation_chain.invoke({"tasks": translated_tasks_text})
-        print("Validation result:",validation_result)
-        if not (validation_result.is_valid_responsible_for and validation_result.is_valid_supporting and validation_result.is_valid_designing):
-            return {
-                "status": "invalid_tasks",
-                "message": validation_result.message
-            }
 
-        # Step 4: Process Identification
-        process_identification_prompt = create_process_identification_prompt(process_data)
-        full_prompt_text = process_identification_prompt.format_prompt(
+class ProcessIdentificationPipeline:
+    """
+    Process identification pipeline (language detection, translation,
+    validation, process identification, FAISS retrieval, reasoning, role selection).
+
+    process_tasks() is thread-safe: chains are stateless and every call works on
+    one catalogue snapshot, which refreshes are swapped in atomically.
+    Independent stages of a call run concurrently on a shared thread pool.
+    """
+
+    def __init__(self):
+        llm = init_llm()
+        self.llm_creative = init_creative_llm()
+        self.validation_chain = create_validation_chain(llm)
+        self.language_detection_chain = create_language_detection_chain(llm)
+        self.translation_chain = create_translation_chain(llm)
+        self.reasoning_prompt = create_reasoning_prompt()
+        self.reasoning_chain = self.reasoning_prompt | llm.with_structured_output(ISOProcessesInvolvementOutput)
+        self.role_selection_chain = create_role_selection_chain(llm)
+
+        self._catalogue = None
+        self._catalogue_lock = threading.Lock()
+        self._next_check = 0.0
+        # Shared by all requests; a request runs at most three stages at once
+        self._executor = ThreadPoolExecutor(max_workers=PIPELINE_WORKERS, thread_name_prefix='process-pipeline')
+
+    def catalogue(self):
+        """Current process catalogue, refreshed if iso_processes changed"""
+        catalogue = self._catalogue
+        if catalogue is not None and time.monotonic() < self._next_check:
+            return catalogue
+
+        with self._catalogue_lock:
+            catalogue = self._catalogue
+            if catalogue is not None and time.monotonic() < self._next_check:
+                return catalogue
+
+            fingerprint = fetch_processes_fingerprint()
+            if catalogue is None or (fingerprint is not None and fingerprint != catalogue.fingerprint):
+                process_data = fetch_processes_from_db()
+                if process_data:
+                    catalogue = ProcessCatalogue(process_data, fingerprint, self.llm_creative)
+                    self._catalogue = catalogue
+                    print(f"Process catalogue loaded: {len(process_data)} processes")
+                elif catalogue is None:
+                    raise ValueError("Failed to fetch process data from the database.")
+
+            self._next_check = time.monotonic() + CATALOGUE_CHECK_SECONDS
+            return catalogue
+
+    def _identify_and_retrieve(self, catalogue, tasks_text, timings, metadata):
+        """Process identification followed by the FAISS retrieval it feeds"""
+        # Step 4: Process Identification (prompt pre-rendered with the catalogue)
+        full_prompt_text = catalogue.identification_prompt.format_prompt(
             user_tasks=tasks_text
         ).to_string()
         token_count = check_token_count(full_prompt_text)
         print(f"Token count for process identification: {token_count}")
 
-        # Step 2: Skip LLM invocation if token count exceeds limit
-        #if token_count > 3000:
-         #   return "Token count exceeds the 3000-token limit for process identification."
-        
-
-        # Step 3: Invoke process identification chain
-        process_identification_chain = create_process_identification_chain(llm_creative, process_data)
         process_identification_input = {"user_tasks": tasks_text}
-        process_identification_result = process_identification_chain.invoke(process_identification_input)
+        process_identification_result = _timed(
+            timings, "process_identification", catalogue.identification_chain.invoke, process_identification_input
+        )
         identified_processes = process_identification_result.processes
         print("Identified Processes:", identified_processes)
 
         if not identified_processes:
-            return "No relevant processes identified based on the user's tasks."
+            return identified_processes, []
 
-        # Step 5: Use identified processes as retrieval query (FAISS SEMANTIC SEARCH)
-        retrieval_query = " ".join(
-            [
-                f"{process['name']} {process['description'][:200]}"
-                for process in process_data if process["name"].lower() in [p.lower() for p in identified_processes]
-            ]
+        # Step 5: Use identified processes as retrieval query (FAISS SEMANTIC SEARCH);
+        # the query vector is composed from per-process embeddings
+        k = len(identified_processes) + 4  # Adjust k based on the number of identified processes
+
+        # Step 6: Retrieve exactly k relevant documents from the vector index (cached per process set)
+        retrieved_docs, cache_hit = _timed(
+            timings, "retrieval", retrieve_documents,
+            catalogue, identified_processes, k, vector_store, embedding_provider
         )
+        metadata["retrieval_cache_hit"] = cache_hit
+        print(f"Retrieved {len(retrieved_docs)} of {k} chunks (cache {'hit' if cache_hit else 'miss'})")
+        return identified_processes, retrieved_docs
 
-        k = len(identified_processes) + 4  # Adjust k based on the number of identified processes
-        print(f"Retrieval Query: {retrieval_query}, Number of Chunks to Retrieve: {k}")
+    def _select_role(self, translated_tasks_text, reasoning_result):
+        """
+        Step 9: LLM-based role selection from the reasoning result.
+
+        Returns:
+            (role suggestion, seconds) - the timing is returned rather than
+            written to the request's timings, which may already be handed back
+        """
+        # Format process involvement for role selection prompt
+        process_involvement_text = "\n".join([
+            f"- {p.process_name}: {p.involvement}"
+            for p in reasoning_result.processes
+            if p.involvement != 'Not performing'
+        ])
+
+        role_selection_input = {
+            "user_tasks": translated_tasks_text,
+            "process_involvement": process_involvement_text
+        }
+
+        timing = {}
+        llm_role_selection = _timed(timing, "role_selection", self.role_selection_chain.invoke, role_selection_input)
+        print("LLM Role Selection:", llm_role_selection)
+        return {
+            "role_id": llm_role_selection.selected_role_id,
+            "role_name": llm_role_selection.selected_role_name,
+            "confidence": llm_role_selection.confidence,
+            "reasoning": llm_role_selection.reasoning
+        }, timing["role_selection"]
+
+    def process_tasks(self, user_tasks_dict: dict, defer_role_selection: bool = False):
+        """
+        Run the pipeline on one user's tasks.
+
+        Stages run as a dependency graph on the pipeline's thread pool:
+
+            language detection --(German)--> translation --> validation
+            validation (speculative, on the original text)
+            process identification --> FAISS retrieval
+                            all of the above --> reasoning --> role selection
+
+        Process identification always worked on the original text, so it and
+        the retrieval start right away. Validation starts speculatively on the
+        original text and is re-run on the translation for German input.
+
+        Args:
+            user_tasks_dict: {"responsible_for": [...], "supporting": [...], "designing": [...]}
+            defer_role_selection: Return the role selection as a Future in
+                "llm_role_suggestion_future" instead of waiting for it, so the
+                caller can overlap it with its own work. The future resolves
+                to (suggestion, seconds); the caller adds the seconds to
+                metadata["stage_timings"]["role_selection"]
+
+        Returns:
+            {"status": "success", "result", "llm_role_suggestion", "metadata"},
+            {"status": "invalid_tasks", "message", "metadata"}, or a message
+            string if nothing could be identified/retrieved.
+            metadata = {"stage_timings": {stage: seconds}, "total_seconds",
+            "retrieval_cache_hit", "reasoning_prompt_tokens"}
+            Only this thread writes timings/metadata: the concurrent stages
+            record into their own dicts, merged when their result is used, so
+            an abandoned (cancelled) stage never writes to a returned result.
+        """
+        started = time.perf_counter()
+        timings = {}
+        metadata = {"stage_timings": timings}
+        retrieval_timings, retrieval_metadata = {}, {}
+        validation_timings = {}
+
+        catalogue = _timed(timings, "catalogue", self.catalogue)
 
-        # Step 6: Retrieve relevant documents using FAISS
-        retrieved_docs = retriever.get_relevant_documents(retrieval_query)
-        retrieved_docs = retrieved_docs[:k]  # Ensure we only take the top k documents
+        tasks_text = "\n".join(
+            ["Responsible For:"] + user_tasks_dict.get("responsible_for", []) +
+            ["Supporting:"] + user_tasks_dict.get("supporting", []) +
+            ["Designing:"] + user_tasks_dict.get("designing", [])
+        )
+
+        pool = self._executor
+        language_future = pool.submit(
+            _timed, timings, "language_detection", self.language_detection_chain.invoke, {"tasks": tasks_text}
+        )
+        retrieval_future = pool.submit(
+            self._identify_and_retrieve, catalogue, tasks_text, retrieval_timings, retrieval_metadata
+        )
+        validation_future = pool.submit(
+            _timed, validation_timings, "validation", self.validation_chain.invoke, {"tasks": tasks_text}
+        )
+        pending = [language_future, retrieval_future, validation_future]
+
+        try:
+            # Step 1: Language Detection
+            language_detection_result = language_future.result()
+            print("Language detection result:", language_detection_result)
+
+            # Step 2: Translation if necessary
+            if language_detection_result.is_german:
+                validation_future.cancel()
+                translation_result = _timed(timings, "translation", self.translation_chain.invoke, {"tasks": tasks_text})
+                # Reassemble the translated tasks from the structured output into the expected text format.
+                translated = translation_result.translated_tasks
+                translated_tasks_text = (
+                    "Responsible For:\n" + "\n".join(translated.responsible_for) + "\n" +
+                    "Supporting:\n" + "\n".join(translated.supporting) + "\n" +
+                    "Designing:\n" + "\n".join(translated.designing)
+                )
+                print("Translated tasks:", translated_tasks_text)
+                # Step 3: Validation of the translated tasks
+                validation_result = _timed(
+                    timings, "validation", self.validation_chain.invoke, {"tasks": translated_tasks_text}
+                )
+            else:
+                translated_tasks_text = tasks_text
+                # Step 3: Validation (already running)
+                validation_result = validation_future.result()
+                timings.update(validation_timings)
+
+            print("Validation result:",validation_result)
+            if not (validation_result.is_valid_responsible_for and validation_result.is_valid_supporting and validation_result.is_valid_designing):
+                retrieval_future.cancel()
+                metadata["total_seconds"] = round(time.perf_counter() - started, 3)
+                return {
+                    "status": "invalid_tasks",
+                    "message": validation_result.message,
+                    "metadata": metadata
+                }
+
+            # Steps 4-6: Process identification and retrieval (already running)
+            identified_processes, retrieved_docs = retrieval_future.result()
+            timings.update(retrieval_timings)
+            metadata.update(retrieval_metadata)
+        except BaseException:
+            for future in pending:
+                future.cancel()
+            raise
+
+        if not identified_processes:
+            return "No relevant processes identified based on the user's tasks."
 
         print("Retrieved docs:", retrieved_docs)
         if not retrieved_docs:
             return "No documents retrieved from the FAISS store."
 
-        # Format the retrieved documents
-        retrieved_iso_processes = format_docs(retrieved_docs)
-        print("Retrieved iso processes:", retrieved_iso_processes)
-        # Step 7: Token Count Check before the final LLM call
-        # Retrieve the reasoning prompt separately
-        reasoning_prompt = create_reasoning_prompt()
-        # Prepare the prompt that will be sent to the reasoning chain
-        reasoning_prompt_text = reasoning_prompt.format_prompt(
+        # Step 7: Token budget before the final LLM call - the fixed prompt is
+        # counted once, documents by their cached counts, and the most relevant
+        # documents that fit are packed in one pass
+        packing_started = time.perf_counter()
+        fixed_prompt_text = self.reasoning_prompt.format_prompt(
             user_tasks=translated_tasks_text,
-            retrieved_iso_processes=retrieved_iso_processes
+            retrieved_iso_processes=""
         ).to_string()
-
-        # Calculate the number of tokens in the prompt
-        num_tokens = len(encoder.encode(reasoning_prompt_text))
-        print(f"Number of tokens in the prompt: {num_tokens}")
-
-        # If the token count exceeds 6000, adjust the retrieved chunks
-        max_tokens = 6000
-        if num_tokens > max_tokens:
-            print("Token count exceeds the limit. Adjusting retrieved documents.")
-            # Strategy: Reduce the number of retrieved documents
-            while num_tokens > max_tokens and len(retrieved_docs) > 1:
-                retrieved_docs = retrieved_docs[:-1]  # Remove the last document
-                retrieved_iso_processes = format_docs(retrieved_docs)
-                reasoning_prompt_text = reasoning_prompt.format_prompt(
-                    user_tasks=translated_tasks_text,
-                    retrieved_iso_processes=retrieved_iso_processes
-                ).to_string()
-                num_tokens = len(encoder.encode(reasoning_prompt_text))
-                print(f"Adjusted number of tokens: {num_tokens}")
-
-            if num_tokens > max_tokens:
-                # If still too long, summarize the retrieved documents
-                print("Even after adjusting, token count is too high. Summarizing retrieved documents.")
-                summary_length = int(len(retrieved_iso_processes) * (max_tokens / num_tokens))
-                retrieved_iso_processes = retrieved_iso_processes[:summary_length]
-                reasoning_prompt_text = reasoning_prompt.format_prompt(
-                    user_tasks=translated_tasks_text,
-                    retrieved_iso_processes=retrieved_iso_processes
-                ).to_string()
-                num_tokens = len(encoder.encode(reasoning_prompt_text))
-                print(f"Final adjusted number of tokens: {num_tokens}")
+        packed = reasoning_packer.pack(
+            check_token_count(fixed_prompt_text), retrieved_docs, REASONING_TOKEN_BUDGET
+        )
+        retrieved_iso_processes = packed.text
+        print(f"Number of tokens in the prompt: {packed.tokens} "
+              f"({len(packed.documents)} documents, {packed.dropped} dropped"
+              f"{', first document truncated' if packed.truncated else ''})")
+        metadata["reasoning_prompt_tokens"] = packed.tokens
+        timings["token_check"] = round(time.perf_counter() - packing_started, 3)
 
         # Step 8: Run the reasoning chain with adjusted prompt
         reasoning_input = {
             "user_tasks": translated_tasks_text,
             "retrieved_iso_processes": retrieved_iso_processes
         }
-        reasoning_result = reasoning_chain.invoke(reasoning_input)
+        reasoning_result = _timed(timings, "reasoning", self.reasoning_chain.invoke, reasoning_input)
         print("Reasoning Result:", reasoning_result)
 
-        # Step 9: NEW - LLM-based role selection
-        # Format process involvement for role selection prompt
-        process_involvement_text = "\n".join([
-            f"- {p.process_name}: {p.involvement}"
-            for p in reasoning_result.processes
-            if p.involvement != 'Not performing'
-        ])
+        # Step 9: LLM-based role selection, in the background while the
+        # result is handed back (and formatted/stored by the caller)
+        role_future = pool.submit(self._select_role, translated_tasks_text, reasoning_result)
 
-        role_selection_input = {
-            "user_tasks": translated_tasks_text,
-            "process_involvement": process_involvement_text
-        }
-
-        llm_role_selection = role_selection_chain.invoke(role_selection_input)
-        print("LLM Role Selection:", llm_role_selection)
-
-        #return reasoning_result
-        return {
+        result = {
             "status": "success",
             "result": reasoning_result,
-            "llm_role_suggestion": {
-                "role_id": llm_role_selection.selected_role_id,
-                "role_name": llm_role_selection.selected_role_name,
-                "confidence": llm_role_selection.confidence,
-                "reasoning": llm_role_selection.reasoning
-            }
+            "metadata": metadata
         }
+        if defer_role_selection:
+            result["llm_role_suggestion_future"] = role_future
+        else:
+            result["llm_role_suggestion"], timings["role_selection"] = role_future.result()
+
+        metadata["total_seconds"] = round(time.perf_counter() - started, 3)
+        print(f"Pipeline stage timings: {timings}")
+        return result
+
+    __call__ = process_tasks
+
+
+_pipeline = None
+_pipeline_lock = threading.Lock()
+
 
-    return process_tasks
+def get_pipeline():
+    """Process-wide warm pipeline (built on first use)"""
+    global _pipeline
+    if _pipeline is None:
+        with _pipeline_lock:
+            if _pipeline is None:
+                _pipeline = ProcessIdentificationPipeline()
+    return _pipeline
+
+
+# --- Create the modified pipeline with token check ---
+def create_pipeline():
+    """
+    Backwards-compatible entry point: returns the warm pipeline's process_tasks.
+
+    Raises ValueError if the process catalogue cannot be loaded.
+    """
+    pipeline = get_pipeline()
+    pipeline.catalogue()
+    return pipeline.process_tasks
 
 # --- Example usage ---
 if __name__ == "__main__":
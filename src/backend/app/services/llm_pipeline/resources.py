@@ -0,0 +1,84 @@
+"""
+Lazily loaded resources of the process identification pipeline
+===============================================================
+
+Importing this module is cheap: it only registers loaders with
+app/services/lazy_resources.py. LangChain (with the pipeline module itself),
+the embedding provider and the process vector index are loaded by the first
+request that runs the pipeline. With SEQPT_PRELOAD=1 the gunicorn master
+preloads the module and the index (pure data); the embedding provider holds an
+OpenAI HTTP client or a torch model and is always created in the worker,
+after fork (fork_safe=False).
+
+The vector index (app/faiss_index, see vector_index.py) is a manifest, a
+memory-mapped vectors.npy and documents.json - nothing is unpickled. It is
+built by setup/utils/rebuild_process_index.py and must match the configured
+embedding provider (see embeddings.py).
+
+pipeline_available() tells whether the pipeline can run without importing
+any of it.
+
+Date: 2026-10-18
+"""
+
+import importlib.util
+import os
+
+from app.services.lazy_resources import measure_import, register_resource
+from app.services.llm_pipeline.vector_index import index_exists
+
+# This file is at: src/backend/app/services/llm_pipeline/resources.py
+# Vector index is at: src/backend/app/faiss_index/
+FAISS_INDEX_PATH = os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'faiss_index')
+)
+
+# Processes with their activities and tasks - source of the index documents
+PROCESS_CATALOGUE_PATH = os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', 'data', 'iso_process_catalogue.json')
+)
+
+REQUIRED_PACKAGES = ('langchain', 'langchain_openai', 'tiktoken')
+
+
+def pipeline_available():
+    """
+    Whether the pipeline's packages and vector index are present (nothing is imported).
+
+    Returns:
+        (available, reason) - reason is None if available
+    """
+    missing = [name for name in REQUIRED_PACKAGES if importlib.util.find_spec(name) is None]
+    if missing:
+        return False, f"Missing packages: {', '.join(missing)}"
+    if not index_exists(FAISS_INDEX_PATH):
+        return False, f"Vector index not found in {FAISS_INDEX_PATH} (run setup/utils/rebuild_process_index.py)"
+    return True, None
+
+
+def _load_pipeline_module():
+    with measure_import('langchain'):
+        from app.services.llm_pipeline import llm_process_identification_pipeline
+    return llm_process_identification_pipeline
+
+
+def _load_embedding_provider():
+    from app.services.llm_pipeline.embeddings import create_embedding_provider
+    with measure_import('embeddings'):
+        return create_embedding_provider()
+
+
+def _load_vector_store():
+    from app.services.llm_pipeline.embeddings import configured_identity
+    from app.services.llm_pipeline.vector_index import VectorIndex
+    index = VectorIndex.load(FAISS_INDEX_PATH)
+    # Checked against the settings - the provider itself is not created here
+    index.check_identity(configured_identity())
+    return index
+
+
+pipeline_module = register_resource('process_identification_pipeline', _load_pipeline_module, 'langchain')
+embedding_provider = register_resource(
+    'embedding_provider', _load_embedding_provider, 'embeddings', fork_safe=False
+)
+vector_store = register_resource('faiss_vector_store', _load_vector_store, 'vector_index')
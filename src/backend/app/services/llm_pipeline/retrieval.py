@@ -0,0 +1,203 @@
+"""
+Process Retrieval - Cached FAISS retrieval keyed by the identified process set
+==============================================================================
+
+process_tasks() built the FAISS query string from the names and truncated
+descriptions of the identified ISO processes, embedded it with a remote
+OpenAIEmbeddings round trip on every call, fetched k=10 documents and
+sliced them to len(processes) + 4. With about 30 ISO processes the same
+process sets recur constantly.
+
+- ProcessEmbeddingTable: one unit vector per catalogue process (its
+  retrieval snippet), embedded in a single batched call when a catalogue is
+  first used. The query vector of a process set is composed locally as the
+  renormalized mean of the stored vectors, so a request needs no embedding
+  call
+- RetrievalCache: documents per (catalogue fingerprint, normalized process
+  set, k), LRU-bounded, with hit-rate and latency counters
+- retrieve_documents(): cache lookup, then one similarity search of exactly
+  k documents
+
+Processes the catalogue does not know (or compose_query_vectors = false)
+fall back to embedding the query text remotely, as before.
+
+Settings come from the 'process_retrieval' section of
+config/learning_objectives_config.json (see config_loader).
+
+Date: 2026-10-18
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.services.config_loader import get_process_retrieval_settings
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_process_set(identified_processes: Sequence[str]) -> Tuple[str, ...]:
+    """Order- and case-insensitive key of an identified process set"""
+    return tuple(sorted({name.strip().lower() for name in identified_processes if name and name.strip()}))
+
+
+class ProcessEmbeddingTable:
+    """Unit-normalized embedding per catalogue process (read-only)"""
+
+    def __init__(self, names: Sequence[str], vectors: np.ndarray):
+        self.index = {name: i for i, name in enumerate(names)}
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        self.vectors = np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+        self.vectors.setflags(write=False)
+
+    @classmethod
+    def build(cls, snippets: Sequence[Tuple[str, str]], embeddings) -> 'ProcessEmbeddingTable':
+        """
+        Args:
+            snippets: [(lower-case process name, retrieval text), ...]
+            embeddings: LangChain Embeddings (one embed_documents() call)
+        """
+        started = time.perf_counter()
+        vectors = embeddings.embed_documents([text for _, text in snippets])
+        logger.info(
+            f"[process_retrieval] Embedded {len(snippets)} process snippets "
+            f"in {time.perf_counter() - started:.2f}s"
+        )
+        return cls([name for name, _ in snippets], np.array(vectors, dtype=np.float32))
+
+    def query_vector(self, process_set: Sequence[str]) -> Optional[np.ndarray]:
+        """Renormalized mean of the processes' vectors (None if any process is unknown)"""
+        rows = [self.index.get(name) for name in process_set]
+        if not rows or any(row is None for row in rows):
+            return None
+        mean = self.vectors[rows].mean(axis=0)
+        norm = np.linalg.norm(mean)
+        return mean / norm if norm > 0 else mean
+
+
+class RetrievalCache:
+    """
+    Retrieved documents per (fingerprint, process set, k), least recently used evicted.
+
+    Counters (see stats()):
+        hits, misses, composed_queries (query vector built locally),
+        embedded_queries (remote embedding call), table_builds, and the
+        total/max retrieval seconds of hits and misses
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Hashable, Tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = {
+            'hits': 0, 'misses': 0, 'composed_queries': 0, 'embedded_queries': 0, 'table_builds': 0
+        }
+        self.latency = {
+            'hit_seconds': 0.0, 'hit_max_seconds': 0.0,
+            'miss_seconds': 0.0, 'miss_max_seconds': 0.0
+        }
+
+    def get(self, key: Hashable) -> Optional[List]:
+        with self._lock:
+            documents = self._entries.get(key)
+            if documents is None:
+                return None
+            self._entries.move_to_end(key)
+            return list(documents)
+
+    def put(self, key: Hashable, documents: Sequence) -> None:
+        with self._lock:
+            self._entries[key] = tuple(documents)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def count(self, counter: str) -> None:
+        with self._lock:
+            self.counters[counter] += 1
+
+    def record(self, hit: bool, seconds: float) -> None:
+        prefix = 'hit' if hit else 'miss'
+        with self._lock:
+            self.counters['hits' if hit else 'misses'] += 1
+            self.latency[f'{prefix}_seconds'] += seconds
+            self.latency[f'{prefix}_max_seconds'] = max(self.latency[f'{prefix}_max_seconds'], seconds)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self.counters)
+            latency = dict(self.latency)
+            stats['entries'] = len(self._entries)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else 0.0
+        stats['avg_hit_ms'] = round(1000 * latency['hit_seconds'] / stats['hits'], 3) if stats['hits'] else 0.0
+        stats['avg_miss_ms'] = round(1000 * latency['miss_seconds'] / stats['misses'], 3) if stats['misses'] else 0.0
+        stats['max_hit_ms'] = round(1000 * latency['hit_max_seconds'], 3)
+        stats['max_miss_ms'] = round(1000 * latency['miss_max_seconds'], 3)
+        return stats
+
+
+_retrieval_cache = None
+_retrieval_cache_lock = threading.Lock()
+
+
+def get_retrieval_cache() -> RetrievalCache:
+    """Process-wide retrieval cache (created on first use from the settings)."""
+    global _retrieval_cache
+    if _retrieval_cache is None:
+        with _retrieval_cache_lock:
+            if _retrieval_cache is None:
+                settings = get_process_retrieval_settings()
+                _retrieval_cache = RetrievalCache(max_entries=int(settings.get('cache_entries', 256)))
+    return _retrieval_cache
+
+
+def retrieve_documents(catalogue, identified_processes: Sequence[str], k: int,
+                       vector_store, embeddings) -> Tuple[List, bool]:
+    """
+    Top-k documents for an identified process set.
+
+    Args:
+        catalogue: ProcessCatalogue (fingerprint, retrieval_snippets,
+            retrieval_query(), embedding_table(embeddings))
+        vector_store: LangChain vector store (similarity_search_by_vector)
+        embeddings: LangChain Embeddings, used for the process table and for
+            queries that cannot be composed
+
+    Returns:
+        (documents, cache_hit)
+    """
+    started = time.perf_counter()
+    cache = get_retrieval_cache()
+    process_set = normalize_process_set(identified_processes)
+    key = (catalogue.fingerprint, process_set, k)
+
+    documents = cache.get(key)
+    if documents is not None:
+        cache.record(True, time.perf_counter() - started)
+        return documents, True
+
+    vector = None
+    if get_process_retrieval_settings().get('compose_query_vectors', True):
+        vector = catalogue.embedding_table(embeddings).query_vector(process_set)
+    if vector is not None:
+        cache.count('composed_queries')
+        query = vector.tolist()
+    else:
+        query_text = catalogue.retrieval_query(identified_processes) or " ".join(identified_processes)
+        cache.count('embedded_queries')
+        query = embeddings.embed_query(query_text)
+
+    documents = vector_store.similarity_search_by_vector(query, k=k)
+    cache.put(key, documents)
+    cache.record(False, time.perf_counter() - started)
+    return list(documents), False
@@ -0,0 +1,114 @@
+"""
+Token Budget - One-pass packing of retrieved documents into the reasoning prompt
+================================================================================
+
+When the reasoning prompt exceeded 6,000 tokens, process_tasks() dropped the
+last retrieved document, re-rendered the whole prompt and re-encoded it -
+once per dropped document, quadratic in the number of documents - and as a
+last resort cut the context by a character ratio.
+
+TokenBudgetPacker counts the fixed part of the prompt once per request and
+every document once per process (the documents come from the fixed ISO
+catalogue, so their counts are cached by text), then keeps the longest
+prefix of the retrieved documents (retrieval order = relevance order, the
+same subset the old loop arrived at) that fits the budget in one pass. If
+not even the first document fits, it is cut at a token boundary.
+
+Counts are summed per part; BPE merges across a part boundary can differ by
+a token, so BOUNDARY_TOKENS per joined part are reserved.
+
+Date: 2026-10-18
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Sequence
+
+# Reserved per document for tokens merging across the separator
+BOUNDARY_TOKENS = 1
+
+DOCUMENT_SEPARATOR = "\n\n"
+
+
+@dataclass(frozen=True)
+class PackedContext:
+    """Documents selected for the prompt and the estimated prompt size"""
+    documents: List
+    text: str
+    tokens: int
+    dropped: int
+    truncated: bool
+
+
+class TokenBudgetPacker:
+    """Packs documents into a token budget; per-text token counts are cached"""
+
+    def __init__(self, encoder, max_entries: int = 4096):
+        self.encoder = encoder
+        self.max_entries = max_entries
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.counters = {'hits': 0, 'misses': 0}
+
+    def count(self, text: str) -> int:
+        """Token count of a document text (cached)"""
+        with self._lock:
+            count = self._counts.get(text)
+            if count is not None:
+                self.counters['hits'] += 1
+                return count
+            self.counters['misses'] += 1
+
+        count = len(self.encoder.encode(text))
+        with self._lock:
+            if len(self._counts) >= self.max_entries:
+                self._counts.clear()
+            self._counts[text] = count
+        return count
+
+    def pack(self, fixed_tokens: int, documents: Sequence, budget: int) -> PackedContext:
+        """
+        Longest prefix of documents (by page_content) that fits the budget.
+
+        Args:
+            fixed_tokens: tokens of the prompt rendered with an empty context
+            documents: retrieved documents in relevance order
+            budget: maximum prompt tokens
+        """
+        separator_tokens = self.count(DOCUMENT_SEPARATOR)
+        used = fixed_tokens
+        selected = []
+        for document in documents:
+            cost = self.count(document.page_content) + BOUNDARY_TOKENS
+            if selected:
+                cost += separator_tokens
+            if used + cost > budget:
+                break
+            selected.append(document)
+            used += cost
+
+        if selected or not documents:
+            return PackedContext(
+                documents=selected,
+                text=DOCUMENT_SEPARATOR.join(d.page_content for d in selected),
+                tokens=used,
+                dropped=len(documents) - len(selected),
+                truncated=False
+            )
+
+        # Not even the most relevant document fits - keep its first tokens
+        remaining = max(budget - fixed_tokens - BOUNDARY_TOKENS, 0)
+        text = self.encoder.decode(self.encoder.encode(documents[0].page_content)[:remaining])
+        return PackedContext(
+            documents=[documents[0]],
+            text=text,
+            tokens=fixed_tokens + remaining + BOUNDARY_TOKENS,
+            dropped=len(documents) - 1,
+            truncated=True
+        )
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self.counters)
+            stats['entries'] = len(self._counts)
+        return stats
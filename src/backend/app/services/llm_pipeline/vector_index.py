@@ -0,0 +1,259 @@
+"""
+Vector Index - Safe, memory-mappable process retrieval index
+============================================================
+
+app/faiss_index held a FAISS index.faiss plus a pickled LangChain docstore
+(index.pkl) that FAISS.load_local only reads with
+allow_dangerous_deserialization=True: unpickling can execute arbitrary code,
+and every worker unpickled and held its own copy.
+
+A VectorIndex directory holds three plain files:
+
+- index.json: manifest (format version, embedding provider and model,
+  dimension, count, source of the documents, creation time)
+- vectors.npy: float32 (count, dimension) matrix, opened with
+  np.load(mmap_mode='r', allow_pickle=False) - the pages are shared by all
+  workers through the OS page cache
+- documents.json: page_content and metadata per row
+
+Search is exact squared L2 distance, like the IndexFlatL2 it replaces; with
+one document per ISO process the matrix is tiny and FAISS is not needed.
+
+The documents are rendered from data/iso_process_catalogue.json (process
+description plus its ISO/IEC 15288 activities and tasks - these are not in
+the database) by process_documents(); read_legacy_faiss_index() converts an
+old index.faiss / index.pkl pair once (setup/utils/rebuild_process_index.py
+--from-legacy).
+
+Date: 2026-10-18
+"""
+
+import json
+import logging
+import os
+import pickle
+import struct
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FORMAT = 'seqpt-vector-index'
+FORMAT_VERSION = 1
+
+MANIFEST_FILE = 'index.json'
+VECTORS_FILE = 'vectors.npy'
+DOCUMENTS_FILE = 'documents.json'
+
+
+@dataclass(frozen=True)
+class IndexedDocument:
+    """Retrieved text (same attributes as a LangChain Document)"""
+    page_content: str
+    metadata: Dict = field(default_factory=dict)
+
+
+def index_exists(path: str) -> bool:
+    return os.path.isfile(os.path.join(path, MANIFEST_FILE))
+
+
+class VectorIndex:
+    """Documents with their embedding vectors (read-only)"""
+
+    def __init__(self, vectors: np.ndarray, documents: Sequence[IndexedDocument], manifest: Mapping):
+        if vectors.ndim != 2 or len(vectors) != len(documents):
+            raise ValueError(f"{len(documents)} documents but vectors of shape {vectors.shape}")
+        self.vectors = vectors
+        self.documents = list(documents)
+        self.manifest = dict(manifest)
+        self._squared_norms = np.einsum('ij,ij->i', vectors, vectors)
+
+    @property
+    def dimension(self) -> int:
+        return self.vectors.shape[1]
+
+    @property
+    def identity(self) -> Dict[str, str]:
+        return {'provider': self.manifest.get('provider'), 'model': self.manifest.get('model')}
+
+    def check_provider(self, provider) -> None:
+        """Raise ValueError unless the index was built with this embedding provider"""
+        self.check_identity(provider.identity)
+
+    def check_identity(self, identity: Mapping[str, str]) -> None:
+        """Raise ValueError unless the index was built with this embedding provider and model"""
+        if dict(identity) != self.identity:
+            raise ValueError(
+                f"Vector index was built with {self.identity['provider']}/{self.identity['model']}, "
+                f"but embeddings are configured as {identity['provider']}/{identity['model']} - "
+                f"rebuild it with setup/utils/rebuild_process_index.py"
+            )
+
+    # -------------------------------------------------------------------------
+    # Build / load / save
+    # -------------------------------------------------------------------------
+
+    @classmethod
+    def build(cls, documents: Sequence[IndexedDocument], provider, source: Optional[Dict] = None) -> 'VectorIndex':
+        """Embed the documents with the provider (one embed_documents() call)"""
+        vectors = np.array(provider.embed_documents([d.page_content for d in documents]), dtype=np.float32)
+        return cls.from_vectors(vectors, documents, provider.identity, source)
+
+    @classmethod
+    def from_vectors(cls, vectors: np.ndarray, documents: Sequence[IndexedDocument],
+                     identity: Mapping[str, str], source: Optional[Dict] = None) -> 'VectorIndex':
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        manifest = {
+            'format': FORMAT,
+            'version': FORMAT_VERSION,
+            'provider': identity['provider'],
+            'model': identity['model'],
+            'dimension': int(vectors.shape[1]) if vectors.ndim == 2 else 0,
+            'count': len(documents),
+            'metric': 'l2',
+            'source': source or {},
+            'created_at': datetime.utcnow().isoformat() + 'Z'
+        }
+        return cls(vectors, documents, manifest)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> 'VectorIndex':
+        """
+        Open an index directory; vectors are memory-mapped unless mmap=False.
+
+        Raises:
+            FileNotFoundError: no index in path
+            ValueError: unknown format or inconsistent files
+        """
+        with open(os.path.join(path, MANIFEST_FILE), encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('format') != FORMAT or manifest.get('version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported vector index format in {path}: {manifest.get('format')} "
+                             f"v{manifest.get('version')}")
+
+        vectors = np.load(os.path.join(path, VECTORS_FILE), mmap_mode='r' if mmap else None, allow_pickle=False)
+        if vectors.dtype != np.float32 or vectors.shape != (manifest['count'], manifest['dimension']):
+            raise ValueError(f"Vectors in {path} do not match the manifest: {vectors.dtype} {vectors.shape}")
+
+        with open(os.path.join(path, DOCUMENTS_FILE), encoding='utf-8') as f:
+            documents = [IndexedDocument(d['page_content'], d.get('metadata') or {}) for d in json.load(f)]
+
+        index = cls(vectors, documents, manifest)
+        logger.info(
+            f"[vector_index] Loaded {manifest['count']} x {manifest['dimension']} "
+            f"({manifest['provider']}/{manifest['model']}) from {path}"
+        )
+        return index
+
+    def save(self, path: str) -> None:
+        """
+        Write the index to a directory. Every file is replaced atomically and
+        the manifest last, so running workers keep their mapping of the old
+        vectors.
+        """
+        os.makedirs(path, exist_ok=True)
+
+        def replace(name, write):
+            target = os.path.join(path, name)
+            temporary = f"{target}.tmp"
+            with open(temporary, 'wb') as f:
+                write(f)
+            os.replace(temporary, target)
+
+        replace(VECTORS_FILE, lambda f: np.save(f, np.ascontiguousarray(self.vectors, dtype=np.float32),
+                                                allow_pickle=False))
+        documents = [{'page_content': d.page_content, 'metadata': d.metadata} for d in self.documents]
+        replace(DOCUMENTS_FILE, lambda f: f.write(json.dumps(documents, ensure_ascii=False, indent=1).encode('utf-8')))
+        replace(MANIFEST_FILE, lambda f: f.write(json.dumps(self.manifest, indent=2).encode('utf-8')))
+
+    # -------------------------------------------------------------------------
+    # Search
+    # -------------------------------------------------------------------------
+
+    def similarity_search_by_vector(self, embedding: Sequence[float], k: int = 4) -> List[IndexedDocument]:
+        """The k documents closest to the query vector (ascending L2 distance, ties by row)"""
+        query = np.asarray(embedding, dtype=np.float32)
+        if query.shape != (self.dimension,):
+            raise ValueError(f"Query vector has shape {query.shape}, index dimension is {self.dimension}")
+
+        k = min(int(k), len(self.documents))
+        if k <= 0:
+            return []
+        distances = self._squared_norms - 2 * (self.vectors @ query) + query @ query
+        rows = np.arange(len(distances)) if k == len(distances) else np.argpartition(distances, k - 1)[:k]
+        rows = rows[np.lexsort((rows, distances[rows]))]
+        return [self.documents[i] for i in rows]
+
+    def similarity_search(self, query: str, embeddings, k: int = 4) -> List[IndexedDocument]:
+        return self.similarity_search_by_vector(embeddings.embed_query(query), k)
+
+
+def load_process_catalogue(path: str) -> List[Dict]:
+    """Processes with their activities and tasks ([{'name', 'description', 'activities': [{'name', 'tasks'}]}])"""
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def merge_process_catalogue(rows: Sequence[Mapping],
+                            catalogue: Sequence[Mapping]) -> Tuple[List[Dict], List[str]]:
+    """
+    iso_processes rows ({'name', 'description'}) with the activities and tasks
+    of the catalogue entry of the same name (case-insensitive).
+
+    Returns:
+        (processes, names of rows without catalogue activities)
+    """
+    activities = {entry['name'].strip().lower(): entry.get('activities', []) for entry in catalogue}
+    processes, missing = [], []
+    for row in rows:
+        key = row['name'].strip().lower()
+        if key not in activities:
+            missing.append(row['name'])
+        processes.append({
+            'name': row['name'],
+            'description': row['description'] or '',
+            'activities': activities.get(key, [])
+        })
+    return processes, missing
+
+
+def process_documents(processes: Sequence[Mapping]) -> List[IndexedDocument]:
+    """One document per process: name, description and its activities with their tasks"""
+    documents = []
+    for process in processes:
+        lines = [f"Process: {process['name']}", f"Process Description: {process.get('description') or ''}"]
+        for activity in process.get('activities', []):
+            lines.append(f"  Activity: {activity['name']}")
+            lines.extend(f"    Task: {task}" for task in activity.get('tasks', []))
+        documents.append(IndexedDocument(page_content="\n".join(lines) + "\n", metadata={}))
+    return documents
+
+
+def read_legacy_faiss_index(path: str) -> Tuple[np.ndarray, List[IndexedDocument]]:
+    """
+    Vectors and documents of a LangChain FAISS.save_local() directory with a
+    flat L2 index (IndexFlatL2), read without the faiss package.
+
+    index.pkl is unpickled - only use this on the trusted index shipped with
+    the repository.
+    """
+    with open(os.path.join(path, 'index.faiss'), 'rb') as f:
+        data = f.read()
+    if data[:4] != b'IxF2':
+        raise ValueError(f"Not a flat L2 FAISS index: {data[:4]!r}")
+    # fourcc, d, ntotal, two unused int64, is_trained, metric_type, vector length
+    dimension, count, _, _, _, _ = struct.unpack_from('<iqqq?i', data, 4)
+    offset = 4 + struct.calcsize('<iqqq?i')
+    (length,) = struct.unpack_from('<Q', data, offset)
+    vectors = np.frombuffer(data, dtype=np.float32, count=length, offset=offset + 8).reshape(count, dimension)
+
+    with open(os.path.join(path, 'index.pkl'), 'rb') as f:
+        docstore, index_to_docstore_id = pickle.load(f)
+    documents = []
+    for row in range(count):
+        document = docstore.search(index_to_docstore_id[row])
+        documents.append(IndexedDocument(document.page_content, dict(document.metadata or {})))
+    return vectors.copy(), documents
@@ -0,0 +1,322 @@
+"""
+LLM Response Cache - Content-addressed fragment cache
+======================================================
+
+Caches individual LLM customizations (e.g. one PMT breakdown for one
+competency/level) keyed by a hash of exactly the inputs that go into the
+prompt, plus the model name and prompt version:
+
+    key = sha256(namespace, model, prompt_version, inputs)
+
+Because the key does not contain the organization or any assessment data,
+- a new assessment in an organization reuses every fragment (zero LLM calls)
+- organizations with identical PMT wording share fragments
+
+Two tiers:
+1. Per-process in-memory LRU (OrderedDict) for repeated lookups in a worker
+2. llm_response_cache table (LLMResponseCache model) shared by all workers
+
+Eviction: entries older than ttl_hours are treated as misses and deleted;
+prune() drops the least recently used rows above max_entries. Memory hits
+refresh last_used_at in the database (at most every LAST_USED_RESOLUTION per
+key) so fragments served from memory are not pruned as unused.
+
+All database access happens in the calling thread (it needs the Flask app
+context) - look up with get_many() before fanning out LLM calls to worker
+threads and store with put_many() afterwards.
+
+Nothing here commits: cache writes run in a savepoint of the caller's session,
+so a failed cache write only rolls back itself and the caller's commit
+persists the entries together with its own changes.
+
+Date: 2026-10-18
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Optional
+
+from app.services.config_loader import get_llm_response_cache_settings
+from app.services.db_helpers import dialect_insert
+
+try:
+    from models import db, LLMResponseCache
+except ImportError:
+    from app.models import db, LLMResponseCache
+
+logger = logging.getLogger(__name__)
+
+# How often a memory hit writes last_used_at back to the database (per key)
+LAST_USED_RESOLUTION = timedelta(minutes=5)
+
+
+def compute_fragment_key(namespace: str, model: str, prompt_version: str, inputs: Dict[str, Any]) -> str:
+    """
+    SHA-256 cache key for one LLM fragment.
+
+    Args:
+        namespace: Fragment type (e.g. 'pmt_breakdown')
+        model: LLM model name
+        prompt_version: Bumped whenever the prompt template changes
+        inputs: Exactly the values interpolated into the prompt
+
+    Returns:
+        64-character hex string
+    """
+    payload = json.dumps(
+        {'ns': namespace, 'model': model, 'prompt': prompt_version, 'inputs': inputs},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class FragmentCache:
+    """
+    Two-tier (memory LRU + database) cache of LLM fragments.
+
+    Counters (see stats()):
+        memory_hits, db_hits, misses, stores, expired, evictions
+    """
+
+    def __init__(self, memory_entries: int, ttl_hours: float, max_entries: int):
+        self.memory_entries = memory_entries
+        self.ttl = timedelta(hours=ttl_hours)
+        self.max_entries = max_entries
+        self._memory: 'OrderedDict[str, tuple]' = OrderedDict()  # key -> (created_at, value, touched_at)
+        self._lock = threading.Lock()
+        self.counters = {
+            'memory_hits': 0,
+            'db_hits': 0,
+            'misses': 0,
+            'stores': 0,
+            'expired': 0,
+            'evictions': 0
+        }
+
+    # ------------------------------------------------------------------
+    # Memory tier
+    # ------------------------------------------------------------------
+
+    def _is_fresh(self, created_at: datetime, now: datetime) -> bool:
+        return created_at is not None and now - created_at < self.ttl
+
+    def _memory_get(self, key: str, now: datetime):
+        """Returns (value, needs_touch) or None; needs_touch means last_used_at is due."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            created_at, value, touched_at = entry
+            if not self._is_fresh(created_at, now):
+                del self._memory[key]
+                return None
+            needs_touch = now - touched_at >= LAST_USED_RESOLUTION
+            if needs_touch:
+                self._memory[key] = (created_at, value, now)
+            self._memory.move_to_end(key)
+            return value, needs_touch
+
+    def _memory_put(self, key: str, created_at: datetime, value: Any, touched_at: datetime) -> None:
+        with self._lock:
+            self._memory[key] = (created_at, value, touched_at)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counters[name] += amount
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """
+        Look up several keys at once (one SELECT for the memory misses, one
+        UPDATE of last_used_at for the hits).
+
+        Returns:
+            {key: value} for every fresh hit; missing keys are misses
+        """
+        now = datetime.utcnow()
+        found = {}
+        pending = []
+        touched = []
+
+        for key in dict.fromkeys(keys):
+            entry = self._memory_get(key, now)
+            if entry is not None:
+                found[key] = entry[0]
+                if entry[1]:
+                    touched.append(key)
+                self._count('memory_hits')
+            else:
+                pending.append(key)
+
+        if pending or touched:
+            try:
+                with db.session.begin_nested():
+                    rows = LLMResponseCache.query.filter(
+                        LLMResponseCache.cache_key.in_(pending)
+                    ).all() if pending else []
+
+                    expired_ids = []
+                    hit_ids = []
+                    for row in rows:
+                        if self._is_fresh(row.created_at, now):
+                            found[row.cache_key] = row.response
+                            hit_ids.append(row.id)
+                            self._memory_put(row.cache_key, row.created_at, row.response, now)
+                        else:
+                            expired_ids.append(row.id)
+
+                    if hit_ids:
+                        LLMResponseCache.query.filter(LLMResponseCache.id.in_(hit_ids)).update(
+                            {
+                                LLMResponseCache.last_used_at: now,
+                                LLMResponseCache.hit_count: LLMResponseCache.hit_count + 1
+                            },
+                            synchronize_session=False
+                        )
+                    if touched:
+                        LLMResponseCache.query.filter(LLMResponseCache.cache_key.in_(touched)).update(
+                            {LLMResponseCache.last_used_at: now},
+                            synchronize_session=False
+                        )
+                    if expired_ids:
+                        LLMResponseCache.query.filter(LLMResponseCache.id.in_(expired_ids)).delete(
+                            synchronize_session=False
+                        )
+
+                self._count('db_hits', len(hit_ids))
+                self._count('expired', len(expired_ids))
+            except Exception as e:
+                logger.warning(f"[FragmentCache] Lookup failed, treating as miss: {e}")
+
+        self._count('misses', len([k for k in pending if k not in found]))
+        return found
+
+    def get(self, key: str) -> Optional[Any]:
+        return self.get_many([key]).get(key)
+
+    def put_many(self, entries: Dict[str, Dict[str, Any]]) -> int:
+        """
+        Store fragments with a single INSERT ... ON CONFLICT DO UPDATE.
+
+        Expired rows are refreshed in place; a fresh row stored concurrently by
+        another worker is kept (its response is just as valid) and the entry is
+        not counted as stored.
+
+        Args:
+            entries: {key: {'namespace', 'model', 'prompt_version', 'response'}}
+
+        Returns:
+            Number of rows written
+        """
+        if not entries:
+            return 0
+
+        now = datetime.utcnow()
+        table = LLMResponseCache.__table__
+        try:
+            stmt = dialect_insert(table).values([
+                {
+                    'cache_key': key,
+                    'namespace': entry['namespace'],
+                    'model': entry['model'],
+                    'prompt_version': entry['prompt_version'],
+                    'response': entry['response'],
+                    'created_at': now,
+                    'last_used_at': now,
+                    'hit_count': 0
+                }
+                for key, entry in entries.items()
+            ])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.cache_key],
+                set_={
+                    'namespace': stmt.excluded.namespace,
+                    'model': stmt.excluded.model,
+                    'prompt_version': stmt.excluded.prompt_version,
+                    'response': stmt.excluded.response,
+                    'created_at': stmt.excluded.created_at,
+                    'last_used_at': stmt.excluded.last_used_at
+                },
+                where=table.c.created_at < now - self.ttl
+            ).returning(table.c.cache_key)
+            with db.session.begin_nested():
+                written = db.session.execute(stmt).scalars().all()
+        except Exception as e:
+            logger.warning(f"[FragmentCache] Store failed: {e}")
+            return 0
+
+        for key in written:
+            self._memory_put(key, now, entries[key]['response'], now)
+        self._count('stores', len(written))
+
+        self.prune()
+        return len(written)
+
+    def prune(self) -> int:
+        """Delete least recently used rows beyond max_entries. Returns rows deleted."""
+        try:
+            with db.session.begin_nested():
+                overflow = LLMResponseCache.query.count() - self.max_entries
+                if overflow <= 0:
+                    return 0
+
+                stale_ids = [
+                    row.id for row in db.session.query(LLMResponseCache.id).order_by(
+                        LLMResponseCache.last_used_at.asc()
+                    ).limit(overflow).all()
+                ]
+                LLMResponseCache.query.filter(LLMResponseCache.id.in_(stale_ids)).delete(
+                    synchronize_session=False
+                )
+            self._count('evictions', len(stale_ids))
+            logger.info(f"[FragmentCache] Pruned {len(stale_ids)} least recently used entries")
+            return len(stale_ids)
+        except Exception as e:
+            logger.warning(f"[FragmentCache] Prune failed: {e}")
+            return 0
+
+    def clear_memory(self) -> None:
+        with self._lock:
+            self._memory.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.counters)
+            stats['memory_size'] = len(self._memory)
+        lookups = stats['memory_hits'] + stats['db_hits'] + stats['misses']
+        stats['hit_rate'] = round((stats['memory_hits'] + stats['db_hits']) / lookups, 3) if lookups else 0.0
+        return stats
+
+
+_fragment_cache: Optional[FragmentCache] = None
+_fragment_cache_lock = threading.Lock()
+
+
+def get_fragment_cache() -> Optional[FragmentCache]:
+    """Process-wide fragment cache, or None if disabled in configuration."""
+    global _fragment_cache
+    settings = get_llm_response_cache_settings()
+    if not settings['enabled']:
+        return None
+
+    if _fragment_cache is None:
+        with _fragment_cache_lock:
+            if _fragment_cache is None:
+                _fragment_cache = FragmentCache(
+                    memory_entries=settings['memory_entries'],
+                    ttl_hours=settings['ttl_hours'],
+                    max_entries=settings['max_entries']
+                )
+    return _fragment_cache
@@ -0,0 +1,382 @@
+"""
+Reference Data Cache - Process-wide cache of near-immutable tables
+==================================================================
+
+competency, role_cluster, iso_processes, strategy_template and
+strategy_template_competency only change when the setup/populate scripts
+run, yet the hot paths re-read them constantly: Competency.query.get() per
+competency inside the gap / pyramid / comparison loops, get_all_competency_ids()
+per call, RoleCluster.query.get() per candidate in suggest-role-simple,
+IsoProcesses.query.all() per request and StrategyTemplateCompetency.query.filter_by()
+per (strategy, competency).
+
+This module keeps them in memory as read-only, slot-based records:
+
+- Each table ("section") is loaded read-through on first use with one query
+  and indexed by id (strategy template targets by template and competency)
+- Records are frozen dataclasses with __slots__, detached from the session,
+  so they can be shared by all threads of a worker
+- Invalidation: every worker compares its cached version with the single
+  reference_data_version row (at most every version_check_seconds) and drops
+  all sections on mismatch. bump_reference_data_version() increments it in
+  the caller's transaction
+- If the version row cannot be read (migration 016 not applied) nothing is
+  cached and every lookup reads the database, as before
+- stats() reports hits, misses (section loads), reloads and the hit rate
+
+Settings come from the 'reference_data' section of
+config/learning_objectives_config.json (see config_loader).
+
+Date: 2026-10-18
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from app.services.config_loader import get_reference_data_settings
+
+try:
+    from models import (
+        db, Competency, IsoProcesses, ReferenceDataVersion, RoleCluster,
+        StrategyTemplate, StrategyTemplateCompetency
+    )
+except ImportError:
+    from app.models import (
+        db, Competency, IsoProcesses, ReferenceDataVersion, RoleCluster,
+        StrategyTemplate, StrategyTemplateCompetency
+    )
+
+logger = logging.getLogger(__name__)
+
+REFERENCE_DATA_VERSION_ID = 1
+
+
+# =============================================================================
+# RECORDS
+# =============================================================================
+
+@dataclass(frozen=True, slots=True)
+class CompetencyRecord:
+    id: int
+    competency_name: str
+    competency_area: Optional[str]
+    description: Optional[str]
+    why_it_matters: Optional[str]
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'name': self.competency_name,
+            'area': self.competency_area,
+            'description': self.description,
+            'why_it_matters': self.why_it_matters
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class RoleClusterRecord:
+    id: int
+    role_cluster_name: str
+    role_cluster_description: str
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'name': self.role_cluster_name,
+            'description': self.role_cluster_description
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class IsoProcessRecord:
+    id: int
+    name: str
+    description: Optional[str]
+    life_cycle_process_id: Optional[int]
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'name': self.name,
+            'description': self.description,
+            'life_cycle_process_id': self.life_cycle_process_id
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class StrategyTemplateRecord:
+    id: int
+    strategy_name: str
+    strategy_description: Optional[str]
+    requires_pmt_context: bool
+    is_active: bool
+    targets: Mapping[int, int]  # {competency_id: target_level}, read-only
+
+
+@dataclass(frozen=True, slots=True)
+class _Section:
+    by_id: Mapping[int, Any]
+    ordered: Tuple[Any, ...]
+
+
+def _section(records) -> _Section:
+    ordered = tuple(sorted(records, key=lambda r: r.id))
+    return _Section(by_id=MappingProxyType({r.id: r for r in ordered}), ordered=ordered)
+
+
+# =============================================================================
+# LOADERS (one query per table)
+# =============================================================================
+
+def _load_competencies() -> _Section:
+    c = Competency.__table__.c
+    rows = db.session.execute(select(
+        c.id, c.competency_name, c.competency_area, c.description, c.why_it_matters
+    )).all()
+    return _section(CompetencyRecord(*row) for row in rows)
+
+
+def _load_role_clusters() -> _Section:
+    c = RoleCluster.__table__.c
+    rows = db.session.execute(select(c.id, c.role_cluster_name, c.role_cluster_description)).all()
+    return _section(RoleClusterRecord(*row) for row in rows)
+
+
+def _load_iso_processes() -> _Section:
+    c = IsoProcesses.__table__.c
+    rows = db.session.execute(select(c.id, c.name, c.description, c.life_cycle_process_id)).all()
+    return _section(IsoProcessRecord(*row) for row in rows)
+
+
+def _load_strategy_templates() -> _Section:
+    t = StrategyTemplate.__table__.c
+    tc = StrategyTemplateCompetency.__table__.c
+
+    targets: Dict[int, Dict[int, int]] = {}
+    for template_id, competency_id, target_level in db.session.execute(
+        select(tc.strategy_template_id, tc.competency_id, tc.target_level)
+    ):
+        targets.setdefault(template_id, {})[competency_id] = target_level
+
+    rows = db.session.execute(select(
+        t.id, t.strategy_name, t.strategy_description, t.requires_pmt_context, t.is_active
+    )).all()
+    return _section(
+        StrategyTemplateRecord(
+            id=row.id,
+            strategy_name=row.strategy_name,
+            strategy_description=row.strategy_description,
+            requires_pmt_context=bool(row.requires_pmt_context),
+            is_active=row.is_active is not False,
+            targets=MappingProxyType(targets.get(row.id, {}))
+        )
+        for row in rows
+    )
+
+
+_LOADERS: Dict[str, Callable[[], _Section]] = {
+    'competencies': _load_competencies,
+    'role_clusters': _load_role_clusters,
+    'iso_processes': _load_iso_processes,
+    'strategy_templates': _load_strategy_templates
+}
+
+
+# =============================================================================
+# VERSION STAMP
+# =============================================================================
+
+def read_reference_data_version() -> Optional[int]:
+    """Current reference data version (0 if never bumped), None if the table is unavailable"""
+    try:
+        with db.session.begin_nested():
+            version = db.session.execute(
+                select(ReferenceDataVersion.version).where(ReferenceDataVersion.id == REFERENCE_DATA_VERSION_ID)
+            ).scalar()
+        return version or 0
+    except SQLAlchemyError as e:
+        logger.debug(f"[reference_data] Version unavailable, caching disabled: {e}")
+        return None
+
+
+def bump_reference_data_version(reason: str) -> None:
+    """
+    Increment the reference data version.
+
+    Does not commit - the caller's commit persists the bump together with
+    the reference data change. This worker's cache is dropped immediately,
+    other workers reload within version_check_seconds.
+
+    Args:
+        reason: Short label of the triggering write (for debugging)
+    """
+    values = {
+        ReferenceDataVersion.version: ReferenceDataVersion.version + 1,
+        ReferenceDataVersion.last_reason: reason,
+        ReferenceDataVersion.updated_at: datetime.utcnow()
+    }
+    updated = ReferenceDataVersion.query.filter_by(
+        id=REFERENCE_DATA_VERSION_ID
+    ).update(values, synchronize_session=False)
+
+    if not updated:
+        try:
+            with db.session.begin_nested():
+                db.session.add(ReferenceDataVersion(
+                    id=REFERENCE_DATA_VERSION_ID,
+                    version=1,
+                    last_reason=reason,
+                    updated_at=datetime.utcnow()
+                ))
+        except IntegrityError:
+            ReferenceDataVersion.query.filter_by(
+                id=REFERENCE_DATA_VERSION_ID
+            ).update(values, synchronize_session=False)
+
+    get_reference_data().invalidate()
+    logger.info(f"[bump_reference_data_version] Reference data version bumped ({reason})")
+
+
+# =============================================================================
+# CACHE
+# =============================================================================
+
+class ReferenceDataCache:
+    """
+    Read-through cache of the reference tables.
+
+    Counters (see stats()):
+        hits, misses, reloads, version_checks
+    """
+
+    def __init__(self, version_check_seconds: float):
+        self.version_check_seconds = version_check_seconds
+        self._sections: Dict[str, _Section] = {}
+        self._version: Optional[int] = None
+        self._checked_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self.counters = {
+            'hits': 0,
+            'misses': 0,
+            'reloads': 0,
+            'version_checks': 0
+        }
+
+    def _check_version(self) -> Optional[int]:
+        """Validate the cached sections against the version row (rate-limited)"""
+        now = time.monotonic()
+        with self._lock:
+            if self._checked_at is not None and now - self._checked_at < self.version_check_seconds:
+                return self._version
+
+        version = read_reference_data_version()
+        with self._lock:
+            self.counters['version_checks'] += 1
+            if version != self._version:
+                if self._sections:
+                    self.counters['reloads'] += 1
+                    logger.info(f"[reference_data] Version {self._version} -> {version}, dropping cached sections")
+                self._sections.clear()
+                self._version = version
+            self._checked_at = now if version is not None else None
+        return version
+
+    def _get(self, name: str) -> _Section:
+        version = self._check_version()
+        with self._lock:
+            section = self._sections.get(name)
+            if section is not None:
+                self.counters['hits'] += 1
+                return section
+            self.counters['misses'] += 1
+
+        section = _LOADERS[name]()
+        if version is not None:
+            with self._lock:
+                # Keep the first load if another thread raced us
+                if self._version == version:
+                    section = self._sections.setdefault(name, section)
+        return section
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def competencies(self) -> List[CompetencyRecord]:
+        """All competencies ordered by id"""
+        return list(self._get('competencies').ordered)
+
+    def competency_ids(self) -> List[int]:
+        return [c.id for c in self._get('competencies').ordered]
+
+    def competency(self, competency_id: int) -> Optional[CompetencyRecord]:
+        return self._get('competencies').by_id.get(competency_id)
+
+    def competency_name(self, competency_id: int) -> str:
+        competency = self.competency(competency_id)
+        return competency.competency_name if competency else f"Competency {competency_id}"
+
+    def role_clusters(self) -> List[RoleClusterRecord]:
+        """All standard role clusters ordered by id"""
+        return list(self._get('role_clusters').ordered)
+
+    def role_cluster(self, role_cluster_id: int) -> Optional[RoleClusterRecord]:
+        return self._get('role_clusters').by_id.get(role_cluster_id)
+
+    def iso_processes(self) -> List[IsoProcessRecord]:
+        """All ISO processes ordered by id"""
+        return list(self._get('iso_processes').ordered)
+
+    def iso_process(self, process_id: int) -> Optional[IsoProcessRecord]:
+        return self._get('iso_processes').by_id.get(process_id)
+
+    def strategy_template(self, template_id: int) -> Optional[StrategyTemplateRecord]:
+        return self._get('strategy_templates').by_id.get(template_id)
+
+    def template_target_level(self, template_id: int, competency_id: int) -> Optional[int]:
+        """Target level of a competency in a strategy template (None if not defined)"""
+        template = self.strategy_template(template_id)
+        return template.targets.get(competency_id) if template else None
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def invalidate(self) -> None:
+        """Drop all sections and re-read the version on the next lookup"""
+        with self._lock:
+            self._sections.clear()
+            self._version = None
+            self._checked_at = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.counters)
+            stats['version'] = self._version
+            stats['sections'] = sorted(self._sections)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else 0.0
+        return stats
+
+
+_reference_data: Optional[ReferenceDataCache] = None
+_reference_data_lock = threading.Lock()
+
+
+def get_reference_data() -> ReferenceDataCache:
+    """Process-wide reference data cache."""
+    global _reference_data
+    if _reference_data is None:
+        with _reference_data_lock:
+            if _reference_data is None:
+                settings = get_reference_data_settings()
+                _reference_data = ReferenceDataCache(settings['version_check_seconds'])
+    return _reference_data
@@ -51,9 +51,12 @@ Status: COMPLETE - Production Ready
 """
 
 from typing import Dict, List, Set, Tuple, Optional
+import json
 import logging
+import numpy as np
 from flask import current_app
 from app.services.config_loader import get_validation_thresholds, get_priority_weights
+from app.services.reference_data import get_reference_data
 
 logger = logging.getLogger(__name__)
 
@@ -62,8 +65,8 @@ try:
     # Try Flask app context first (production)
     from app import models as app_models
     from app.models import (
-        UserAssessment, Role, LearningStrategy, RoleCompetency,
-        StrategyTemplateCompetency, CompetencyScore, PMTContext, Competency
+        db, User, UserAssessment, Role, LearningStrategy, RoleCompetency,
+        CompetencyScore, PMTContext
     )
     from app.services.learning_objectives_text_generator import (
         get_template_objective,
@@ -78,8 +81,8 @@ except (ImportError, ModuleNotFoundError):
     # Fall back to direct import (testing/standalone)
     import models as app_models
     from models import (
-        UserAssessment, Role, LearningStrategy, RoleCompetency,
-        StrategyTemplateCompetency, CompetencyScore, PMTContext, Competency
+        db, User, UserAssessment, Role, LearningStrategy, RoleCompetency,
+        CompetencyScore, PMTContext
     )
     # Import text generator from same directory
     import sys
@@ -96,6 +99,252 @@ except (ImportError, ModuleNotFoundError):
     )
 
 
+# ============================================================================
+# DATA MATRICES: One query per table instead of point lookups in loops
+# ============================================================================
+
+def _parse_role_ids(selected_roles) -> List[int]:
+    """Role IDs from UserAssessment.selected_roles (list or stringified JSON)"""
+    role_ids = selected_roles
+    if isinstance(role_ids, str):
+        try:
+            role_ids = json.loads(role_ids)
+        except (json.JSONDecodeError, TypeError):
+            return []
+    if not isinstance(role_ids, list):
+        return []
+
+    parsed = []
+    for role_id in role_ids:
+        try:
+            parsed.append(int(role_id))
+        except (TypeError, ValueError):
+            continue
+    return parsed
+
+
+class PathwayMatrices:
+    """
+    Dense in-memory view of all inputs of the role-based pathway
+
+    Replaces the CompetencyScore / RoleCompetency / StrategyTemplateCompetency
+    .first() lookups that used to run inside the strategies x competencies x
+    users loops. Everything is loaded with one query per table (competency
+    names and strategy template targets come from the reference data cache);
+    missing rows are NaN and resolved exactly like the old point lookups did:
+
+        user_scores        (users x competencies)        - first row by ID per user/competency
+        assessment_scores  (assessments x competencies)  - first row by ID per assessment/competency
+        requirements       (roles x competencies)        - role_competency_value
+        targets            (strategies x competencies)   - strategy template target_level
+        user_requirements  (users x competencies)        - MAX over a multi-role user's roles
+
+    Users are the unique user IDs of user_assessments in first-appearance
+    order; a user with several completed assessments is classified with the
+    roles of their last one (multi-role assessments take precedence), which
+    is what the previous per-assessment loop ended up storing.
+    """
+
+    def __init__(
+        self,
+        user_assessments: List,
+        organization_roles: List,
+        selected_strategies: List,
+        all_competencies: List[int]
+    ):
+        self.competency_ids = list(all_competencies)
+        self.competency_index = {comp_id: j for j, comp_id in enumerate(self.competency_ids)}
+        self.user_assessments = list(user_assessments)
+        n_competencies = len(self.competency_ids)
+
+        reference = get_reference_data()
+        self.competency_names = {}
+        for comp_id in self.competency_ids:
+            competency = reference.competency(comp_id)
+            if competency is not None:
+                self.competency_names[comp_id] = competency.competency_name
+
+        # Roles: organization roles plus every role referenced by an assessment
+        selected_role_ids = [_parse_role_ids(a.selected_roles) for a in self.user_assessments]
+        referenced = {role_id for ids in selected_role_ids for role_id in ids}
+        referenced.update(role.id for role in organization_roles)
+        roles = Role.query.filter(Role.id.in_(referenced)).order_by(Role.id).all() if referenced else []
+
+        self.role_ids = [role.id for role in roles]
+        self.role_index = {role_id: i for i, role_id in enumerate(self.role_ids)}
+        self.role_names = {role.id: role.role_name for role in roles}
+
+        # Same as UserAssessment.selected_role_objects (existing roles only)
+        self.assessment_role_ids = [
+            sorted({role_id for role_id in ids if role_id in self.role_index})
+            for ids in selected_role_ids
+        ]
+
+        self.requirements = np.full((len(self.role_ids), n_competencies), np.nan)
+        if self.role_ids:
+            rows = db.session.query(
+                RoleCompetency.role_cluster_id,
+                RoleCompetency.competency_id,
+                RoleCompetency.role_competency_value
+            ).filter(
+                RoleCompetency.role_cluster_id.in_(self.role_ids)
+            ).order_by(RoleCompetency.id.desc()).all()
+            self._fill(self.requirements, rows, self.role_index)
+
+        # Users and scores
+        self.user_ids = list(dict.fromkeys(a.user_id for a in self.user_assessments))
+        self.user_index = {user_id: i for i, user_id in enumerate(self.user_ids)}
+        self.assessment_user_index = np.array(
+            [self.user_index[a.user_id] for a in self.user_assessments], dtype=int
+        )
+        assessment_ids = [a.id for a in self.user_assessments]
+        assessment_index = {assessment_id: i for i, assessment_id in enumerate(assessment_ids)}
+
+        self.user_scores = np.full((len(self.user_ids), n_competencies), np.nan)
+        self.assessment_scores = np.full((len(assessment_ids), n_competencies), np.nan)
+        if self.user_ids:
+            rows = db.session.query(
+                CompetencyScore.user_id,
+                CompetencyScore.assessment_id,
+                CompetencyScore.competency_id,
+                CompetencyScore.score
+            ).filter(
+                db.or_(
+                    CompetencyScore.user_id.in_(self.user_ids),
+                    CompetencyScore.assessment_id.in_(assessment_ids)
+                )
+            ).order_by(CompetencyScore.id.desc()).all()
+            # Descending IDs: the lowest ID is written last and wins
+            self._fill(self.user_scores, [(r.user_id, r.competency_id, r.score) for r in rows], self.user_index)
+            self._fill(
+                self.assessment_scores,
+                [(r.assessment_id, r.competency_id, r.score) for r in rows],
+                assessment_index
+            )
+
+        # Strategy targets
+        self.strategy_index = {strategy.id: k for k, strategy in enumerate(selected_strategies)}
+        self.targets = np.full((len(selected_strategies), n_competencies), np.nan)
+        for strategy in selected_strategies:
+            if not strategy.strategy_template_id:
+                logger.warning(f"[ROLE-BASED] Strategy {strategy.id} has no template_id - no competency targets")
+                continue
+            template = reference.strategy_template(strategy.strategy_template_id)
+            if template is None:
+                continue
+            for comp_id, target_level in template.targets.items():
+                j = self.competency_index.get(comp_id)
+                if j is not None and target_level is not None:
+                    self.targets[self.strategy_index[strategy.id], j] = target_level
+
+        self.user_requirements = self._effective_user_requirements()
+
+    def _fill(self, matrix: np.ndarray, rows, row_index: Dict[int, int]) -> None:
+        for key, comp_id, value in rows:
+            i = row_index.get(key)
+            j = self.competency_index.get(comp_id)
+            if i is not None and j is not None and value is not None:
+                matrix[i, j] = value
+
+    def _effective_user_requirements(self) -> np.ndarray:
+        """Per-user requirement vector (MAX for multi-role users, 0 if none)"""
+        last_assessment = {}
+        last_multi_role = {}
+        for k, assessment in enumerate(self.user_assessments):
+            last_assessment[assessment.user_id] = k
+            if len(self.assessment_role_ids[k]) > 1:
+                last_multi_role[assessment.user_id] = k
+
+        result = np.zeros((len(self.user_ids), len(self.competency_ids)))
+        for user_id, i in self.user_index.items():
+            k = last_multi_role.get(user_id, last_assessment[user_id])
+            role_rows = [self.role_index[role_id] for role_id in self.assessment_role_ids[k]]
+            if role_rows:
+                block = self.requirements[role_rows]
+                has_value = ~np.isnan(block).all(axis=0)
+                result[i, has_value] = np.nanmax(block[:, has_value], axis=0)
+        return result
+
+    # ------------------------------------------------------------------
+    # Point accessors (same results as the old query helpers)
+    # ------------------------------------------------------------------
+
+    def competency_name(self, competency_id: int) -> str:
+        """get_competency_name() equivalent"""
+        name = self.competency_names.get(competency_id)
+        return name if name else f'Competency {competency_id}'
+
+    def role_requirement(self, role_id: int, competency_id: int, default: int = 0) -> int:
+        """get_role_requirement() equivalent; default for missing rows"""
+        i = self.role_index.get(role_id)
+        if i is None:
+            return default
+        value = self.requirements[i, self.competency_index[competency_id]]
+        return default if np.isnan(value) else int(value)
+
+    def strategy_target(self, strategy, competency_id: int) -> Optional[int]:
+        """get_strategy_target_level() equivalent"""
+        value = self.targets[self.strategy_index[strategy.id], self.competency_index[competency_id]]
+        return None if np.isnan(value) else int(value)
+
+    def user_score(self, user_id: int, competency_id: int) -> int:
+        value = self.user_scores[self.user_index[user_id], self.competency_index[competency_id]]
+        return 0 if np.isnan(value) else int(value)
+
+    def assessment_score(self, position: int, competency_id: int) -> int:
+        value = self.assessment_scores[position, self.competency_index[competency_id]]
+        return 0 if np.isnan(value) else int(value)
+
+    def assessment_score_list(self, competency_id: int) -> List[int]:
+        """Scores of every assessment's user that has one (one entry per assessment)"""
+        column = self.user_scores[self.assessment_user_index, self.competency_index[competency_id]]
+        return [int(v) for v in column[~np.isnan(column)]]
+
+    def assessments_in_role(self, role_id: int) -> List:
+        return [
+            assessment for assessment, role_ids in zip(self.user_assessments, self.assessment_role_ids)
+            if role_id in role_ids
+        ]
+
+    def max_role_requirement(self, role_ids: List[int], competency_id: int, exclude_na: bool = False) -> int:
+        """MAX requirement over roles, starting at 0 (optionally ignoring -100 = N/A)"""
+        max_req = 0
+        for role_id in role_ids:
+            req = self.role_requirement(role_id, competency_id)
+            if exclude_na and req == -100:
+                continue
+            max_req = max(max_req, req)
+        return max_req
+
+    # ------------------------------------------------------------------
+    # Vectorized scenario classification
+    # ------------------------------------------------------------------
+
+    def classify_scenarios(self, strategy) -> Tuple[List[int], np.ndarray]:
+        """
+        Classify every user for every competency the strategy targets.
+
+        Vectorized form of classify_gap_scenario() over the score,
+        requirement and target matrices.
+
+        Returns:
+            (competency_ids with a target, users x those competencies array of 'A'-'D')
+        """
+        targets = self.targets[self.strategy_index[strategy.id]]
+        columns = np.flatnonzero(~np.isnan(targets))
+
+        current = np.nan_to_num(self.user_scores[:, columns], nan=0.0)
+        required = self.user_requirements[:, columns]
+        target = np.broadcast_to(targets[columns], current.shape)
+
+        scenario_d = (current >= required) & (current >= target)
+        scenario_c = ~scenario_d & (target > required)
+        scenario_b = ~scenario_d & ~scenario_c & (target <= current) & (current < required)
+        labels = np.select([scenario_d, scenario_c, scenario_b], ['D', 'C', 'B'], default='A')
+
+        return [self.competency_ids[j] for j in columns], labels
+
+
 # ============================================================================
 # STEP 1: Get Data
 # ============================================================================
@@ -131,7 +380,7 @@ def get_assessment_data(organization_id: int):
     ).all()
 
     # Get all competency IDs dynamically from database
-    all_competencies = [c.id for c in Competency.query.order_by(Competency.id).all()]
+    all_competencies = get_reference_data().competency_ids()
 
     logger.info(
         f"[STEP 1] Retrieved data: {len(user_assessments)} users, "
@@ -146,49 +395,45 @@ def get_assessment_data(organization_id: int):
     }
 
 
-def extract_user_assessment_details(user_assessments: List, all_competencies: List[int]) -> List[Dict]:
+def extract_user_assessment_details(
+    user_assessments: List,
+    all_competencies: List[int],
+    matrices: Optional[PathwayMatrices] = None
+) -> List[Dict]:
     """
     Extract detailed user assessment data for frontend Algorithm Explanation Card
 
     Returns array of user assessment details with competency scores
     """
-    user_details = []
+    if matrices is None:
+        matrices = PathwayMatrices(user_assessments, [], [], all_competencies)
 
-    for assessment in user_assessments:
-        # Get competency scores for this user
-        competencies_data = []
+    user_ids = {assessment.user_id for assessment in user_assessments}
+    usernames = dict(
+        db.session.query(User.id, User.username).filter(User.id.in_(user_ids)).all()
+    ) if user_ids else {}
 
-        for comp_id in all_competencies:
-            score = CompetencyScore.query.filter_by(
-                assessment_id=assessment.id,
-                competency_id=comp_id
-            ).first()
+    user_details = []
 
-            competencies_data.append({
+    for position, assessment in enumerate(user_assessments):
+        # Get competency scores for this assessment
+        competencies_data = [
+            {
                 'id': comp_id,
-                'name': get_competency_name(comp_id),
-                'current_level': score.score if score else 0
-            })
+                'name': matrices.competency_name(comp_id),
+                'current_level': matrices.assessment_score(position, comp_id)
+            }
+            for comp_id in all_competencies
+        ]
 
         # Get user's role name(s) from assessment
-        role_name = "Unknown"
-        if assessment.selected_roles:
-            # Handle JSON field - could be list or stringified JSON
-            role_ids = assessment.selected_roles
-            if isinstance(role_ids, str):
-                import json
-                try:
-                    role_ids = json.loads(role_ids)
-                except:
-                    role_ids = []
-
-            if role_ids and isinstance(role_ids, list):
-                roles = Role.query.filter(Role.id.in_(role_ids)).all()
-                role_name = ", ".join([r.role_name for r in roles]) if roles else "Unknown"
+        role_names = [matrices.role_names[role_id] for role_id in matrices.assessment_role_ids[position]]
+        role_name = ", ".join(role_names) if role_names else "Unknown"
 
+        username = usernames.get(assessment.user_id)
         user_details.append({
             'user_id': assessment.user_id,
-            'username': assessment.user.username if assessment.user else f"User {assessment.user_id}",
+            'username': username if username else f"User {assessment.user_id}",
             'role': role_name,
             'competencies': competencies_data
         })
@@ -197,31 +442,31 @@ def extract_user_assessment_details(user_assessments: List, all_competencies: Li
     return user_details
 
 
-def extract_role_requirements(organization_roles: List, all_competencies: List[int]) -> List[Dict]:
+def extract_role_requirements(
+    organization_roles: List,
+    all_competencies: List[int],
+    matrices: Optional[PathwayMatrices] = None
+) -> List[Dict]:
     """
     Extract role competency requirements for frontend Algorithm Explanation Card
 
     Returns array of role requirements with competency levels
     """
+    if matrices is None:
+        matrices = PathwayMatrices([], organization_roles, [], all_competencies)
+
     role_requirements = []
 
     for role in organization_roles:
-        requirements_data = []
-
-        for comp_id in all_competencies:
-            role_comp = RoleCompetency.query.filter_by(
-                role_cluster_id=role.id,
-                competency_id=comp_id
-            ).first()
-
-            # Get level (-100 for N/A, or actual level 0-6)
-            level = role_comp.role_competency_value if (role_comp and role_comp.role_competency_value is not None) else -100
-
-            requirements_data.append({
+        # Get level (-100 for N/A, or actual level 0-6)
+        requirements_data = [
+            {
                 'id': comp_id,
-                'name': get_competency_name(comp_id),
-                'level': level
-            })
+                'name': matrices.competency_name(comp_id),
+                'level': matrices.role_requirement(role.id, comp_id, default=-100)
+            }
+            for comp_id in all_competencies
+        ]
 
         role_requirements.append({
             'role_id': role.id,
@@ -238,7 +483,8 @@ def extract_role_analysis_details(
     organization_roles: List,
     user_assessments: List,
     selected_strategies: List,
-    all_competencies: List[int]
+    all_competencies: List[int],
+    matrices: Optional[PathwayMatrices] = None
 ) -> Dict:
     """
     Extract detailed role analysis data for frontend Algorithm Explanation Card (Step 2)
@@ -253,6 +499,7 @@ def extract_role_analysis_details(
         user_assessments: List of user assessments
         selected_strategies: List of selected strategies
         all_competencies: List of all competency IDs
+        matrices: Preloaded PathwayMatrices (built from the arguments if omitted)
 
     Returns:
         {
@@ -282,6 +529,9 @@ def extract_role_analysis_details(
 
     logger.info("[extract_role_analysis_details] Starting extraction...")
 
+    if matrices is None:
+        matrices = PathwayMatrices(user_assessments, organization_roles, selected_strategies, all_competencies)
+
     role_analysis_details = {}
 
     for role in organization_roles:
@@ -289,7 +539,7 @@ def extract_role_analysis_details(
         role_name = role.role_name
 
         # Get users in this role
-        users_in_role = [u for u in user_assessments if role_id in [r.id for r in u.selected_role_objects]]
+        users_in_role = matrices.assessments_in_role(role_id)
 
         if not users_in_role:
             continue  # Skip roles with no users
@@ -297,19 +547,14 @@ def extract_role_analysis_details(
         competency_analyses = {}
 
         for comp_id in all_competencies:
-            comp_name = get_competency_name(comp_id)
+            comp_name = matrices.competency_name(comp_id)
 
             # Get user scores for this competency in this role
             user_scores = {}
             score_list = []
 
             for user in users_in_role:
-                comp_score = CompetencyScore.query.filter_by(
-                    user_id=user.user_id,
-                    competency_id=comp_id
-                ).first()
-
-                score = comp_score.score if comp_score else 0
+                score = matrices.user_score(user.user_id, comp_id)
                 user_scores[user.user_id] = score
                 score_list.append(score)
 
@@ -317,11 +562,7 @@ def extract_role_analysis_details(
             median_level = int(median(score_list)) if score_list else 0
 
             # Get role requirement for this competency
-            role_comp = RoleCompetency.query.filter_by(
-                role_cluster_id=role_id,
-                competency_id=comp_id
-            ).first()
-            role_requirement = role_comp.role_competency_value if (role_comp and role_comp.role_competency_value is not None) else 0
+            role_requirement = matrices.role_requirement(role_id, comp_id)
 
             # Extract scenario classifications per strategy
             by_strategy = {}
@@ -331,7 +572,7 @@ def extract_role_analysis_details(
                 strategy_name = strategy.strategy_name
 
                 # Get strategy target
-                target_level = get_strategy_target_level(strategy, comp_id)
+                target_level = matrices.strategy_target(strategy, comp_id)
                 if target_level is None:
                     continue
 
@@ -381,8 +622,7 @@ def extract_role_analysis_details(
 def get_competency_name(competency_id: int) -> str:
     """Helper: Get competency name from database"""
     try:
-        comp = Competency.query.get(competency_id)
-        return comp.competency_name if comp else f'Competency {competency_id}'
+        return get_reference_data().competency_name(competency_id)
     except Exception as e:
         logger.warning(f"[get_competency_name] Error fetching name for ID {competency_id}: {e}")
         return f'Competency {competency_id}'
@@ -394,7 +634,8 @@ def generate_coverage_summary(
     selected_strategies: List,
     organization_roles: List,
     all_competencies: List[int],
-    user_assessments: List
+    user_assessments: List,
+    matrices: Optional[PathwayMatrices] = None
 ) -> List[Dict]:
     """
     Generate summary table data for Step 4 display (all 16 competencies at a glance)
@@ -406,6 +647,7 @@ def generate_coverage_summary(
         organization_roles: List of organization roles (for max_role_requirement calculation)
         all_competencies: List of all competency IDs (for max_role_requirement calculation)
         user_assessments: List of user assessments (for current level calculation)
+        matrices: Preloaded PathwayMatrices (built from the arguments if omitted)
 
     Returns:
         Array of competency summaries:
@@ -429,29 +671,22 @@ def generate_coverage_summary(
     """
     logger.info("[generate_coverage_summary] Starting generation...")
 
-    # CRITICAL FIX: Pre-calculate max role requirements for all competencies
-    max_role_requirements = {}
-    for competency_id in all_competencies:
-        max_req = 0
-        for role in organization_roles:
-            req = get_role_requirement(role.id, competency_id)
-            if req != -100:  # Exclude N/A values
-                max_req = max(max_req, req)
-        max_role_requirements[competency_id] = max_req
+    if matrices is None:
+        matrices = PathwayMatrices(user_assessments, organization_roles, selected_strategies, all_competencies)
+
+    # CRITICAL FIX: Pre-calculate max role requirements for all competencies (excluding N/A values)
+    org_role_ids = [role.id for role in organization_roles]
+    max_role_requirements = {
+        competency_id: matrices.max_role_requirement(org_role_ids, competency_id, exclude_na=True)
+        for competency_id in all_competencies
+    }
 
     logger.info(f"[generate_coverage_summary] Calculated max role requirements for {len(max_role_requirements)} competencies")
 
     # NEW: Pre-calculate organizational median current levels for all competencies
     org_current_levels = {}
     for competency_id in all_competencies:
-        all_scores = []
-        for user in user_assessments:
-            comp_score = CompetencyScore.query.filter_by(
-                user_id=user.user_id,
-                competency_id=competency_id
-            ).first()
-            if comp_score and comp_score.score is not None:
-                all_scores.append(comp_score.score)
+        all_scores = matrices.assessment_score_list(competency_id)
 
         # Calculate organizational median
         org_current_levels[competency_id] = calculate_median(all_scores) if all_scores else 0
@@ -491,7 +726,7 @@ def generate_coverage_summary(
             gap_severity = 'none'
 
         # Get competency name directly from database
-        comp_name = get_competency_name(comp_id)
+        comp_name = matrices.competency_name(comp_id)
 
         # Get fit scores data
         fit_scores_entry = all_strategy_fit_scores.get(comp_id_str, {})
@@ -662,7 +897,8 @@ def process_expert_strategies_simple(
     expert_strategies: List,
     user_assessments: List,
     all_competencies: List[int],
-    pmt_context
+    pmt_context,
+    matrices: Optional[PathwayMatrices] = None
 ) -> Dict:
     """
     Simple 2-way processing for expert development strategies (e.g., Train the Trainer)
@@ -679,6 +915,7 @@ def process_expert_strategies_simple(
         user_assessments: All user assessments
         all_competencies: List of all competency IDs
         pmt_context: PMT context (optional, typically not used for expert strategies)
+        matrices: Preloaded PathwayMatrices (built from the arguments if omitted)
 
     Returns:
         Dictionary of learning objectives by strategy (no validation context)
@@ -688,6 +925,9 @@ def process_expert_strategies_simple(
 
     logger.info(f"[EXPERT PROCESSING] Processing {len(expert_strategies)} expert strategies (simple 2-way)")
 
+    if matrices is None:
+        matrices = PathwayMatrices(user_assessments, [], expert_strategies, all_competencies)
+
     objectives = {}
 
     for strategy in expert_strategies:
@@ -710,22 +950,13 @@ def process_expert_strategies_simple(
 
         for competency_id in all_competencies:
             # Get target level for this competency from strategy template
-            target_level = get_strategy_target_level(strategy, competency_id)
+            target_level = matrices.strategy_target(strategy, competency_id)
 
             if target_level is None or target_level == 0:
                 continue  # Strategy doesn't train this competency
 
             # Calculate organizational median current level
-            current_scores = []
-            for user in user_assessments:
-                # CRITICAL FIX: Use user.user_id (FK to users), NOT user.id (assessment ID)
-                comp_score = CompetencyScore.query.filter_by(
-                    user_id=user.user_id,
-                    competency_id=competency_id
-                ).first()
-
-                if comp_score and comp_score.score is not None:
-                    current_scores.append(comp_score.score)
+            current_scores = matrices.assessment_score_list(competency_id)
 
             if not current_scores:
                 logger.warning(
@@ -736,7 +967,7 @@ def process_expert_strategies_simple(
             current_level = calculate_median(current_scores)
             gap = target_level - current_level
 
-            competency_name = get_competency_name(competency_id)
+            competency_name = matrices.competency_name(competency_id)
 
             if gap > 0:
                 # Training required
@@ -829,7 +1060,8 @@ def analyze_all_roles_fixed(
     organization_roles: List,
     user_assessments: List,
     selected_strategies: List,
-    all_competencies: List[int]
+    all_competencies: List[int],
+    matrices: Optional[PathwayMatrices] = None
 ) -> Dict:
     """
     STEP 2: Analyze all roles with CRITICAL FIX for multi-role users
@@ -837,6 +1069,9 @@ def analyze_all_roles_fixed(
     Key difference from original: Multi-role users are evaluated against
     their MAX role requirement only, preventing scenario conflicts.
 
+    Classification is a single vectorized comparison per strategy over the
+    users x competencies score and requirement matrices (PathwayMatrices).
+
     Returns:
         {
             strategy_id: {
@@ -848,73 +1083,20 @@ def analyze_all_roles_fixed(
             }
         }
     """
-    # CRITICAL FIX: Preprocess multi-role users
-    multi_role_requirements = {}
-    for user in user_assessments:
-        user_role_ids = [r.id for r in user.selected_role_objects]
-        if len(user_role_ids) > 1:
-            multi_role_requirements[user.user_id] = get_user_max_role_requirements(
-                user.user_id,
-                user_role_ids,
-                all_competencies
-            )
-            logger.debug(
-                f"User {user.user_id} has multiple roles: {user_role_ids}. "
-                f"Using max requirements."
-            )
+    if matrices is None:
+        matrices = PathwayMatrices(user_assessments, organization_roles, selected_strategies, all_competencies)
 
     role_analyses = {}
 
     for strategy in selected_strategies:
         role_analyses[strategy.id] = {}
 
-        for competency_id in all_competencies:
-            scenario_classifications = {}
-
-            # Get strategy target for this competency
-            archetype_target = get_strategy_target_level(strategy, competency_id)
-
-            if archetype_target is None:
-                continue
-
-            # Classify each user
-            for user in user_assessments:
-                # Get user's current level
-                # CRITICAL FIX: Use user.user_id (FK to users), NOT user.id (assessment ID)
-                comp_score = CompetencyScore.query.filter_by(
-                    user_id=user.user_id,  # Fixed: was user.id (assessment ID)
-                    competency_id=competency_id
-                ).first()
-
-                current_level = comp_score.score if comp_score else 0
-
-                # CRITICAL FIX: Determine role requirement
-                if user.user_id in multi_role_requirements:
-                    # Multi-role user: use MAX requirement
-                    role_requirement = multi_role_requirements[user.user_id][competency_id]
-                else:
-                    # Single-role user: use that role's requirement
-                    user_role_ids = [r.id for r in user.selected_role_objects]
-                    if user_role_ids:
-                        role_requirement = get_role_requirement(
-                            user_role_ids[0],
-                            competency_id
-                        )
-                    else:
-                        role_requirement = 0
-
-                # Classify scenario
-                scenario = classify_gap_scenario(
-                    current_level,
-                    archetype_target,
-                    role_requirement
-                )
-
-                # CRITICAL FIX: Use user.user_id (actual user ID), not user.id (assessment ID)
-                scenario_classifications[user.user_id] = scenario
+        competency_ids, labels = matrices.classify_scenarios(strategy)
 
+        for j, competency_id in enumerate(competency_ids):
+            # CRITICAL FIX: Keyed by user.user_id (actual user ID), not user.id (assessment ID)
             role_analyses[strategy.id][competency_id] = {
-                'scenario_classifications': scenario_classifications
+                'scenario_classifications': dict(zip(matrices.user_ids, labels[:, j].tolist()))
             }
 
     logger.info(
@@ -933,12 +1115,7 @@ def get_strategy_target_level(strategy, competency_id: int) -> Optional[int]:
     instead of per-organization strategy_competency table
     """
     if strategy.strategy_template_id:
-        template_comp = StrategyTemplateCompetency.query.filter_by(
-            strategy_template_id=strategy.strategy_template_id,
-            competency_id=competency_id
-        ).first()
-
-        return template_comp.target_level if template_comp else None
+        return get_reference_data().template_target_level(strategy.strategy_template_id, competency_id)
     else:
         # Fallback: strategy not linked to template (shouldn't happen)
         logger.warning(f"[ROLE-BASED] Strategy {strategy.id} has no template_id for competency {competency_id}")
@@ -1136,7 +1313,8 @@ def cross_strategy_coverage(
     role_analyses: Dict,
     selected_strategies: List,
     all_competencies: List[int],
-    total_users: int
+    total_users: int,
+    matrices: Optional[PathwayMatrices] = None
 ) -> Tuple[Dict, Dict, Dict]:
     """
     STEP 4: Cross-strategy coverage with ENHANCEMENTS
@@ -1150,6 +1328,7 @@ def cross_strategy_coverage(
     coverage = {}
     competency_scenario_distributions = {}
     all_strategy_fit_scores_data = {}
+    competency_name = matrices.competency_name if matrices is not None else get_competency_name
 
     for competency_id in all_competencies:
         strategy_fit_scores = {}
@@ -1171,7 +1350,10 @@ def cross_strategy_coverage(
             fit_score = calculate_fit_score(aggregation, total_users)
 
             # Get target level
-            target_level = get_strategy_target_level(strategy, competency_id)
+            if matrices is not None:
+                target_level = matrices.strategy_target(strategy, competency_id)
+            else:
+                target_level = get_strategy_target_level(strategy, competency_id)
 
             strategy_fit_scores[strategy.id] = {
                 'fit_score': fit_score,
@@ -1218,13 +1400,13 @@ def cross_strategy_coverage(
 
         # Store competency scenario distributions for frontend
         competency_scenario_distributions[str(competency_id)] = {
-            'competency_name': get_competency_name(competency_id),
+            'competency_name': competency_name(competency_id),
             'by_strategy': scenario_distributions_by_strategy
         }
 
         # Store all strategy fit scores for frontend
         all_strategy_fit_scores_data[str(competency_id)] = {
-            'competency_name': get_competency_name(competency_id),
+            'competency_name': competency_name(competency_id),
             'strategies': [
                 {
                     'strategy_id': strategy.id,
@@ -1292,6 +1474,14 @@ def run_role_based_pathway_analysis_fixed(organization_id: int) -> Dict:
 
     total_users = len(data['user_assessments'])
 
+    # Load scores, role requirements and strategy targets once (one query each)
+    matrices = PathwayMatrices(
+        data['user_assessments'],
+        data['organization_roles'],
+        data['selected_strategies'],
+        data['all_competencies']
+    )
+
     # NEW: Classify strategies into gap-based vs expert development
     gap_based_strategies, expert_strategies = classify_strategies(data['selected_strategies'])
 
@@ -1321,7 +1511,8 @@ def run_role_based_pathway_analysis_fixed(organization_id: int) -> Dict:
             data['organization_roles'],
             data['user_assessments'],
             gap_based_strategies,  # Only gap-based
-            data['all_competencies']
+            data['all_competencies'],
+            matrices
         )
 
         # Step 4: Cross-strategy coverage (WITH ENHANCEMENTS) - ONLY gap-based
@@ -1329,7 +1520,8 @@ def run_role_based_pathway_analysis_fixed(organization_id: int) -> Dict:
             role_analyses,
             gap_based_strategies,  # Only gap-based
             data['all_competencies'],
-            total_users
+            total_users,
+            matrices
         )
 
         # Step 5: Strategy Validation Layer - ONLY gap-based
@@ -1351,7 +1543,8 @@ def run_role_based_pathway_analysis_fixed(organization_id: int) -> Dict:
             data['all_competencies'],
             coverage,
             data['organization_roles'],
-            pmt_context
+            pmt_context,
+            matrices
         )
 
         # NEW: Extract detailed processing data for frontend Algorithm Explanation Card
@@ -1360,7 +1553,8 @@ def run_role_based_pathway_analysis_fixed(organization_id: int) -> Dict:
             data['organization_roles'],
             data['user_assessments'],
             gap_based_strategies,
-            data['all_competencies']
+            data['all_competencies'],
+            matrices
         )
 
         # DEBUG: Log what we're passing to generate_coverage_summary
@@ -1376,7 +1570,8 @@ def run_role_based_pathway_analysis_fixed(organization_id: int) -> Dict:
             gap_based_strategies,
             data['organization_roles'],  # ADDED for max_role_requirement fix
             data['all_competencies'],  # ADDED for max_role_requirement fix
-            data['user_assessments']  # NEW: For current_level calculation
+            data['user_assessments'],  # NEW: For current_level calculation
+            matrices
         )
 
         gap_based_result = {
@@ -1408,7 +1603,8 @@ def run_role_based_pathway_analysis_fixed(organization_id: int) -> Dict:
             expert_strategies,
             data['user_assessments'],
             data['all_competencies'],
-            pmt_context
+            pmt_context,
+            matrices
         )
 
         logger.info(f"[TRACK 2] Expert processing complete - {len(expert_result)} strategies processed")
@@ -1420,8 +1616,12 @@ def run_role_based_pathway_analysis_fixed(organization_id: int) -> Dict:
     # ==========================================================================
 
     # Extract user assessment details and role requirements for frontend
-    user_assessments_detail = extract_user_assessment_details(data['user_assessments'], data['all_competencies'])
-    role_requirements_detail = extract_role_requirements(data['organization_roles'], data['all_competencies'])
+    user_assessments_detail = extract_user_assessment_details(
+        data['user_assessments'], data['all_competencies'], matrices
+    )
+    role_requirements_detail = extract_role_requirements(
+        data['organization_roles'], data['all_competencies'], matrices
+    )
 
     # Determine pathway based on strategy classification
     if len(expert_strategies) > 0 and len(gap_based_strategies) > 0:
@@ -1852,7 +2052,8 @@ def generate_learning_objectives(
     all_competencies: List[int],
     coverage: Dict,
     organization_roles: List,
-    pmt_context: Optional['PMTContext'] = None
+    pmt_context: Optional['PMTContext'] = None,
+    matrices: Optional[PathwayMatrices] = None
 ) -> Dict:
     """
     STEP 7 + 8: Generate learning objectives per strategy WITH TEXT GENERATION
@@ -1868,20 +2069,22 @@ def generate_learning_objectives(
         coverage: Cross-strategy coverage data
         organization_roles: List of organization roles (for max role requirement)
         pmt_context: Optional PMT context for deep customization
+        matrices: Preloaded PathwayMatrices (built from the arguments if omitted)
 
     Returns:
         Learning objectives organized by strategy with full text
     """
     objectives_by_strategy = {}
 
+    if matrices is None:
+        matrices = PathwayMatrices(user_assessments, organization_roles, selected_strategies, all_competencies)
+
     # Pre-calculate max role requirements for all competencies
-    max_role_requirements = {}
-    for competency_id in all_competencies:
-        max_req = 0
-        for role in organization_roles:
-            req = get_role_requirement(role.id, competency_id)
-            max_req = max(max_req, req)
-        max_role_requirements[competency_id] = max_req
+    org_role_ids = [role.id for role in organization_roles]
+    max_role_requirements = {
+        competency_id: matrices.max_role_requirement(org_role_ids, competency_id)
+        for competency_id in all_competencies
+    }
 
     logger.info(f"[STEP 7] Calculated max role requirements for {len(max_role_requirements)} competencies")
 
@@ -1897,22 +2100,13 @@ def generate_learning_objectives(
 
         for competency_id in all_competencies:
             # Get all user scores for this competency
-            all_scores = []
-            for user in user_assessments:
-                # CRITICAL FIX: Use user.user_id (FK to users), NOT user.id (assessment ID)
-                comp_score = CompetencyScore.query.filter_by(
-                    user_id=user.user_id,  # Fixed: was user.id (assessment ID)
-                    competency_id=competency_id
-                ).first()
-
-                if comp_score:
-                    all_scores.append(comp_score.score)
+            all_scores = matrices.assessment_score_list(competency_id)
 
             # Calculate organizational current level (median)
             org_current_level = calculate_median(all_scores) if all_scores else 0
 
             # Get strategy target
-            strategy_target = get_strategy_target_level(strategy, competency_id)
+            strategy_target = matrices.strategy_target(strategy, competency_id)
 
             if strategy_target is None:
                 continue
@@ -1949,7 +2143,7 @@ def generate_learning_objectives(
 
                     trainable_obj = {
                         'competency_id': competency_id,
-                        'competency_name': get_competency_name(competency_id),
+                        'competency_name': matrices.competency_name(competency_id),
                         'current_level': org_current_level,
                         'target_level': strategy_target,
                         'gap': 0,
@@ -1977,7 +2171,7 @@ def generate_learning_objectives(
                     )
 
                     logger.info(
-                        f"[SCENARIO C - BEYOND ROLE] Competency {competency_id} ({get_competency_name(competency_id)}): "
+                        f"[SCENARIO C - BEYOND ROLE] Competency {competency_id} ({matrices.competency_name(competency_id)}): "
                         f"Current {org_current_level} >= Role Req {max_role_req} but < Strategy {strategy_target}. "
                         f"Role requirement is MET. Training to strategy target (gap = {gap}). "
                         f"Generating learning objective."
@@ -2017,7 +2211,7 @@ def generate_learning_objectives(
 
                     trainable_obj = {
                         'competency_id': competency_id,
-                        'competency_name': get_competency_name(competency_id),
+                        'competency_name': matrices.competency_name(competency_id),
                         'current_level': org_current_level,
                         'target_level': strategy_target,
                         'gap': gap,
@@ -2075,7 +2269,7 @@ def generate_learning_objectives(
 
                     trainable_obj = {
                         'competency_id': competency_id,
-                        'competency_name': get_competency_name(competency_id),
+                        'competency_name': matrices.competency_name(competency_id),
                         'current_level': org_current_level,
                         'target_level': strategy_target,
                         'gap': 0,
@@ -2149,7 +2343,7 @@ def generate_learning_objectives(
             # Build objective output
             trainable_obj = {
                 'competency_id': competency_id,
-                'competency_name': get_competency_name(competency_id),
+                'competency_name': matrices.competency_name(competency_id),
                 'current_level': org_current_level,
                 'target_level': strategy_target,
                 'gap': gap,
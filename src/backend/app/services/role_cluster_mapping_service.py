@@ -12,6 +12,41 @@ from typing import List, Dict, Any, Optional
 from openai import OpenAI
 import uuid
 
+from app.services.config_loader import get_role_mapping_settings
+from app.services.llm_executor import run_ordered
+
+
+MAPPING_INSTRUCTIONS = """## Instructions:
+
+1. Analyze the role's responsibilities, skills, and description carefully
+2. **CRITICAL: Check if this is a Systems Engineering role first**
+   - SE roles involve: requirements, design, integration, testing, V&V, technical coordination, production, quality, service
+   - SE roles can include: project management, process management, innovation management, technical support
+   - SE roles are primarily technical/engineering-focused with product/system development context
+3. **EXCLUDE these PURE business roles completely** (return empty mappings array):
+   - **Pure Payroll/Benefits**: Employee compensation, benefits administration, payroll processing (NOT competency/qualification management)
+   - **Pure Finance/Accounting**: Bookkeeping, financial reporting, tax preparation, accounts payable/receivable, treasury operations
+   - **Pure Marketing**: Advertising campaigns, brand management, social media marketing, market research (NOT product/service innovation)
+   - **Pure Sales**: Sales quotas, commission management, CRM systems, sales territories, deal closing (NOT technical sales or customer requirements)
+   - **Pure Legal**: Contract law, litigation, legal counsel, regulatory filings (NOT engineering standards/compliance)
+   - **Pure Administration**: Office management, facilities management, receptionist, general administrative support
+4. **INCLUDE these SE-related roles** (can map to clusters):
+   - **Innovation Management**: Commercial implementation of products/services, new business models, technology commercialization (Cluster #13)
+   - **HR for SE**: Competency development, qualification management, SE training programs, technical recruiting (relates to Process #6)
+   - **Internal Support**: IT support for SE tools, SE qualification support, SE process support (Cluster #12)
+   - **Business Analysis**: Systems/mission analysis, stakeholder requirements (if technical - Process #17)
+   - **Project Management**: Technical project coordination (Cluster #3)
+5. Identify which SE role cluster(s) best match this role **ONLY if there is a strong alignment**
+6. A role may map to multiple clusters if responsibilities span multiple areas
+7. Provide a confidence score (0-100%) for each mapping based on how well the responsibilities align
+8. **ONLY include mappings with confidence >= 80%** - We prefer high-quality matches
+9. **If the role is pure business (non-SE) or no cluster has >= 80% confidence, return an empty mappings array**
+10. Do NOT force a match - it's better to have no mapping than a poor one
+11. Explain your reasoning for each mapping in detail
+12. Identify which specific responsibilities align with each cluster
+13. Mark the strongest match as the primary mapping (if any mappings exist)
+"""
+
 
 class RoleClusterMappingService:
     """Service for mapping organization roles to SE role clusters"""
@@ -123,25 +158,19 @@ class RoleClusterMappingService:
             }
         ]
 
-    def build_mapping_prompt(self,
-                            org_role_title: str,
-                            org_role_description: str,
-                            org_role_responsibilities: Optional[List[str]] = None,
-                            org_role_skills: Optional[List[str]] = None,
-                            role_clusters: Optional[List[Dict[str, Any]]] = None) -> str:
-        """Build the prompt for OpenAI to map a role to clusters"""
-
-        if role_clusters is None:
-            # Use static clusters for POC
-            role_clusters = self.get_all_role_clusters_static()
-
-        # Format role clusters for the prompt
-        clusters_text = "\n".join([
+    def build_cluster_catalogue(self, role_clusters: List[Dict[str, Any]]) -> str:
+        """Format the role clusters for the prompt (static per batch)"""
+        return "\n".join([
             f"{i+1}. **{cluster['name']}**: {cluster['description']}"
             for i, cluster in enumerate(role_clusters)
         ])
 
-        # Build role information section
+    def format_role_info(self,
+                         org_role_title: str,
+                         org_role_description: str,
+                         org_role_responsibilities: Optional[List[str]] = None,
+                         org_role_skills: Optional[List[str]] = None) -> str:
+        """Format the role information section of a prompt"""
         role_info = f"**Role Title**: {org_role_title}\n\n**Role Description**: {org_role_description}"
 
         if org_role_responsibilities:
@@ -150,6 +179,30 @@ class RoleClusterMappingService:
         if org_role_skills:
             role_info += f"\n\n**Required Skills**:\n" + "\n".join([f"- {s}" for s in org_role_skills])
 
+        return role_info
+
+    def build_mapping_prompt(self,
+                            org_role_title: str,
+                            org_role_description: str,
+                            org_role_responsibilities: Optional[List[str]] = None,
+                            org_role_skills: Optional[List[str]] = None,
+                            role_clusters: Optional[List[Dict[str, Any]]] = None,
+                            clusters_text: Optional[str] = None) -> str:
+        """Build the prompt for OpenAI to map a role to clusters"""
+
+        if clusters_text is None:
+            if role_clusters is None:
+                # Use static clusters for POC
+                role_clusters = self.get_all_role_clusters_static()
+
+            # Format role clusters for the prompt
+            clusters_text = self.build_cluster_catalogue(role_clusters)
+
+        # Build role information section
+        role_info = self.format_role_info(
+            org_role_title, org_role_description, org_role_responsibilities, org_role_skills
+        )
+
         prompt = f"""You are an expert in Systems Engineering role classification based on the SE framework developed by Ulf Koenemann et al. at Fraunhofer IEM.
 
 Your task is to analyze the provided organization role and determine if it matches one or more SE Role Clusters.
@@ -162,36 +215,7 @@ Your task is to analyze the provided organization role and determine if it match
 
 {clusters_text}
 
-## Instructions:
-
-1. Analyze the role's responsibilities, skills, and description carefully
-2. **CRITICAL: Check if this is a Systems Engineering role first**
-   - SE roles involve: requirements, design, integration, testing, V&V, technical coordination, production, quality, service
-   - SE roles can include: project management, process management, innovation management, technical support
-   - SE roles are primarily technical/engineering-focused with product/system development context
-3. **EXCLUDE these PURE business roles completely** (return empty mappings array):
-   - **Pure Payroll/Benefits**: Employee compensation, benefits administration, payroll processing (NOT competency/qualification management)
-   - **Pure Finance/Accounting**: Bookkeeping, financial reporting, tax preparation, accounts payable/receivable, treasury operations
-   - **Pure Marketing**: Advertising campaigns, brand management, social media marketing, market research (NOT product/service innovation)
-   - **Pure Sales**: Sales quotas, commission management, CRM systems, sales territories, deal closing (NOT technical sales or customer requirements)
-   - **Pure Legal**: Contract law, litigation, legal counsel, regulatory filings (NOT engineering standards/compliance)
-   - **Pure Administration**: Office management, facilities management, receptionist, general administrative support
-4. **INCLUDE these SE-related roles** (can map to clusters):
-   - **Innovation Management**: Commercial implementation of products/services, new business models, technology commercialization (Cluster #13)
-   - **HR for SE**: Competency development, qualification management, SE training programs, technical recruiting (relates to Process #6)
-   - **Internal Support**: IT support for SE tools, SE qualification support, SE process support (Cluster #12)
-   - **Business Analysis**: Systems/mission analysis, stakeholder requirements (if technical - Process #17)
-   - **Project Management**: Technical project coordination (Cluster #3)
-5. Identify which SE role cluster(s) best match this role **ONLY if there is a strong alignment**
-6. A role may map to multiple clusters if responsibilities span multiple areas
-7. Provide a confidence score (0-100%) for each mapping based on how well the responsibilities align
-8. **ONLY include mappings with confidence >= 80%** - We prefer high-quality matches
-9. **If the role is pure business (non-SE) or no cluster has >= 80% confidence, return an empty mappings array**
-10. Do NOT force a match - it's better to have no mapping than a poor one
-11. Explain your reasoning for each mapping in detail
-12. Identify which specific responsibilities align with each cluster
-13. Mark the strongest match as the primary mapping (if any mappings exist)
-
+{MAPPING_INSTRUCTIONS}
 ## Response Format (JSON):
 
 Return your analysis in the following JSON format:
@@ -230,12 +254,113 @@ IMPORTANT:
 
         return prompt
 
+    def build_batch_mapping_prompt(self, roles: List[Dict[str, Any]], clusters_text: str) -> str:
+        """Build one prompt mapping several roles (same rules as build_mapping_prompt)"""
+        roles_text = "\n\n".join([
+            f"### Role {index}\n\n" + self.format_role_info(
+                role.get('title'),
+                role.get('description', ''),
+                role.get('responsibilities', []),
+                role.get('skills', [])
+            )
+            for index, role in enumerate(roles, 1)
+        ])
+
+        return f"""You are an expert in Systems Engineering role classification based on the SE framework developed by Ulf Koenemann et al. at Fraunhofer IEM.
+
+Your task is to analyze each of the {len(roles)} provided organization roles independently and determine if it matches one or more SE Role Clusters.
+
+## Organization Roles to Analyze:
+
+{roles_text}
+
+## Available SE Role Clusters:
+
+{clusters_text}
+
+{MAPPING_INSTRUCTIONS}
+Apply these instructions to every role separately - the roles do not influence each other.
+
+## Response Format (JSON):
+
+Return your analysis in the following JSON format, with exactly one entry per role:
+
+{{
+  "roles": [
+    {{
+      "role_index": 1,
+      "mappings": [
+        {{
+          "cluster_name": "Name of the SE cluster (exact match from list above)",
+          "confidence_score": 85,
+          "reasoning": "Detailed explanation of why this cluster matches",
+          "matched_responsibilities": ["Specific responsibility from the role"],
+          "is_primary": true
+        }}
+      ],
+      "overall_analysis": "Brief summary of the role's primary focus and how it fits (or doesn't fit) into the SE framework."
+    }}
+  ]
+}}
+
+IMPORTANT:
+- Return ONLY valid JSON, no additional text or markdown formatting
+- "role_index" is the number of the role in the list above
+- Use exact cluster names from the list provided above
+- **ONLY include mappings with confidence >= 80%**, otherwise "mappings": []
+- If mappings exist, mark exactly ONE per role as "is_primary": true
+- Order each role's mappings by confidence_score (highest first)
+"""
+
+    def _resolve_cluster_ids(self, mappings: List[Dict[str, Any]], role_clusters_map: Dict[str, int]) -> None:
+        """Add cluster_id to every mapping (exact, then fuzzy name match)"""
+        for mapping in mappings:
+            cluster_name = mapping['cluster_name']
+            # Try to find exact match
+            cluster_id = role_clusters_map.get(cluster_name)
+
+            if not cluster_id:
+                # Try fuzzy matching (case-insensitive, partial match)
+                for name, cid in role_clusters_map.items():
+                    if cluster_name.lower() in name.lower() or name.lower() in cluster_name.lower():
+                        cluster_id = cid
+                        mapping['cluster_name'] = name  # Update to exact name
+                        break
+
+            mapping['cluster_id'] = cluster_id
+
+            if not cluster_id:
+                print(f"[WARNING] Could not find cluster ID for: {cluster_name}")
+
+    def _complete_json(self, prompt: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Run the mapping prompt and parse the JSON answer"""
+        options = {'timeout': timeout} if timeout else {}
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {
+                    "role": "system",
+                    "content": "You are an expert in Systems Engineering role classification based on the SE framework. Always return valid JSON."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            temperature=0.3,  # Lower temperature for more deterministic results
+            response_format={"type": "json_object"},
+            **options
+        )
+        return json.loads(response.choices[0].message.content)
+
     def map_single_role(self,
                        org_role_title: str,
                        org_role_description: str,
                        org_role_responsibilities: Optional[List[str]] = None,
                        org_role_skills: Optional[List[str]] = None,
-                       role_clusters: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+                       role_clusters: Optional[List[Dict[str, Any]]] = None,
+                       clusters_text: Optional[str] = None,
+                       timeout: Optional[float] = None) -> Dict[str, Any]:
         """
         Use AI to map a single organization role to SE-QPT clusters
 
@@ -245,6 +370,8 @@ IMPORTANT:
             org_role_responsibilities: List of key responsibilities
             org_role_skills: List of required skills
             role_clusters: Optional list of role clusters (uses static if not provided)
+            clusters_text: Pre-formatted cluster catalogue (see build_cluster_catalogue)
+            timeout: Request timeout in seconds (None = client default)
 
         Returns:
             {
@@ -270,50 +397,18 @@ IMPORTANT:
             org_role_description,
             org_role_responsibilities,
             org_role_skills,
-            role_clusters
+            role_clusters,
+            clusters_text
         )
 
         try:
             print(f"[INFO] Mapping role: {org_role_title}")
 
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert in Systems Engineering role classification based on the SE framework. Always return valid JSON."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.3,  # Lower temperature for more deterministic results
-                response_format={"type": "json_object"}
-            )
-
-            result = json.loads(response.choices[0].message.content)
+            result = self._complete_json(prompt, timeout)
 
             # Validate and enrich with cluster IDs
             role_clusters_map = {rc['name']: rc['id'] for rc in role_clusters}
-
-            for mapping in result.get('mappings', []):
-                cluster_name = mapping['cluster_name']
-                # Try to find exact match
-                cluster_id = role_clusters_map.get(cluster_name)
-
-                if not cluster_id:
-                    # Try fuzzy matching (case-insensitive, partial match)
-                    for name, cid in role_clusters_map.items():
-                        if cluster_name.lower() in name.lower() or name.lower() in cluster_name.lower():
-                            cluster_id = cid
-                            mapping['cluster_name'] = name  # Update to exact name
-                            break
-
-                mapping['cluster_id'] = cluster_id
-
-                if not cluster_id:
-                    print(f"[WARNING] Could not find cluster ID for: {cluster_name}")
+            self._resolve_cluster_ids(result.get('mappings', []), role_clusters_map)
 
             print(f"[SUCCESS] Mapped {org_role_title} to {len(result.get('mappings', []))} clusters")
 
@@ -327,12 +422,70 @@ IMPORTANT:
                 'error': str(e)
             }
 
+    def map_role_group(self,
+                       roles: List[Dict[str, Any]],
+                       role_clusters: List[Dict[str, Any]],
+                       clusters_text: str,
+                       timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Map several roles with one structured-output prompt.
+
+        Roles missing from the answer (or all roles, if the call fails) are
+        mapped individually with map_single_role.
+
+        Returns:
+            One map_single_role-style result per role, in input order
+        """
+        if len(roles) == 1:
+            role = roles[0]
+            return [self.map_single_role(
+                role.get('title'), role.get('description', ''),
+                role.get('responsibilities', []), role.get('skills', []),
+                role_clusters, clusters_text, timeout
+            )]
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(roles)
+        try:
+            print(f"[INFO] Mapping {len(roles)} roles in one prompt")
+            answer = self._complete_json(self.build_batch_mapping_prompt(roles, clusters_text), timeout)
+
+            role_clusters_map = {rc['name']: rc['id'] for rc in role_clusters}
+            for entry in answer.get('roles', []):
+                index = entry.get('role_index')
+                if not isinstance(index, int) or not 1 <= index <= len(roles) or results[index - 1] is not None:
+                    continue
+                mappings = entry.get('mappings', [])
+                self._resolve_cluster_ids(mappings, role_clusters_map)
+                results[index - 1] = {
+                    'mappings': mappings,
+                    'overall_analysis': entry.get('overall_analysis', '')
+                }
+        except Exception as e:
+            print(f"[ERROR] Grouped AI mapping failed, mapping roles individually: {str(e)}")
+
+        for i, role in enumerate(roles):
+            if results[i] is None:
+                results[i] = self.map_single_role(
+                    role.get('title'), role.get('description', ''),
+                    role.get('responsibilities', []), role.get('skills', []),
+                    role_clusters, clusters_text, timeout
+                )
+        return results
+
     def map_multiple_roles(self,
                           roles: List[Dict[str, Any]],
-                          role_clusters: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+                          role_clusters: Optional[List[Dict[str, Any]]] = None,
+                          max_workers: Optional[int] = None,
+                          role_timeout_seconds: Optional[float] = None,
+                          roles_per_prompt: Optional[int] = None) -> Dict[str, Any]:
         """
         Map multiple roles at once
 
+        Roles are mapped concurrently on a bounded thread pool; the cluster
+        catalogue part of the prompt is formatted once per batch. A role whose
+        call fails or times out gets an 'error' entry, the others are kept.
+        Unset limits come from the 'role_mapping' config section.
+
         Args:
             roles: List of role dictionaries with keys:
                    - title (required)
@@ -340,6 +493,9 @@ IMPORTANT:
                    - responsibilities (optional list)
                    - skills (optional list)
             role_clusters: Optional list of role clusters
+            max_workers: Concurrent LLM calls
+            role_timeout_seconds: Timeout of each LLM call
+            roles_per_prompt: Roles packed into one prompt (1 = one call per role)
 
         Returns:
             {
@@ -359,39 +515,47 @@ IMPORTANT:
         if role_clusters is None:
             role_clusters = self.get_all_role_clusters_static()
 
-        batch_id = str(uuid.uuid4())
-        results = []
-        total_mappings = 0
-
-        print(f"[INFO] Starting batch mapping for {len(roles)} roles (batch_id: {batch_id})")
-
-        for i, role_data in enumerate(roles, 1):
-            role_title = role_data.get('title')
-            role_description = role_data.get('description', '')
-            role_responsibilities = role_data.get('responsibilities', [])
-            role_skills = role_data.get('skills', [])
+        settings = get_role_mapping_settings()
+        max_workers = max_workers or settings['max_workers']
+        role_timeout_seconds = role_timeout_seconds or settings['role_timeout_seconds']
+        roles_per_prompt = max(1, roles_per_prompt or settings['roles_per_prompt'])
 
-            print(f"[INFO] Processing role {i}/{len(roles)}: {role_title}")
+        batch_id = str(uuid.uuid4())
+        clusters_text = self.build_cluster_catalogue(role_clusters)
+        groups = [roles[i:i + roles_per_prompt] for i in range(0, len(roles), roles_per_prompt)]
 
-            # Get AI mapping
-            mapping_result = self.map_single_role(
-                role_title,
-                role_description,
-                role_responsibilities,
-                role_skills,
-                role_clusters
-            )
+        print(
+            f"[INFO] Starting batch mapping for {len(roles)} roles in {len(groups)} calls "
+            f"on {max_workers} workers (batch_id: {batch_id})"
+        )
 
-            mappings = mapping_result.get('mappings', [])
-            total_mappings += len(mappings)
+        group_results = run_ordered(
+            self.map_role_group,
+            [(group, role_clusters, clusters_text, role_timeout_seconds) for group in groups],
+            max_workers=max_workers
+        )
 
-            results.append({
-                'role_title': role_title,
-                'role_description': role_description,
-                'mappings': mappings,
-                'overall_analysis': mapping_result.get('overall_analysis', ''),
-                'error': mapping_result.get('error')
-            })
+        results = []
+        total_mappings = 0
+        for group, (mapping_results, error) in zip(groups, group_results):
+            if error is not None:
+                mapping_results = [{
+                    'mappings': [],
+                    'overall_analysis': f'Error during AI analysis: {str(error)}',
+                    'error': str(error)
+                }] * len(group)
+
+            for role_data, mapping_result in zip(group, mapping_results):
+                mappings = mapping_result.get('mappings', [])
+                total_mappings += len(mappings)
+
+                results.append({
+                    'role_title': role_data.get('title'),
+                    'role_description': role_data.get('description', ''),
+                    'mappings': mappings,
+                    'overall_analysis': mapping_result.get('overall_analysis', ''),
+                    'error': mapping_result.get('error')
+                })
 
         print(f"[SUCCESS] Batch mapping complete. Total mappings: {total_mappings}")
 
@@ -0,0 +1,293 @@
+"""
+Role-Process Matrix Initialization - Bulk writes for newly saved roles
+======================================================================
+
+Backs POST /phase1/roles/initialize-matrix. Every role gets one
+role_process_matrix row per ISO process:
+
+- STANDARD roles copy the values of the organization 1 reference role with
+  the same role cluster (0 for processes the reference does not cover)
+- CUSTOM roles get AI-generated values (CustomRoleMatrixGenerator), or 0
+  for every process if generation fails
+
+The endpoint used to build one ORM object per role x process (about 30 per
+role), look up the reference role and count existing rows per role, and
+re-query the whole organization matrix and role list for every custom role.
+
+Now:
+- Reference roles and existing row counts are prefetched with one query each
+- STANDARD roles are copied with one INSERT ... SELECT per role
+- The AI context (organization matrix after the standard copies, and the
+  organization's roles) is loaded once and shared by all custom roles
+- Custom role matrices are generated concurrently (llm_executor.run_ordered);
+  custom roles of the same request therefore do not see each other's values
+- AI and zero-filled rows are written with one multi-row INSERT
+
+Nothing here commits.
+
+Date: 2026-10-18
+"""
+
+import logging
+from typing import Dict, List, Optional
+
+from sqlalchemy import and_, func, insert, literal, select
+from sqlalchemy.orm import joinedload
+
+from app.services.llm_executor import run_ordered
+from app.services.reference_data import get_reference_data
+
+try:
+    from models import db, IsoProcesses, OrganizationRoles, RoleProcessMatrix
+except ImportError:
+    from app.models import db, IsoProcesses, OrganizationRoles, RoleProcessMatrix
+
+logger = logging.getLogger(__name__)
+
+# Template organization with the 14 standard roles and the baseline matrix
+REFERENCE_ORGANIZATION_ID = 1
+
+
+def load_reference_roles(cluster_ids) -> Dict[int, int]:
+    """{standard_role_cluster_id: reference organization role id} (first role per cluster)"""
+    cluster_ids = {cid for cid in cluster_ids if cid}
+    if not cluster_ids:
+        return {}
+
+    reference_roles = {}
+    for role_id, cluster_id in db.session.query(
+        OrganizationRoles.id, OrganizationRoles.standard_role_cluster_id
+    ).filter(
+        OrganizationRoles.organization_id == REFERENCE_ORGANIZATION_ID,
+        OrganizationRoles.standard_role_cluster_id.in_(cluster_ids)
+    ).order_by(OrganizationRoles.id):
+        reference_roles.setdefault(cluster_id, role_id)
+    return reference_roles
+
+
+def count_existing_rows(org_id: int, role_ids) -> Dict[int, int]:
+    """{role_id: number of role_process_matrix rows} for roles that have any"""
+    role_ids = [rid for rid in role_ids if rid]
+    if not role_ids:
+        return {}
+    return dict(db.session.query(
+        RoleProcessMatrix.role_cluster_id, func.count(RoleProcessMatrix.id)
+    ).filter(
+        RoleProcessMatrix.organization_id == org_id,
+        RoleProcessMatrix.role_cluster_id.in_(role_ids)
+    ).group_by(RoleProcessMatrix.role_cluster_id).all())
+
+
+def copy_reference_matrix(org_id: int, role_id: int, reference_role_id: int) -> int:
+    """
+    Copy the reference role's values to a role for every ISO process.
+
+    Returns:
+        Number of rows inserted
+    """
+    rpm = RoleProcessMatrix.__table__
+    processes = IsoProcesses.__table__
+    reference = rpm.alias('reference')
+
+    values = select(
+        literal(org_id),
+        literal(role_id),
+        processes.c.id,
+        func.coalesce(reference.c.role_process_value, 0)
+    ).select_from(
+        processes.outerjoin(reference, and_(
+            reference.c.iso_process_id == processes.c.id,
+            reference.c.organization_id == REFERENCE_ORGANIZATION_ID,
+            reference.c.role_cluster_id == reference_role_id
+        ))
+    ).order_by(processes.c.id)
+
+    result = db.session.execute(insert(rpm).from_select(
+        ['organization_id', 'role_cluster_id', 'iso_process_id', 'role_process_value'],
+        values
+    ))
+    return result.rowcount
+
+
+def insert_matrix_rows(org_id: int, matrices: Dict[int, Dict[int, int]], process_ids: List[int]) -> int:
+    """
+    Insert {role_id: {process_id: value}} with one multi-row INSERT
+    (processes missing from a role's values get 0).
+
+    Returns:
+        Number of rows inserted
+    """
+    rows = [
+        {
+            'organization_id': org_id,
+            'role_cluster_id': role_id,
+            'iso_process_id': process_id,
+            'role_process_value': values.get(process_id, 0)
+        }
+        for role_id, values in matrices.items()
+        for process_id in process_ids
+    ]
+    if rows:
+        db.session.execute(insert(RoleProcessMatrix.__table__), rows)
+    return len(rows)
+
+
+def load_ai_context(org_id: int):
+    """
+    Current organization matrix and roles, as context for custom role generation.
+
+    Returns:
+        (existing_matrix {process_id: {role_id: value}} or None, existing_roles list or None)
+    """
+    existing_matrix = {}
+    for process_id, role_id, value in db.session.query(
+        RoleProcessMatrix.iso_process_id, RoleProcessMatrix.role_cluster_id, RoleProcessMatrix.role_process_value
+    ).filter(RoleProcessMatrix.organization_id == org_id):
+        existing_matrix.setdefault(process_id, {})[role_id] = value
+
+    existing_roles = [
+        {
+            'id': r.id,
+            'orgRoleName': r.role_name,
+            'standardRoleName': r.standard_cluster.role_cluster_name if r.standard_cluster else None
+        }
+        for r in OrganizationRoles.query.options(
+            joinedload(OrganizationRoles.standard_cluster)
+        ).filter_by(organization_id=org_id).all()
+    ]
+    return existing_matrix or None, existing_roles or None
+
+
+def generate_custom_matrices(generator, custom_roles: List[Dict], processes_for_ai: List[Dict],
+                             existing_matrix: Optional[Dict], existing_roles: Optional[List]) -> Dict[int, Dict[int, int]]:
+    """
+    Generate the matrices of all custom roles concurrently.
+
+    Returns:
+        {role_id: {process_id: value}} - all zeros for a role whose generation failed
+    """
+    arg_tuples = [
+        (
+            role.get('orgRoleName'),
+            role.get('standard_role_description', '') or role.get('description', ''),
+            processes_for_ai,
+            existing_matrix,
+            existing_roles
+        )
+        for role in custom_roles
+    ]
+    results = run_ordered(generator.generate_matrix_for_custom_role, arg_tuples)
+
+    matrices = {}
+    for role, (ai_result, error) in zip(custom_roles, results):
+        role_name = role.get('orgRoleName')
+        if error is None and ai_result['success']:
+            logger.info(f"[MATRIX INIT] AI generated matrix for '{role_name}': {ai_result.get('reasoning', '')}")
+            matrices[role['id']] = ai_result['matrix']
+        else:
+            reason = error if error is not None else ai_result.get('error', 'Unknown error')
+            logger.warning(f"[MATRIX INIT] AI generation failed for '{role_name}', using zeros: {reason}")
+            matrices[role['id']] = {}
+    return matrices
+
+
+def initialize_role_matrices(org_id: int, roles: List[Dict], smart_merge: bool, generator) -> Dict:
+    """
+    Create the role-process matrix rows of the given roles.
+
+    Args:
+        org_id: Organization
+        roles: Saved roles ({id, orgRoleName, standardRoleId, identificationMethod, ...})
+        smart_merge: Skip roles that already have matrix rows (otherwise the
+            organization's matrix is deleted first)
+        generator: CustomRoleMatrixGenerator for CUSTOM roles
+
+    Returns:
+        {'entries_created', 'roles_skipped', 'initialized_role_ids', 'processes_per_role'}
+    """
+    if not smart_merge:
+        # Full reset - delete existing matrix entries for this organization
+        RoleProcessMatrix.query.filter_by(organization_id=org_id).delete()
+        logger.info(f"[MATRIX INIT] Full reset - deleted existing matrix for org {org_id}")
+    else:
+        logger.info(f"[MATRIX INIT] Smart merge - preserving matrix for unchanged roles")
+
+    all_processes = get_reference_data().iso_processes()
+    all_process_ids = [p.id for p in all_processes]
+    if len(all_process_ids) != 30:
+        logger.warning(f"[MATRIX INIT] Expected 30 processes, found {len(all_process_ids)}")
+
+    existing_counts = count_existing_rows(org_id, [r.get('id') for r in roles]) if smart_merge else {}
+    reference_roles = load_reference_roles(
+        r.get('standardRoleId') for r in roles
+        if r.get('identificationMethod', 'STANDARD') == 'STANDARD'
+    )
+
+    entries_created = 0
+    roles_skipped = 0
+    initialized_role_ids = []
+    zero_filled = {}
+    custom_roles = []
+
+    for role in roles:
+        role_id = role.get('id')
+        role_name = role.get('orgRoleName')
+        standard_cluster_id = role.get('standardRoleId')
+        identification_method = role.get('identificationMethod', 'STANDARD')
+
+        if not role_id:
+            logger.warning(f"[MATRIX INIT] Skipping role without ID: {role_name}")
+            continue
+
+        # SMART MERGE: Skip roles that already have matrix data (unchanged roles)
+        if existing_counts.get(role_id):
+            roles_skipped += 1
+            logger.info(
+                f"[MATRIX INIT] Skipping role '{role_name}' (ID: {role_id}) - "
+                f"matrix already exists ({existing_counts[role_id]} entries)"
+            )
+            continue
+
+        initialized_role_ids.append(role_id)
+
+        if identification_method == 'STANDARD' and standard_cluster_id:
+            reference_role_id = reference_roles.get(standard_cluster_id)
+            if reference_role_id:
+                entries_created += copy_reference_matrix(org_id, role_id, reference_role_id)
+                logger.info(
+                    f"[MATRIX INIT] Copied reference values for STANDARD role "
+                    f"'{role_name}' (cluster {standard_cluster_id})"
+                )
+            else:
+                logger.warning(
+                    f"[MATRIX INIT] No reference role found for cluster {standard_cluster_id}, using zeros"
+                )
+                zero_filled[role_id] = {}
+        elif identification_method == 'CUSTOM':
+            custom_roles.append(role)
+        else:
+            logger.warning(
+                f"[MATRIX INIT] Unknown identification method '{identification_method}' for role '{role_name}'"
+            )
+
+    entries_created += insert_matrix_rows(org_id, zero_filled, all_process_ids)
+
+    if custom_roles:
+        # Context includes the standard roles copied above
+        db.session.flush()
+        existing_matrix, existing_roles = load_ai_context(org_id)
+        processes_for_ai = [
+            {'id': p.id, 'name': p.name, 'description': p.description or ''} for p in all_processes
+        ]
+        logger.info(f"[MATRIX INIT] Generating AI-powered matrices for {len(custom_roles)} CUSTOM roles")
+        ai_matrices = generate_custom_matrices(
+            generator, custom_roles, processes_for_ai, existing_matrix, existing_roles
+        )
+        entries_created += insert_matrix_rows(org_id, ai_matrices, all_process_ids)
+
+    return {
+        'entries_created': entries_created,
+        'roles_skipped': roles_skipped,
+        'initialized_role_ids': initialized_role_ids,
+        'processes_per_role': len(all_process_ids)
+    }
@@ -0,0 +1,247 @@
+"""
+Role Similarity - Vectorized nearest role search with cached role matrices
+==========================================================================
+
+find_most_similar_role_cluster() (app/most_similar_role.py) re-queried and
+re-aggregated role_competency_matrix of the organization on every call,
+built one NumPy vector per role in a dict comprehension and computed the
+Euclidean, Manhattan and cosine distances role by role in Python, calling
+min() over all distances once per role.
+
+This module keeps, per organization, a contiguous roles x competencies
+matrix (same aggregation and competency axis as before) and ranks any
+number of user score vectors against it with one broadcasted operation per
+metric:
+
+- RoleMatrixCache: process-wide, read-through per organization. An entry is
+  valid while the organization's input revision (organization_input_revision)
+  is unchanged - every route that rewrites role_competency_matrix bumps it -
+  and is dropped immediately in this worker by invalidate_role_matrix(),
+  which competency_matrix_recompute calls after recomputing
+- compute_distances(): users x roles distance matrices for all three metrics
+- rank_roles(): per user the same result dict as find_most_similar_role_cluster()
+
+Date: 2026-10-18
+"""
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import func, select
+
+from app.services.input_revision import get_input_revision
+
+try:
+    from models import db, RoleCompetencyMatrix
+except ImportError:
+    from app.models import db, RoleCompetencyMatrix
+
+logger = logging.getLogger(__name__)
+
+METRICS = ('euclidean', 'manhattan', 'cosine')
+
+# min_distance reported when the organization has no role requirements
+NO_ROLE_DISTANCE = 999
+
+
+@dataclass(frozen=True)
+class RoleMatrix:
+    """Role requirement vectors of one organization (read-only arrays)"""
+    organization_id: int
+    revision: int
+    role_ids: np.ndarray        # (R,) ordered by role id
+    competency_ids: np.ndarray  # (C,) competencies present in the organization's matrix
+    vectors: np.ndarray         # (R, C) float64, C-contiguous
+
+    @property
+    def competency_index(self) -> Dict[int, int]:
+        return {int(cid): j for j, cid in enumerate(self.competency_ids)}
+
+
+def load_role_matrix(org_id: int, revision: int = 0) -> RoleMatrix:
+    """One aggregate query -> roles x competencies matrix (missing cells are 0)"""
+    rcm = RoleCompetencyMatrix
+    rows = db.session.execute(
+        select(
+            rcm.role_cluster_id,
+            rcm.competency_id,
+            func.sum(rcm.role_competency_value).label('role_competency_value')
+        ).where(
+            rcm.organization_id == org_id
+        ).group_by(rcm.role_cluster_id, rcm.competency_id)
+    ).all()
+
+    role_ids = np.array(sorted({row.role_cluster_id for row in rows}), dtype=np.int64)
+    competency_ids = np.array(sorted({row.competency_id for row in rows}), dtype=np.int64)
+    role_index = {int(rid): i for i, rid in enumerate(role_ids)}
+    comp_index = {int(cid): j for j, cid in enumerate(competency_ids)}
+
+    vectors = np.zeros((len(role_ids), len(competency_ids)), dtype=np.float64)
+    for row in rows:
+        vectors[role_index[row.role_cluster_id], comp_index[row.competency_id]] = row.role_competency_value or 0
+    vectors.setflags(write=False)
+    role_ids.setflags(write=False)
+    competency_ids.setflags(write=False)
+
+    return RoleMatrix(
+        organization_id=org_id,
+        revision=revision,
+        role_ids=role_ids,
+        competency_ids=competency_ids,
+        vectors=vectors
+    )
+
+
+class RoleMatrixCache:
+    """
+    Per-organization role matrices, validated against the input revision.
+
+    Counters (see stats()):
+        hits, misses, reloads
+    """
+
+    def __init__(self):
+        self._matrices: Dict[int, RoleMatrix] = {}
+        self._lock = threading.Lock()
+        self.counters = {'hits': 0, 'misses': 0, 'reloads': 0}
+
+    def get(self, org_id: int) -> RoleMatrix:
+        revision = get_input_revision(org_id)
+        with self._lock:
+            cached = self._matrices.get(org_id)
+            if cached is not None and cached.revision == revision:
+                self.counters['hits'] += 1
+                return cached
+            self.counters['misses'] += 1
+            if cached is not None:
+                self.counters['reloads'] += 1
+
+        matrix = load_role_matrix(org_id, revision)
+        with self._lock:
+            self._matrices[org_id] = matrix
+        logger.debug(
+            f"[RoleMatrixCache] Org {org_id} rev {revision}: "
+            f"{len(matrix.role_ids)} roles x {len(matrix.competency_ids)} competencies"
+        )
+        return matrix
+
+    def invalidate(self, org_id: Optional[int] = None) -> None:
+        """Drop one organization's matrix (all if org_id is None)"""
+        with self._lock:
+            if org_id is None:
+                self._matrices.clear()
+            else:
+                self._matrices.pop(org_id, None)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self.counters)
+            stats['organizations'] = len(self._matrices)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else 0.0
+        return stats
+
+
+_role_matrix_cache = RoleMatrixCache()
+
+
+def get_role_matrix_cache() -> RoleMatrixCache:
+    """Process-wide role matrix cache."""
+    return _role_matrix_cache
+
+
+def invalidate_role_matrix(org_id: Optional[int] = None) -> None:
+    """Drop cached role matrices after role_competency_matrix was rewritten."""
+    _role_matrix_cache.invalidate(org_id)
+
+
+# =============================================================================
+# DISTANCES
+# =============================================================================
+
+def user_score_matrix(role_matrix: RoleMatrix, user_scores: Sequence[Sequence[Mapping]]) -> np.ndarray:
+    """
+    users x competencies matrix on the role matrix's competency axis.
+
+    Args:
+        user_scores: per user a list of {'competency_id', 'score'} (competencies
+            outside the organization's matrix are ignored, missing ones are 0)
+    """
+    comp_index = role_matrix.competency_index
+    users = np.zeros((len(user_scores), len(comp_index)), dtype=np.float64)
+    for i, scores in enumerate(user_scores):
+        for entry in scores:
+            j = comp_index.get(entry['competency_id'])
+            if j is not None:
+                users[i, j] = entry['score'] or 0
+    return users
+
+
+def compute_distances(users: np.ndarray, roles: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Euclidean, Manhattan and cosine distances of every user to every role.
+
+    Args:
+        users: (U, C) score vectors
+        roles: (R, C) requirement vectors
+
+    Returns:
+        {metric: (U, R) distance matrix}; cosine distance is 1.0 if either
+        vector is zero
+    """
+    diff = users[:, None, :] - roles[None, :, :]
+    euclidean = np.sqrt(np.einsum('urc,urc->ur', diff, diff))
+    manhattan = np.abs(diff).sum(axis=2)
+
+    user_norms = np.linalg.norm(users, axis=1)
+    role_norms = np.linalg.norm(roles, axis=1)
+    magnitudes = np.outer(user_norms, role_norms)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cosine = np.where(magnitudes == 0, 1.0, 1 - (users @ roles.T) / magnitudes)
+
+    return {'euclidean': euclidean, 'manhattan': manhattan, 'cosine': cosine}
+
+
+def rank_roles(org_id: int, user_scores: Sequence[Sequence[Mapping]]) -> List[Dict]:
+    """
+    Closest role clusters of many users at once.
+
+    Returns:
+        Per user {'role_ids', 'min_distance', 'metric_agreement', 'distances'},
+        see find_most_similar_role_cluster()
+    """
+    role_matrix = get_role_matrix_cache().get(org_id)
+    role_ids = role_matrix.role_ids.tolist()
+
+    if not role_ids:
+        return [
+            {
+                'role_ids': [],
+                'min_distance': NO_ROLE_DISTANCE,
+                'metric_agreement': 0,
+                'distances': {metric: {} for metric in METRICS}
+            }
+            for _ in user_scores
+        ]
+
+    distances = compute_distances(user_score_matrix(role_matrix, user_scores), role_matrix.vectors)
+    minima = {metric: values.min(axis=1, keepdims=True) for metric, values in distances.items()}
+    closest = {metric: distances[metric] == minima[metric] for metric in METRICS}
+
+    results = []
+    for i in range(len(user_scores)):
+        euclidean_role_ids = [role_ids[k] for k in np.flatnonzero(closest['euclidean'][i])]
+        best = np.flatnonzero(closest['euclidean'][i])[0]
+        results.append({
+            'role_ids': euclidean_role_ids,
+            'min_distance': float(minima['euclidean'][i, 0]),
+            'metric_agreement': int(sum(bool(closest[metric][i, best]) for metric in METRICS)),
+            'distances': {
+                metric: dict(zip(role_ids, distances[metric][i].tolist()))
+                for metric in METRICS
+            }
+        })
+    return results
@@ -33,6 +33,8 @@ from typing import Dict, List, Optional
 import logging
 from statistics import median
 
+from app.services.reference_data import get_reference_data
+
 logger = logging.getLogger(__name__)
 
 # Import compatibility layer
@@ -40,8 +42,7 @@ try:
     # Try Flask app context first (production)
     from app import models as app_models
     from app.models import (
-        UserAssessment, LearningStrategy, StrategyTemplateCompetency,
-        UserCompetencySurveyResult, PMTContext, Competency
+        UserAssessment, LearningStrategy, UserCompetencySurveyResult, PMTContext
     )
     from app.services.learning_objectives_text_generator import (
         get_template_objective,
@@ -56,8 +57,7 @@ except (ImportError, ModuleNotFoundError):
     # Fall back to direct import (testing/standalone)
     import models as app_models
     from models import (
-        UserAssessment, LearningStrategy, StrategyTemplateCompetency,
-        UserCompetencySurveyResult, PMTContext, Competency
+        UserAssessment, LearningStrategy, UserCompetencySurveyResult, PMTContext
     )
     import sys
     import os
@@ -116,7 +116,7 @@ def get_task_based_assessment_data(organization_id: int):
     ).order_by(LearningStrategy.priority.asc()).all()
 
     # Get actual competency IDs from database (not hardcoded)
-    all_competencies = [c.id for c in Competency.query.order_by(Competency.id).all()]
+    all_competencies = get_reference_data().competency_ids()
 
     logger.info(
         f"[STEP 1 TASK-BASED] Retrieved {len(user_assessments)} task-based users, "
@@ -206,18 +206,16 @@ def get_strategy_targets(strategy: LearningStrategy, all_competencies: List[int]
         }
     """
     targets = {}
+    reference = get_reference_data()
 
     for comp_id in all_competencies:
-        # Get target from strategy_template_competency table (global templates)
+        # Get target from strategy_template_competency table (global templates, cached)
         # Query via strategy's template_id link instead of per-org strategy_id
         if strategy.strategy_template_id:
-            template_comp = StrategyTemplateCompetency.query.filter_by(
-                strategy_template_id=strategy.strategy_template_id,
-                competency_id=comp_id
-            ).first()
+            target_level = reference.template_target_level(strategy.strategy_template_id, comp_id)
 
-            if template_comp:
-                targets[comp_id] = template_comp.target_level
+            if target_level is not None:
+                targets[comp_id] = target_level
             else:
                 # If no target defined in template, assume 0 (no training for this competency)
                 targets[comp_id] = 0
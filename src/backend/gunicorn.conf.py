@@ -0,0 +1,27 @@
+"""
+Gunicorn configuration for the SE-QPT backend (read automatically from the
+working directory; command line options such as --workers still apply)
+
+SEQPT_PRELOAD=1 imports the app once in the master (preload_app) and loads the
+lazy resources configured under 'resource_loading' (LangChain, tiktoken,
+vector index) before the workers are forked, so all workers share them
+copy-on-write. Without it every worker loads them on first use.
+"""
+
+import os
+
+preload_app = os.getenv('SEQPT_PRELOAD', '').lower() in ('1', 'true', 'yes')
+
+
+def when_ready(server):
+    """Runs in the master after the app was loaded, before the workers are forked"""
+    if not preload_app:
+        return
+
+    from app.services.lazy_resources import format_startup_report, preload_configured_resources
+
+    results = preload_configured_resources()
+    for name, error in results.items():
+        if error:
+            server.log.warning(f"Preloading {name} failed, workers load it on first use: {error}")
+    server.log.info(format_startup_report())
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+SE-QPT Learning Objectives Worker
+Processes queued learning objectives generation jobs (learning_objectives_job table)
+
+Usage:
+    python lo_worker.py                  # one worker process
+    python lo_worker.py --processes 2    # two worker processes
+    python lo_worker.py --once           # drain the queue and exit
+"""
+
+import os
+import sys
+import logging
+import multiprocessing
+
+# Add current directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def worker_main(index, once):
+    """Entry point of one worker process (own app, own DB connections)"""
+    import socket
+    from app import create_app
+    from app.services.learning_objectives_jobs import run_worker
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s [%(processName)s] %(levelname)s %(name)s: %(message)s'
+    )
+
+    application = create_app()
+    with application.app_context():
+        run_worker(worker_id=f"{socket.gethostname()}:{os.getpid()}:{index}", once=once)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='SE-QPT Learning Objectives Worker')
+    parser.add_argument('--processes', type=int, default=1, help='Number of worker processes')
+    parser.add_argument('--once', action='store_true', help='Exit when the queue is empty')
+
+    args = parser.parse_args()
+
+    if args.processes <= 1:
+        worker_main(0, args.once)
+    else:
+        # Spawn so every worker builds its own app and connection pool
+        context = multiprocessing.get_context('spawn')
+        processes = [
+            context.Process(target=worker_main, args=(i, args.once), name=f'lo-worker-{i}')
+            for i in range(args.processes)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
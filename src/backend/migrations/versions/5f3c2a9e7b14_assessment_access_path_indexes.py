@@ -0,0 +1,73 @@
+"""Composite and partial indexes for the assessment access paths
+
+Revision ID: 5f3c2a9e7b14
+Revises: 2dcaba1849cd
+Create Date: 2026-10-18 10:00:00.000000
+
+The learning objectives pathways, the assessment routes and the role
+mapping filter these tables by:
+
+- user_se_competency_survey_results: (organization_id, competency_id),
+  (user_id, assessment_id), assessment_id ordered by competency_id
+- user_assessment: latest completed assessment per (organization_id, user_id),
+  latest assessment of a user by created_at
+- user_role_cluster: role_cluster_id (members of organization roles), assessment_id
+- role_competency_matrix: (role_cluster_id, competency_id)
+- unknown_role_competency_matrix: (organization_id, user_name) - already served
+  by the unique constraint (organization_id, user_name, competency_id)
+
+Indexes are built CONCURRENTLY so the upgrade does not block submissions.
+Databases created by setup/migrations/*.sql can run this revision after
+"flask db stamp 2dcaba1849cd" (IF NOT EXISTS makes it idempotent).
+
+The index definitions mirror models.py (__table_args__);
+tests/test_query_plans.py checks both stay in sync and EXPLAINs the
+canonical queries against a seeded PostgreSQL database.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5f3c2a9e7b14'
+down_revision = '2dcaba1849cd'
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, columns, partial index predicate)
+INDEXES = [
+    ('idx_survey_results_org_competency', 'user_se_competency_survey_results',
+     ['organization_id', 'competency_id'], None),
+    ('idx_survey_results_user_assessment', 'user_se_competency_survey_results',
+     ['user_id', 'assessment_id'], None),
+    ('idx_survey_results_assessment_competency', 'user_se_competency_survey_results',
+     ['assessment_id', 'competency_id'], None),
+    ('idx_user_assessment_latest_completed', 'user_assessment',
+     ['organization_id', 'user_id', 'id'], 'completed_at IS NOT NULL'),
+    ('idx_user_assessment_user_created', 'user_assessment',
+     ['user_id', 'created_at'], None),
+    ('idx_user_role_cluster_role_user', 'user_role_cluster',
+     ['role_cluster_id', 'user_id'], None),
+    ('idx_user_role_cluster_assessment', 'user_role_cluster',
+     ['assessment_id'], None),
+    ('idx_role_competency_matrix_role_competency', 'role_competency_matrix',
+     ['role_cluster_id', 'competency_id'], None),
+]
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            statement = f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"
+            if where:
+                statement += f" WHERE {where}"
+            op.execute(sa.text(statement))
+        for table in sorted({table for _, table, _, _ in INDEXES}):
+            op.execute(sa.text(f"ANALYZE {table}"))
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, _, _, _ in reversed(INDEXES):
+            op.execute(sa.text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
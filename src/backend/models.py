@@ -473,6 +473,7 @@ class RoleCompetencyMatrix(db.Model):
 
     __table_args__ = (
         db.UniqueConstraint('organization_id', 'role_cluster_id', 'competency_id', name='role_competency_matrix_unique'),
+        db.Index('idx_role_competency_matrix_role_competency', 'role_cluster_id', 'competency_id'),
     )
 
     def to_dict(self):
@@ -942,6 +943,275 @@ class GeneratedLearningObjectives(db.Model):
         }
 
 
+class OrganizationInputRevision(db.Model):
+    """
+    Per-organization revision counter for learning objectives inputs
+
+    Table: organization_input_revision
+    Purpose: Cheap freshness check for the generated_learning_objectives cache.
+    Instead of hashing every latest survey result and role assignment of an
+    organization on each request, compute_input_hash() reads this single row.
+
+    The counter is bumped (in the same transaction as the write) by every
+    route that changes assessment scores, user role assignments, organization
+    roles, selected strategies or PMT context. Data written outside those
+    routes (e.g. SQL test data scripts) requires "Regenerate" (force=True).
+
+    Created: 2026-10-18 (Migration 014_organization_input_revision.sql)
+    """
+    __tablename__ = 'organization_input_revision'
+
+    organization_id = db.Column(db.Integer, db.ForeignKey('organization.id', ondelete='CASCADE'), primary_key=True)
+    revision = db.Column(db.BigInteger, nullable=False, default=0)
+    last_reason = db.Column(db.String(50))  # e.g. 'assessment_submit', 'roles_save'
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<OrganizationInputRevision org={self.organization_id} rev={self.revision}>'
+
+
+class ReferenceDataVersion(db.Model):
+    """
+    Version stamp of the near-immutable reference tables
+
+    Table: reference_data_version (single row, id = 1)
+    Purpose: Invalidation of the process-wide reference data cache
+    (app/services/reference_data.py), which keeps competency, role_cluster,
+    iso_processes and strategy_template(_competency) in memory. Every worker
+    compares its cached version with this row and reloads on mismatch.
+
+    Bumped by the setup/populate scripts that write those tables. SQL scripts
+    changing them must run
+    UPDATE reference_data_version SET version = version + 1 WHERE id = 1.
+
+    Created: 2026-10-18 (Migration 016_reference_data_version.sql)
+    """
+    __tablename__ = 'reference_data_version'
+
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+    last_reason = db.Column(db.String(50))  # e.g. 'populate_competencies'
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<ReferenceDataVersion v={self.version}>'
+
+
+class LatestUserCompetencyScore(db.Model):
+    """
+    Denormalized scores of each user's latest completed assessment
+
+    Table: latest_user_competency_score
+    Purpose: Replaces the "latest completed assessment per user" subquery
+    (max(user_assessment.id) grouped by user, joined to
+    user_se_competency_survey_results) that the learning objectives pathways
+    rebuilt per competency. One row per (organization, user, competency),
+    taken from the user's latest completed assessment in that organization.
+
+    Maintained in the same transaction as the submit routes
+    (app/services/latest_scores.py refresh_latest_scores). Data written outside
+    those routes (e.g. SQL test data scripts) requires rebuild_latest_scores().
+
+    Created: 2026-10-18 (Migration 017_latest_user_competency_score.sql)
+    """
+    __tablename__ = 'latest_user_competency_score'
+
+    organization_id = db.Column(db.Integer, db.ForeignKey('organization.id', ondelete='CASCADE'), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    competency_id = db.Column(db.Integer, db.ForeignKey('competency.id', ondelete='CASCADE'), primary_key=True)
+    assessment_id = db.Column(db.Integer, db.ForeignKey('user_assessment.id', ondelete='CASCADE'), nullable=False)
+    score = db.Column(db.Integer, nullable=False)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('idx_latest_score_org_competency', 'organization_id', 'competency_id', 'score'),
+        db.Index('idx_latest_score_user_assessment', 'user_id', 'assessment_id'),
+    )
+
+    def __repr__(self):
+        return f'<LatestUserCompetencyScore org={self.organization_id} user={self.user_id} comp={self.competency_id} score={self.score}>'
+
+
+class LearningObjectivesJob(db.Model):
+    """
+    Queued learning objectives generation (background job)
+
+    Table: learning_objectives_job
+    Purpose: Run generate_complete_learning_objectives() in separate worker
+    processes (lo_worker.py) instead of inside a gunicorn request. The table
+    itself is the queue: workers claim the oldest 'queued' row, report
+    progress/heartbeat while running, and the status endpoint reads it.
+
+    Status flow: queued -> running -> completed | failed
+    Deduplication: at most one queued/running job per (organization, input_hash)
+    The generated result is stored in generated_learning_objectives (cache).
+
+    Created: 2026-10-18 (Migration 015_learning_objectives_job.sql)
+    """
+    __tablename__ = 'learning_objectives_job'
+
+    id = db.Column(db.Integer, primary_key=True)
+    organization_id = db.Column(db.Integer, db.ForeignKey('organization.id', ondelete='CASCADE'), nullable=False)
+    input_hash = db.Column(db.String(64), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, running, completed, failed
+    force = db.Column(db.Boolean, nullable=False, default=False)
+
+    # Generation inputs: {'selected_strategies': [...], 'pmt_context': {...} | None}
+    request_payload = db.Column(db.JSON, nullable=False)
+
+    # Latest GenerationProgress snapshot (algorithm, LLM call counts)
+    progress = db.Column(db.JSON)
+    error = db.Column(db.Text)
+    pathway = db.Column(db.String(30))
+
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    worker_id = db.Column(db.String(100))
+    requested_by_user_id = db.Column(db.Integer, nullable=True)
+
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    heartbeat_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+    __table_args__ = (
+        db.Index('idx_lo_job_status_created', 'status', 'created_at'),
+        db.Index(
+            'uq_lo_job_active_input',
+            'organization_id', 'input_hash',
+            unique=True,
+            postgresql_where=db.text("status IN ('queued', 'running')"),
+            sqlite_where=db.text("status IN ('queued', 'running')")
+        ),
+    )
+
+    def __repr__(self):
+        return f'<LearningObjectivesJob {self.id} org={self.organization_id} {self.status}>'
+
+    def to_dict(self):
+        """Convert to dictionary for JSON response"""
+        return {
+            'job_id': self.id,
+            'organization_id': self.organization_id,
+            'status': self.status,
+            'force': self.force,
+            'progress': self.progress or {},
+            'error': self.error,
+            'pathway': self.pathway,
+            'attempts': self.attempts,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'heartbeat_at': self.heartbeat_at.isoformat() if self.heartbeat_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+
+class LLMResponseCache(db.Model):
+    """
+    Content-addressed cache for individual LLM customization fragments
+
+    Table: llm_response_cache
+    Purpose: Reuse per-(competency, level, template, PMT) customizations across
+    regenerations and across organizations with the same PMT wording.
+
+    Unlike GeneratedLearningObjectives (whole-org output keyed by input_hash),
+    entries here only depend on the exact prompt inputs, so a new assessment
+    in an organization does not invalidate them.
+
+    Key: SHA-256 of namespace + model + prompt_version + prompt inputs
+    Eviction: TTL on read, LRU (last_used_at) pruning above max_entries
+
+    Created: 2026-10-18 (Migration 013_llm_response_cache.sql)
+    """
+    __tablename__ = 'llm_response_cache'
+
+    id = db.Column(db.Integer, primary_key=True)
+    cache_key = db.Column(db.String(64), nullable=False, unique=True)
+    namespace = db.Column(db.String(50), nullable=False)  # e.g. 'pmt_breakdown', 'ttt_objective'
+    model = db.Column(db.String(50), nullable=False)
+    prompt_version = db.Column(db.String(20), nullable=False)
+    response = db.Column(db.JSON, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    last_used_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    hit_count = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.Index('idx_llm_response_cache_last_used', 'last_used_at'),
+    )
+
+    def __repr__(self):
+        return f'<LLMResponseCache {self.namespace} key={self.cache_key[:8]}... hits={self.hit_count}>'
+
+
+class LearningObjectivesExport(db.Model):
+    """
+    Pre-rendered learning objectives export (JSON, Excel or PDF)
+
+    Table: learning_objectives_export
+    Purpose: Serve GET /phase2/learning-objectives/<org_id>/export without
+    rendering on every download. Rendered right after generation and on the
+    first request for other filter options (learning_objectives_export.py).
+
+    Key: (organization_id, input_hash, export_format, options_key) where
+    options_key = SHA-256 of the filter options, the organization name and
+    the render version (a renamed organization gets new artifacts)
+    Content: export_blob row with the same content_hash (also the ETag) -
+    the foreign key keeps referenced blobs from being pruned
+    Invalidation: deleted by save_to_cache() when the objectives change
+
+    Created: 2026-10-18 (Migration 018_learning_objectives_export.sql)
+    """
+    __tablename__ = 'learning_objectives_export'
+
+    id = db.Column(db.Integer, primary_key=True)
+    organization_id = db.Column(db.Integer, db.ForeignKey('organization.id', ondelete='CASCADE'), nullable=False)
+    input_hash = db.Column(db.String(64), nullable=False)
+    export_format = db.Column(db.String(10), nullable=False)  # json, excel, pdf
+    options_key = db.Column(db.String(64), nullable=False)
+    options = db.Column(db.JSON, nullable=False)  # {'strategy': ..., 'include_validation': ...}
+
+    content_hash = db.Column(
+        db.String(64), db.ForeignKey('export_blob.content_hash', name='fk_lo_export_blob'), nullable=False
+    )
+    content_type = db.Column(db.String(100), nullable=False)
+    size_bytes = db.Column(db.Integer, nullable=False)
+    render_seconds = db.Column(db.Float)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.UniqueConstraint(
+            'organization_id', 'input_hash', 'export_format', 'options_key',
+            name='uq_lo_export_key'
+        ),
+        db.Index('idx_lo_export_content_hash', 'content_hash'),
+    )
+
+    def __repr__(self):
+        return f'<LearningObjectivesExport org={self.organization_id} {self.export_format} hash={self.content_hash[:8]}...>'
+
+
+class ExportBlob(db.Model):
+    """
+    Content-addressed export file
+
+    Table: export_blob
+    Purpose: Rendered bytes of LearningObjectivesExport rows, stored once per
+    distinct content (SHA-256). Kept apart from the artifact rows so
+    conditional requests (If-None-Match) never load the file.
+    Unreferenced blobs are pruned after each pre-render.
+
+    Created: 2026-10-18 (Migration 018_learning_objectives_export.sql)
+    """
+    __tablename__ = 'export_blob'
+
+    content_hash = db.Column(db.String(64), primary_key=True)
+    content = db.Column(db.LargeBinary, nullable=False)
+    size_bytes = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<ExportBlob {self.content_hash[:8]}... {self.size_bytes} bytes>'
+
+
 # =============================================================================
 # SECTION 3: USER AND AUTHENTICATION MODELS
 # =============================================================================
@@ -976,6 +1246,12 @@ class UserCompetencySurveyResult(db.Model):
     organization = db.relationship('Organization', backref='survey_results', foreign_keys=[organization_id])
     user = db.relationship('User', backref='survey_results', foreign_keys=[user_id])
 
+    __table_args__ = (
+        db.Index('idx_survey_results_org_competency', 'organization_id', 'competency_id'),
+        db.Index('idx_survey_results_user_assessment', 'user_id', 'assessment_id'),
+        db.Index('idx_survey_results_assessment_competency', 'assessment_id', 'competency_id'),
+    )
+
     def calculate_gap(self, target_level):
         """Calculate and update gap size"""
         self.target_level = target_level
@@ -1029,6 +1305,11 @@ class UserRoleCluster(db.Model):
     user = db.relationship('User', backref=db.backref('role_clusters', cascade="all, delete-orphan", lazy=True), foreign_keys=[user_id])
     organization_role = db.relationship('OrganizationRoles', backref=db.backref('user_role_clusters', cascade="all, delete-orphan", lazy=True))
 
+    __table_args__ = (
+        db.Index('idx_user_role_cluster_role_user', 'role_cluster_id', 'user_id'),
+        db.Index('idx_user_role_cluster_assessment', 'assessment_id'),
+    )
+
     def __repr__(self):
         return f"<UserRoleCluster user_id={self.user_id}, org_role_id={self.role_cluster_id}>"
 
@@ -1055,6 +1336,37 @@ class UserCompetencySurveyFeedback(db.Model):
         return f"<UserCompetencySurveyFeedback user_id={self.user_id} organization_id={self.organization_id}>"
 
 
+class AssessmentFeedbackClaim(db.Model):
+    """
+    Claim on the feedback generation of one assessment
+
+    Table: assessment_feedback_claim
+    Purpose: Deduplicate feedback generation across gunicorn workers. The
+    process that inserts the row (primary key = assessment) generates the
+    feedback; the row is deleted once the feedback is stored, or marked
+    'failed' so a later results request can retry.
+
+    Status flow: running -> (deleted) | failed
+    A running claim older than the stale timeout, or older than the latest
+    submission of the assessment, is taken over.
+
+    Created: 2026-10-18 (Migration 019_assessment_feedback_claim.sql)
+    """
+    __tablename__ = 'assessment_feedback_claim'
+
+    assessment_id = db.Column(
+        db.Integer, db.ForeignKey('user_assessment.id', ondelete='CASCADE'), primary_key=True
+    )
+    status = db.Column(db.String(20), nullable=False, default='running')  # running, failed
+    worker_id = db.Column(db.String(100))
+    attempts = db.Column(db.Integer, nullable=False, default=1)
+    error = db.Column(db.Text)
+    claimed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<AssessmentFeedbackClaim assessment_id={self.assessment_id} status={self.status}>"
+
+
 # NOTE: LearningPlan model removed - not yet implemented
 # Future learning plan features will be added when implemented
 
@@ -1087,6 +1399,16 @@ class UserAssessment(db.Model):
     user = db.relationship('User', backref='assessments_history', foreign_keys=[user_id])
     organization = db.relationship('Organization', backref='user_assessments', foreign_keys=[organization_id])
 
+    __table_args__ = (
+        # Latest completed assessment per (organization, user): max(id) WHERE completed_at IS NOT NULL
+        db.Index(
+            'idx_user_assessment_latest_completed', 'organization_id', 'user_id', 'id',
+            postgresql_where=db.text('completed_at IS NOT NULL'),
+            sqlite_where=db.text('completed_at IS NOT NULL')
+        ),
+        db.Index('idx_user_assessment_user_created', 'user_id', 'created_at'),
+    )
+
     @property
     def selected_role_objects(self):
         """
@@ -112,6 +112,9 @@ if __name__ == '__main__':
     parser.add_argument('--host', default='127.0.0.1', help='Host to bind to')
     parser.add_argument('--port', type=int, default=5000, help='Port to bind to')
     parser.add_argument('--debug', action='store_true', help='Enable debug mode')
+    parser.add_argument('--preload', action='store_true',
+                        help='Load the LLM pipeline resources (LangChain, tiktoken, vector index) at startup '
+                             'instead of on first request')
 
     args = parser.parse_args()
 
@@ -119,4 +122,8 @@ if __name__ == '__main__':
         init_database()
     else:
         app = create_application()
+        if args.preload:
+            from app.services.lazy_resources import format_startup_report, preload_configured_resources
+            preload_configured_resources()
+            print(format_startup_report())
         app.run(host=args.host, port=args.port, debug=args.debug)
\ No newline at end of file
@@ -0,0 +1,38 @@
+-- Migration 013: LLM Response (Fragment) Cache
+-- Purpose: Cache individual PMT customizations by content hash so that
+--          regenerating learning objectives after a score change makes no
+--          LLM calls, and organizations with identical PMT wording share results
+-- Date: 2026-10-18
+
+-- Table: llm_response_cache
+CREATE TABLE IF NOT EXISTS llm_response_cache (
+    id SERIAL PRIMARY KEY,
+
+    -- SHA-256 of namespace + model + prompt version + prompt inputs
+    cache_key VARCHAR(64) NOT NULL UNIQUE,
+    namespace VARCHAR(50) NOT NULL,
+    model VARCHAR(50) NOT NULL,
+    prompt_version VARCHAR(20) NOT NULL,
+
+    -- Parsed LLM output (dict for PMT breakdowns, string for TTT objectives)
+    response JSONB NOT NULL,
+
+    -- Eviction bookkeeping (TTL on created_at, LRU on last_used_at)
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    last_used_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    hit_count INTEGER NOT NULL DEFAULT 0
+);
+
+-- Indexes for performance
+CREATE INDEX IF NOT EXISTS idx_llm_response_cache_last_used ON llm_response_cache(last_used_at);
+
+-- Comments
+COMMENT ON TABLE llm_response_cache IS 'Content-addressed cache of LLM customization fragments (shared across organizations)';
+COMMENT ON COLUMN llm_response_cache.cache_key IS 'SHA-256 of namespace, model, prompt version and exact prompt inputs';
+COMMENT ON COLUMN llm_response_cache.last_used_at IS 'Updated on every hit; used for LRU pruning';
+
+-- Success message
+DO $$
+BEGIN
+    RAISE NOTICE '[Migration 013] LLM response cache table created successfully';
+END $$;
@@ -0,0 +1,25 @@
+-- Migration 014: Organization Input Revision
+-- Purpose: Per-organization revision counter used by compute_input_hash() so the
+--          learning objectives cache freshness check is a single-row lookup instead
+--          of hashing every survey result and role assignment of the organization
+-- Date: 2026-10-18
+
+-- Table: organization_input_revision
+CREATE TABLE IF NOT EXISTS organization_input_revision (
+    organization_id INTEGER PRIMARY KEY REFERENCES organization(id) ON DELETE CASCADE,
+
+    -- Bumped by assessment submit, role save, strategy save and PMT update routes
+    revision BIGINT NOT NULL DEFAULT 0,
+    last_reason VARCHAR(50),
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+-- Comments
+COMMENT ON TABLE organization_input_revision IS 'Monotonic counter of learning objectives input changes per organization';
+COMMENT ON COLUMN organization_input_revision.revision IS 'Incremented in the same transaction as every input change; part of the LO cache input hash';
+
+-- Success message
+DO $$
+BEGIN
+    RAISE NOTICE '[Migration 014] Organization input revision table created successfully';
+END $$;
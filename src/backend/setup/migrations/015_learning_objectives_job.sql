@@ -0,0 +1,50 @@
+-- Migration 015: Learning Objectives Job Queue
+-- Purpose: Database-backed queue for background learning objectives generation.
+--          Web requests enqueue a job and return 202; lo_worker.py processes
+--          claim jobs with SELECT ... FOR UPDATE SKIP LOCKED.
+-- Date: 2026-10-18
+
+-- Table: learning_objectives_job
+CREATE TABLE IF NOT EXISTS learning_objectives_job (
+    id SERIAL PRIMARY KEY,
+    organization_id INTEGER NOT NULL REFERENCES organization(id) ON DELETE CASCADE,
+    input_hash VARCHAR(64) NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+    force BOOLEAN NOT NULL DEFAULT FALSE,
+
+    -- Generation inputs and latest progress snapshot
+    request_payload JSON NOT NULL,
+    progress JSON,
+    error TEXT,
+    pathway VARCHAR(30),
+
+    -- Worker bookkeeping
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker_id VARCHAR(100),
+    requested_by_user_id INTEGER,
+
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    started_at TIMESTAMP,
+    heartbeat_at TIMESTAMP,
+    finished_at TIMESTAMP
+);
+
+-- Index for claiming the oldest queued job
+CREATE INDEX IF NOT EXISTS idx_lo_job_status_created
+ON learning_objectives_job(status, created_at);
+
+-- At most one active job per organization and input hash (deduplication)
+CREATE UNIQUE INDEX IF NOT EXISTS uq_lo_job_active_input
+ON learning_objectives_job(organization_id, input_hash)
+WHERE status IN ('queued', 'running');
+
+-- Comments
+COMMENT ON TABLE learning_objectives_job IS 'Queue of background learning objectives generation jobs';
+COMMENT ON COLUMN learning_objectives_job.status IS 'queued -> running -> completed | failed';
+COMMENT ON COLUMN learning_objectives_job.heartbeat_at IS 'Updated by the worker while running; stale jobs are re-queued';
+
+-- Success message
+DO $$
+BEGIN
+    RAISE NOTICE '[Migration 015] Learning objectives job table created successfully';
+END $$;
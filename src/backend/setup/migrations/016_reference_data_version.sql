@@ -0,0 +1,30 @@
+-- Migration 016: Reference Data Version
+-- Purpose: Version stamp for the process-wide reference data cache (competency,
+--          role_cluster, iso_processes, strategy_template, strategy_template_competency).
+--          Workers compare their cached version with this row and reload on mismatch.
+-- Date: 2026-10-18
+
+-- Table: reference_data_version (single row)
+CREATE TABLE IF NOT EXISTS reference_data_version (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+
+    -- Bumped by the setup/populate scripts; SQL scripts changing reference tables
+    -- must run: UPDATE reference_data_version SET version = version + 1 WHERE id = 1;
+    version BIGINT NOT NULL DEFAULT 0,
+    last_reason VARCHAR(50),
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+INSERT INTO reference_data_version (id, version, last_reason)
+VALUES (1, 1, 'migration_016')
+ON CONFLICT (id) DO NOTHING;
+
+-- Comments
+COMMENT ON TABLE reference_data_version IS 'Version stamp of the near-immutable reference tables cached in memory by every worker';
+COMMENT ON COLUMN reference_data_version.version IS 'Incremented whenever competency, role_cluster, iso_processes or strategy template data changes';
+
+-- Success message
+DO $$
+BEGIN
+    RAISE NOTICE '[Migration 016] Reference data version table created successfully';
+END $$;
@@ -0,0 +1,61 @@
+-- Migration 017: Latest User Competency Score
+-- Purpose: Materialized scores of each user's latest completed assessment per organization.
+--          Replaces the max(user_assessment.id) GROUP BY user_id subquery the learning
+--          objectives pathways rebuilt per competency. Maintained by the submit routes
+--          in the same transaction as the survey results.
+-- Date: 2026-10-18
+
+-- Table: latest_user_competency_score
+CREATE TABLE IF NOT EXISTS latest_user_competency_score (
+    organization_id INTEGER NOT NULL REFERENCES organization(id) ON DELETE CASCADE,
+    user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    competency_id INTEGER NOT NULL REFERENCES competency(id) ON DELETE CASCADE,
+
+    -- Latest completed assessment of the user in this organization
+    assessment_id INTEGER NOT NULL REFERENCES user_assessment(id) ON DELETE CASCADE,
+    score INTEGER NOT NULL,
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+
+    PRIMARY KEY (organization_id, user_id, competency_id)
+);
+
+-- Org-wide snapshots / per-competency score lists (index-only scan)
+CREATE INDEX IF NOT EXISTS idx_latest_score_org_competency
+    ON latest_user_competency_score (organization_id, competency_id, score);
+
+-- Latest assessment of a user across organizations (role-based pathway)
+CREATE INDEX IF NOT EXISTS idx_latest_score_user_assessment
+    ON latest_user_competency_score (user_id, assessment_id);
+
+-- Backfill from existing assessments. Re-run this statement after loading data with
+-- SQL scripts that bypass the submit routes (or call latest_scores.rebuild_latest_scores()).
+WITH latest AS (
+    SELECT organization_id, user_id, MAX(id) AS assessment_id
+    FROM user_assessment
+    WHERE completed_at IS NOT NULL
+    GROUP BY organization_id, user_id
+)
+INSERT INTO latest_user_competency_score
+    (organization_id, user_id, competency_id, assessment_id, score, updated_at)
+SELECT latest.organization_id, latest.user_id, r.competency_id, latest.assessment_id, MAX(r.score), NOW()
+FROM user_se_competency_survey_results r
+JOIN latest
+  ON r.assessment_id = latest.assessment_id
+ AND r.user_id = latest.user_id
+ AND r.organization_id = latest.organization_id
+WHERE r.competency_id IS NOT NULL
+GROUP BY latest.organization_id, latest.user_id, r.competency_id, latest.assessment_id
+ON CONFLICT (organization_id, user_id, competency_id) DO UPDATE
+SET assessment_id = EXCLUDED.assessment_id,
+    score = EXCLUDED.score,
+    updated_at = EXCLUDED.updated_at;
+
+-- Comments
+COMMENT ON TABLE latest_user_competency_score IS 'Scores of each user''s latest completed assessment per organization (maintained on assessment submit)';
+COMMENT ON COLUMN latest_user_competency_score.assessment_id IS 'user_assessment the scores were taken from (max completed id per organization and user)';
+
+-- Success message
+DO $$
+BEGIN
+    RAISE NOTICE '[Migration 017] Latest user competency score table created and backfilled successfully';
+END $$;
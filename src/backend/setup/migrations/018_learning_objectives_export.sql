@@ -0,0 +1,48 @@
+-- Migration 018: Learning Objectives Export Artifacts
+-- Purpose: Pre-rendered learning objectives exports (JSON, Excel, PDF) per organization,
+--          input hash, format and filter options. The rendered bytes are stored once per
+--          content hash in export_blob; the content hash is served as the ETag.
+-- Date: 2026-10-18
+
+-- Table: export_blob (content-addressed file contents)
+CREATE TABLE IF NOT EXISTS export_blob (
+    content_hash VARCHAR(64) PRIMARY KEY,
+    content BYTEA NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+-- Table: learning_objectives_export
+CREATE TABLE IF NOT EXISTS learning_objectives_export (
+    id SERIAL PRIMARY KEY,
+    organization_id INTEGER NOT NULL REFERENCES organization(id) ON DELETE CASCADE,
+    input_hash VARCHAR(64) NOT NULL,
+    export_format VARCHAR(10) NOT NULL,
+    options_key VARCHAR(64) NOT NULL,
+    options JSON NOT NULL,
+
+    -- Rendered file
+    content_hash VARCHAR(64) NOT NULL,
+    content_type VARCHAR(100) NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    render_seconds DOUBLE PRECISION,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+
+    CONSTRAINT uq_lo_export_key UNIQUE (organization_id, input_hash, export_format, options_key),
+    CONSTRAINT fk_lo_export_blob FOREIGN KEY (content_hash) REFERENCES export_blob(content_hash)
+);
+
+-- Index for pruning unreferenced blobs (and the foreign key check on blob delete)
+CREATE INDEX IF NOT EXISTS idx_lo_export_content_hash
+ON learning_objectives_export(content_hash);
+
+-- Comments
+COMMENT ON TABLE export_blob IS 'Rendered export files keyed by SHA-256 of their content';
+COMMENT ON TABLE learning_objectives_export IS 'Pre-rendered learning objectives exports (deleted when the objectives are regenerated)';
+COMMENT ON COLUMN learning_objectives_export.options_key IS 'SHA-256 of the filter options, organization name and render version';
+
+-- Success message
+DO $$
+BEGIN
+    RAISE NOTICE '[Migration 018] Learning objectives export tables created successfully';
+END $$;
@@ -0,0 +1,26 @@
+-- Migration 019: Assessment Feedback Claims
+-- Purpose: Cross-process deduplication of the LLM feedback generation for
+--          submitted assessments. The worker that inserts the claim row generates
+--          the feedback; the results endpoint reports 'pending' meanwhile.
+-- Date: 2026-10-18
+
+-- Table: assessment_feedback_claim
+CREATE TABLE IF NOT EXISTS assessment_feedback_claim (
+    assessment_id INTEGER PRIMARY KEY REFERENCES user_assessment(id) ON DELETE CASCADE,
+    status VARCHAR(20) NOT NULL DEFAULT 'running',
+    worker_id VARCHAR(100),
+    attempts INTEGER NOT NULL DEFAULT 1,
+    error TEXT,
+    claimed_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+-- Comments
+COMMENT ON TABLE assessment_feedback_claim IS 'Feedback generation in progress (deleted once the feedback is stored)';
+COMMENT ON COLUMN assessment_feedback_claim.status IS 'running | failed (retried on the next results request)';
+COMMENT ON COLUMN assessment_feedback_claim.claimed_at IS 'Running claims older than the stale timeout or the latest submission are taken over';
+
+-- Success message
+DO $$
+BEGIN
+    RAISE NOTICE '[Migration 019] Assessment feedback claim table created successfully';
+END $$;
@@ -0,0 +1,126 @@
+"""
+Rebuild the process retrieval index (app/faiss_index)
+====================================================
+
+Embeds one document per ISO process - its description, activities and
+tasks from data/iso_process_catalogue.json - with the configured embedding
+provider (config 'embeddings' section, or --provider / --model) and writes
+the safe vector index format (index.json, vectors.npy, documents.json - see
+app/services/llm_pipeline/vector_index.py).
+
+Usage (from src/backend/):
+    python setup/utils/rebuild_process_index.py                     # from the process catalogue
+    python setup/utils/rebuild_process_index.py --provider local    # local CPU model
+    python setup/utils/rebuild_process_index.py --from-database
+        # names and descriptions from iso_processes, activities and tasks
+        # from the catalogue (matched by process name)
+    python setup/utils/rebuild_process_index.py --from-legacy OLD_DIR
+        # convert a pickled FAISS index.faiss / index.pkl (trusted files only);
+        # keeps its ada-002 vectors unless --provider / --model re-embeds them
+
+Running workers pick up a rebuilt index after a restart.
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+import time
+
+# Backend root (src/backend) for the app imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.services.config_loader import get_embedding_settings
+from app.services.llm_pipeline.embeddings import create_embedding_provider
+from app.services.llm_pipeline.resources import FAISS_INDEX_PATH, PROCESS_CATALOGUE_PATH
+from app.services.llm_pipeline.vector_index import (
+    VectorIndex, load_process_catalogue, merge_process_catalogue, process_documents,
+    read_legacy_faiss_index
+)
+
+# Embeddings model of the pickled index shipped before the safe format
+LEGACY_IDENTITY = {'provider': 'openai', 'model': 'text-embedding-ada-002'}
+
+
+def fetch_iso_processes(database_url):
+    """iso_processes rows in id order and their fingerprint (same as the pipeline's catalogue check)"""
+    from sqlalchemy import create_engine, text
+
+    engine = create_engine(database_url)
+    try:
+        with engine.connect() as connection:
+            rows = connection.execute(text(
+                "SELECT id, name, description FROM iso_processes ORDER BY id"
+            )).mappings().all()
+    finally:
+        engine.dispose()
+
+    processes = [dict(row) for row in rows]
+    digest = hashlib.md5("\x1e".join(
+        f"{p['name']}\x1f{p['description'] or ''}" for p in processes
+    ).encode('utf-8')).hexdigest()
+    return processes, f"{len(processes)}:{digest}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rebuild the process retrieval vector index')
+    parser.add_argument('--provider', help='Embedding provider (openai, local); default from config')
+    parser.add_argument('--model', help='Embedding model; default from config')
+    parser.add_argument('--output', default=FAISS_INDEX_PATH, help=f'Index directory (default: {FAISS_INDEX_PATH})')
+    parser.add_argument('--catalogue', default=PROCESS_CATALOGUE_PATH,
+                        help=f'Processes with activities and tasks (default: {PROCESS_CATALOGUE_PATH})')
+    parser.add_argument('--from-database', action='store_true',
+                        help='Take process names and descriptions from iso_processes')
+    parser.add_argument('--database-url', default=os.getenv('DATABASE_URL'), help='Default: $DATABASE_URL')
+    parser.add_argument('--from-legacy', metavar='DIR',
+                        help='Convert a pickled FAISS index.faiss / index.pkl directory instead of reading iso_processes')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+
+    if args.from_legacy:
+        print(f"[INFO] Reading legacy FAISS index from {args.from_legacy}...")
+        vectors, documents = read_legacy_faiss_index(args.from_legacy)
+        source = {'type': 'legacy_faiss', 'documents': len(documents)}
+        if args.provider or args.model:
+            provider = create_embedding_provider(args.provider, args.model)
+            print(f"[INFO] Re-embedding {len(documents)} documents with {provider.name}/{provider.model}...")
+            index = VectorIndex.build(documents, provider, source)
+        else:
+            index = VectorIndex.from_vectors(vectors, documents, LEGACY_IDENTITY, source)
+    else:
+        catalogue = load_process_catalogue(args.catalogue)
+        source = {'type': 'process_catalogue', 'catalogue': os.path.basename(args.catalogue)}
+        processes = catalogue
+        if args.from_database:
+            if not args.database_url:
+                print("[ERROR] DATABASE_URL is not set (use --database-url)")
+                return 1
+            rows, fingerprint = fetch_iso_processes(args.database_url)
+            if not rows:
+                print("[ERROR] iso_processes is empty - populate it first (setup/populate/populate_iso_processes.py)")
+                return 1
+            processes, missing = merge_process_catalogue(rows, catalogue)
+            if missing:
+                print(f"[WARNING] No activities/tasks in {args.catalogue} for: {', '.join(missing)} "
+                      f"- their documents only contain the description")
+            source.update({'type': 'iso_processes', 'fingerprint': fingerprint})
+        provider = create_embedding_provider(args.provider, args.model)
+        print(f"[INFO] Embedding {len(processes)} ISO processes with {provider.name}/{provider.model}...")
+        index = VectorIndex.build(process_documents(processes), provider, source)
+
+    index.save(args.output)
+    print(f"[OK] Wrote {index.manifest['count']} x {index.manifest['dimension']} "
+          f"({index.manifest['provider']}/{index.manifest['model']}) to {args.output} "
+          f"in {time.perf_counter() - started:.1f}s")
+
+    settings = get_embedding_settings()
+    configured = {'provider': settings['provider'], 'model': settings.get(f"{settings['provider']}_model")}
+    if configured != index.identity:
+        print(f"[WARNING] The config uses {configured['provider']}/{configured['model']} embeddings - "
+              f"update its 'embeddings' section, otherwise the pipeline refuses this index")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,48 @@
+"""
+Shared Test Fixtures
+====================
+
+sqlite_app builds a Flask app on an in-memory SQLite database with only the
+tables a test module needs. Module-level app_ctx fixtures call it with their
+table list and add their own seed data.
+"""
+
+import pytest
+from flask import Flask
+from sqlalchemy.pool import StaticPool
+
+from models import db
+
+
+@pytest.fixture
+def sqlite_app():
+    """
+    Factory: sqlite_app(tables, shared=False) -> Flask app with its app context pushed.
+
+    Args (of the returned callable):
+        tables: Model classes whose tables are created
+        shared: One shared connection, for background threads that must see
+                the same in-memory database
+    """
+    contexts = []
+
+    def make(tables, shared=False):
+        app = Flask(__name__)
+        app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+        if shared:
+            app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+                'poolclass': StaticPool,
+                'connect_args': {'check_same_thread': False}
+            }
+        db.init_app(app)
+        ctx = app.app_context()
+        ctx.push()
+        contexts.append(ctx)
+        db.metadata.create_all(db.engine, tables=[m.__table__ for m in tables])
+        return app
+
+    yield make
+
+    for ctx in reversed(contexts):
+        db.session.remove()
+        ctx.pop()
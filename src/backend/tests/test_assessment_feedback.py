@@ -0,0 +1,179 @@
+"""
+Unit Tests for Assessment Feedback Generation
+=============================================
+
+Tests for the prefetched feedback inputs, concurrent per-area generation,
+background generation/storage and the database claim of assessment_feedback.py
+against an in-memory SQLite database (the LLM call is patched).
+"""
+
+import threading
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from models import (
+    db, AssessmentFeedbackClaim, Competency, CompetencyIndicator, RoleCompetencyMatrix, UserAssessment,
+    UserCompetencySurveyResults, UserCompetencySurveyFeedback
+)
+from app.services import assessment_feedback as feedback
+
+TABLES = (
+    Competency, CompetencyIndicator, RoleCompetencyMatrix, UserAssessment,
+    UserCompetencySurveyResults, UserCompetencySurveyFeedback, AssessmentFeedbackClaim
+)
+
+
+@pytest.fixture
+def app_ctx(sqlite_app):
+    # One shared in-memory database for the background thread
+    app = sqlite_app(TABLES, shared=True)
+    seed()
+    return app
+
+
+def seed():
+    """Assessment 1: three competencies in two areas, one without requirement"""
+    competencies = [(1, 'Systems Thinking', 'Core'), (7, 'Communication', 'Social'), (8, 'Leadership', 'Social')]
+    for comp_id, name, area in competencies:
+        db.session.add(Competency(id=comp_id, competency_name=name, competency_area=area))
+    db.session.add(CompetencyIndicator(competency_id=1, level='1', indicator_en='Knows the system'))
+    db.session.add(CompetencyIndicator(competency_id=1, level='3', indicator_en='Applies it'))
+    db.session.add(CompetencyIndicator(competency_id=1, level='3', indicator_en='Teaches it'))
+    for comp_id, value in ((1, 4), (7, 2), (8, 0)):
+        db.session.add(RoleCompetencyMatrix(
+            role_cluster_id=5, competency_id=comp_id, organization_id=1, role_competency_value=value
+        ))
+    db.session.add(UserAssessment(
+        id=1, user_id=1, organization_id=1, assessment_type='role_based',
+        survey_type='known_roles', selected_roles=[5], completed_at=datetime.utcnow()
+    ))
+    for comp_id, score in ((1, 1), (7, 0), (8, 6)):
+        db.session.add(UserCompetencySurveyResults(
+            user_id=1, organization_id=1, competency_id=comp_id, score=score, assessment_id=1
+        ))
+    db.session.commit()
+
+
+def fake_llm(calls):
+    lock = threading.Lock()
+
+    def generate(competency_area, competencies):
+        with lock:
+            calls.append(competency_area)
+        return {'competency_area': competency_area, 'feedbacks': [c['competency_name'] for c in competencies]}
+    return generate
+
+
+class TestFeedbackInputs:
+
+    def test_inputs_grouped_by_area_with_prefetched_indicators(self, app_ctx):
+        required = feedback.load_required_scores(db.session.get(UserAssessment, 1))
+        assert required == [{'competency_id': 1, 'max_score': 4.0}, {'competency_id': 7, 'max_score': 2.0}]
+
+        user_competencies = UserCompetencySurveyResults.query.order_by(UserCompetencySurveyResults.competency_id).all()
+        inputs = feedback.build_feedback_inputs(user_competencies, {m['competency_id']: m['max_score'] for m in required})
+
+        assert list(inputs) == ['Core', 'Social']
+        assert inputs['Core'] == [{
+            'competency_name': 'Systems Thinking',
+            'user_level': '1',
+            'user_indicator': 'Knows the system',
+            'required_level': '3',
+            'required_indicator': 'Applies it. Teaches it'
+        }]
+        communication = inputs['Social'][0]
+        assert communication['user_indicator'] == 'You are unaware or lack knowledge in this competency area'
+        assert communication['required_indicator'] == 'No specific indicators available for level 2 (verstehen (understand))'
+
+
+class TestGeneration:
+
+    def test_feedback_generated_per_area_and_stored_once(self, app_ctx):
+        calls = []
+        with patch.object(feedback, 'generate_feedback_with_llm', fake_llm(calls)):
+            first = feedback.generate_assessment_feedback(1)
+            second = feedback.generate_assessment_feedback(1)
+
+        assert sorted(calls) == ['Core', 'Social']
+        assert [f['competency_area'] for f in first] == ['Core', 'Social']
+        assert second == first
+        assert UserCompetencySurveyFeedback.query.count() == 1
+
+    def test_llm_failure_stores_nothing(self, app_ctx):
+        def failing(competency_area, competencies):
+            raise RuntimeError('LLM down')
+
+        with patch.object(feedback, 'generate_feedback_with_llm', failing):
+            with pytest.raises(RuntimeError):
+                feedback.generate_assessment_feedback(1)
+
+        assert UserCompetencySurveyFeedback.query.count() == 0
+
+    def test_results_report_pending_without_waiting(self, app_ctx):
+        calls = []
+        release = threading.Event()
+        generate = fake_llm(calls)
+
+        def blocking(competency_area, competencies):
+            release.wait(timeout=10)
+            return generate(competency_area, competencies)
+
+        with patch.object(feedback, 'generate_feedback_with_llm', blocking):
+            future = feedback.schedule_feedback_generation(1)
+            assert feedback.get_feedback_status(1) == ([], feedback.FEEDBACK_PENDING)
+            # Claimed: a second submit (any worker process) does not start another job
+            assert feedback.schedule_feedback_generation(1) is None
+            release.set()
+            future.result(timeout=10)
+
+        served, status = feedback.get_feedback_status(1)
+        assert status == feedback.FEEDBACK_COMPLETED and len(calls) == 2
+        assert [f['competency_area'] for f in served] == ['Core', 'Social']
+        assert AssessmentFeedbackClaim.query.count() == 0  # released once stored
+
+
+class TestClaim:
+
+    def test_failed_claim_retried_until_max_attempts(self, app_ctx):
+        def failing(competency_area, competencies):
+            raise RuntimeError('LLM down')
+
+        with patch.object(feedback, 'generate_feedback_with_llm', failing):
+            for attempt in range(1, feedback.MAX_ATTEMPTS + 1):
+                future = feedback.schedule_feedback_generation(1)
+                future.result(timeout=10)
+                claim = db.session.get(AssessmentFeedbackClaim, 1)
+                db.session.refresh(claim)
+                assert (claim.status, claim.attempts, claim.error) == ('failed', attempt, 'LLM down')
+
+            assert feedback.get_feedback_status(1) == ([], feedback.FEEDBACK_FAILED)
+
+    def test_stale_and_resubmitted_claims_taken_over(self, app_ctx):
+        now = datetime.utcnow()
+        db.session.add(AssessmentFeedbackClaim(
+            assessment_id=1, status='running', worker_id='other:1', attempts=1,
+            claimed_at=now - timedelta(seconds=30)
+        ))
+        db.session.commit()
+
+        # Running on another worker (claimed after the submission)
+        db.session.get(UserAssessment, 1).completed_at = now - timedelta(seconds=60)
+        db.session.commit()
+        assert feedback.claim_feedback_generation(1) is None
+
+        # The assessment was submitted again after the claim
+        db.session.get(UserAssessment, 1).completed_at = now
+        db.session.commit()
+        token = feedback.claim_feedback_generation(1)
+        assert token is not None
+        claim = db.session.get(AssessmentFeedbackClaim, 1)
+        assert (claim.worker_id, claim.attempts, claim.claimed_at) == (feedback._worker_id, 1, token)
+
+        # Worker died: the claim goes stale
+        claim.claimed_at = token - timedelta(seconds=feedback.CLAIM_STALE_SECONDS + 1)
+        db.session.get(UserAssessment, 1).completed_at = claim.claimed_at - timedelta(seconds=1)
+        db.session.commit()
+        assert feedback.claim_feedback_generation(1) is not None
+        assert db.session.get(AssessmentFeedbackClaim, 1).attempts == 2
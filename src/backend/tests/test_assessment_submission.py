@@ -0,0 +1,124 @@
+"""
+Unit Tests for the Bulk Assessment Submission
+=============================================
+
+Tests for assessment_submission.py against an in-memory SQLite database:
+set-based survey result writes, the role assignment upsert, batch
+submissions and the in-memory results summary.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from models import (
+    db, Competency, LatestUserCompetencyScore, OrganizationInputRevision, RoleCompetencyMatrix,
+    UserAssessment, UserCompetencySurveyFeedback, UserCompetencySurveyResults, UserRoleCluster
+)
+from app.services import reference_data
+from app.services.assessment_submission import (
+    apply_submissions, build_submission_results, collect_answers
+)
+from app.services.reference_data import ReferenceDataCache
+
+TABLES = (
+    Competency, LatestUserCompetencyScore, OrganizationInputRevision, RoleCompetencyMatrix,
+    UserAssessment, UserCompetencySurveyFeedback, UserCompetencySurveyResults, UserRoleCluster
+)
+
+
+@pytest.fixture
+def app_ctx(sqlite_app, monkeypatch):
+    monkeypatch.setattr(reference_data, '_reference_data', ReferenceDataCache(version_check_seconds=0))
+    sqlite_app(TABLES)
+    for comp_id, name in ((1, 'Systems Thinking'), (2, 'Communication'), (3, 'Leadership')):
+        db.session.add(Competency(id=comp_id, competency_name=name, competency_area='Core'))
+    for role_id, comp_id, value in ((5, 1, 4), (5, 2, 2), (6, 2, 4), (6, 3, 0)):
+        db.session.add(RoleCompetencyMatrix(
+            role_cluster_id=role_id, competency_id=comp_id, organization_id=1, role_competency_value=value
+        ))
+    db.session.commit()
+
+
+def add_assessment(assessment_id, user_id=1, selected_roles=(5,)):
+    assessment = UserAssessment(
+        id=assessment_id, user_id=user_id, organization_id=1, assessment_type='role_based',
+        survey_type='known_roles', selected_roles=list(selected_roles)
+    )
+    db.session.add(assessment)
+    db.session.commit()
+    return assessment
+
+
+def stored_results(assessment_id):
+    return sorted(
+        (r.competency_id, r.score)
+        for r in UserCompetencySurveyResults.query.filter_by(assessment_id=assessment_id)
+    )
+
+
+def test_collect_answers_skips_missing_and_keeps_last():
+    answers = [{'competency_id': 3, 'current_level': 1}, {'current_level': 6},
+               {'competency_id': 1}, {'competency_id': 3, 'current_level': 4}]
+    assert collect_answers(answers) == {1: 0, 3: 4}
+
+
+def test_submission_writes_results_roles_and_latest_scores(app_ctx):
+    first = add_assessment(1)
+    apply_submissions([(first, {1: 2, 2: 1})])
+    db.session.commit()
+
+    second = add_assessment(2, selected_roles=(5, 6))
+    db.session.add(UserCompetencySurveyFeedback(user_id=1, organization_id=1, assessment_id=2, feedback=[]))
+    counts = apply_submissions([(second, {1: 4, 2: 2, 3: 6})])
+    db.session.commit()
+
+    assert counts == {'survey_results': 3, 'role_assignments': 2}
+    assert stored_results(1) == [(1, 2), (2, 1)]
+    assert stored_results(2) == [(1, 4), (2, 2), (3, 6)]
+    assert second.completed_at is not None
+    # Role 5 was held from assessment 1: re-pointed, not a primary key violation
+    assert sorted((r.role_cluster_id, r.assessment_id) for r in UserRoleCluster.query) == [(5, 2), (6, 2)]
+    assert UserCompetencySurveyFeedback.query.count() == 0
+    assert sorted((s.competency_id, s.score, s.assessment_id) for s in LatestUserCompetencyScore.query) == \
+        [(1, 4, 2), (2, 2, 2), (3, 6, 2)]
+    assert OrganizationInputRevision.query.filter_by(organization_id=1).one().revision == 2
+
+
+def test_resubmission_replaces_results(app_ctx):
+    assessment = add_assessment(1)
+    apply_submissions([(assessment, {1: 2, 2: 1, 3: 0})])
+    apply_submissions([(assessment, {2: 6})])
+    db.session.commit()
+
+    assert stored_results(1) == [(2, 6)]
+    assert [(s.competency_id, s.score) for s in LatestUserCompetencyScore.query] == [(2, 6)]
+
+
+def test_batch_submission_keeps_newest_role_assignment(app_ctx):
+    submissions = [
+        (add_assessment(1, user_id=1), {1: 1}),
+        (add_assessment(2, user_id=1), {1: 2}),
+        (add_assessment(3, user_id=2, selected_roles=(6,)), {2: 4}),
+    ]
+    counts = apply_submissions(submissions)
+    db.session.commit()
+
+    assert counts == {'survey_results': 3, 'role_assignments': 2}
+    assert sorted((r.user_id, r.role_cluster_id, r.assessment_id) for r in UserRoleCluster.query) == \
+        [(1, 5, 2), (2, 6, 3)]
+    assert sorted((s.user_id, s.score) for s in LatestUserCompetencyScore.query) == [(1, 2), (2, 4)]
+    # One revision bump per organization and batch
+    assert OrganizationInputRevision.query.filter_by(organization_id=1).one().revision == 1
+
+
+def test_results_summary_from_answers(app_ctx):
+    assessment = add_assessment(1, selected_roles=(5, 6))
+    assessment.completed_at = datetime.utcnow()
+
+    user_scores, max_scores, summary = build_submission_results(assessment, {3: 6, 2: 4, 1: 2})
+
+    assert max_scores == [{'competency_id': 1, 'max_score': 4.0}, {'competency_id': 2, 'max_score': 4.0}]
+    assert [(s['competency_id'], s['score'], s['competency_name']) for s in user_scores] == \
+        [(1, 2, 'Systems Thinking'), (2, 4, 'Communication')]
+    assert summary == {'total': 2, 'proficient': 1, 'needs_improvement': 1}
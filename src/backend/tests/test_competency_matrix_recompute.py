@@ -0,0 +1,181 @@
+"""
+Unit Tests for the Incremental Competency Matrix Recompute
+==========================================================
+
+Tests for competency_matrix_recompute.py against an in-memory SQLite
+database. Results are compared with a per-organization full rebuild that
+mirrors the update_role_competency_matrix stored procedure.
+"""
+
+from collections import defaultdict
+from unittest.mock import patch
+
+import pytest
+
+from models import (
+    db, OrganizationInputRevision, ProcessCompetencyMatrix, RoleCompetencyMatrix, RoleProcessMatrix,
+    UnknownRoleCompetencyMatrix, UnknownRoleProcessMatrix
+)
+from app.services import competency_matrix_recompute as recompute
+
+TABLES = (
+    OrganizationInputRevision, ProcessCompetencyMatrix, RoleCompetencyMatrix, RoleProcessMatrix,
+    UnknownRoleCompetencyMatrix, UnknownRoleProcessMatrix
+)
+
+
+@pytest.fixture
+def app_ctx(sqlite_app):
+    app = sqlite_app(TABLES)
+    seed()
+    return app
+
+
+def seed():
+    """Two organizations, processes 1-3, competencies 1 and 2, one task-based user"""
+    for process_id, competency_id, value in ((1, 1, 1), (2, 1, 2), (3, 1, 0), (1, 2, 2), (3, 2, 1)):
+        db.session.add(ProcessCompetencyMatrix(
+            iso_process_id=process_id, competency_id=competency_id, process_competency_value=value
+        ))
+    for org_id, role_id, process_id, value in (
+        (1, 10, 1, 2), (1, 10, 2, 1), (1, 11, 3, 4),
+        (2, 20, 1, 4), (2, 20, 2, 2), (2, 20, 3, 1)
+    ):
+        db.session.add(RoleProcessMatrix(
+            organization_id=org_id, role_cluster_id=role_id, iso_process_id=process_id, role_process_value=value
+        ))
+    for process_id, value in ((1, 1), (2, 2), (3, 4)):
+        db.session.add(UnknownRoleProcessMatrix(
+            organization_id=1, user_name='alice', iso_process_id=process_id, role_process_value=value
+        ))
+    db.session.commit()
+    for competency_id in (1, 2):
+        recompute.recompute_role_competency_for_competency(competency_id)
+        recompute.recompute_unknown_role_competency_for_competency(competency_id)
+    db.session.commit()
+
+
+def full_rebuild():
+    """Expected role_competency_matrix, computed like the stored procedure"""
+    process_values = defaultdict(dict)
+    for row in ProcessCompetencyMatrix.query.all():
+        process_values[row.iso_process_id][row.competency_id] = row.process_competency_value
+
+    expected = {}
+    for row in RoleProcessMatrix.query.all():
+        for competency_id, value in process_values[row.iso_process_id].items():
+            level = recompute.COMPETENCY_LEVEL_MAP.get(row.role_process_value * value, -100)
+            key = (row.organization_id, row.role_cluster_id, competency_id)
+            expected[key] = max(expected.get(key, level), level)
+    return expected
+
+
+def stored():
+    return {
+        (r.organization_id, r.role_cluster_id, r.competency_id): r.role_competency_value
+        for r in RoleCompetencyMatrix.query.all()
+    }
+
+
+class TestCompetencyRecompute:
+
+    def test_initial_recompute_matches_full_rebuild(self, app_ctx):
+        assert stored() == full_rebuild()
+        assert stored()[(1, 10, 1)] == 2  # max(2*1, 1*2)
+        assert stored()[(2, 20, 2)] == 1  # max(4*2 -> invalid, 1*1)
+
+    def test_column_edit_upserts_and_recomputes_only_that_competency(self, app_ctx):
+        untouched = {k: v for k, v in stored().items() if k[2] == 2}
+
+        counts = recompute.update_process_competency_column(1, {'1': 3, '3': 1, '4': 2})
+        db.session.commit()
+
+        values = {
+            r.iso_process_id: r.process_competency_value
+            for r in ProcessCompetencyMatrix.query.filter_by(competency_id=1)
+        }
+        assert values == {1: 3, 2: 2, 3: 1, 4: 2}
+        assert ProcessCompetencyMatrix.query.count() == 6
+
+        assert stored() == full_rebuild()
+        assert {k: v for k, v in stored().items() if k[2] == 2} == untouched
+        assert counts == {
+            'process_rows': 3, 'role_competency_rows': 3,
+            'unknown_role_competency_rows': 1, 'organizations': 2
+        }
+        # Role requirements of both organizations changed
+        assert sorted((r.organization_id, r.revision) for r in OrganizationInputRevision.query) == [(1, 1), (2, 1)]
+
+    def test_unknown_role_matrix_follows_edit(self, app_ctx):
+        def alice(competency_id):
+            return UnknownRoleCompetencyMatrix.query.filter_by(
+                user_name='alice', competency_id=competency_id
+            ).one().role_competency_value
+
+        # max(1*1, 2*2, 4*0) = 4
+        assert alice(1) == 4
+        recompute.update_process_competency_column(1, {1: 0, 2: 1, 3: 1})
+        db.session.commit()
+        assert alice(1) == 4  # max(1*0, 2*1, 4*1)
+        recompute.update_process_competency_column(1, {3: 0})
+        db.session.commit()
+        assert alice(1) == 2  # max(1*0, 2*1, 4*0)
+        assert alice(2) == 4  # max(1*2, 4*1)
+
+    def test_column_edit_invalidates_every_affected_organization(self, app_ctx):
+        # Organization 3 only has a task-based user
+        db.session.add(UnknownRoleProcessMatrix(
+            organization_id=3, user_name='bob', iso_process_id=2, role_process_value=1
+        ))
+        recompute.recompute_unknown_role_competency_for_competency(1)
+        db.session.commit()
+
+        with patch.object(recompute, 'invalidate_role_matrix') as invalidate:
+            recompute.update_process_competency_column(1, {2: 1})
+            db.session.commit()
+
+        invalidate.assert_called_once_with()
+        assert sorted((r.organization_id, r.revision) for r in OrganizationInputRevision.query) == [
+            (1, 1), (2, 1), (3, 1)
+        ]
+
+
+class TestRoleDeltaRecompute:
+
+    def test_unchanged_matrix_touches_nothing(self, app_ctx):
+        assert recompute.recompute_role_competencies(1) == 0
+        assert recompute.upsert_role_process_values(1, 10, {'1': 2, '2': 1}) == []
+
+    def test_cell_edit_rewrites_only_affected_rows(self, app_ctx):
+        other_org = {k: v for k, v in stored().items() if k[0] == 2}
+
+        # Process 3 only feeds competency 1 (value 0) and 2 (value 1)
+        changed = recompute.upsert_role_process_values(1, 10, {'1': 2, '3': 2})
+        assert changed == [3]
+        touched = recompute.recompute_role_competencies(1, role_ids=[10], process_ids=changed)
+        db.session.commit()
+
+        assert stored() == full_rebuild()
+        assert stored()[(1, 10, 2)] == 4  # max(2*2, 2*1) - was 4 through process 1 already
+        assert touched == 0
+        assert {k: v for k, v in stored().items() if k[0] == 2} == other_org
+
+        changed = recompute.upsert_role_process_values(1, 10, {1: 1})
+        touched = recompute.recompute_role_competencies(1, role_ids=[10], process_ids=changed)
+        db.session.commit()
+
+        assert stored() == full_rebuild()
+        assert stored()[(1, 10, 2)] == 2  # max(1*2, 2*1)
+        assert touched == 1  # competency 1 stays max(1*1, 1*2) = 2
+
+    def test_removed_source_deletes_row_and_new_role_is_inserted(self, app_ctx):
+        RoleProcessMatrix.query.filter_by(organization_id=1, role_cluster_id=11).delete()
+        db.session.add(RoleProcessMatrix(organization_id=1, role_cluster_id=12, iso_process_id=1, role_process_value=1))
+        db.session.flush()
+
+        touched = recompute.recompute_role_competencies(1)
+        db.session.commit()
+
+        assert stored() == full_rebuild()
+        assert not any(k[1] == 11 for k in stored())
+        assert touched == 4  # 2 deleted for role 11, 2 inserted for role 12
@@ -0,0 +1,143 @@
+"""
+Unit Tests for Document Ingestion
+=================================
+
+Tests for document_ingestion.py: token-budget chunking, merging of per-chunk
+role / PMT results and the chunked, cached extract_from_document() with a
+fake extraction function and an in-memory SQLite fragment cache.
+"""
+
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from models import LLMResponseCache
+from app.services import document_ingestion as ingestion
+from app.services.llm_response_cache import FragmentCache
+
+SETTINGS = {'chunk_tokens': 14, 'max_chunks': 40, 'max_workers': 4, 'cache_enabled': True}
+
+
+def word_count(text):
+    return len(text.split())
+
+
+@pytest.fixture
+def app_ctx(sqlite_app):
+    sqlite_app([LLMResponseCache])
+    cache = FragmentCache(memory_entries=10, ttl_hours=1, max_entries=100)
+    with patch.object(ingestion, 'get_fragment_cache', return_value=cache), \
+            patch.object(ingestion, 'count_tokens', word_count):
+        yield cache
+
+
+class TestChunking:
+
+    @staticmethod
+    def chunks(pieces, max_tokens):
+        return list(ingestion.iter_chunks(pieces, max_tokens, token_counter=word_count))
+
+    def test_pieces_packed_in_order_within_budget(self):
+        pieces = ['one two three', 'four five', '', 'six seven eight nine', 'ten']
+        assert self.chunks(pieces, 6) == ['one two three\nfour five', 'six seven eight nine\nten']
+
+    def test_oversized_piece_is_split(self):
+        piece = ' '.join(f'w{i}' for i in range(12))
+        chunks = self.chunks(['intro', piece], 5)
+        assert all(word_count(chunk) <= 5 for chunk in chunks)
+        assert ' '.join(chunks).split() == ['intro'] + piece.split()
+
+    def test_txt_is_read_whole(self):
+        assert list(ingestion.iter_document_text(b'hello\nworld', 'Notes.TXT')) == ['hello\nworld']
+
+    def test_unsupported_extension(self):
+        with pytest.raises(ingestion.DocumentIngestionError) as excinfo:
+            list(ingestion.iter_document_text(b'x', 'roles.xlsx'))
+        assert excinfo.value.status_code == 400
+
+
+class TestMerging:
+
+    def test_roles_deduplicated_by_title(self):
+        merged = ingestion.merge_roles([
+            [{'title': 'Systems Engineer', 'description': 'Short', 'responsibilities': ['Specify'], 'skills': ['SysML']},
+             {'title': 'Tester', 'description': 'Tests'}],
+            [{'title': ' systems  engineer', 'description': 'Owns the system architecture',
+              'responsibilities': ['specify', 'Integrate'], 'skills': ['DOORS']}],
+        ])
+
+        assert [r['title'] for r in merged] == ['Systems Engineer', 'Tester']
+        assert merged[0]['description'] == 'Owns the system architecture'
+        assert merged[0]['responsibilities'] == ['Specify', 'Integrate']
+        assert merged[0]['skills'] == ['SysML', 'DOORS']
+
+    def test_pmt_merged_by_category(self):
+        merged = ingestion.merge_pmt([
+            {'document_type': 'tool', 'document_summary': 'Tools.',
+             'tools': [{'name': 'JIRA', 'description': 'Tracking', 'confidence': 'medium'}],
+             'suggested_text': {'processes': '', 'methods': '', 'tools': 'JIRA'}},
+            {'document_type': 'process', 'document_summary': 'Processes.',
+             'processes': [{'name': 'V-model', 'description': 'Lifecycle', 'confidence': 'high'}],
+             'tools': [{'name': 'jira', 'description': 'Issue tracking', 'confidence': 'high'}],
+             'suggested_text': {'processes': 'V-model', 'methods': '', 'tools': 'JIRA'}},
+        ])
+
+        assert merged['document_type'] == 'mixed'
+        assert merged['document_summary'] == 'Tools. Processes.'
+        assert merged['tools'] == [{'name': 'JIRA', 'description': 'Issue tracking', 'confidence': 'high'}]
+        assert [p['name'] for p in merged['processes']] == ['V-model']
+        assert merged['methods'] == []
+        assert merged['suggested_text'] == {'processes': 'V-model', 'methods': '', 'tools': 'JIRA'}
+
+    def test_single_chunk_pmt_unchanged(self):
+        result = {'document_type': 'tool', 'tools': []}
+        assert ingestion.merge_pmt([result]) is result
+
+
+class TestExtractFromDocument:
+
+    DOCUMENT = '\n'.join(f'Role {i} is responsible for engineering tasks' for i in range(6)).encode()
+
+    def extract(self, extract_chunk, data=None):
+        return ingestion.extract_from_document(
+            data or self.DOCUMENT, 'roles.txt', extract_chunk, ingestion.merge_roles,
+            'document_roles', 'test-v1', settings=SETTINGS
+        )
+
+    def test_chunks_extracted_concurrently_and_cached_by_content(self, app_ctx):
+        barrier = threading.Barrier(3, timeout=5)
+        calls = []
+
+        def extract_chunk(chunk):
+            calls.append(chunk)
+            barrier.wait()
+            return [{'title': line.split(' is ')[0]} for line in chunk.splitlines()] + [{'title': 'Lead'}]
+
+        first = self.extract(extract_chunk)
+
+        assert first['chunks'] == 3 and first['failed_chunks'] == 0
+        assert first['cached'] is False
+        assert [r['title'] for r in first['result']] == ['Role 0', 'Role 1', 'Lead', 'Role 2', 'Role 3', 'Role 4', 'Role 5']
+
+        second = self.extract(lambda chunk: pytest.fail('cached document re-extracted'))
+        assert second['cached'] is True
+        assert second['result'] == first['result']
+        assert second['sha256'] == first['sha256']
+        assert app_ctx.stats()['memory_hits'] == 1
+
+    def test_failed_chunk_keeps_others_and_is_not_cached(self, app_ctx):
+        def extract_chunk(chunk):
+            if 'Role 2' in chunk:
+                raise ValueError('bad JSON')
+            return [{'title': 'Lead'}]
+
+        result = self.extract(extract_chunk)
+
+        assert result['failed_chunks'] == 1 and result['chunks'] == 3
+        assert result['result'] == [{'title': 'Lead'}]
+        assert LLMResponseCache.query.count() == 0
+
+    def test_short_document_rejected_before_extraction(self, app_ctx):
+        with pytest.raises(ingestion.DocumentIngestionError, match='empty or too short'):
+            self.extract(lambda chunk: pytest.fail('extracted a short document'), data=b'Too short')
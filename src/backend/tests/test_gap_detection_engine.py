@@ -0,0 +1,118 @@
+"""
+Unit Tests for the Set-based Gap Detection Engine
+=================================================
+
+Checks that OrgScoreSnapshot + compute_gaps_by_competency() produce exactly
+the same structures as the per-competency helpers in learning_objectives_core
+(process_competency_with_roles / process_competency_organizational).
+
+Runs against an in-memory SQLite database seeded with random assessments.
+"""
+
+import json
+import random
+from datetime import datetime
+
+import pytest
+
+from models import (
+    db, Organization, User, Competency, OrganizationRoles, UserAssessment,
+    UserCompetencySurveyResult, UserRoleCluster, RoleCompetencyMatrix,
+    LatestUserCompetencyScore
+)
+from app.services import learning_objectives_core as core
+from app.services.latest_scores import rebuild_latest_scores
+from app.services.gap_detection_engine import (
+    OrgScoreSnapshot, compute_gaps_by_competency, compute_ttt_counts
+)
+
+TABLES = (
+    Organization, User, Competency, OrganizationRoles, UserAssessment,
+    UserCompetencySurveyResult, UserRoleCluster, RoleCompetencyMatrix,
+    LatestUserCompetencyScore
+)
+LEVELS = [0, 1, 2, 4, 6]
+
+
+@pytest.fixture
+def app_ctx(sqlite_app):
+    sqlite_app(TABLES)
+
+
+def seed_org(seed: int, with_roles: bool = True):
+    rng = random.Random(seed)
+    for comp_id in range(1, 17):
+        db.session.add(Competency(id=comp_id, competency_name=f"Competency {comp_id}"))
+    db.session.add(Organization(id=1, organization_name='Org', organization_public_key='ORG'))
+    for role_id in range(1, 6):
+        db.session.add(OrganizationRoles(id=role_id, organization_id=1, role_name=f"Role {role_id}"))
+
+    assessment_id = 0
+    for user_id in range(1, 40):
+        for _ in range(rng.randint(0, 2)):
+            assessment_id += 1
+            db.session.add(UserAssessment(
+                id=assessment_id, user_id=user_id, organization_id=1,
+                assessment_type='role_based',
+                completed_at=datetime.utcnow() if rng.random() < 0.9 else None
+            ))
+            for comp_id in range(1, 17):
+                if rng.random() < 0.9:
+                    db.session.add(UserCompetencySurveyResult(
+                        user_id=user_id, organization_id=1, competency_id=comp_id,
+                        score=rng.choice(LEVELS), assessment_id=assessment_id
+                    ))
+        if with_roles:
+            for role_id in rng.sample(range(1, 6), rng.randint(0, 2)):
+                db.session.add(UserRoleCluster(user_id=user_id, role_cluster_id=role_id))
+
+    for role_id in range(1, 6):
+        for comp_id in range(1, 17):
+            db.session.add(RoleCompetencyMatrix(
+                role_cluster_id=role_id, competency_id=comp_id, organization_id=1,
+                role_competency_value=rng.choice(LEVELS)
+            ))
+    rebuild_latest_scores()
+    db.session.commit()
+    return {comp_id: rng.choice(LEVELS) for comp_id in range(1, 17)}
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_role_based_matches_per_competency_path(app_ctx, seed):
+    targets = seed_org(seed, with_roles=True)
+    snapshot = OrgScoreSnapshot.load(1)
+    assert snapshot.has_roles
+
+    expected = {c: core.process_competency_with_roles(1, c, targets[c]) for c in range(1, 17)}
+    assert json.dumps(compute_gaps_by_competency(snapshot, targets)) == json.dumps(expected)
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_organizational_matches_per_competency_path(app_ctx, seed):
+    targets = seed_org(seed, with_roles=False)
+    snapshot = OrgScoreSnapshot.load(1)
+    assert not snapshot.has_roles
+
+    expected = {c: core.process_competency_organizational(1, c, targets[c]) for c in range(1, 17)}
+    assert json.dumps(compute_gaps_by_competency(snapshot, targets)) == json.dumps(expected)
+
+
+def test_ttt_counts_match_organizational_scores(app_ctx):
+    seed_org(3)
+    counts = compute_ttt_counts(OrgScoreSnapshot.load(1))
+
+    for comp_id in range(1, 17):
+        scores = core.get_all_user_scores_for_competency(1, comp_id)
+        assert counts[comp_id] == {
+            'total_users': len(scores),
+            'users_needing': len([s for s in scores if s < 6])
+        }
+
+
+def test_role_requirements_match_point_queries(app_ctx):
+    seed_org(4)
+    snapshot = OrgScoreSnapshot.load(1)
+
+    for i, role in enumerate(snapshot.roles):
+        for j, comp_id in enumerate(snapshot.competency_ids):
+            assert snapshot.role_requirements[i, j] == core.get_role_competency_requirement(role.id, comp_id)
@@ -0,0 +1,65 @@
+"""
+Unit Tests for the Organization Input Revision
+==============================================
+
+Tests for bump_input_revision() / get_input_revision() and their use in
+learning_objectives_core.compute_input_hash() against an in-memory SQLite
+database.
+"""
+
+import pytest
+
+from models import db, OrganizationInputRevision
+from app.services.input_revision import bump_input_revision, get_input_revision
+from app.services.learning_objectives_core import compute_input_hash
+
+
+@pytest.fixture
+def app_ctx(sqlite_app):
+    sqlite_app([OrganizationInputRevision])
+
+
+STRATEGIES = [{'strategy_id': 2, 'strategy_name': 'SE for Managers'}]
+
+
+class TestInputRevision:
+
+    def test_unknown_org_is_revision_zero(self, app_ctx):
+        assert get_input_revision(7) == 0
+
+    def test_bump_creates_then_increments(self, app_ctx):
+        bump_input_revision(7, 'assessment_submit')
+        db.session.commit()
+        bump_input_revision(7, 'roles_save')
+        db.session.commit()
+
+        row = OrganizationInputRevision.query.get(7)
+        assert row.revision == 2
+        assert row.last_reason == 'roles_save'
+        assert get_input_revision(8) == 0
+
+    def test_rollback_discards_bump(self, app_ctx):
+        bump_input_revision(7, 'assessment_submit')
+        db.session.commit()
+        bump_input_revision(7, 'assessment_submit')
+        db.session.rollback()
+
+        assert get_input_revision(7) == 1
+
+
+class TestComputeInputHash:
+
+    def test_hash_stable_without_changes(self, app_ctx):
+        assert compute_input_hash(7, STRATEGIES, None) == compute_input_hash(7, STRATEGIES, None)
+
+    def test_bump_invalidates_hash(self, app_ctx):
+        before = compute_input_hash(7, STRATEGIES, None)
+        bump_input_revision(7, 'assessment_submit')
+        db.session.commit()
+
+        assert compute_input_hash(7, STRATEGIES, None) != before
+
+    def test_strategies_and_pmt_still_part_of_hash(self, app_ctx):
+        base = compute_input_hash(7, STRATEGIES, {'tools': 'DOORS'})
+        assert compute_input_hash(7, [], {'tools': 'DOORS'}) != base
+        assert compute_input_hash(7, STRATEGIES, {'tools': 'JIRA'}) != base
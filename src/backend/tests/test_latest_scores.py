@@ -0,0 +1,126 @@
+"""
+Unit Tests for the Materialized Latest Scores
+=============================================
+
+Tests for latest_scores.py against an in-memory SQLite database: the
+materialized rows must match the "latest completed assessment per user"
+subquery they replace, and refresh_latest_scores() must follow retakes.
+"""
+
+import random
+from datetime import datetime
+
+import pytest
+from sqlalchemy import func
+
+from models import (
+    db, Organization, User, Competency, UserAssessment,
+    UserCompetencySurveyResult, LatestUserCompetencyScore
+)
+from app.services.latest_scores import (
+    org_score_rows, rebuild_latest_scores, refresh_latest_scores, user_score_rows
+)
+
+TABLES = (Organization, User, Competency, UserAssessment, UserCompetencySurveyResult, LatestUserCompetencyScore)
+LEVELS = [0, 1, 2, 4, 6]
+
+
+@pytest.fixture
+def app_ctx(sqlite_app):
+    sqlite_app(TABLES)
+    for comp_id in range(1, 5):
+        db.session.add(Competency(id=comp_id, competency_name=f"Competency {comp_id}"))
+    for org_id in (1, 2):
+        db.session.add(Organization(id=org_id, organization_name=f'Org {org_id}', organization_public_key=f'ORG{org_id}'))
+    db.session.commit()
+
+
+def submit(assessment_id, user_id, org_id, scores, completed=True):
+    db.session.add(UserAssessment(
+        id=assessment_id, user_id=user_id, organization_id=org_id, assessment_type='role_based',
+        completed_at=datetime.utcnow() if completed else None
+    ))
+    for comp_id, score in scores.items():
+        db.session.add(UserCompetencySurveyResult(
+            user_id=user_id, organization_id=org_id, competency_id=comp_id,
+            score=score, assessment_id=assessment_id
+        ))
+    refresh_latest_scores(org_id, user_id)
+    db.session.commit()
+
+
+def subquery_scores(org_id, competency_id):
+    """The per-competency query latest_user_competency_score replaces"""
+    latest = db.session.query(
+        UserAssessment.user_id,
+        func.max(UserAssessment.id).label('latest_assessment_id')
+    ).filter(
+        UserAssessment.organization_id == org_id,
+        UserAssessment.completed_at.isnot(None)
+    ).group_by(UserAssessment.user_id).subquery()
+
+    rows = db.session.query(UserCompetencySurveyResult).join(
+        latest,
+        db.and_(
+            UserCompetencySurveyResult.user_id == latest.c.user_id,
+            UserCompetencySurveyResult.assessment_id == latest.c.latest_assessment_id
+        )
+    ).filter(
+        UserCompetencySurveyResult.organization_id == org_id,
+        UserCompetencySurveyResult.competency_id == competency_id
+    ).all()
+    return sorted((r.user_id, r.score) for r in rows)
+
+
+def test_retake_replaces_scores(app_ctx):
+    submit(1, user_id=10, org_id=1, scores={1: 2, 2: 4, 3: 1})
+    submit(2, user_id=10, org_id=1, scores={1: 6, 2: 4})
+
+    rows = sorted(org_score_rows(1))
+    assert [tuple(r) for r in rows] == [(10, 1, 6), (10, 2, 4)]
+    assert [tuple(r) for r in org_score_rows(1, competency_id=1)] == [(10, 1, 6)]
+
+
+def test_incomplete_assessment_is_ignored(app_ctx):
+    submit(1, user_id=10, org_id=1, scores={1: 2})
+    submit(2, user_id=10, org_id=1, scores={1: 6}, completed=False)
+    assert [tuple(r) for r in org_score_rows(1)] == [(10, 1, 2)]
+
+
+def test_user_rows_use_latest_assessment_across_organizations(app_ctx):
+    submit(1, user_id=10, org_id=2, scores={1: 1, 2: 1})
+    submit(2, user_id=10, org_id=1, scores={1: 4})
+    submit(3, user_id=11, org_id=2, scores={2: 6})
+
+    rows = sorted(tuple(r) for r in user_score_rows([10, 11]))
+    assert rows == [(10, 1, 4), (11, 2, 6)]
+    assert user_score_rows([]) == []
+    # Organization scope keeps each organization's own latest assessment
+    assert sorted(tuple(r) for r in org_score_rows(2)) == [(10, 1, 1), (10, 2, 1), (11, 2, 6)]
+
+
+def test_rebuild_matches_latest_assessment_subquery(app_ctx):
+    rng = random.Random(7)
+    assessment_id = 0
+    for user_id in range(1, 30):
+        for _ in range(rng.randint(0, 3)):
+            assessment_id += 1
+            db.session.add(UserAssessment(
+                id=assessment_id, user_id=user_id, organization_id=1, assessment_type='role_based',
+                completed_at=datetime.utcnow() if rng.random() < 0.8 else None
+            ))
+            for comp_id in range(1, 5):
+                if rng.random() < 0.8:
+                    db.session.add(UserCompetencySurveyResult(
+                        user_id=user_id, organization_id=1, competency_id=comp_id,
+                        score=rng.choice(LEVELS), assessment_id=assessment_id
+                    ))
+    db.session.commit()
+
+    written = rebuild_latest_scores(1)
+    db.session.commit()
+
+    assert written == LatestUserCompetencyScore.query.count()
+    for comp_id in range(1, 5):
+        materialized = sorted((r.user_id, r.score) for r in org_score_rows(1, comp_id))
+        assert materialized == subquery_scores(1, comp_id)
@@ -0,0 +1,114 @@
+"""
+Unit Tests for the Lazy Resource Registry
+=========================================
+
+Tests for lazy_resources.py: resources load once on first use (also under
+concurrent access), preloading reports failures instead of raising and never
+creates fork-unsafe resources (clients) in the pre-fork master, and building
+the Derik integration no longer imports the pipeline stack.
+"""
+
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+from app.services.lazy_resources import ResourceRegistry, format_startup_report, measure_import, startup_report
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+def test_resource_loaded_once_on_first_use():
+    registry = ResourceRegistry()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.02)
+        return 'x-y'
+
+    resource = registry.register('splitter', loader)
+    assert not resource.loaded and calls == []
+
+    threads = [threading.Thread(target=resource.get) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert resource.split('-') == ['x', 'y']  # attribute access is forwarded
+    assert registry.register('splitter', lambda: 'other') is resource
+    assert registry.report() == [{
+        'name': 'splitter', 'subsystem': 'splitter', 'loaded': True,
+        'load_seconds': resource.load_seconds, 'error': None
+    }]
+
+
+def test_preload_reports_failures_and_retries_later():
+    registry = ResourceRegistry()
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise OSError('index missing')
+        return {'index': True}
+
+    registry.register('index', flaky, 'faiss')
+    registry.register('encoder', lambda: 'enc', 'tiktoken')
+
+    results = registry.preload(['index', 'encoder', 'unknown'])
+
+    assert results == {'index': 'OSError: index missing', 'encoder': None, 'unknown': 'not registered'}
+    assert registry.report()[0]['error'] == 'OSError: index missing'
+    assert registry.resource('index').get() == {'index': True}
+    assert registry.report()[0]['error'] is None
+
+
+def test_preload_skips_fork_unsafe_resources():
+    registry = ResourceRegistry()
+    registry.register('index', lambda: 'mmap', 'vector_index')
+    client = registry.register('client', lambda: 'http-client', 'embeddings', fork_safe=False)
+
+    assert registry.preload() == {'index': None}
+    assert registry.preload(['client']) == {'client': 'not fork-safe (created after fork)'}
+    assert not client.loaded
+    assert client.get() == 'http-client'  # created on first use in the worker
+
+
+def test_configured_preload_holds_no_clients():
+    from app.services.config_loader import get_resource_loading_settings
+    from app.services.lazy_resources import get_registry
+    from app.services.llm_pipeline import resources  # noqa: F401 (registers the pipeline resources)
+
+    registry = get_registry()
+    for name in get_resource_loading_settings()['preload']:
+        if name in registry.names():
+            assert registry.resource(name).fork_safe, name
+    assert not registry.resource('embedding_provider').fork_safe
+
+
+def test_import_cost_in_startup_report():
+    with measure_import('test-subsystem'):
+        import json  # noqa: F401  (already imported - counts 0 modules)
+
+    entry = next(e for e in startup_report()['imports'] if e['subsystem'] == 'test-subsystem')
+    assert entry['modules'] == 0 and entry['seconds'] >= 0
+    assert '- test-subsystem:' in format_startup_report()
+
+
+def test_derik_integration_import_defers_pipeline_stack():
+    code = (
+        "import sys\n"
+        "import app.derik_integration as derik\n"
+        "heavy = [m for m in ('langchain', 'langchain_openai', 'langchain_community', 'tiktoken', 'faiss',"
+        " 'app.services.llm_pipeline.llm_process_identification_pipeline') if m in sys.modules]\n"
+        "print('HEAVY', heavy)\n"
+    )
+    output = subprocess.run(
+        [sys.executable, '-c', code], cwd=BACKEND_DIR, capture_output=True, text=True, timeout=120
+    )
+    assert output.returncode == 0, output.stderr
+    assert 'HEAVY []' in output.stdout
@@ -0,0 +1,116 @@
+"""
+Unit Tests for the Learning Objective Template Registry
+=======================================================
+
+Tests for learning_objective_templates.py and the template lookups of
+learning_objectives_text_generator.py / learning_objectives_core.py that use it.
+"""
+
+import json
+import os
+
+import pytest
+
+from app.services import learning_objective_templates as registry_module
+from app.services import learning_objectives_text_generator as text_generator
+from app.services import learning_objectives_core as core
+
+TEMPLATES = {
+    'learningObjectiveTemplates': {
+        'Systems Thinking': {'1': 'Knows systems.', '2': 'Understands systems.'},
+        'Requirements Definition': {
+            '4': {
+                'unified': 'Is able to define requirements.',
+                'pmt_breakdown': {'process': 'Follow the process.', 'tool': 'Use a tool.'}
+            }
+        }
+    },
+    'archetypeCompetencyTargetLevels': {
+        'SE for managers': {'Systems Thinking': 4}
+    }
+}
+
+
+@pytest.fixture
+def template_file(tmp_path, monkeypatch):
+    path = tmp_path / 'templates.json'
+    path.write_text(json.dumps(TEMPLATES), encoding='utf-8')
+    monkeypatch.setattr(registry_module, 'TEMPLATE_PATH', path)
+    registry_module.reset_template_registry()
+    yield path
+    registry_module.reset_template_registry()
+
+
+def rewrite(path, data, mtime_offset):
+    path.write_text(json.dumps(data), encoding='utf-8')
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + mtime_offset))
+    # Skip the reload check interval
+    registry_module._next_check = 0.0
+
+
+class TestTemplateRegistry:
+
+    def test_file_is_parsed_once(self, template_file, monkeypatch):
+        loads = []
+        original = registry_module._load_registry
+        monkeypatch.setattr(registry_module, '_load_registry', lambda p: loads.append(p) or original(p))
+
+        for _ in range(3):
+            assert text_generator.get_template_objective(1, 2) == 'Understands systems.'
+            text_generator.get_template_objective_full(14, 4)
+
+        assert len(loads) == 1
+
+    def test_lookups_match_previous_format(self, template_file):
+        assert text_generator.get_template_objective(14, 4) == 'Is able to define requirements.'
+        assert text_generator.get_template_objective(1, 6) == '[Template missing for Systems Thinking level 6]'
+        assert text_generator.get_template_objective(99, 1) == '[Template missing - unknown competency ID: 99]'
+
+        full = text_generator.get_template_objective_full(14, 4)
+        assert full == {
+            'objective_text': 'Is able to define requirements.',
+            'has_pmt': True,
+            'pmt_breakdown': {'process': 'Follow the process.', 'tool': 'Use a tool.'}
+        }
+        assert text_generator.get_template_objective_full(1, 1)['has_pmt'] is False
+
+        templates = core.load_learning_objective_templates()
+        assert core.get_template_objective(templates, 'Systems Thinking', 1) == 'Knows systems.'
+        assert core.get_template_objective(templates, 'Unknown', 1) is None
+        assert core.get_template_objective_with_pmt(templates, 'Requirements Definition', 4) == full
+
+    def test_returned_breakdown_does_not_leak_into_registry(self, template_file):
+        full = text_generator.get_template_objective_full(14, 4)
+        full['pmt_breakdown']['process'] = 'changed'
+        assert text_generator.get_template_objective_full(14, 4)['pmt_breakdown']['process'] == 'Follow the process.'
+
+    def test_archetype_targets_case_insensitive(self, template_file):
+        assert text_generator.get_archetype_targets_for_strategy('SE for Managers') == {'Systems Thinking': 4}
+        assert text_generator.get_archetype_targets_for_strategy('Unknown strategy') == {}
+
+    def test_returned_targets_do_not_leak_into_registry(self, template_file):
+        targets = text_generator.get_archetype_targets_for_strategy('SE for managers')
+        targets['Systems Thinking'] = 6
+        assert text_generator.get_archetype_targets_for_strategy('SE for managers') == {'Systems Thinking': 4}
+        with pytest.raises(TypeError):
+            registry_module.get_template_registry().archetype_targets('SE for managers')['Systems Thinking'] = 6
+
+    def test_reload_on_mtime_change(self, template_file):
+        assert text_generator.get_template_objective(1, 1) == 'Knows systems.'
+
+        changed = json.loads(json.dumps(TEMPLATES))
+        changed['learningObjectiveTemplates']['Systems Thinking']['1'] = 'Knows systems well.'
+        rewrite(template_file, changed, mtime_offset=10)
+
+        assert text_generator.get_template_objective(1, 1) == 'Knows systems well.'
+
+    def test_invalid_reload_keeps_previous_version(self, template_file):
+        registry = registry_module.get_template_registry()
+
+        template_file.write_text('{invalid', encoding='utf-8')
+        stat = os.stat(template_file)
+        os.utime(template_file, (stat.st_atime, stat.st_mtime + 10))
+        registry_module._next_check = 0.0
+
+        assert registry_module.get_template_registry() is registry
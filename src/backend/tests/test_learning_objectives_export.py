@@ -0,0 +1,279 @@
+"""
+Unit Tests for the Learning Objectives Export Artifacts
+=======================================================
+
+Tests for learning_objectives_export.py against an in-memory SQLite
+database: the regular and write-only Excel workbooks are identical, renders
+are reproducible byte for byte, artifacts are stored once per key with
+content-addressed blobs, regenerated objectives drop their exports,
+prerender_exports() renders the configured formats (also on the background
+thread of start_export_prerender()), and the export route serves ETags,
+304 responses and X-Export-Cache, rendering again when the objectives
+change mid-request.
+"""
+
+import io
+import json
+import threading
+import time
+from datetime import datetime
+
+import openpyxl
+import pytest
+
+from models import db, ExportBlob, GeneratedLearningObjectives, LearningObjectivesExport, Organization
+from app.services import learning_objectives_export as export
+from app.services.learning_objectives_core import save_to_cache
+
+ROLES = {'5': {'role_name': 'Developer', 'levels_needed': [1, 2], 'users_needing_training': 3, 'total_users': 4}}
+
+OBJECTIVES = {
+    'success': True,
+    'selected_strategies': [{'strategy_name': 'Common basic understanding'}],
+    'learning_objectives_by_strategy': {
+        '1': {'strategy_name': 'Common basic understanding'},
+        '2': {'strategy_name': 'Train the trainer'}
+    },
+    'strategy_validation': {'status': 'GOOD'},
+    'data': {'main_pyramid': {'levels': {
+        '1': {'competencies': [
+            {'competency_id': 1, 'competency_name': 'Systems Thinking', 'status': 'achieved',
+             'target_level': 2, 'current_level': 2, 'learning_objective': 'Knows X. Knows Y.'},
+            {'competency_id': 2, 'competency_name': 'Communication', 'status': 'training_required',
+             'target_level': 4, 'current_level': 0, 'gap_data': {'roles': ROLES},
+             'learning_objective': {'objective_text': 'Explains A.',
+                                    'has_pmt_breakdown': True, 'pmt_breakdown': {'process': 'P', 'tool': 'T'}}}
+        ]},
+        '4': {'competencies': [
+            {'competency_id': 2, 'competency_name': 'Communication', 'status': 'training_required',
+             'target_level': 2, 'current_level': 0, 'learning_objective': 'Applies B.'}
+        ]}
+    }}}
+}
+
+
+@pytest.fixture
+def app_ctx(sqlite_app):
+    # One shared in-memory database for the prerender thread
+    app = sqlite_app([Organization, GeneratedLearningObjectives, LearningObjectivesExport, ExportBlob], shared=True)
+    db.session.add(Organization(id=1, organization_name='Acme Systems', organization_public_key='acme'))
+    db.session.commit()
+    return app
+
+
+@pytest.fixture
+def client(app_ctx, monkeypatch):
+    # The blueprint module creates OpenAI clients at import time
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+    from app.routes.phase2_learning import phase2_learning_bp
+    app_ctx.register_blueprint(phase2_learning_bp, url_prefix='/api')
+    return app_ctx.test_client()
+
+
+def export_url(export_format, **params):
+    query = ''.join(f'&{name}={value}' for name, value in params.items())
+    return f'/api/phase2/learning-objectives/1/export?format={export_format}{query}'
+
+
+def generate(input_hash='a' * 64, objectives=OBJECTIVES):
+    assert save_to_cache(1, input_hash, 'ROLE_BASED', objectives)
+    return GeneratedLearningObjectives.query.filter_by(organization_id=1).first()
+
+
+def sheet_contents(content):
+    sheet = openpyxl.load_workbook(io.BytesIO(content)).active
+    cells = [
+        (cell.coordinate, cell.value, cell.fill.fgColor.rgb, cell.font.b, cell.border.left.style)
+        for row in sheet.iter_rows() for cell in row
+    ]
+    heights = {r: d.height for r, d in sheet.row_dimensions.items() if d.height}
+    return sheet.title, sorted(map(str, sheet.merged_cells.ranges)), cells, heights
+
+
+def test_write_only_workbook_matches_regular_workbook():
+    regular = sheet_contents(export.render_excel(OBJECTIVES, 'Acme', None, write_only=False))
+    streamed = sheet_contents(export.render_excel(OBJECTIVES, 'Acme', None, write_only=True))
+
+    assert streamed == regular
+    cells = {coordinate: value for coordinate, value, *_ in regular[2]}
+    assert cells['B4'] == 2 and cells['A13'] == 'Systems Thinking'
+    assert cells['B14'].startswith('Roles: Developer (3/4)') and '[TOOL]\nT' in cells['B14']
+    assert cells['D13'] == 'Not Targeted'
+    assert regular[1] == ['A1:D1', 'B3:D3'] and regular[3] == {13: 200, 14: 200}
+
+
+@pytest.mark.parametrize('write_only', [False, True])
+def test_excel_render_is_reproducible(monkeypatch, write_only):
+    generated_at = datetime(2026, 10, 18, 9, 30)
+    first = export.render_excel(OBJECTIVES, 'Acme', generated_at, write_only=write_only)
+    # A day later (zip entries are stamped with time.time() unless fixed)
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now + 86400)
+    second = export.render_excel(OBJECTIVES, 'Acme', generated_at, write_only=write_only)
+
+    assert first == second
+    properties = openpyxl.load_workbook(io.BytesIO(first)).properties
+    assert properties.created == properties.modified == generated_at
+
+
+def test_pdf_render_is_reproducible():
+    pytest.importorskip('reportlab')
+    generated_at = datetime(2026, 10, 18, 9, 30)
+    data = dict(OBJECTIVES, selected_strategies=[{'name': 'Common basic understanding', 'priority': 1}])
+
+    first = export.render_pdf(data, 'Acme', generated_at)
+    time.sleep(1.1)  # CreationDate has second resolution
+    assert export.render_pdf(data, 'Acme', generated_at) == first
+
+
+def test_artifact_stored_once_per_key(app_ctx):
+    cached = generate()
+    options = export.export_options()
+
+    artifact = export.render_export(cached, 'Acme Systems', 'json', options)
+
+    assert export.find_export(1, 'a' * 64, 'json', options, 'Acme Systems').id == artifact.id
+    assert export.find_export(1, 'a' * 64, 'json', export.export_options('Train the trainer'), 'Acme Systems') is None
+    assert json.loads(export.get_export_content(artifact.content_hash)) == OBJECTIVES
+
+    # Rendered again for an existing key (concurrent request) - the stored artifact is kept
+    assert export.render_export(cached, 'Acme Systems', 'json', options).id == artifact.id
+    assert LearningObjectivesExport.query.count() == 1
+
+
+def test_identical_content_shares_blob(app_ctx):
+    without_validation = {k: v for k, v in OBJECTIVES.items() if k != 'strategy_validation'}
+    cached = generate(objectives=without_validation)
+
+    first = export.render_export(cached, 'Acme Systems', 'json', export.export_options())
+    second = export.render_export(cached, 'Acme Systems', 'json', export.export_options(include_validation=False))
+
+    assert first.options_key != second.options_key
+    assert first.content_hash == second.content_hash
+    assert ExportBlob.query.count() == 1
+
+
+def test_renamed_organization_gets_new_artifacts(app_ctx, monkeypatch):
+    monkeypatch.setattr(export, 'get_learning_objectives_export_settings', lambda: {
+        'prerender_enabled': True, 'prerender_formats': ['excel'], 'excel_write_only_min_role_entries': 1000
+    })
+    generate()
+    assert export.prerender_exports(1) == 1
+
+    db.session.get(Organization, 1).organization_name = 'Acme Engineering'
+    db.session.commit()
+
+    options = export.export_options()
+    assert export.find_export(1, 'a' * 64, 'excel', options, 'Acme Engineering') is None
+    assert export.prerender_exports(1) == 1
+    assert export.find_export(1, 'a' * 64, 'excel', options, 'Acme Engineering') is not None
+
+
+def test_filter_options(app_ctx):
+    cached = generate()
+
+    artifact = export.render_export(
+        cached, 'Acme Systems', 'json', export.export_options('Train the trainer', include_validation=False)
+    )
+    data = json.loads(export.get_export_content(artifact.content_hash))
+    assert list(data['learning_objectives_by_strategy']) == ['2']
+    assert 'strategy_validation' not in data
+
+    with pytest.raises(export.StrategyNotFoundError):
+        export.render_export(cached, 'Acme Systems', 'json', export.export_options('Unknown'))
+
+
+def test_regeneration_drops_exports_and_prerender_replaces_them(app_ctx, monkeypatch):
+    monkeypatch.setattr(export, 'get_learning_objectives_export_settings', lambda: {
+        'prerender_enabled': True, 'prerender_formats': ['excel', 'json'], 'excel_write_only_min_role_entries': 1000
+    })
+    generate()
+    assert export.prerender_exports(1) == 2
+    assert export.prerender_exports(1) == 0
+    old_hashes = {a.content_hash for a in LearningObjectivesExport.query.all()}
+
+    generate(input_hash='b' * 64, objectives=dict(OBJECTIVES, selected_strategies=[]))
+    assert LearningObjectivesExport.query.count() == 0
+
+    assert export.prerender_exports(1) == 2
+    artifacts = LearningObjectivesExport.query.all()
+    assert {a.input_hash for a in artifacts} == {'b' * 64}
+    # Blobs of the previous objectives are pruned
+    assert {b.content_hash for b in ExportBlob.query.all()} == {a.content_hash for a in artifacts}
+    assert not old_hashes & {a.content_hash for a in artifacts}
+
+
+def test_start_export_prerender_runs_once_per_organization(app_ctx, client, monkeypatch):
+    monkeypatch.setattr(export, 'get_learning_objectives_export_settings', lambda: {
+        'prerender_enabled': True, 'prerender_formats': ['excel', 'json'], 'excel_write_only_min_role_entries': 1000
+    })
+    generate()
+    release = threading.Event()
+    prerender_exports = export.prerender_exports
+
+    def gated(org_id):
+        release.wait(timeout=10)
+        return prerender_exports(org_id)
+
+    monkeypatch.setattr(export, 'prerender_exports', gated)
+    assert export.start_export_prerender(app_ctx, 1)
+    assert not export.start_export_prerender(app_ctx, 1)  # already running for the organization
+    release.set()
+    for thread in threading.enumerate():
+        if thread.name == 'lo-export-1':
+            thread.join(timeout=10)
+
+    assert LearningObjectivesExport.query.count() == 2
+    assert client.get(export_url('excel')).headers['X-Export-Cache'] == 'hit'
+
+
+def test_route_etag_and_conditional_request(client):
+    generate()
+
+    first = client.get(export_url('excel'))
+    assert first.status_code == 200 and first.headers['X-Export-Cache'] == 'rendered'
+    assert first.headers['Cache-Control'] == 'private, no-cache'
+    assert first.headers['Content-Type'] == export.EXPORT_FORMATS['excel'][0]
+    etag = first.get_etag()[0]
+    assert etag == LearningObjectivesExport.query.one().content_hash
+
+    second = client.get(export_url('excel'))
+    assert second.headers['X-Export-Cache'] == 'hit' and second.data == first.data
+    assert second.get_etag()[0] == etag
+
+    not_modified = client.get(export_url('excel'), headers={'If-None-Match': f'"{etag}"'})
+    assert not_modified.status_code == 304 and not_modified.data == b''
+    assert not_modified.get_etag()[0] == etag
+
+    # Other filter options are a different artifact (the sheet ignores the strategy filter, JSON does not)
+    json_etag = client.get(export_url('json')).get_etag()[0]
+    filtered = client.get(export_url('json', strategy='Train the trainer'), headers={'If-None-Match': f'"{json_etag}"'})
+    assert filtered.status_code == 200 and filtered.headers['X-Export-Cache'] == 'rendered'
+    assert list(json.loads(filtered.data)['learning_objectives_by_strategy']) == ['2']
+
+    assert client.get(export_url('excel', strategy='Unknown')).status_code == 404
+    assert client.get(export_url('csv')).status_code == 400
+
+
+def test_route_renders_again_when_blob_is_gone(client, monkeypatch):
+    generate()
+    stale_hash = client.get(export_url('json')).get_etag()[0]
+
+    get_export_content = export.get_export_content
+    regenerated = []
+
+    def regenerated_after_lookup(content_hash):
+        # Another worker replaces the objectives and prunes the blob between lookup and read
+        if not regenerated:
+            regenerated.append(content_hash)
+            generate(input_hash='b' * 64, objectives=dict(OBJECTIVES, selected_strategies=[]))
+            export.prune_export_blobs()
+        return get_export_content(content_hash)
+
+    monkeypatch.setattr(export, 'get_export_content', regenerated_after_lookup)
+    response = client.get(export_url('json'))
+
+    assert regenerated == [stale_hash]
+    assert response.status_code == 200 and response.headers['X-Export-Cache'] == 'rendered'
+    assert json.loads(response.data)['selected_strategies'] == []
+    assert response.get_etag()[0] != stale_hash
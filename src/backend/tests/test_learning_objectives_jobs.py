@@ -0,0 +1,149 @@
+"""
+Unit Tests for the Learning Objectives Job Queue
+================================================
+
+Tests for submission deduplication, claiming, stale job recovery and job
+execution (learning_objectives_jobs.py) against an in-memory SQLite database.
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from models import db, LearningObjectivesJob
+from app.services import learning_objectives_jobs as jobs
+from app.services import learning_objectives_core as core
+from app.services.generation_progress import (
+    GenerationProgress, current_progress, set_current_progress, reset_current_progress
+)
+
+STRATEGIES = [{'strategy_id': 1, 'strategy_name': 'Continuous support'}]
+
+
+@pytest.fixture
+def app_ctx(sqlite_app):
+    # One shared in-memory database for the heartbeat thread
+    return sqlite_app([LearningObjectivesJob], shared=True)
+
+
+def submit(org_id=1, input_hash='a' * 64, force=False):
+    return jobs.submit_generation_job(org_id, input_hash, STRATEGIES, None, force=force)
+
+
+class TestSubmit:
+
+    def test_active_job_is_deduplicated(self, app_ctx):
+        first, created = submit()
+        second, created_again = submit()
+
+        assert created and not created_again
+        assert second.id == first.id
+        assert LearningObjectivesJob.query.count() == 1
+
+    def test_finished_job_does_not_block_new_one(self, app_ctx):
+        first, _ = submit()
+        first.status = jobs.JOB_COMPLETED
+        db.session.commit()
+
+        second, created = submit()
+        assert created and second.id != first.id
+
+    def test_different_inputs_get_separate_jobs(self, app_ctx):
+        submit(input_hash='a' * 64)
+        submit(input_hash='b' * 64)
+        submit(org_id=2)
+        assert LearningObjectivesJob.query.count() == 3
+
+
+class TestClaim:
+
+    def test_oldest_job_is_claimed_once(self, app_ctx):
+        old, _ = submit(input_hash='a' * 64)
+        new, _ = submit(input_hash='b' * 64)
+        old.created_at = datetime.utcnow() - timedelta(minutes=1)
+        db.session.commit()
+
+        claimed = jobs.claim_next_job('w1')
+        assert claimed.id == old.id
+        assert claimed.status == jobs.JOB_RUNNING
+        assert claimed.worker_id == 'w1' and claimed.attempts == 1
+
+        assert jobs.claim_next_job('w2').id == new.id
+        assert jobs.claim_next_job('w3') is None
+
+    def test_stale_running_job_is_requeued_then_failed(self, app_ctx):
+        submit()
+        job = jobs.claim_next_job('w1')
+        job.heartbeat_at = datetime.utcnow() - timedelta(minutes=10)
+        db.session.commit()
+
+        assert jobs.requeue_stale_jobs(stale_after_seconds=60, max_attempts=2) == 1
+        assert jobs.get_job(job.id).status == jobs.JOB_QUEUED
+
+        job = jobs.claim_next_job('w2')
+        assert job.attempts == 2
+        job.heartbeat_at = datetime.utcnow() - timedelta(minutes=10)
+        db.session.commit()
+
+        jobs.requeue_stale_jobs(stale_after_seconds=60, max_attempts=2)
+        assert jobs.get_job(job.id).status == jobs.JOB_FAILED
+
+
+class TestExecute:
+
+    def test_worker_runs_job_and_records_progress(self, app_ctx):
+        calls = []
+
+        def fake_generate(org_id, selected_strategies, pmt_context=None, force=False, progress=None):
+            calls.append((org_id, selected_strategies, force))
+            progress.start_algorithm(6)
+            progress.add_llm_calls(pending=2, cached=1)
+            progress.llm_call_done()
+            progress.llm_call_done()
+            return {'success': True, 'pathway': 'ROLE_BASED'}
+
+        job, _ = submit(force=True)
+        with patch.object(core, 'generate_complete_learning_objectives', fake_generate):
+            assert jobs.run_worker(worker_id='w1', once=True) == 1
+
+        job = jobs.get_job(job.id)
+        assert calls == [(1, STRATEGIES, True)]
+        assert job.status == jobs.JOB_COMPLETED
+        assert job.pathway == 'ROLE_BASED'
+        assert job.progress['algorithm'] == 6
+        assert job.progress['llm_calls_completed'] == 2
+        assert job.progress['llm_calls_cached'] == 1
+        assert job.finished_at is not None
+
+    def test_failed_generation_marks_job_failed(self, app_ctx):
+        def failing_generate(**kwargs):
+            raise ValueError('No assessment data')
+
+        job, _ = submit()
+        with patch.object(core, 'generate_complete_learning_objectives', failing_generate):
+            jobs.run_worker(worker_id='w1', once=True)
+
+        job = jobs.get_job(job.id)
+        assert job.status == jobs.JOB_FAILED
+        assert job.error == 'No assessment data'
+
+
+class TestProgressReporting:
+
+    def test_llm_calls_are_counted_in_active_progress(self):
+        progress = GenerationProgress()
+        token = set_current_progress(progress)
+        try:
+            with patch.object(core, 'get_fragment_cache', return_value=None):
+                core.run_cached_customizations(
+                    'pmt_breakdown', 'v1', lambda *a: {'process': 'x'},
+                    [('Communication', level, {}, {}) for level in (1, 2, 4)]
+                )
+        finally:
+            reset_current_progress(token)
+
+        snapshot = progress.snapshot()
+        assert snapshot['llm_calls_total'] == 3
+        assert snapshot['llm_calls_completed'] == 3
+        assert current_progress() is None
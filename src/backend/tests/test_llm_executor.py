@@ -0,0 +1,87 @@
+"""
+Unit Tests for the LLM Executor
+===============================
+
+Tests for run_ordered() (bounded concurrency, deterministic order) and
+TokenBucket (rate limiting / 429 penalty).
+"""
+
+import threading
+import time
+
+from app.services.llm_executor import TokenBucket, run_ordered
+
+
+class TestRunOrdered:
+    """Test suite for run_ordered()"""
+
+    def test_results_follow_input_order(self):
+        """Later jobs finishing first must not reorder results"""
+
+        def slow_echo(value, delay):
+            time.sleep(delay)
+            return value
+
+        jobs = [(i, 0.05 * (5 - i)) for i in range(5)]
+        results = run_ordered(slow_echo, jobs, max_workers=5)
+
+        assert [value for value, _ in results] == [0, 1, 2, 3, 4]
+        assert all(error is None for _, error in results)
+
+    def test_concurrency_cap(self):
+        """Never more than max_workers calls in flight"""
+        lock = threading.Lock()
+        state = {'active': 0, 'peak': 0}
+
+        def tracked(_):
+            with lock:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+            time.sleep(0.02)
+            with lock:
+                state['active'] -= 1
+
+        run_ordered(tracked, [(i,) for i in range(12)], max_workers=3)
+
+        assert state['peak'] <= 3
+
+    def test_errors_are_isolated(self):
+        """A failing call is reported in its slot, other calls still succeed"""
+
+        def maybe_fail(value):
+            if value == 1:
+                raise ValueError('boom')
+            return value * 10
+
+        results = run_ordered(maybe_fail, [(0,), (1,), (2,)], max_workers=2)
+
+        assert results[0] == (0, None)
+        assert results[1][0] is None and isinstance(results[1][1], ValueError)
+        assert results[2] == (20, None)
+
+    def test_empty_jobs(self):
+        assert run_ordered(lambda: None, []) == []
+
+
+class TestTokenBucket:
+    """Test suite for TokenBucket"""
+
+    def test_burst_then_throttle(self):
+        bucket = TokenBucket(rate=20, capacity=2)
+
+        start = time.monotonic()
+        for _ in range(4):
+            bucket.acquire()
+        elapsed = time.monotonic() - start
+
+        # 2 tokens immediately, 2 more at 20/s
+        assert elapsed >= 0.08
+
+    def test_penalize_pauses_refill(self):
+        bucket = TokenBucket(rate=100, capacity=5)
+        bucket.penalize(0.1)
+
+        start = time.monotonic()
+        bucket.acquire()
+
+        assert time.monotonic() - start >= 0.09
@@ -0,0 +1,181 @@
+"""
+Unit Tests for the LLM Response (Fragment) Cache
+================================================
+
+Tests for compute_fragment_key(), FragmentCache and
+learning_objectives_core.run_cached_customizations() against an in-memory
+SQLite database.
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from models import db, LLMResponseCache
+from app.services import llm_response_cache
+from app.services.llm_response_cache import FragmentCache, compute_fragment_key
+from app.services import learning_objectives_core as core
+
+
+@pytest.fixture
+def app_ctx(sqlite_app):
+    sqlite_app([LLMResponseCache])
+
+
+def entry(response):
+    return {'namespace': 'pmt_breakdown', 'model': 'm', 'prompt_version': 'v1', 'response': response}
+
+
+class TestFragmentKey:
+
+    def test_key_is_order_independent(self):
+        a = compute_fragment_key('ns', 'm', 'v1', {'a': 1, 'b': 2})
+        b = compute_fragment_key('ns', 'm', 'v1', {'b': 2, 'a': 1})
+        assert a == b and len(a) == 64
+
+    def test_model_and_prompt_version_are_part_of_key(self):
+        base = compute_fragment_key('ns', 'm', 'v1', {'a': 1})
+        assert compute_fragment_key('ns', 'other', 'v1', {'a': 1}) != base
+        assert compute_fragment_key('ns', 'm', 'v2', {'a': 1}) != base
+
+
+class TestFragmentCache:
+
+    def test_store_and_hit_across_processes(self, app_ctx):
+        cache = FragmentCache(memory_entries=10, ttl_hours=1, max_entries=100)
+        cache.put_many({'k1': entry({'process': 'x'})})
+
+        # A fresh instance (other worker) only has the database tier
+        other = FragmentCache(memory_entries=10, ttl_hours=1, max_entries=100)
+        assert other.get_many(['k1', 'k2']) == {'k1': {'process': 'x'}}
+        assert other.stats()['db_hits'] == 1
+        assert other.stats()['misses'] == 1
+        assert LLMResponseCache.query.filter_by(cache_key='k1').one().hit_count == 1
+
+        # Second lookup is served from memory
+        other.get('k1')
+        assert other.stats()['memory_hits'] == 1
+
+    def test_expired_entries_are_misses(self, app_ctx):
+        cache = FragmentCache(memory_entries=10, ttl_hours=1, max_entries=100)
+        cache.put_many({'k1': entry('text')})
+        row = LLMResponseCache.query.filter_by(cache_key='k1').one()
+        row.created_at = datetime.utcnow() - timedelta(hours=2)
+        db.session.commit()
+        cache.clear_memory()
+
+        assert cache.get('k1') is None
+        assert cache.stats()['expired'] == 1
+        assert LLMResponseCache.query.count() == 0
+
+    def test_lru_pruning(self, app_ctx):
+        cache = FragmentCache(memory_entries=10, ttl_hours=1, max_entries=2)
+        cache.put_many({'old': entry('a')})
+        cache.put_many({'mid': entry('b')})
+        LLMResponseCache.query.filter_by(cache_key='old').one().last_used_at = datetime.utcnow() - timedelta(minutes=5)
+        db.session.commit()
+
+        cache.put_many({'new': entry('c')})
+
+        assert {r.cache_key for r in LLMResponseCache.query.all()} == {'mid', 'new'}
+        assert cache.stats()['evictions'] == 1
+
+    def test_concurrent_store_keeps_batch(self, app_ctx):
+        # Another worker stored 'k1' first; the rest of the batch is still written
+        FragmentCache(memory_entries=10, ttl_hours=1, max_entries=100).put_many({'k1': entry('theirs')})
+        cache = FragmentCache(memory_entries=10, ttl_hours=1, max_entries=100)
+
+        assert cache.put_many({'k1': entry('ours'), 'k2': entry('b')}) == 1
+        assert cache.stats()['stores'] == 1
+        assert cache.get_many(['k1', 'k2']) == {'k1': 'theirs', 'k2': 'b'}
+        assert cache.stats()['db_hits'] == 1
+
+    def test_expired_row_is_refreshed(self, app_ctx):
+        cache = FragmentCache(memory_entries=10, ttl_hours=1, max_entries=100)
+        cache.put_many({'k1': entry('old')})
+        LLMResponseCache.query.filter_by(cache_key='k1').one().created_at = datetime.utcnow() - timedelta(hours=2)
+        db.session.commit()
+
+        assert cache.put_many({'k1': entry('new')}) == 1
+        db.session.expire_all()
+        assert LLMResponseCache.query.filter_by(cache_key='k1').one().response == 'new'
+
+    def test_memory_hits_refresh_last_used(self, app_ctx):
+        cache = FragmentCache(memory_entries=10, ttl_hours=1, max_entries=2)
+        cache.put_many({'hot': entry('a')})
+        cache.put_many({'cold': entry('b')})
+        for key, minutes in (('hot', 40), ('cold', 30)):
+            LLMResponseCache.query.filter_by(cache_key=key).one().last_used_at = (
+                datetime.utcnow() - timedelta(minutes=minutes)
+            )
+        db.session.commit()
+
+        # 'hot' is served from memory but still written back once the resolution has passed
+        later = datetime.utcnow() + llm_response_cache.LAST_USED_RESOLUTION
+        with patch.object(llm_response_cache, 'datetime') as fake_datetime:
+            fake_datetime.utcnow.return_value = later
+            assert cache.get('hot') == 'a'
+        assert cache.stats()['memory_hits'] == 1
+
+        cache.put_many({'new': entry('c')})
+        assert {r.cache_key for r in LLMResponseCache.query.all()} == {'hot', 'new'}
+
+    def test_caller_transaction_is_left_alone(self, app_ctx):
+        cache = FragmentCache(memory_entries=10, ttl_hours=1, max_entries=100)
+        db.session.add(LLMResponseCache(
+            cache_key='caller', namespace='ns', model='m', prompt_version='v1', response='x',
+            created_at=datetime.utcnow(), last_used_at=datetime.utcnow()
+        ))
+        cache.put_many({'k1': entry('a')})
+        cache.clear_memory()
+        assert cache.get('k1') == 'a'
+
+        # Nothing was committed - the caller's rollback discards its row and the cache writes
+        db.session.rollback()
+        assert LLMResponseCache.query.count() == 0
+
+    def test_failed_store_keeps_caller_changes(self, app_ctx):
+        cache = FragmentCache(memory_entries=10, ttl_hours=1, max_entries=100)
+        db.session.add(LLMResponseCache(
+            cache_key='caller', namespace='ns', model='m', prompt_version='v1', response='x',
+            created_at=datetime.utcnow(), last_used_at=datetime.utcnow()
+        ))
+        # NOT NULL violation inside the cache's savepoint
+        assert cache.put_many({'k1': {**entry('a'), 'namespace': None}}) == 0
+
+        db.session.commit()
+        assert [r.cache_key for r in LLMResponseCache.query.all()] == ['caller']
+
+
+class TestRunCachedCustomizations:
+
+    def test_second_run_makes_no_llm_calls(self, app_ctx):
+        calls = []
+
+        def fake_customize(name, level, template, pmt):
+            calls.append((name, level))
+            return {'process': f"{template['process']} with {pmt['tools']}"}
+
+        cache = FragmentCache(memory_entries=10, ttl_hours=1, max_entries=100)
+        pmt = {'processes': 'V-Model', 'methods': 'Scrum', 'tools': 'DOORS'}
+        jobs = [('Systems Thinking', level, {'process': f'P{level}'}, pmt) for level in (1, 2, 4)]
+
+        with patch.object(core, 'get_fragment_cache', return_value=cache):
+            first = core.run_cached_customizations('pmt_breakdown', 'v1', fake_customize, jobs)
+            # Another organization with the same PMT wording
+            second = core.run_cached_customizations('pmt_breakdown', 'v1', fake_customize, jobs)
+
+        assert len(calls) == 3
+        assert first == second
+        assert first[0] == ({'process': 'P1 with DOORS'}, None)
+
+    def test_failures_are_not_cached(self, app_ctx):
+        cache = FragmentCache(memory_entries=10, ttl_hours=1, max_entries=100)
+        jobs = [('Communication', 1, 'template', {'tools': 'JIRA'})]
+
+        with patch.object(core, 'get_fragment_cache', return_value=cache):
+            result = core.run_cached_customizations('ttt_objective', 'v1', lambda *a: None, jobs)
+
+        assert result == [(None, None)]
+        assert LLMResponseCache.query.count() == 0
@@ -0,0 +1,209 @@
+"""
+Unit Tests for the Warm Process Identification Pipeline
+=======================================================
+
+Tests the process catalogue refresh and the concurrent stage graph of
+ProcessIdentificationPipeline (llm_process_identification_pipeline.py). The
+database fetches, the LLM chains, embeddings and vector index are replaced. The module
+needs LangChain; the stage tests also need the tiktoken encoding (a lazy
+resource) and are skipped where it cannot be loaded.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+try:
+    from langchain_core.runnables import RunnableLambda
+    from app.services.llm_pipeline import llm_process_identification_pipeline as pipeline_module
+    from app.services.llm_pipeline import retrieval
+except Exception as e:  # LangChain unavailable
+    pytest.skip(f"Process identification pipeline unavailable: {e}", allow_module_level=True)
+
+PROCESSES = [
+    {'name': 'Verification process', 'description': 'Verify the system', 'combined': ''},
+    {'name': 'Integration process', 'description': 'Integrate the system', 'combined': ''},
+]
+
+
+class FakeLLM:
+    def with_structured_output(self, model):
+        return RunnableLambda(lambda prompt: model(processes=[]))
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    state = {'fingerprint': '2:a', 'fetches': 0}
+
+    def fetch():
+        state['fetches'] += 1
+        return list(PROCESSES)
+
+    monkeypatch.setattr(pipeline_module, 'fetch_processes_fingerprint', lambda: state['fingerprint'])
+    monkeypatch.setattr(pipeline_module, 'fetch_processes_from_db', fetch)
+
+    instance = object.__new__(pipeline_module.ProcessIdentificationPipeline)
+    instance.llm_creative = FakeLLM()
+    instance._catalogue = None
+    instance._catalogue_lock = threading.Lock()
+    instance._next_check = 0.0
+    return instance, state
+
+
+def test_catalogue_built_once_and_refreshed_on_change(pipeline):
+    instance, state = pipeline
+
+    first = instance.catalogue()
+    assert instance.catalogue() is first
+
+    # Fingerprint unchanged after the check interval - no reload
+    instance._next_check = 0.0
+    assert instance.catalogue() is first
+    assert state['fetches'] == 1
+
+    state['fingerprint'] = '3:b'
+    instance._next_check = 0.0
+    assert instance.catalogue() is not first
+    assert state['fetches'] == 2
+
+
+def test_failed_refresh_keeps_previous_catalogue(pipeline, monkeypatch):
+    instance, state = pipeline
+    first = instance.catalogue()
+
+    monkeypatch.setattr(pipeline_module, 'fetch_processes_from_db', lambda: [])
+    state['fingerprint'] = '3:b'
+    instance._next_check = 0.0
+    assert instance.catalogue() is first
+
+
+def test_catalogue_prerenders_prompt_and_retrieval_query(pipeline):
+    instance, _ = pipeline
+    catalogue = instance.catalogue()
+
+    prompt = catalogue.identification_prompt.format_prompt(user_tasks='Testing').to_string()
+    assert 'Verification process: Verify the system...' in prompt
+    assert catalogue.retrieval_query(['integration process', 'Verification Process']) == (
+        'Verification process Verify the system Integration process Integrate the system'
+    )
+
+
+def chain(func):
+    return SimpleNamespace(invoke=func)
+
+
+@pytest.fixture
+def stage_pipeline(pipeline, monkeypatch):
+    """Pipeline with fake chains; language detection, validation and identification block on a barrier"""
+    try:
+        pipeline_module.encoder.get()
+    except Exception as e:  # tiktoken download unavailable
+        pytest.skip(f"tiktoken encoding unavailable: {e}")
+    instance, _ = pipeline
+    instance._executor = ThreadPoolExecutor(max_workers=4)
+    instance.reasoning_prompt = pipeline_module.create_reasoning_prompt()
+    barrier = threading.Barrier(3, timeout=5)
+    calls = []
+
+    def concurrent_stage(name, result):
+        def invoke(inputs):
+            calls.append((name, inputs))
+            barrier.wait()  # only passes if the three stages run at the same time
+            return result
+        return invoke
+
+    valid = SimpleNamespace(is_valid_responsible_for=True, is_valid_supporting=True,
+                            is_valid_designing=True, message='')
+    instance.language_detection_chain = chain(concurrent_stage('language', SimpleNamespace(is_german=False)))
+    instance.validation_chain = chain(concurrent_stage('validation', valid))
+    instance.reasoning_chain = chain(lambda inputs: SimpleNamespace(processes=[
+        SimpleNamespace(process_name='Verification process', involvement='Responsible')
+    ]))
+    instance.role_selection_chain = chain(lambda inputs: SimpleNamespace(
+        selected_role_id=9, selected_role_name='V&V Operator', confidence='High', reasoning='Tests'
+    ))
+
+    catalogue = instance.catalogue()
+    catalogue.identification_chain = chain(concurrent_stage(
+        'identification', SimpleNamespace(processes=['Verification process'])
+    ))
+    monkeypatch.setattr(retrieval, '_retrieval_cache', retrieval.RetrievalCache())
+    monkeypatch.setattr(pipeline_module, 'embedding_provider', SimpleNamespace(
+        embed_documents=lambda texts: [[1.0, float(i)] for i in range(len(texts))]
+    ))
+    monkeypatch.setattr(pipeline_module, 'vector_store', SimpleNamespace(
+        similarity_search_by_vector=lambda vector, k: [SimpleNamespace(page_content='Verification process')] * k
+    ))
+    yield instance, calls
+    instance._executor.shutdown(wait=False, cancel_futures=True)
+
+
+TASKS = {'responsible_for': ['Testing'], 'supporting': ['Reviews'], 'designing': ['Test benches']}
+
+
+def test_independent_stages_run_concurrently_with_timings(stage_pipeline):
+    instance, calls = stage_pipeline
+
+    result = instance.process_tasks(TASKS)
+
+    assert result['status'] == 'success'
+    assert {name for name, _ in calls} == {'language', 'validation', 'identification'}
+    assert result['llm_role_suggestion']['role_id'] == 9
+    timings = result['metadata']['stage_timings']
+    assert {'language_detection', 'validation', 'process_identification', 'retrieval',
+            'token_check', 'reasoning', 'role_selection'} <= set(timings)
+    assert result['metadata']['total_seconds'] >= timings['reasoning']
+    assert result['metadata']['retrieval_cache_hit'] is False
+
+    # Same identified process set: retrieval served from the cache
+    calls.clear()
+    instance.catalogue().identification_chain = chain(lambda inputs: SimpleNamespace(processes=['Verification process']))
+    instance.language_detection_chain = chain(lambda inputs: SimpleNamespace(is_german=False))
+    instance.validation_chain = chain(lambda inputs: SimpleNamespace(
+        is_valid_responsible_for=True, is_valid_supporting=True, is_valid_designing=True, message=''
+    ))
+    assert instance.process_tasks(TASKS)['metadata']['retrieval_cache_hit'] is True
+
+
+def test_german_tasks_validated_after_translation(stage_pipeline):
+    instance, calls = stage_pipeline
+    instance.language_detection_chain = chain(lambda inputs: SimpleNamespace(is_german=True))
+    instance.validation_chain = chain(lambda inputs: calls.append(('validation', inputs)) or SimpleNamespace(
+        is_valid_responsible_for=True, is_valid_supporting=True, is_valid_designing=False, message='Invalid'
+    ))
+    instance.translation_chain = chain(lambda inputs: SimpleNamespace(translated_tasks=SimpleNamespace(
+        responsible_for=['Translated'], supporting=['Translated'], designing=['Translated']
+    )))
+    # Identification does not wait for the other stages here
+    instance.catalogue().identification_chain = chain(lambda inputs: SimpleNamespace(processes=[]))
+
+    result = instance.process_tasks(TASKS)
+
+    assert result['status'] == 'invalid_tasks'
+    assert 'translation' in result['metadata']['stage_timings']
+    validated = [inputs['tasks'] for name, inputs in calls if name == 'validation']
+    assert any(text.startswith('Responsible For:\nTranslated') for text in validated)
+
+
+def test_deferred_role_selection_returns_future(stage_pipeline):
+    instance, _ = stage_pipeline
+    started = threading.Event()
+
+    def slow_role_selection(inputs):
+        started.set()
+        time.sleep(0.05)
+        return SimpleNamespace(selected_role_id=4, selected_role_name='System Engineer',
+                               confidence='Medium', reasoning='Integration')
+    instance.role_selection_chain = chain(slow_role_selection)
+
+    result = instance.process_tasks(TASKS, defer_role_selection=True)
+    timings = dict(result['metadata']['stage_timings'])
+
+    assert 'llm_role_suggestion' not in result
+    suggestion, seconds = result['llm_role_suggestion_future'].result(timeout=5)
+    assert suggestion['role_name'] == 'System Engineer' and seconds >= 0.05
+    # The background stage returns its timing instead of writing to the returned metadata
+    assert result['metadata']['stage_timings'] == timings and 'role_selection' not in timings
@@ -0,0 +1,123 @@
+"""
+Unit Tests for the Cached Process Retrieval
+===========================================
+
+Tests for llm_pipeline/retrieval.py with fake embeddings and vector store:
+query vectors composed from the per-process table, exactly-k searches,
+cache keys independent of order and case, and the counters.
+"""
+
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.services.llm_pipeline import retrieval
+from app.services.llm_pipeline.retrieval import (
+    ProcessEmbeddingTable, RetrievalCache, normalize_process_set, retrieve_documents
+)
+
+SNIPPETS = [
+    ('verification process', 'Verification process Verify the system'),
+    ('integration process', 'Integration process Integrate the system'),
+    ('risk management process', 'Risk management process Manage risks'),
+]
+
+
+class FakeEmbeddings:
+    def __init__(self):
+        self.documents_calls = 0
+        self.query_calls = []
+
+    def embed_documents(self, texts):
+        self.documents_calls += 1
+        return [[3.0 * (i == j) for j in range(3)] for i in range(len(texts))]
+
+    def embed_query(self, text):
+        self.query_calls.append(text)
+        return [0.0, 0.0, 1.0]
+
+
+class FakeVectorStore:
+    def __init__(self):
+        self.searches = []
+
+    def similarity_search_by_vector(self, vector, k):
+        self.searches.append((vector, k))
+        return [SimpleNamespace(page_content=f'doc {i}') for i in range(k)]
+
+
+class FakeCatalogue:
+    fingerprint = '3:abc'
+
+    def __init__(self):
+        self._table = None
+        self._lock = threading.Lock()
+
+    def retrieval_query(self, identified_processes):
+        identified = {p.lower() for p in identified_processes}
+        return " ".join(text for name, text in SNIPPETS if name in identified)
+
+    def embedding_table(self, embeddings):
+        with self._lock:
+            if self._table is None:
+                self._table = ProcessEmbeddingTable.build(SNIPPETS, embeddings)
+        return self._table
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = RetrievalCache(max_entries=2)
+    monkeypatch.setattr(retrieval, '_retrieval_cache', cache)
+    return cache
+
+
+def test_query_vector_is_normalized_mean():
+    table = ProcessEmbeddingTable.build(SNIPPETS, FakeEmbeddings())
+
+    vector = table.query_vector(('integration process', 'verification process'))
+
+    assert np.allclose(vector, [np.sqrt(0.5), np.sqrt(0.5), 0.0])
+    assert table.query_vector(('unknown process',)) is None
+    assert table.query_vector(()) is None
+
+
+def test_process_set_key_ignores_order_case_and_duplicates():
+    assert normalize_process_set(['Integration process ', 'verification Process', 'integration process']) == \
+        ('integration process', 'verification process')
+
+
+def test_cached_retrieval_searches_exactly_k_without_query_embedding(cache):
+    catalogue, embeddings, store = FakeCatalogue(), FakeEmbeddings(), FakeVectorStore()
+
+    docs, hit = retrieve_documents(catalogue, ['Verification process', 'Integration process'], 6, store, embeddings)
+    again, hit_again = retrieve_documents(catalogue, ['integration process', 'VERIFICATION PROCESS'], 6, store, embeddings)
+
+    assert (hit, hit_again) == (False, True)
+    assert len(docs) == 6 and [d.page_content for d in again] == [d.page_content for d in docs]
+    assert [k for _, k in store.searches] == [6]
+    assert embeddings.documents_calls == 1 and embeddings.query_calls == []
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['composed_queries'], stats['hit_rate']) == (1, 1, 1, 0.5)
+
+
+def test_unknown_process_falls_back_to_remote_query_embedding(cache):
+    catalogue, embeddings, store = FakeCatalogue(), FakeEmbeddings(), FakeVectorStore()
+
+    retrieve_documents(catalogue, ['Verification process', 'Made-up process'], 6, store, embeddings)
+
+    assert embeddings.query_calls == ['Verification process Verify the system']
+    assert store.searches == [([0.0, 0.0, 1.0], 6)]
+    assert cache.stats()['embedded_queries'] == 1
+
+
+def test_cache_evicts_least_recently_used(cache):
+    catalogue, embeddings, store = FakeCatalogue(), FakeEmbeddings(), FakeVectorStore()
+    for processes in (['Verification process'], ['Integration process'], ['Verification process'],
+                      ['Risk management process'], ['Integration process']):
+        retrieve_documents(catalogue, processes, 5, store, embeddings)
+
+    # Integration was evicted by Risk management (Verification was used more recently)
+    assert cache.stats()['entries'] == 2
+    assert len(store.searches) == 4
@@ -0,0 +1,112 @@
+"""
+Unit Tests for the Reference Data Cache
+=======================================
+
+Tests for reference_data.py against an in-memory SQLite database: cached
+lookups, version stamp invalidation across workers and the uncached
+fallback when the version table is missing.
+"""
+
+import pytest
+from flask import Flask
+
+from models import (
+    db, Competency, IsoProcesses, ReferenceDataVersion, RoleCluster,
+    StrategyTemplate, StrategyTemplateCompetency
+)
+from app.services import reference_data
+from app.services.reference_data import ReferenceDataCache, bump_reference_data_version
+
+REFERENCE_TABLES = (Competency, IsoProcesses, RoleCluster, StrategyTemplate, StrategyTemplateCompetency)
+
+
+def make_app(with_version_table):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    db.init_app(app)
+    tables = REFERENCE_TABLES + ((ReferenceDataVersion,) if with_version_table else ())
+    with app.app_context():
+        db.metadata.create_all(db.engine, tables=[m.__table__ for m in tables])
+    return app
+
+
+def seed():
+    for comp_id, name in ((2, 'Lifecycle Consideration'), (1, 'Systems Thinking')):
+        db.session.add(Competency(id=comp_id, competency_name=name, competency_area='Core'))
+    db.session.add(RoleCluster(id=4, role_cluster_name='System Engineer', role_cluster_description='Overview'))
+    db.session.add(IsoProcesses(id=1, name='acquisition process'))
+    db.session.add(StrategyTemplate(id=1, strategy_name='SE for managers'))
+    db.session.add(StrategyTemplateCompetency(id=1, strategy_template_id=1, competency_id=1, target_level=4))
+    db.session.commit()
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = ReferenceDataCache(version_check_seconds=0)
+    monkeypatch.setattr(reference_data, '_reference_data', cache)
+    with make_app(with_version_table=True).app_context():
+        seed()
+        bump_reference_data_version('test_seed')
+        db.session.commit()
+        yield cache
+        db.session.remove()
+
+
+class TestReferenceDataCache:
+
+    def test_lookups_served_from_memory(self, cache):
+        assert cache.competency_ids() == [1, 2]
+        assert cache.competency(1).competency_name == 'Systems Thinking'
+        assert cache.competency_name(99) == 'Competency 99'
+        assert cache.role_cluster(4).to_dict() == {'id': 4, 'name': 'System Engineer', 'description': 'Overview'}
+        assert [p.name for p in cache.iso_processes()] == ['acquisition process']
+        assert cache.template_target_level(1, 1) == 4
+        assert cache.template_target_level(1, 2) is None
+        assert cache.template_target_level(7, 1) is None
+
+        stats = cache.stats()
+        assert stats['misses'] == 4  # one load per table
+        assert stats['hits'] == 4
+        assert stats['hit_rate'] == 0.5
+        assert stats['version'] == 1
+
+    def test_records_are_read_only(self, cache):
+        with pytest.raises(AttributeError):
+            cache.competency(1).competency_name = 'Changed'
+        with pytest.raises(TypeError):
+            cache.strategy_template(1).targets[1] = 6
+
+    def test_version_bump_reloads_other_workers(self, cache):
+        other_worker = ReferenceDataCache(version_check_seconds=0)
+        assert other_worker.competency(1).competency_name == 'Systems Thinking'
+
+        Competency.query.filter_by(id=1).update({'competency_name': 'Systems Thinking (renamed)'})
+        db.session.commit()
+        assert other_worker.competency(1).competency_name == 'Systems Thinking'  # still cached
+
+        bump_reference_data_version('test_rename')
+        db.session.commit()
+        assert other_worker.competency(1).competency_name == 'Systems Thinking (renamed)'
+        assert other_worker.stats()['reloads'] == 1
+        assert other_worker.stats()['version'] == 2
+
+    def test_version_checks_are_rate_limited(self, cache):
+        throttled = ReferenceDataCache(version_check_seconds=3600)
+        throttled.competency_ids()
+        bump_reference_data_version('test_throttle')
+        db.session.commit()
+        throttled.competency_ids()
+        assert throttled.stats()['version_checks'] == 1
+        assert throttled.stats()['version'] == 1
+
+
+def test_without_version_table_nothing_is_cached():
+    cache = ReferenceDataCache(version_check_seconds=0)
+    with make_app(with_version_table=False).app_context():
+        seed()
+        assert cache.competency(1).competency_name == 'Systems Thinking'
+        Competency.query.filter_by(id=1).update({'competency_name': 'Renamed'})
+        db.session.commit()
+        assert cache.competency(1).competency_name == 'Renamed'
+        assert cache.stats()['hits'] == 0
+        db.session.remove()
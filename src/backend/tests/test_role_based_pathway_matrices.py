@@ -0,0 +1,119 @@
+"""
+Unit Tests for the Role-Based Pathway Matrices
+==============================================
+
+Checks that PathwayMatrices (dense score / requirement / target matrices)
+and the vectorized scenario classification give the same answers as the
+scalar helpers of role_based_pathway_fixed.
+
+Runs against an in-memory SQLite database.
+"""
+
+import itertools
+from datetime import datetime
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from models import (
+    db, User, Competency, OrganizationRoles, UserAssessment, UserCompetencySurveyResult,
+    RoleCompetencyMatrix, StrategyTemplate, StrategyTemplateCompetency, LearningStrategy
+)
+from app.services import role_based_pathway_fixed as rbp
+
+TABLES = (
+    User, Competency, OrganizationRoles, UserAssessment, UserCompetencySurveyResult,
+    RoleCompetencyMatrix, StrategyTemplate, StrategyTemplateCompetency, LearningStrategy
+)
+LEVELS = [0, 1, 2, 4, 6]
+
+
+@pytest.fixture
+def app_ctx(sqlite_app):
+    sqlite_app(TABLES)
+
+
+def seed_org():
+    """Two competencies, two roles, three users (one multi-role, one re-assessed)"""
+    for comp_id in (1, 2):
+        db.session.add(Competency(id=comp_id, competency_name=f"Competency {comp_id}"))
+    for role_id in (1, 2):
+        db.session.add(OrganizationRoles(id=role_id, organization_id=1, role_name=f"Role {role_id}"))
+    for (role_id, comp_id), value in {(1, 1): 2, (1, 2): 4, (2, 1): 6, (2, 2): -100}.items():
+        db.session.add(RoleCompetencyMatrix(
+            role_cluster_id=role_id, competency_id=comp_id, organization_id=1, role_competency_value=value
+        ))
+
+    db.session.add(StrategyTemplate(id=1, strategy_name='SE for managers'))
+    db.session.add(StrategyTemplateCompetency(strategy_template_id=1, competency_id=1, target_level=4))
+    db.session.add(LearningStrategy(id=1, organization_id=1, strategy_name='SE for managers',
+                                    selected=True, strategy_template_id=1))
+
+    for user_id in (1, 2, 3):
+        db.session.add(User(id=user_id, username=f"user{user_id}", password_hash='x'))
+    assessments = [(1, 1, [1, 2]), (2, 2, [1]), (3, 3, [2]), (4, 3, [1])]
+    for assessment_id, user_id, roles in assessments:
+        db.session.add(UserAssessment(
+            id=assessment_id, user_id=user_id, organization_id=1, assessment_type='role_based',
+            selected_roles=roles, completed_at=datetime.utcnow()
+        ))
+    db.session.flush()
+    scores = [(1, 1, 1, 1), (1, 1, 2, 6), (2, 2, 1, 4), (3, 3, 1, 0), (4, 3, 1, 2)]
+    for assessment_id, user_id, comp_id, score in scores:
+        db.session.add(UserCompetencySurveyResult(
+            user_id=user_id, organization_id=1, competency_id=comp_id, score=score, assessment_id=assessment_id
+        ))
+    db.session.commit()
+
+
+def test_vectorized_classification_matches_scalar_rules():
+    grid = list(itertools.product(LEVELS, [1, 2, 4, 6], LEVELS + [-100]))
+    matrices = object.__new__(rbp.PathwayMatrices)
+    matrices.competency_ids = list(range(len(grid)))
+    matrices.strategy_index = {1: 0}
+    matrices.user_scores = np.array([[g[0] for g in grid]], dtype=float)
+    matrices.targets = np.array([[g[1] for g in grid]], dtype=float)
+    matrices.user_requirements = np.array([[g[2] for g in grid]], dtype=float)
+
+    competency_ids, labels = matrices.classify_scenarios(SimpleNamespace(id=1))
+
+    assert competency_ids == matrices.competency_ids
+    assert labels[0].tolist() == [rbp.classify_gap_scenario(*g) for g in grid]
+
+
+def test_matrices_match_point_queries(app_ctx):
+    seed_org()
+    data = rbp.get_assessment_data(1)
+    matrices = rbp.PathwayMatrices(
+        data['user_assessments'], data['organization_roles'],
+        data['selected_strategies'], data['all_competencies']
+    )
+    strategy = data['selected_strategies'][0]
+
+    for role_id, comp_id in itertools.product((1, 2), (1, 2)):
+        assert matrices.role_requirement(role_id, comp_id) == rbp.get_role_requirement(role_id, comp_id)
+    for comp_id in (1, 2):
+        assert matrices.strategy_target(strategy, comp_id) == rbp.get_strategy_target_level(strategy, comp_id)
+
+    # Multi-role user 1 takes the MAX (including N/A = -100 only when nothing else exists)
+    assert matrices.user_requirements[matrices.user_index[1]].tolist() == [6, 4]
+    # User 3 was re-assessed with role 1: the last assessment decides
+    assert matrices.user_requirements[matrices.user_index[3]].tolist() == [2, 4]
+
+
+def test_analyze_all_roles_classifies_each_user_once(app_ctx):
+    seed_org()
+    data = rbp.get_assessment_data(1)
+
+    analyses = rbp.analyze_all_roles_fixed(
+        data['organization_roles'], data['user_assessments'],
+        data['selected_strategies'], data['all_competencies']
+    )
+
+    # Competency 2 has no target in the strategy template
+    assert list(analyses[1]) == [1]
+    # user 1: current 1 < target 4 <= MAX requirement 6 -> A
+    # user 2: current 4 >= requirement 2 and >= target 4 -> D
+    # user 3: target 4 > requirement 2 (role of the last assessment) -> C
+    assert analyses[1][1]['scenario_classifications'] == {1: 'A', 2: 'D', 3: 'C'}
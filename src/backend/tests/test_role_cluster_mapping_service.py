@@ -0,0 +1,103 @@
+"""
+Unit Tests for Batch Role Cluster Mapping
+=========================================
+
+Tests for the concurrent / grouped map_multiple_roles() of
+role_cluster_mapping_service.py with a fake OpenAI client.
+"""
+
+import json
+import re
+import threading
+from types import SimpleNamespace
+
+from app.services.role_cluster_mapping_service import RoleClusterMappingService
+
+
+class FakeCompletions:
+    """Answers mapping prompts; blocks single-role calls on a barrier when given one"""
+
+    def __init__(self, barrier=None, fail_titles=(), drop_from_groups=()):
+        self.barrier = barrier
+        self.fail_titles = fail_titles
+        self.drop_from_groups = drop_from_groups
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def create(self, messages, **kwargs):
+        prompt = messages[-1]['content']
+        titles = re.findall(r'\*\*Role Title\*\*: (.+)', prompt)
+        with self.lock:
+            self.calls.append((titles, kwargs.get('timeout')))
+        if self.barrier is not None:
+            self.barrier.wait()
+        if any(title in self.fail_titles for title in titles):
+            raise RuntimeError('LLM down')
+
+        def mapping(title):
+            return {'cluster_name': 'system engineer', 'confidence_score': 90, 'reasoning': title,
+                    'matched_responsibilities': [], 'is_primary': True}
+
+        if len(titles) == 1:
+            answer = {'mappings': [mapping(titles[0])], 'overall_analysis': titles[0]}
+        else:
+            answer = {'roles': [
+                {'role_index': i, 'mappings': [mapping(title)], 'overall_analysis': title}
+                for i, title in enumerate(titles, 1) if title not in self.drop_from_groups
+            ]}
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(answer)))])
+
+
+def make_service(completions):
+    service = object.__new__(RoleClusterMappingService)
+    service.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    service.model = 'test-model'
+    service.db_session = None
+    return service
+
+
+ROLES = [{'title': f'Role {i}', 'description': 'Engineering work'} for i in range(1, 5)]
+
+
+class TestMapMultipleRoles:
+
+    def test_roles_mapped_concurrently_in_input_order(self):
+        completions = FakeCompletions(barrier=threading.Barrier(4, timeout=5))
+        result = make_service(completions).map_multiple_roles(
+            ROLES, max_workers=4, role_timeout_seconds=30, roles_per_prompt=1
+        )
+
+        assert [r['role_title'] for r in result['results']] == [r['title'] for r in ROLES]
+        assert [r['overall_analysis'] for r in result['results']] == [r['title'] for r in ROLES]
+        assert result['results'][0]['mappings'][0]['cluster_id'] == 4
+        assert result['results'][0]['mappings'][0]['cluster_name'] == 'System Engineer'
+        assert result['total_mappings'] == 4
+        assert {timeout for _, timeout in completions.calls} == {30}
+
+    def test_failed_role_keeps_other_results(self):
+        completions = FakeCompletions(fail_titles=('Role 2',))
+        result = make_service(completions).map_multiple_roles(ROLES, max_workers=2, roles_per_prompt=1)
+
+        errors = [r['error'] for r in result['results']]
+        assert errors[1] == 'LLM down'
+        assert errors[0] is None and errors[2] is None and errors[3] is None
+        assert result['total_mappings'] == 3
+
+    def test_grouped_prompts_fall_back_for_missing_roles(self):
+        completions = FakeCompletions(drop_from_groups=('Role 2',))
+        result = make_service(completions).map_multiple_roles(ROLES, max_workers=2, roles_per_prompt=2)
+
+        assert sorted(len(titles) for titles, _ in completions.calls) == [1, 2, 2]
+        assert ['Role 2'] in [titles for titles, _ in completions.calls]
+        assert [r['overall_analysis'] for r in result['results']] == [r['title'] for r in ROLES]
+        assert all(r['mappings'][0]['cluster_id'] == 4 for r in result['results'])
+
+    def test_catalogue_formatted_once_per_batch(self, monkeypatch):
+        service = make_service(FakeCompletions())
+        formatted = []
+        original = service.build_cluster_catalogue
+        monkeypatch.setattr(service, 'build_cluster_catalogue', lambda clusters: formatted.append(1) or original(clusters))
+
+        service.map_multiple_roles(ROLES, max_workers=2, roles_per_prompt=1)
+
+        assert len(formatted) == 1
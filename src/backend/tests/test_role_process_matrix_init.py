@@ -0,0 +1,105 @@
+"""
+Unit Tests for the Bulk Role-Process Matrix Initialization
+==========================================================
+
+Tests for role_process_matrix_init.py against an in-memory SQLite database
+(the custom role generator is replaced by a fake).
+"""
+
+import threading
+
+import pytest
+
+from models import db, IsoProcesses, OrganizationRoles, RoleCluster, RoleProcessMatrix
+from app.services import role_process_matrix_init as matrix_init
+
+TABLES = (IsoProcesses, OrganizationRoles, RoleCluster, RoleProcessMatrix)
+
+
+@pytest.fixture
+def app_ctx(sqlite_app):
+    app = sqlite_app(TABLES)
+    seed()
+    return app
+
+
+def seed():
+    """Processes 1-4; reference org 1 has a role for cluster 4 covering processes 1-3"""
+    db.session.add(RoleCluster(id=4, role_cluster_name='System Engineer', role_cluster_description=''))
+    for process_id in range(1, 5):
+        db.session.add(IsoProcesses(id=process_id, name=f'Process {process_id}', description=''))
+    db.session.add(OrganizationRoles(id=1, organization_id=1, role_name='System Engineer', standard_role_cluster_id=4))
+    for process_id, value in ((1, 2), (2, 1), (3, 4)):
+        db.session.add(RoleProcessMatrix(organization_id=1, role_cluster_id=1, iso_process_id=process_id, role_process_value=value))
+    for role_id, name, cluster_id in ((10, 'SE Lead', 4), (11, 'Data Wrangler', None), (12, 'Toolsmith', None), (13, 'Tester', 9)):
+        db.session.add(OrganizationRoles(id=role_id, organization_id=5, role_name=name, standard_role_cluster_id=cluster_id))
+    db.session.commit()
+
+
+ROLES = [
+    {'id': 10, 'orgRoleName': 'SE Lead', 'standardRoleId': 4, 'identificationMethod': 'STANDARD'},
+    {'id': 11, 'orgRoleName': 'Data Wrangler', 'identificationMethod': 'CUSTOM', 'description': 'Data'},
+    {'id': 12, 'orgRoleName': 'Toolsmith', 'identificationMethod': 'CUSTOM'},
+    {'id': 13, 'orgRoleName': 'Tester', 'standardRoleId': 9, 'identificationMethod': 'STANDARD'},
+]
+
+
+class FakeGenerator:
+    def __init__(self, fail_for=()):
+        self.fail_for = fail_for
+        self.contexts = []
+        self.lock = threading.Lock()
+
+    def generate_matrix_for_custom_role(self, role_name, role_description, processes, existing_matrix, existing_roles):
+        with self.lock:
+            self.contexts.append((role_name, existing_matrix, existing_roles))
+        if role_name in self.fail_for:
+            return {'success': False, 'matrix': {p['id']: 0 for p in processes}, 'error': 'AI down'}
+        return {'success': True, 'matrix': {1: 3, 4: 1}, 'reasoning': 'Fake'}
+
+
+def org_matrix(org_id):
+    matrix = {}
+    for row in RoleProcessMatrix.query.filter_by(organization_id=org_id):
+        matrix.setdefault(row.role_cluster_id, {})[row.iso_process_id] = row.role_process_value
+    return matrix
+
+
+class TestInitializeRoleMatrices:
+
+    def test_standard_custom_and_zero_filled_roles(self, app_ctx):
+        generator = FakeGenerator(fail_for=('Toolsmith',))
+        result = matrix_init.initialize_role_matrices(5, ROLES, False, generator)
+        db.session.commit()
+
+        assert org_matrix(5) == {
+            10: {1: 2, 2: 1, 3: 4, 4: 0},  # copied from reference, 0 where it has no value
+            11: {1: 3, 2: 0, 3: 0, 4: 1},  # AI values
+            12: {1: 0, 2: 0, 3: 0, 4: 0},  # AI failed
+            13: {1: 0, 2: 0, 3: 0, 4: 0},  # no reference role for cluster 9
+        }
+        assert result == {
+            'entries_created': 16, 'roles_skipped': 0,
+            'initialized_role_ids': [10, 11, 12, 13], 'processes_per_role': 4
+        }
+
+    def test_ai_context_loaded_once_with_standard_copies(self, app_ctx):
+        generator = FakeGenerator()
+        matrix_init.initialize_role_matrices(5, ROLES, False, generator)
+
+        assert sorted(name for name, _, _ in generator.contexts) == ['Data Wrangler', 'Toolsmith']
+        _, existing_matrix, existing_roles = generator.contexts[0]
+        assert all(context[1] is existing_matrix for context in generator.contexts)
+        assert existing_matrix[3] == {10: 4, 13: 0}
+        assert {'id': 10, 'orgRoleName': 'SE Lead', 'standardRoleName': 'System Engineer'} in existing_roles
+
+    def test_smart_merge_skips_roles_with_matrix(self, app_ctx):
+        db.session.add(RoleProcessMatrix(organization_id=5, role_cluster_id=10, iso_process_id=1, role_process_value=1))
+        db.session.commit()
+
+        result = matrix_init.initialize_role_matrices(5, ROLES[:2], True, FakeGenerator())
+        db.session.commit()
+
+        assert result['roles_skipped'] == 1
+        assert result['initialized_role_ids'] == [11]
+        assert org_matrix(5)[10] == {1: 1}
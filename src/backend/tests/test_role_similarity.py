@@ -0,0 +1,124 @@
+"""
+Unit Tests for the Vectorized Role Similarity
+=============================================
+
+Tests for role_similarity.py against an in-memory SQLite database: the
+broadcasted distances and rankings must equal the per-role loop of the
+original find_most_similar_role_cluster(), and cached role matrices must
+follow the organization's input revision.
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from models import db, OrganizationInputRevision, RoleCompetencyMatrix
+from app.most_similar_role import find_most_similar_role_cluster, find_most_similar_role_clusters
+from app.services import role_similarity
+from app.services.input_revision import bump_input_revision
+from app.services.role_similarity import RoleMatrixCache, compute_distances
+
+LEVELS = [0, 1, 2, 4, 6]
+
+
+@pytest.fixture
+def app_ctx(sqlite_app, monkeypatch):
+    monkeypatch.setattr(role_similarity, '_role_matrix_cache', RoleMatrixCache())
+    sqlite_app([RoleCompetencyMatrix, OrganizationInputRevision])
+
+
+def seed_roles(rng, org_id=1, roles=8, competencies=16):
+    for role_id in range(1, roles + 1):
+        for comp_id in range(1, competencies + 1):
+            if rng.random() < 0.9:
+                db.session.add(RoleCompetencyMatrix(
+                    role_cluster_id=org_id * 100 + role_id, competency_id=comp_id,
+                    organization_id=org_id, role_competency_value=rng.choice(LEVELS)
+                ))
+    db.session.commit()
+
+
+def loop_reference(org_id, user_scores):
+    """The per-role loop of the original find_most_similar_role_cluster()"""
+    roles = {}
+    for row in RoleCompetencyMatrix.query.filter_by(organization_id=org_id):
+        roles.setdefault(row.role_cluster_id, {})
+        roles[row.role_cluster_id][row.competency_id] = roles[row.role_cluster_id].get(row.competency_id, 0) + \
+            row.role_competency_value
+    comp_ids = sorted({c for values in roles.values() for c in values})
+    scores = {e['competency_id']: e['score'] for e in user_scores}
+    user = np.array([scores.get(c, 0) for c in comp_ids])
+
+    distances = {'euclidean': {}, 'manhattan': {}, 'cosine': {}}
+    for role_id in sorted(roles):
+        vec = np.array([roles[role_id].get(c, 0) for c in comp_ids])
+        distances['euclidean'][role_id] = np.linalg.norm(user - vec)
+        distances['manhattan'][role_id] = np.sum(np.abs(user - vec))
+        m1, m2 = np.linalg.norm(user), np.linalg.norm(vec)
+        distances['cosine'][role_id] = 1.0 if m1 == 0 or m2 == 0 else 1 - np.dot(user, vec) / (m1 * m2)
+    closest = {m: [r for r, d in values.items() if d == min(values.values())] for m, values in distances.items()}
+    best = closest['euclidean'][0]
+    return {
+        'role_ids': closest['euclidean'],
+        'min_distance': min(distances['euclidean'].values()),
+        'metric_agreement': sum(best in closest[m] for m in closest),
+        'distances': distances
+    }
+
+
+def random_user(rng, competencies=16):
+    return [{'competency_id': c, 'score': rng.choice(LEVELS)} for c in range(1, competencies + 1) if rng.random() < 0.8]
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_batch_ranking_matches_per_role_loop(app_ctx, seed):
+    rng = random.Random(seed)
+    seed_roles(rng)
+    users = [random_user(rng) for _ in range(25)] + [[]]
+
+    results = find_most_similar_role_clusters(1, users)
+
+    for user_scores, result in zip(users, results):
+        expected = loop_reference(1, user_scores)
+        assert result['role_ids'] == expected['role_ids']
+        assert result['min_distance'] == expected['min_distance']
+        assert result['metric_agreement'] == expected['metric_agreement']
+        assert result['distances'] == expected['distances']
+    assert find_most_similar_role_cluster(1, users[0]) == results[0]
+
+
+def test_ties_return_all_closest_roles():
+    users = np.array([[2.0, 2.0]])
+    roles = np.array([[2.0, 4.0], [2.0, 0.0], [0.0, 0.0]])
+    distances = compute_distances(users, roles)
+    assert distances['euclidean'].tolist() == [[2.0, 2.0, np.sqrt(8)]]
+    assert distances['cosine'][0, 2] == 1.0  # zero role vector
+
+
+def test_organization_without_roles(app_ctx):
+    assert find_most_similar_role_clusters(5, [[{'competency_id': 1, 'score': 4}]]) == [{
+        'role_ids': [], 'min_distance': 999, 'metric_agreement': 0,
+        'distances': {'euclidean': {}, 'manhattan': {}, 'cosine': {}}
+    }]
+
+
+def test_role_matrix_cached_until_input_revision_changes(app_ctx):
+    for role_id, comp_id, value in ((1, 1, 2), (1, 2, 4), (2, 1, 1), (2, 2, 0)):
+        db.session.add(RoleCompetencyMatrix(
+            role_cluster_id=role_id, competency_id=comp_id, organization_id=1, role_competency_value=value
+        ))
+    db.session.commit()
+    cache = role_similarity.get_role_matrix_cache()
+    user = [{'competency_id': 1, 'score': 6}, {'competency_id': 2, 'score': 6}]
+
+    find_most_similar_role_clusters(1, [user])
+    RoleCompetencyMatrix.query.filter_by(organization_id=1).update({'role_competency_value': 6})
+    db.session.commit()
+    assert find_most_similar_role_clusters(1, [user])[0]['min_distance'] != 0  # still cached
+    assert cache.stats()['hits'] == 1
+
+    bump_input_revision(1, 'test')
+    db.session.commit()
+    assert find_most_similar_role_clusters(1, [user])[0]['min_distance'] == 0
+    assert cache.stats()['reloads'] == 1
@@ -0,0 +1,95 @@
+"""
+Unit Tests for the Reasoning Prompt Token Budget
+================================================
+
+Tests for llm_pipeline/token_budget.py with a word-level fake encoder: the
+packed subset equals the result of the old drop-and-re-encode loop, every
+document is encoded once across requests, and an oversized first document
+is cut at a token boundary.
+"""
+
+import random
+from types import SimpleNamespace
+
+from app.services.llm_pipeline.token_budget import (
+    BOUNDARY_TOKENS, DOCUMENT_SEPARATOR, TokenBudgetPacker
+)
+
+
+class WordEncoder:
+    """One token per whitespace-separated word (separators cost nothing)"""
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, text):
+        self.encoded.append(text)
+        return text.split()
+
+    def decode(self, tokens):
+        return " ".join(tokens)
+
+
+def document(words, tag):
+    return SimpleNamespace(page_content=" ".join(f"{tag}{i}" for i in range(words)))
+
+
+def old_loop(fixed, docs, budget):
+    """Drop the last document until the re-encoded prompt fits (at least one document kept)"""
+    encoder = WordEncoder()
+    while True:
+        tokens = fixed + len(encoder.encode(DOCUMENT_SEPARATOR.join(d.page_content for d in docs)))
+        if tokens <= budget or len(docs) <= 1:
+            return docs
+        docs = docs[:-1]
+
+
+def test_packed_subset_matches_iterative_loop():
+    rng = random.Random(3)
+    for _ in range(50):
+        docs = [document(rng.randint(20, 400), f"d{i}-") for i in range(rng.randint(1, 14))]
+        fixed = rng.randint(100, 1500)
+        budget = 6000
+        # Reserve the boundary tokens in the reference as well
+        expected = old_loop(fixed + BOUNDARY_TOKENS * len(docs), docs, budget)
+
+        packed = TokenBudgetPacker(WordEncoder()).pack(fixed, docs, budget)
+
+        if not packed.truncated:
+            assert packed.documents == expected[:len(packed.documents)]
+            assert packed.tokens <= budget
+            assert packed.text == DOCUMENT_SEPARATOR.join(d.page_content for d in packed.documents)
+            assert packed.dropped == len(docs) - len(packed.documents)
+
+
+def test_document_counts_cached_across_requests():
+    encoder = WordEncoder()
+    packer = TokenBudgetPacker(encoder)
+    catalogue = [document(300, f"p{i}-") for i in range(10)]
+
+    for _ in range(5):
+        packer.pack(1000, random.Random(_).sample(catalogue, 6), 3000)
+
+    encoded_documents = [text for text in encoder.encoded if text != DOCUMENT_SEPARATOR]
+    assert len(encoded_documents) == len(set(encoded_documents)) <= 10
+    assert packer.stats()['hits'] > 0
+
+
+def test_oversized_first_document_truncated_by_tokens():
+    packer = TokenBudgetPacker(WordEncoder())
+    docs = [document(500, "big"), document(10, "small")]
+
+    packed = packer.pack(fixed_tokens=5800, documents=docs, budget=6000)
+
+    assert packed.truncated and packed.dropped == 1
+    assert len(packed.text.split()) == 200 - BOUNDARY_TOKENS
+    assert packed.text.startswith("big0 big1") and packed.tokens == 6000
+
+
+def test_everything_fits_and_no_documents():
+    packer = TokenBudgetPacker(WordEncoder())
+    docs = [document(10, "a"), document(10, "b")]
+
+    packed = packer.pack(100, docs, 6000)
+    assert packed.documents == docs and packed.tokens == 100 + 20 + 2 * BOUNDARY_TOKENS
+    assert packer.pack(100, [], 6000).documents == []
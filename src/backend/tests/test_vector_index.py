@@ -0,0 +1,167 @@
+"""
+Unit Tests for the Vector Index and Embedding Providers
+=======================================================
+
+Tests for llm_pipeline/vector_index.py and llm_pipeline/embeddings.py: the
+safe on-disk format round trip (memory-mapped, no pickle), exact L2 search,
+the provider check, conversion of a legacy FAISS directory, rebuilding the
+shipped documents from the process catalogue and the provider factory.
+"""
+
+import importlib.util
+import pickle
+import struct
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.services import llm_executor
+from app.services.llm_pipeline import embeddings as embeddings_module
+from app.services.llm_pipeline.embeddings import (
+    EmbeddingProvider, OpenAIEmbeddingProvider, create_embedding_provider
+)
+from app.services.llm_pipeline.resources import FAISS_INDEX_PATH, PROCESS_CATALOGUE_PATH
+from app.services.llm_pipeline.vector_index import (
+    IndexedDocument, VectorIndex, load_process_catalogue, merge_process_catalogue,
+    process_documents, read_legacy_faiss_index
+)
+
+IDENTITY = {'provider': 'openai', 'model': 'text-embedding-ada-002'}
+
+
+class FakeDocstore:
+    def __init__(self, documents):
+        self._dict = documents
+
+    def search(self, doc_id):
+        return self._dict[doc_id]
+
+
+def random_index(rows=12, dimension=8, seed=0):
+    rng = np.random.default_rng(seed)
+    vectors = rng.normal(size=(rows, dimension)).astype(np.float32)
+    documents = [IndexedDocument(f'doc {i}', {'row': i}) for i in range(rows)]
+    return VectorIndex.from_vectors(vectors, documents, IDENTITY)
+
+
+def test_save_and_load_memory_mapped(tmp_path):
+    index = random_index()
+    index.save(str(tmp_path))
+
+    loaded = VectorIndex.load(str(tmp_path))
+
+    assert isinstance(loaded.vectors, np.memmap)
+    assert not loaded.vectors.flags.writeable
+    assert np.array_equal(loaded.vectors, index.vectors)
+    assert loaded.documents == index.documents
+    assert loaded.manifest['count'] == 12 and loaded.identity == IDENTITY
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['documents.json', 'index.json', 'vectors.npy']
+
+
+def test_search_returns_exactly_k_nearest_in_distance_order():
+    index = random_index()
+    query = np.random.default_rng(1).normal(size=8).astype(np.float32)
+
+    results = index.similarity_search_by_vector(query.tolist(), k=5)
+
+    distances = ((index.vectors - query) ** 2).sum(axis=1)
+    assert [d.metadata['row'] for d in results] == np.argsort(distances, kind='stable')[:5].tolist()
+    assert len(index.similarity_search_by_vector(query, k=50)) == 12
+    with pytest.raises(ValueError):
+        index.similarity_search_by_vector([1.0, 2.0], k=1)
+
+
+def test_provider_mismatch_is_refused():
+    index = random_index()
+    index.check_provider(SimpleNamespace(identity=dict(IDENTITY)))
+    with pytest.raises(ValueError, match='rebuild'):
+        index.check_provider(SimpleNamespace(identity={'provider': 'local', 'model': 'all-MiniLM-L6-v2'}))
+
+
+def test_legacy_faiss_directory_converted(tmp_path):
+    vectors = np.arange(12, dtype=np.float32).reshape(3, 4)
+    header = b'IxF2' + struct.pack('<iqqq?i', 4, 3, 1 << 20, 1 << 20, True, 1) + struct.pack('<Q', vectors.size)
+    (tmp_path / 'index.faiss').write_bytes(header + vectors.tobytes())
+    docstore = FakeDocstore({f'id-{i}': SimpleNamespace(page_content=f'Process {i}', metadata={}) for i in range(3)})
+    with open(tmp_path / 'index.pkl', 'wb') as f:
+        pickle.dump((docstore, {0: 'id-2', 1: 'id-0', 2: 'id-1'}), f)
+
+    converted, documents = read_legacy_faiss_index(str(tmp_path))
+
+    assert np.array_equal(converted, vectors)
+    assert [d.page_content for d in documents] == ['Process 2', 'Process 0', 'Process 1']
+
+
+def test_shipped_index_finds_each_process_document():
+    index = VectorIndex.load(FAISS_INDEX_PATH)
+
+    assert index.identity == IDENTITY
+    for row in (0, 7, 29):
+        assert index.similarity_search_by_vector(index.vectors[row], k=1)[0] == index.documents[row]
+
+
+def test_rebuilt_documents_match_shipped_index():
+    index = VectorIndex.load(FAISS_INDEX_PATH)
+
+    documents = process_documents(load_process_catalogue(PROCESS_CATALOGUE_PATH))
+
+    assert documents == index.documents
+    assert all('  Activity: ' in d.page_content and '    Task: ' in d.page_content for d in documents)
+
+
+def test_database_rows_keep_catalogue_activities():
+    catalogue = load_process_catalogue(PROCESS_CATALOGUE_PATH)
+    rows = [
+        {'id': 1, 'name': 'Acquisition Process', 'description': 'Updated description.'},
+        {'id': 99, 'name': 'New process', 'description': None}
+    ]
+
+    processes, missing = merge_process_catalogue(rows, catalogue)
+    documents = process_documents(processes)
+
+    assert missing == ['New process']
+    assert documents[0].page_content.startswith(
+        'Process: Acquisition Process\nProcess Description: Updated description.\n  Activity: Prepare for the acquisition\n'
+    )
+    assert documents[1].page_content == 'Process: New process\nProcess Description: \n'
+
+
+def test_openai_provider_batches_and_keeps_order(monkeypatch):
+    batches = []
+
+    def create(model, input):
+        batches.append(list(input))
+        data = [SimpleNamespace(index=i, embedding=[float(len(text))]) for i, text in enumerate(input)]
+        return SimpleNamespace(data=list(reversed(data)))
+
+    client = SimpleNamespace(embeddings=SimpleNamespace(create=create))
+    monkeypatch.setattr(llm_executor, 'get_openai_client', lambda api_key: client)
+    monkeypatch.setattr(llm_executor, 'get_rate_limiter', lambda: SimpleNamespace(acquire=lambda: None))
+
+    provider = OpenAIEmbeddingProvider('text-embedding-ada-002', batch_size=2)
+
+    assert provider.embed_documents(['a', 'bb', 'ccc']) == [[1.0], [2.0], [3.0]]
+    assert batches == [['a', 'bb'], ['ccc']]
+    assert provider.embed_query('dddd') == [4.0]
+    assert provider.identity == IDENTITY
+
+
+def test_provider_must_implement_embed():
+    with pytest.raises(TypeError):
+        EmbeddingProvider('model')
+
+
+def test_provider_factory(monkeypatch):
+    monkeypatch.setattr(embeddings_module, 'get_embedding_settings', lambda: {
+        'provider': 'openai', 'openai_model': 'text-embedding-3-small', 'local_model': 'x', 'batch_size': 16
+    })
+    provider = create_embedding_provider()
+    assert (provider.name, provider.model, provider.batch_size) == ('openai', 'text-embedding-3-small', 16)
+
+    with pytest.raises(ValueError, match='Unknown embedding provider'):
+        create_embedding_provider('remote-gpu')
+
+    if importlib.util.find_spec('sentence_transformers') is None:
+        with pytest.raises(ImportError, match='sentence-transformers'):
+            create_embedding_provider('local')
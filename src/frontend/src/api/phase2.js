@@ -8,6 +8,9 @@ import axiosInstance from './axios';
 // Extended timeout for LLM-based operations (5 minutes)
 const LLM_TIMEOUT = 300000;
 
+// Poll interval for background learning objectives generation jobs
+const JOB_POLL_INTERVAL = 2000;
+
 /**
  * Phase 2 Task 1: Determine Necessary Competencies APIs
  */
@@ -226,29 +229,68 @@ export const phase2Task3Api = {
 
   /**
    * Generate learning objectives
+   * Queues a background generation job and polls it until it finishes.
    * @param {Number} orgId - Organization ID
-   * @param {Object} options - Generation options (force: boolean for regeneration)
+   * @param {Object} options - Generation options (force: boolean for regeneration,
+   *   onProgress: optional callback receiving the job progress while polling)
    * @returns {Promise} Generated learning objectives
    */
   generateObjectives: async (orgId, options = {}) => {
+    const { onProgress, ...requestOptions } = options;
     try {
       const response = await axiosInstance.post(
         '/api/phase2/learning-objectives/generate',
         {
           organization_id: orgId,
-          ...options
-        },
-        {
-          timeout: LLM_TIMEOUT  // Extended timeout for LLM processing
+          ...requestOptions,
+          async: true
         }
       );
-      return response.data;
+
+      // 200 = inputs unchanged, cached result returned directly
+      if (response.status !== 202) {
+        return response.data;
+      }
+
+      const deadline = Date.now() + LLM_TIMEOUT;
+      while (Date.now() < deadline) {
+        await new Promise(resolve => setTimeout(resolve, JOB_POLL_INTERVAL));
+        const { job } = await phase2Task3Api.getGenerationJob(response.data.job_id);
+
+        if (onProgress) {
+          onProgress(job);
+        }
+        if (job.status === 'completed') {
+          return await phase2Task3Api.getObjectives(orgId);
+        }
+        if (job.status === 'failed') {
+          throw new Error(job.error || 'Learning objectives generation failed');
+        }
+      }
+      throw new Error('Learning objectives generation timed out');
     } catch (error) {
       console.error('[Phase2 Task3 API] Failed to generate objectives:', error);
       throw error;
     }
   },
 
+  /**
+   * Get status of a background generation job
+   * @param {Number} jobId - Job ID returned by generateObjectives
+   * @returns {Promise} Job status ({ job: { status, progress, error, ... } })
+   */
+  getGenerationJob: async (jobId) => {
+    try {
+      const response = await axiosInstance.get(
+        `/api/phase2/learning-objectives/jobs/${jobId}`
+      );
+      return response.data;
+    } catch (error) {
+      console.error('[Phase2 Task3 API] Failed to fetch generation job:', error);
+      throw error;
+    }
+  },
+
   /**
    * Get existing learning objectives
    * @param {Number} orgId - Organization ID